@@ -10,10 +10,11 @@ import core.config.config_ as cconconf
 
 import collections
 import copy
-import inspect
 import logging
 import os
 import re
+import sys
+import traceback
 from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import numpy as np
@@ -173,21 +174,43 @@ _OrderedDictType = collections.OrderedDict
 class _ConfigWriterInfo:
     """
     Store information on the function that writes a value into a Config.
+
+    Values are marked as used thousands of times while building a System, so
+    only the file name, line number, and function name of each frame are
+    captured when the object is built. The traceback and the shorthand for
+    the caller are formatted only when they are needed, e.g., when printing
+    a config in verbose mode.
     """
 
     def __init__(self):
-        # Capture information about who is constructing this object.
-        self._full_traceback = self._get_full_traceback()
-        self._shorthand_caller = self._get_shorthand_caller()
+        # Capture information about who is constructing this object, from the
+        # outermost to the innermost frame.
+        self._stack = self._get_stack()
 
     def __str__(self) -> str:
-        return self._shorthand_caller
+        return self._get_shorthand_caller()
 
     def __repr__(self) -> str:
-        return self._full_traceback
+        return self._get_full_traceback()
 
     @staticmethod
-    def _get_full_traceback() -> str:
+    def _get_stack() -> List[Tuple[str, int, str]]:
+        """
+        Return the filename, line number, and function name of the frames.
+
+        Walking the frames is much cheaper than `inspect.stack()` since it
+        doesn't read the source files.
+        """
+        stack = []
+        frame = sys._getframe(1)
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, frame.f_lineno, code.co_name))
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def _get_full_traceback(self) -> str:
         """
         Return full traceback as str.
 
@@ -198,16 +221,23 @@ class _ConfigWriterInfo:
         File "/app/core/config/test/test_config.py", line 2037, in test4
             actual_value = test_config.get_and_mark_as_used("key2")
         ...
-        File "/app/core/config/config_.py", line 188, in _get_full_traceback
-            return hintros.stacktrace_to_str()
-        File "/app/helpers/hintrospection.py", line 254, in stacktrace_to_str
-            txt = traceback.format_stack()
+        File "/app/core/config/config_.py", line 520, in _mark_as_used
+            writer = _ConfigWriterInfo()
+        File "/app/core/config/config_.py", line 190, in __init__
+            self._stack = self._get_stack()
         ```
         """
-        return hintros.stacktrace_to_str()
+        # The source lines are looked up only now.
+        stack_summary = traceback.StackSummary.from_list(
+            [
+                (filename, lineno, name, None)
+                for filename, lineno, name in self._stack
+            ]
+        )
+        txt = "".join(stack_summary.format())
+        return txt
 
-    @staticmethod
-    def _get_shorthand_caller() -> str:
+    def _get_shorthand_caller(self) -> str:
         """
         Return a shorthand for the latest outside caller of the function.
 
@@ -220,25 +250,24 @@ class _ConfigWriterInfo:
 
         'dataflow/system/system_builder_utils.py::49::get_config_template'
         """
-        stack = inspect.stack()
         # Select the current filename.
-        filename = stack[0].filename
+        filename = self._stack[-1][0]
         # Select the latest caller that is outside of the current module.
         # Due to abundance of internal recursive calls, we want to get the first
-        # call outside of the current module. E.g. for the stacktrace:
+        # call outside of the current module. E.g. for the stack:
         # ```
-        # FrameInfo(frame=<frame at 0x7fdce4734230, file '/app/core/config/test/test_config.py', line 2037, code test4>, filename='/app/core/config/test/test_config.py', lineno=2037, function='test4', code_context=['        actual_value = test_config.get_and_mark_as_used("key2")\n'], index=0)
-        # FrameInfo(frame=<frame at 0x4cafb50, file '/app/core/config/config_.py', line 1198, code _get_item>, filename='/app/core/config/config_.py', lineno=1198, function='_get_item', code_context=['        ret = self._config.__getitem__(key, mark_key_as_used=mark_key_as_used)  # type: ignore\n'], index=0)
-        # FrameInfo(frame=<frame at 0x7fdce471edd0, file '/app/core/config/config_.py', line 475, code _mark_as_used>, filename='/app/core/config/config_.py', lineno=475, function='_mark_as_used', code_context=['            writer = _ConfigWriterInfo()\n'], index=0)
-        # FrameInfo(frame=<frame at 0x4d0cd70, file '/app/core/config/config_.py', line 178, code __init__>, filename='/app/core/config/config_.py', lineno=178, function='__init__', code_context=['        self._shorthand_caller = self._get_shorthand_caller()\n'], index=0)
-        # FrameInfo(frame=<frame at 0x7fdce471e230, file '/app/core/config/config_.py', line 210, code _get_shorthand_caller>, filename='/app/core/config/config_.py', lineno=207, function='_get_shorthand_caller', code_context=['        stack = inspect.stack()\n'], index=0)
+        # ('/app/core/config/test/test_config.py', 2037, 'test4')
+        # ('/app/core/config/config_.py', 1198, '_get_item')
+        # ('/app/core/config/config_.py', 520, '_mark_as_used')
+        # ('/app/core/config/config_.py', 190, '__init__')
         # ```
         # We select the first one with a different file, i.e.:
-        # `FrameInfo(frame=<frame at 0x7fdce4734230, file '/app/core/config/test/test_config.py', line 2037, code test4>, filename='/app/core/config/test/test_config.py', lineno=2037, function='test4', code_context=['        actual_value = test_config.get_and_mark_as_used("key2")\n'], index=0)`
-        #
-        caller = next(call for call in stack if call.filename != filename)
+        # `('/app/core/config/test/test_config.py', 2037, 'test4')`
+        caller_filename, caller_lineno, caller_function = next(
+            call for call in reversed(self._stack) if call[0] != filename
+        )
         latest_outside_caller = (
-            f"{caller.filename}::{caller.lineno}::{caller.function}"
+            f"{caller_filename}::{caller_lineno}::{caller_function}"
         )
         return latest_outside_caller
 
@@ -9,8 +9,11 @@ from typing import Generator, Iterable, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 
 import helpers.hdbg as hdbg
+import helpers.hnumba as hnumba
+import helpers.hpandas as hpandas
 
 _LOG = logging.getLogger(__name__)
 
@@ -33,6 +36,137 @@ def _crop_data_frame_in_batches(
     return generator_object
 
 
+# Index of each statistic in the state of `_extract_bars_kernel()`.
+_TICK_NUM = 0
+_PREV_PRICE = 1
+_PREV_TICK_RULE = 2
+_OPEN = 3
+_HIGH = 4
+_LOW = 5
+_CUM_TICKS = 6
+_CUM_DOLLAR_VALUE = 7
+_CUM_VOLUME = 8
+_CUM_BUY_VOLUME = 9
+_STATE_SIZE = 10
+
+# Cumulative statistics that can be used as metric to sample the bars.
+_METRIC_TO_STATE_IDX = {
+    "cum_ticks": _CUM_TICKS,
+    "cum_dollar_value": _CUM_DOLLAR_VALUE,
+    "cum_volume": _CUM_VOLUME,
+    "cum_buy_volume": _CUM_BUY_VOLUME,
+}
+
+# Columns of the bars, besides `date_time`, computed by
+# `_extract_bars_kernel()`.
+_BAR_VALUE_COLS = [
+    "tick_num",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "cum_buy_volume",
+    "cum_ticks",
+    "cum_dollar_value",
+]
+
+
+def _get_initial_state() -> np.ndarray:
+    """
+    Return the state of `_extract_bars_kernel()` before the first tick.
+    """
+    state = np.zeros(_STATE_SIZE)
+    state[_PREV_PRICE] = np.nan
+    state[_OPEN] = np.nan
+    state[_HIGH] = -np.inf
+    state[_LOW] = np.inf
+    return state
+
+
+@hnumba.jit
+def _extract_bars_kernel(
+    prices: np.ndarray,
+    volumes: np.ndarray,
+    thresholds: np.ndarray,
+    metric_idx: int,
+    state: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sample the bars from ticks, updating `state` in place.
+
+    :param prices: price of each tick
+    :param volumes: volume of each tick
+    :param thresholds: threshold of each tick or a single threshold for all
+        the ticks
+    :param metric_idx: index in `state` of the cumulative statistic that
+        triggers a sample when it reaches the threshold
+    :param state: statistics of the ticks since the last bar (see
+        `_get_initial_state()`), carried over from the previous batch
+    :return: index of the tick closing each bar and values of the bars with
+        the columns in `_BAR_VALUE_COLS`
+    """
+    num_ticks = prices.shape[0]
+    capacity = min(num_ticks, 1024)
+    bar_idxs = np.empty(capacity, np.int64)
+    bar_values = np.empty((capacity, 9), np.float64)
+    num_bars = 0
+    for i in range(num_ticks):
+        price = prices[i]
+        volume = volumes[i]
+        state[_TICK_NUM] += 1
+        # Apply the tick rule as defined on page 29 of Advances in Financial
+        # Machine Learning.
+        tick_diff = 0.0
+        if not np.isnan(state[_PREV_PRICE]):
+            tick_diff = price - state[_PREV_PRICE]
+        if tick_diff != 0:
+            state[_PREV_TICK_RULE] = np.sign(tick_diff)
+        signed_tick = state[_PREV_TICK_RULE]
+        state[_PREV_PRICE] = price
+        # Update the bar statistics.
+        if np.isnan(state[_OPEN]):
+            state[_OPEN] = price
+        state[_HIGH] = max(state[_HIGH], price)
+        state[_LOW] = min(state[_LOW], price)
+        state[_CUM_TICKS] += 1
+        state[_CUM_DOLLAR_VALUE] += price * volume
+        state[_CUM_VOLUME] += volume
+        if signed_tick == 1:
+            state[_CUM_BUY_VOLUME] += volume
+        # If threshold reached then take a sample.
+        threshold = thresholds[0] if thresholds.shape[0] == 1 else thresholds[i]
+        if state[metric_idx] >= threshold:
+            if num_bars == capacity:
+                capacity *= 2
+                bar_idxs_tmp = np.empty(capacity, np.int64)
+                bar_idxs_tmp[:num_bars] = bar_idxs
+                bar_idxs = bar_idxs_tmp
+                bar_values_tmp = np.empty((capacity, 9), np.float64)
+                bar_values_tmp[:num_bars] = bar_values
+                bar_values = bar_values_tmp
+            bar_idxs[num_bars] = i
+            bar_values[num_bars, 0] = state[_TICK_NUM]
+            bar_values[num_bars, 1] = state[_OPEN]
+            bar_values[num_bars, 2] = state[_HIGH]
+            bar_values[num_bars, 3] = state[_LOW]
+            bar_values[num_bars, 4] = price
+            bar_values[num_bars, 5] = state[_CUM_VOLUME]
+            bar_values[num_bars, 6] = state[_CUM_BUY_VOLUME]
+            bar_values[num_bars, 7] = state[_CUM_TICKS]
+            bar_values[num_bars, 8] = state[_CUM_DOLLAR_VALUE]
+            num_bars += 1
+            # Reset the bar statistics.
+            state[_OPEN] = np.nan
+            state[_HIGH] = -np.inf
+            state[_LOW] = np.inf
+            state[_CUM_TICKS] = 0
+            state[_CUM_DOLLAR_VALUE] = 0
+            state[_CUM_VOLUME] = 0
+            state[_CUM_BUY_VOLUME] = 0
+    return bar_idxs[:num_bars], bar_values[:num_bars]
+
+
 class _StandardBars:
     """
     Contains all of the logic to construct the standard bars from chapter 2.
@@ -57,24 +191,16 @@ class _StandardBars:
         :param threshold:
         :param batch_size: Number of rows to read in from the csv, per batch.
         """
+        hdbg.dassert_in(metric, _METRIC_TO_STATE_IDX)
         # Base properties.
         self.metric = metric
         self.batch_size = batch_size
-        self.prev_tick_rule = 0
-        # Cache properties.
-        self.open_price: Optional[float] = None
-        self.prev_price: Optional[float] = None
-        self.close_price: Optional[float] = None
-        self.high_price, self.low_price = -np.inf, np.inf
-        self.cum_statistics = {
-            "cum_ticks": 0,
-            "cum_dollar_value": 0,
-            "cum_volume": 0,
-            "cum_buy_volume": 0,
-        }
-        # Tick number when bar was formed.
-        self.tick_num = 0
+        # Statistics of the ticks since the last bar, carried over from one
+        # batch to the next one.
+        self._state = _get_initial_state()
         # Threshold at which to sample.
+        if isinstance(threshold, pd.Series):
+            hpandas.dassert_strictly_increasing_index(threshold)
         self.threshold = threshold
         # Batch_run properties.
         # The first flag is false since the first batch doesn't use the cache.
@@ -87,12 +213,13 @@ class _StandardBars:
         output_path: Optional[str] = None,
     ) -> Union[pd.DataFrame, None]:
         """
-        Read csv file(s) or pd.DataFrame in batches and then constructs the
-        financial data structure in the form of a DataFrame. The csv file or
-        DataFrame must have only 3 columns: date_time, price, & volume.
+        Read csv or Parquet file(s) or pd.DataFrame in batches and then
+        constructs the financial data structure in the form of a DataFrame.
+        The file or DataFrame must have only 3 columns: date_time, price, &
+        volume.
 
-        :param file_path_or_df: Path to the csv file(s) or Pandas Data Frame containing
-        raw tick data in the format[date_time, price, volume]
+        :param file_path_or_df: Path to the csv or Parquet file(s) or Pandas
+        Data Frame containing raw tick data in the format[date_time, price, volume]
         :param to_csv: Flag for writing the results of bars generation to local csv file,
         or to in-memory DataFrame
         :param output_path: Path to results file, if to_csv = True
@@ -109,34 +236,20 @@ class _StandardBars:
         # Read csv in batches.
         count = 0
         final_bars = []
-        cols = [
-            "date_time",
-            "tick_num",
-            "open",
-            "high",
-            "low",
-            "close",
-            "volume",
-            "cum_buy_volume",
-            "cum_ticks",
-            "cum_dollar_value",
-        ]
         for batch in self._batch_iterator(file_path_or_df):
             _LOG.debug("Batch number: %d", count)
-            list_bars = self.run(data=batch)
+            bars_df = self._run(batch)
             if to_csv is True:
-                pd.DataFrame(list_bars, columns=cols).to_csv(
-                    output_path, header=header, index=False, mode="a"
-                )
+                bars_df.to_csv(output_path, header=header, index=False, mode="a")
                 header = False
-            else:
+            elif not bars_df.empty:
                 # Append to bars list.
-                final_bars += list_bars
+                final_bars.append(bars_df)
             count += 1
         _LOG.debug("Returning bars")
         # Return a DataFrame.
         if final_bars:
-            bars_df = pd.DataFrame(final_bars, columns=cols)
+            bars_df = pd.concat(final_bars, ignore_index=True)
             return bars_df
         # Processed DataFrame is stored in .csv file, return None.
         return None
@@ -151,16 +264,28 @@ class _StandardBars:
         in the format[date_time, price, volume]
         :return: Financial data structure
         """
+        bars_df = self._run(data)
+        list_bars: List[list] = bars_df.values.tolist()
+        return list_bars
+
+    def _run(self, data: Union[list, tuple, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Same as `run()` but return the bars as a DataFrame.
+        """
         if isinstance(data, (list, tuple)):
-            values = data
+            date_times = np.array([row[0] for row in data], dtype=object)
+            prices = np.array([row[1] for row in data], dtype=float)
+            volumes = np.array([row[2] for row in data])
         elif isinstance(data, pd.DataFrame):
-            values = data.values
+            date_times = data.iloc[:, 0].to_numpy()
+            prices = data.iloc[:, 1].to_numpy(dtype=float)
+            volumes = data.iloc[:, 2].to_numpy()
         else:
             raise ValueError("data is neither list nor tuple nor pd.DataFrame")
-        list_bars = self._extract_bars(data=values)
+        bars_df = self._extract_bars(date_times, prices, volumes)
         # Set flag to True: notify function to use cache.
         self.flag = True
-        return list_bars
+        return bars_df
 
     @staticmethod
     def _assert_csv(test_batch: pd.DataFrame) -> None:
@@ -193,24 +318,18 @@ class _StandardBars:
         """
         Iterate over rows.
 
-        :param file_path_or_df: Path to the csv file(s) or Pandas Data Frame containing
-        raw tick data in the format[date_time, price, volume]
+        :param file_path_or_df: Path to the csv or Parquet file(s) or Pandas
+        Data Frame containing raw tick data in the format[date_time, price, volume]
         """
         if isinstance(file_path_or_df, (list, tuple)):
             # Assert format of all files.
             for file_path in file_path_or_df:
                 self._read_first_row(file_path)
             for file_path in file_path_or_df:
-                for batch in pd.read_csv(
-                    file_path, chunksize=self.batch_size, parse_dates=[0]
-                ):
-                    yield batch
+                yield from self._read_file_in_batches(file_path)
         elif isinstance(file_path_or_df, str):
             self._read_first_row(file_path_or_df)
-            for batch in pd.read_csv(
-                file_path_or_df, chunksize=self.batch_size, parse_dates=[0]
-            ):
-                yield batch
+            yield from self._read_file_in_batches(file_path_or_df)
         elif isinstance(file_path_or_df, pd.DataFrame):
             for batch in _crop_data_frame_in_batches(
                 file_path_or_df, self.batch_size
@@ -222,161 +341,103 @@ class _StandardBars:
                 "iterable of strings, nor pd.DataFrame"
             )
 
-    def _read_first_row(self, file_path: str) -> None:
+    def _read_file_in_batches(
+        self, file_path: str
+    ) -> Generator[pd.DataFrame, None, None]:
         """
-        Read first row of the CSV file.
+        Read a csv or Parquet file in batches of `batch_size` rows.
 
-        :param file_path: Path to the csv file containing raw tick data
+        :param file_path: Path to the file containing raw tick data
         in the format[date_time, price, volume]
         """
-        # Read in the first row & assert format.
-        first_row = pd.read_csv(file_path, nrows=1)
-        self._assert_csv(first_row)
+        if file_path.endswith(".parquet"):
+            parquet_file = pq.ParquetFile(file_path)
+            for record_batch in parquet_file.iter_batches(
+                batch_size=self.batch_size
+            ):
+                yield record_batch.to_pandas()
+        else:
+            for batch in pd.read_csv(
+                file_path, chunksize=self.batch_size, parse_dates=[0]
+            ):
+                yield batch
 
-    def _extract_bars(self, data: Union[list, tuple, np.ndarray]) -> list:
+    def _read_first_row(self, file_path: str) -> None:
         """
-        Compile the various bars: dollar, volume, or tick, in a for loop.
-
-        We did investigate the use of trying to solve this in a vectorised
-        manner but found that a For loop worked well.
+        Read first row of the csv or Parquet file.
 
-        :param data: (tuple) Contains 3 columns - date_time, price, and volume.
-        :return: Extracted bars
+        :param file_path: Path to the file containing raw tick data
+        in the format[date_time, price, volume]
         """
-        # Iterate over rows.
-        list_bars: List[list] = []
-        for row in data:
-            # Set variables.
-            date_time = row[0]
-            self.tick_num += 1
-            price = float(row[1])
-            volume = row[2]
-            dollar_value = price * volume
-            signed_tick = self._apply_tick_rule(price)
-            if isinstance(self.threshold, (int, float)):
-                # If the threshold is fixed, it's used for every sampling.
-                threshold = self.threshold
-            else:
-                # If the threshold is changing, then the threshold defined just before
-                # sampling time is used
-                threshold = self.threshold.iloc[
-                    self.threshold.index.get_loc(date_time, method="pad")
-                ]
-            if self.open_price is None:
-                self.open_price = price
-            # Update high low prices.
-            self.high_price, self.low_price = self._update_high_low(price)
-            # Calculations.
-            self.cum_statistics["cum_ticks"] += 1
-            self.cum_statistics["cum_dollar_value"] += dollar_value
-            self.cum_statistics["cum_volume"] += volume
-            if signed_tick == 1:
-                self.cum_statistics["cum_buy_volume"] += volume
-            # If threshold reached then take a sample.
-            if self.cum_statistics[self.metric] >= threshold:
-                self._create_bars(
-                    date_time, price, self.high_price, self.low_price, list_bars
-                )
-                # Reset cache.
-                self._reset_cache()
-        return list_bars
+        # Read in the first row & assert format.
+        if file_path.endswith(".parquet"):
+            parquet_file = pq.ParquetFile(file_path)
+            record_batch = next(parquet_file.iter_batches(batch_size=1))
+            first_row = record_batch.to_pandas()
+        else:
+            first_row = pd.read_csv(file_path, nrows=1)
+        self._assert_csv(first_row)
 
-    def _reset_cache(self) -> None:
-        """
-        Describe how cache should be reset when new bar is sampled.
+    def _get_thresholds(self, date_times: np.ndarray) -> np.ndarray:
         """
-        self.open_price = None
-        self.high_price, self.low_price = -np.inf, np.inf
-        self.cum_statistics = {
-            "cum_ticks": 0,
-            "cum_dollar_value": 0,
-            "cum_volume": 0,
-            "cum_buy_volume": 0,
-        }
-
-    def _update_high_low(self, price: float) -> Tuple[float, float]:
-        """
-        Update the high and low prices using the current price.
+        Return the threshold to use for each tick.
 
-        :param price: Current price
-        :return: Updated high and low prices
+        :param date_times: timestamp of each tick
+        :return: threshold for each tick or a single threshold, if it is fixed
         """
-        if price > self.high_price:
-            high_price = price
-        else:
-            high_price = self.high_price
-
-        if price < self.low_price:
-            low_price = price
+        if isinstance(self.threshold, (int, float)):
+            # If the threshold is fixed, it's used for every sampling.
+            thresholds = np.array([self.threshold], dtype=float)
         else:
-            low_price = self.low_price
-        return high_price, low_price
+            # If the threshold is changing, then the threshold defined just
+            # before sampling time is used.
+            idxs = (
+                self.threshold.index.searchsorted(
+                    pd.to_datetime(date_times), side="right"
+                )
+                - 1
+            )
+            if idxs.size > 0:
+                hdbg.dassert_lte(
+                    0,
+                    idxs.min(),
+                    "No threshold before the tick at %s",
+                    date_times[np.argmin(idxs)],
+                )
+            thresholds = self.threshold.to_numpy(dtype=float)[idxs]
+        return thresholds
 
-    def _create_bars(
-        self,
-        date_time: str,
-        price: float,
-        high_price: float,
-        low_price: float,
-        list_bars: list,
-    ) -> None:
-        """
-        Construct a bar which has the following fields: date_time, open, high,
-        low, close, volume, cum_buy_volume, cum_ticks, cum_dollar_value. These
-        bars are appended to list_bars, which is later used to construct the
-        final bars DataFrame.
-
-        :param date_time: Timestamp of the bar
-        :param price: The current price
-        :param high_price: Highest price in the period
-        :param low_price: Lowest price in the period
-        :param list_bars: List to which we append the bars
+    def _extract_bars(
+        self, date_times: np.ndarray, prices: np.ndarray, volumes: np.ndarray
+    ) -> pd.DataFrame:
         """
-        # Create bars.
-        open_price = self.open_price
-        high_price = max(high_price, open_price)
-        low_price = min(low_price, open_price)
-        close_price = price
-        volume = self.cum_statistics["cum_volume"]
-        cum_buy_volume = self.cum_statistics["cum_buy_volume"]
-        cum_ticks = self.cum_statistics["cum_ticks"]
-        cum_dollar_value = self.cum_statistics["cum_dollar_value"]
-        # Update bars.
-        list_bars.append(
-            [
-                date_time,
-                self.tick_num,
-                open_price,
-                high_price,
-                low_price,
-                close_price,
-                volume,
-                cum_buy_volume,
-                cum_ticks,
-                cum_dollar_value,
-            ]
-        )
+        Compile the various bars: dollar, volume, or tick.
 
-    def _apply_tick_rule(self, price: float) -> int:
-        """
-        Apply the tick rule as defined on page 29 of Advances in Financial
-        Machine Learning.
+        The ticks are processed by a compiled loop over NumPy arrays.
 
-        :param price: Price at time t
-        :return: The signed tick
+        :param date_times: timestamp of each tick
+        :param prices: price of each tick
+        :param volumes: volume of each tick
+        :return: Extracted bars
         """
-        if self.prev_price is not None:
-            tick_diff = price - self.prev_price
-        else:
-            tick_diff = 0
-        if tick_diff != 0:
-            signed_tick: int = np.sign(tick_diff)
-            self.prev_tick_rule = signed_tick
-        else:
-            signed_tick = self.prev_tick_rule
-        # Update previous price used for tick rule calculations.
-        self.prev_price = price
-        return signed_tick
+        thresholds = self._get_thresholds(date_times)
+        metric_idx = _METRIC_TO_STATE_IDX[self.metric]
+        bar_idxs, bar_values = _extract_bars_kernel(
+            prices,
+            volumes.astype(float),
+            thresholds,
+            metric_idx,
+            self._state,
+        )
+        bars = pd.DataFrame(bar_values, columns=_BAR_VALUE_COLS)
+        bars["tick_num"] = bars["tick_num"].astype(int)
+        bars["cum_ticks"] = bars["cum_ticks"].astype(int)
+        if np.issubdtype(volumes.dtype, np.integer):
+            # Keep integer volumes.
+            bars["volume"] = bars["volume"].astype(volumes.dtype)
+            bars["cum_buy_volume"] = bars["cum_buy_volume"].astype(volumes.dtype)
+        bars.insert(0, "date_time", date_times[bar_idxs])
+        return bars
 
     def _get_imbalance(
         self, price: float, signed_tick: int, volume: float
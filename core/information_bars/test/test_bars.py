@@ -6,10 +6,14 @@ import core.information_bars.test.test_bars as bttbar
 
 import os
 
+import numpy as np
+import pandas as pd
+
 import core.information_bars.bars as cinbabar
 import helpers.hpandas as hpandas
 import helpers.hunit_test as hunitest
 
+
 class TestBars(hunitest.TestCase):
     def test_get_tick_bars(self) -> None:
         """
@@ -48,3 +52,92 @@ class TestBars(hunitest.TestCase):
         file_name = os.path.join(self.get_input_dir(), file_name)
         file_name = os.path.abspath(file_name)
         return file_name
+
+
+# #############################################################################
+# TestBars2
+# #############################################################################
+
+
+class TestBars2(hunitest.TestCase):
+    """
+    Check that the bars don't depend on how the ticks are read.
+    """
+
+    def test_batches1(self) -> None:
+        """
+        Check that the bars are the same when the ticks are processed in
+        batches.
+        """
+        df = self._get_ticks()
+        expected = cinbabar.get_dollar_bars(df, threshold=3000)
+        actual = cinbabar.get_dollar_bars(df, threshold=3000, batch_size=7)
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+
+    def test_parquet1(self) -> None:
+        """
+        Check that the bars are the same when the ticks are read from a csv
+        and a Parquet file.
+        """
+        df = self._get_ticks()
+        scratch_dir = self.get_scratch_space()
+        csv_file_path = os.path.join(scratch_dir, "ticks.csv")
+        df.to_csv(csv_file_path, index=False)
+        parquet_file_path = os.path.join(scratch_dir, "ticks.parquet")
+        df.to_parquet(parquet_file_path, index=False)
+        expected = cinbabar.get_volume_bars(
+            csv_file_path, threshold=100, batch_size=10
+        )
+        actual = cinbabar.get_volume_bars(
+            parquet_file_path, threshold=100, batch_size=10
+        )
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+
+    def test_variable_threshold1(self) -> None:
+        """
+        Check that the threshold defined before each tick is used.
+        """
+        df = self._get_ticks()
+        threshold = pd.Series(
+            [5, 10],
+            index=pd.to_datetime(["2022-01-01 09:30:00", "2022-01-01 09:30:30"]),
+        )
+        actual = cinbabar.get_tick_bars(df, threshold=threshold, batch_size=7)
+        actual = actual[["date_time", "tick_num", "cum_ticks"]]
+        actual = hpandas.df_to_str(actual, num_rows=None)
+        expected = r"""
+                    date_time  tick_num  cum_ticks
+        0 2022-01-01 09:30:04         5          5
+        1 2022-01-01 09:30:09        10          5
+        2 2022-01-01 09:30:14        15          5
+        3 2022-01-01 09:30:19        20          5
+        4 2022-01-01 09:30:24        25          5
+        5 2022-01-01 09:30:29        30          5
+        6 2022-01-01 09:30:39        40         10
+        7 2022-01-01 09:30:49        50         10
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    @staticmethod
+    def _get_ticks() -> pd.DataFrame:
+        """
+        Build 50 ticks, one per second.
+        """
+        rng = np.random.default_rng(seed=0)
+        num_ticks = 50
+        df = pd.DataFrame(
+            {
+                "date_time": pd.date_range(
+                    "2022-01-01 09:30:00", periods=num_ticks, freq="S"
+                ),
+                "price": np.round(100 + rng.normal(size=num_ticks).cumsum(), 2),
+                "volume": rng.integers(1, 50, size=num_ticks),
+            }
+        )
+        return df
@@ -0,0 +1,306 @@
+"""
+Import as:
+
+import core.key_sorted_ring_buffer as cksoribu
+"""
+
+import collections
+import logging
+from typing import Any, List, Optional, Tuple, Type, Union
+
+import numpy as np
+import pandas as pd
+
+import helpers.hdbg as hdbg
+import helpers.hobject as hobject
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+# KeySortedRingBuffer
+# #############################################################################
+
+
+class KeySortedRingBuffer(hobject.PrintableMixin):
+    """
+    Key-value pairs where insertion order respects key order, stored in
+    preallocated NumPy arrays.
+
+    This has the same interface as `KeySortedOrderedDict`, but it only stores
+    numerical values of one of the following types:
+    - float scalars, if `is_scalar=True`
+    - `pd.Series` indexed by column labels (e.g., asset ids), if `fields` is
+      `None`
+    - `pd.DataFrame` indexed by column labels with `fields` as columns (e.g.,
+      `price`, `value`)
+
+    The values are stored in a ring buffer with one row per key and one column
+    per label, so that the values of the most recent keys can be retrieved as
+    a dataframe through `get_df()` without building it from one object per
+    key.
+
+    The columns are sorted by label, like the union of the indices of the
+    values computed by `pd.DataFrame(odict)`, unless they are passed to the
+    constructor. A label missing from a value is
+    represented as a missing column and not as a NaN value, so values are
+    returned with their labels in sorted order.
+    """
+
+    def __init__(
+        self,
+        key_type: Type,
+        max_keys: Optional[int] = None,
+        *,
+        columns: Optional[List[Any]] = None,
+        fields: Optional[List[str]] = None,
+        is_scalar: bool = False,
+    ):
+        """
+        Constructor.
+
+        :param key_type: type of the keys
+        :param max_keys: maximum number of keys to store, evicting the oldest
+            ones
+            - `None` for no limit, in which case the buffer grows as needed
+        :param columns: labels of the columns, when known in advance (e.g.,
+            the names of some statistics)
+            - `None` to add a column for each new label, keeping the columns
+              sorted
+        :param fields: names of the columns of dataframe values
+            - `None` for `pd.Series` values
+        :param is_scalar: whether the values are scalars
+        """
+        if max_keys is not None:
+            hdbg.dassert_lte(1, max_keys)
+        if is_scalar:
+            hdbg.dassert_is(fields, None)
+            hdbg.dassert_is(columns, None)
+            columns = [0]
+        self._key_type = key_type
+        self._max_keys = max_keys
+        self._fields = fields
+        self._is_scalar = is_scalar
+        # The buffer is preallocated for all the keys, when bounded.
+        capacity = max_keys if max_keys is not None else 16
+        num_fields = 1 if fields is None else len(fields)
+        # Labels of the columns, in sorted order unless passed by the caller.
+        self._has_fixed_columns = columns is not None
+        self._columns = pd.Index([] if columns is None else columns)
+        hdbg.dassert(not self._columns.has_duplicates)
+        num_columns = max(len(self._columns), 1)
+        # Key of each row.
+        self._keys = np.empty(capacity, dtype=object)
+        # Values of each row with shape `(capacity, num_columns, num_fields)`.
+        self._values = np.full((capacity, num_columns, num_fields), np.nan)
+        # Whether a label is present in the value of each row.
+        self._is_present = np.zeros((capacity, num_columns), dtype=bool)
+        # Map key -> sequence number of the corresponding row. The row of a
+        # sequence number is `seq_num % capacity`.
+        self._key_to_seq_num = {}
+        # Sequence number of the next row to write.
+        self._end_seq_num = 0
+
+    def __len__(self) -> int:
+        return len(self._key_to_seq_num)
+
+    def __contains__(self, key: Any) -> bool:
+        hdbg.dassert_isinstance(key, self._key_type)
+        return key in self._key_to_seq_num
+
+    def __getitem__(self, key: Any) -> Any:
+        hdbg.dassert_isinstance(key, self._key_type)
+        seq_num = self._key_to_seq_num[key]
+        return self._get_value(seq_num % self._capacity)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        hdbg.dassert_isinstance(key, self._key_type)
+        if self._key_to_seq_num:
+            last_key, _ = self._peek_key_and_row()
+            hdbg.dassert_lt(last_key, key)
+        if self._max_keys is None and len(self) == self._capacity:
+            self._resize(2 * self._capacity)
+        row = self._end_seq_num % self._capacity
+        # Evict the key stored in the row, if any.
+        if self._end_seq_num >= self._capacity:
+            del self._key_to_seq_num[self._keys[row]]
+        self._set_value(row, value)
+        self._keys[row] = key
+        self._key_to_seq_num[key] = self._end_seq_num
+        self._end_seq_num += 1
+
+    @property
+    def _capacity(self) -> int:
+        return self._keys.shape[0]
+
+    def peek(self) -> Tuple[Any, Any]:
+        """
+        Get but do not remove last key, value pair.
+        """
+        hdbg.dassert_lt(0, len(self), "The buffer is empty")
+        key, row = self._peek_key_and_row()
+        return key, self._get_value(row)
+
+    def get_ordered_dict(
+        self, num_keys: Optional[int] = None
+    ) -> collections.OrderedDict:
+        """
+        Get `num_keys` most recent elements as an `OrderedDict`.
+        """
+        odict = collections.OrderedDict()
+        for row in self._get_rows(num_keys):
+            odict[self._keys[row]] = self._get_value(row)
+        return odict
+
+    def get_df(
+        self, num_keys: Optional[int] = None, *, field: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Get `num_keys` most recent elements as a dataframe indexed by key.
+
+        This is equivalent to `pd.DataFrame(odict).transpose()` where `odict`
+        is the output of `get_ordered_dict()`, but it is computed with a single
+        slice of the buffer.
+
+        :param field: the field to return for dataframe values
+        :return: dataframe with the labels present in at least one of the rows
+            as columns
+        """
+        hdbg.dassert(not self._is_scalar, "Use `get_ordered_dict()` for scalars")
+        field_idx = self._get_field_idx(field)
+        rows = self._get_rows(num_keys)
+        if rows.size == 0:
+            return pd.DataFrame()
+        num_columns = len(self._columns)
+        is_present = self._is_present[rows, :num_columns]
+        is_column_present = is_present.any(axis=0)
+        values = self._values[rows, :num_columns, field_idx][
+            :, is_column_present
+        ]
+        df = pd.DataFrame(
+            values,
+            index=pd.Index(self._keys[rows].tolist()),
+            columns=self._columns[is_column_present],
+        )
+        return df
+
+    # /////////////////////////////////////////////////////////////////////////
+
+    def _get_field_idx(self, field: Optional[str]) -> int:
+        if self._fields is None:
+            hdbg.dassert_is(field, None)
+            field_idx = 0
+        else:
+            hdbg.dassert_in(field, self._fields)
+            field_idx = self._fields.index(field)
+        return field_idx
+
+    def _peek_key_and_row(self) -> Tuple[Any, int]:
+        row = (self._end_seq_num - 1) % self._capacity
+        return self._keys[row], row
+
+    def _get_rows(self, num_keys: Optional[int]) -> np.ndarray:
+        """
+        Return the rows of the `num_keys` most recent keys, in key order.
+        """
+        num_keys_tmp = len(self)
+        if num_keys is not None:
+            num_keys_tmp = min(num_keys, num_keys_tmp)
+        seq_nums = np.arange(self._end_seq_num - num_keys_tmp, self._end_seq_num)
+        return seq_nums % self._capacity
+
+    def _resize(self, num_rows: int) -> None:
+        """
+        Resize the buffer to `num_rows` rows.
+        """
+        old_rows = self._get_rows(None)
+        keys = np.empty(num_rows, dtype=object)
+        values = np.full((num_rows,) + self._values.shape[1:], np.nan)
+        is_present = np.zeros(
+            (num_rows,) + self._is_present.shape[1:], dtype=bool
+        )
+        # Copy the rows so that the row of sequence number `seq_num` is
+        # `seq_num % num_rows`.
+        start_seq_num = self._end_seq_num - old_rows.size
+        new_rows = np.arange(start_seq_num, self._end_seq_num) % num_rows
+        keys[new_rows] = self._keys[old_rows]
+        values[new_rows] = self._values[old_rows]
+        is_present[new_rows] = self._is_present[old_rows]
+        self._keys = keys
+        self._values = values
+        self._is_present = is_present
+
+    def _add_columns(self, labels: pd.Index) -> None:
+        """
+        Add columns for the new `labels`, keeping the labels sorted.
+        """
+        if self._columns.empty:
+            # Use the first labels to preserve their type.
+            columns = labels.copy()
+        else:
+            columns = self._columns.append(labels)
+        columns = columns.sort_values()
+        # Move the current columns to their new position.
+        num_columns = self._is_present.shape[1]
+        if len(columns) > num_columns:
+            num_columns = max(len(columns), 2 * num_columns)
+        values = np.full(
+            (self._capacity, num_columns, self._values.shape[2]), np.nan
+        )
+        is_present = np.zeros((self._capacity, num_columns), dtype=bool)
+        idxs = columns.get_indexer(self._columns)
+        values[:, idxs] = self._values[:, : len(self._columns)]
+        is_present[:, idxs] = self._is_present[:, : len(self._columns)]
+        self._columns = columns
+        self._values = values
+        self._is_present = is_present
+
+    def _get_column_idxs(self, labels: pd.Index) -> np.ndarray:
+        """
+        Return the columns of `labels`, adding columns for new labels.
+        """
+        hdbg.dassert(not labels.has_duplicates, "labels=%s", labels)
+        idxs = self._columns.get_indexer(labels)
+        is_new = idxs == -1
+        if is_new.any():
+            hdbg.dassert(
+                not self._has_fixed_columns,
+                "Labels %s are not in columns=%s",
+                labels[is_new],
+                self._columns,
+            )
+            self._add_columns(labels[is_new])
+            idxs = self._columns.get_indexer(labels)
+        return idxs
+
+    def _set_value(self, row: int, value: Any) -> None:
+        self._values[row] = np.nan
+        self._is_present[row] = False
+        if self._is_scalar:
+            hdbg.dassert(np.isscalar(value), "value=%s", value)
+            labels = self._columns
+            data = np.array([[value]], dtype=float)
+        elif self._fields is None:
+            hdbg.dassert_isinstance(value, pd.Series)
+            labels = value.index
+            data = value.to_numpy(dtype=float).reshape(-1, 1)
+        else:
+            hdbg.dassert_isinstance(value, pd.DataFrame)
+            hdbg.dassert_is_subset(self._fields, value.columns)
+            labels = value.index
+            data = value[self._fields].to_numpy(dtype=float)
+        idxs = self._get_column_idxs(labels)
+        self._values[row, idxs] = data
+        self._is_present[row, idxs] = True
+
+    def _get_value(self, row: int) -> Union[float, pd.Series, pd.DataFrame]:
+        if self._is_scalar:
+            return float(self._values[row, 0, 0])
+        is_present = self._is_present[row, : len(self._columns)]
+        labels = self._columns[is_present]
+        values = self._values[row, : len(self._columns)][is_present]
+        if self._fields is None:
+            value = pd.Series(values[:, 0], index=labels, dtype=float)
+        else:
+            value = pd.DataFrame(values, index=labels, columns=self._fields)
+        return value
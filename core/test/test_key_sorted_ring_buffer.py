@@ -0,0 +1,109 @@
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+import core.key_sorted_ordered_dict as cksoordi
+import core.key_sorted_ring_buffer as cksoribu
+import helpers.hpandas as hpandas
+import helpers.hunit_test as hunitest
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+# TestKeySortedRingBuffer1
+# #############################################################################
+
+
+class TestKeySortedRingBuffer1(hunitest.TestCase):
+    """
+    Check `KeySortedRingBuffer` against `KeySortedOrderedDict`.
+    """
+
+    def check_random_series(self, max_keys: Optional[int]) -> None:
+        """
+        Insert series with a random subset of labels and compare the state.
+        """
+        rng = np.random.default_rng(seed=1)
+        ring_buffer = cksoribu.KeySortedRingBuffer(pd.Timestamp, max_keys)
+        odict = cksoordi.KeySortedOrderedDict(pd.Timestamp, max_keys)
+        all_labels = [101, 202, 303, 404, 505]
+        for i in range(40):
+            key = pd.Timestamp("2000-01-01 09:30:00") + pd.Timedelta(minutes=i)
+            num_labels = rng.integers(1, len(all_labels) + 1)
+            labels = sorted(rng.choice(all_labels, num_labels, replace=False))
+            srs = pd.Series(rng.normal(size=num_labels), index=labels)
+            ring_buffer[key] = srs
+            odict[key] = srs
+            # Check.
+            self.assertEqual(len(ring_buffer), len(odict))
+            self.assertIn(key, ring_buffer)
+            actual_key, actual_srs = ring_buffer.peek()
+            self.assertEqual(actual_key, key)
+            self.assert_equal(str(actual_srs), str(srs))
+            for num_keys in [None, 1, 3]:
+                actual = ring_buffer.get_df(num_keys)
+                expected = pd.DataFrame(
+                    odict.get_ordered_dict(num_keys)
+                ).transpose()
+                self.assert_equal(
+                    hpandas.df_to_str(actual, num_rows=None),
+                    hpandas.df_to_str(expected, num_rows=None),
+                )
+
+    def test_bounded1(self) -> None:
+        """
+        Check a buffer that evicts the oldest keys.
+        """
+        self.check_random_series(max_keys=5)
+
+    def test_unbounded1(self) -> None:
+        """
+        Check a buffer that grows as needed.
+        """
+        self.check_random_series(max_keys=None)
+
+    def test_fields1(self) -> None:
+        """
+        Check a buffer storing dataframes.
+        """
+        ring_buffer = cksoribu.KeySortedRingBuffer(
+            pd.Timestamp, 2, fields=["price", "value"]
+        )
+        for i in range(3):
+            key = pd.Timestamp("2000-01-01 09:30:00") + pd.Timedelta(minutes=i)
+            df = pd.DataFrame(
+                {"price": [10.0 + i, 20.0 + i], "value": [1.0 * i, 2.0 * i]},
+                index=[202, 101 + i],
+            )
+            ring_buffer[key] = df
+        # Check.
+        actual = hpandas.df_to_str(
+            ring_buffer.get_df(field="value"), num_rows=None
+        )
+        expected = r"""
+                             102  103  202
+        2000-01-01 09:31:00  2.0  NaN  1.0
+        2000-01-01 09:32:00  NaN  4.0  2.0
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+        self.assertNotIn(pd.Timestamp("2000-01-01 09:30:00"), ring_buffer)
+
+    def test_scalar1(self) -> None:
+        """
+        Check a buffer storing scalars.
+        """
+        ring_buffer = cksoribu.KeySortedRingBuffer(
+            pd.Timestamp, 2, is_scalar=True
+        )
+        for i in range(3):
+            key = pd.Timestamp("2000-01-01 09:30:00") + pd.Timedelta(minutes=i)
+            ring_buffer[key] = 100.0 * i
+        # Check.
+        actual = str(ring_buffer.get_ordered_dict())
+        expected = r"""
+        OrderedDict([(Timestamp('2000-01-01 09:31:00'), 100.0), (Timestamp('2000-01-01 09:32:00'), 200.0)])
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
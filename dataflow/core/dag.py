@@ -4,11 +4,23 @@ Import as:
 import dataflow.core.dag as dtfcordag
 """
 
+import concurrent.futures
 import itertools
 import json
 import logging
 import os
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 import networkx as networ
 import pandas as pd
@@ -94,8 +106,16 @@ class DAG(hobject.PrintableMixin):
             self._profile_execution,
             self._dst_dir,
         )
-        # Disable freeing nodes.
+        # Disable freeing node outputs once all their consumers have run.
         self.force_free_nodes = False
+        # Disable incremental execution.
+        self._incremental = False
+        self._incremental_state: Dict[
+            Tuple[dtfcornode.Method, dtfcornode.NodeId], _IncrementalNodeState
+        ] = {}
+        # Execute the nodes serially by default.
+        self._scheduler = "serial"
+        self._max_workers: Optional[int] = None
 
     def __repr__(self) -> str:
         """
@@ -196,6 +216,59 @@ class DAG(hobject.PrintableMixin):
                 dst_dir, None, "Need to specify a directory to save the data"
             )
 
+    def set_incremental_mode(self, incremental: bool) -> None:
+        """
+        Enable or disable incremental execution of the DAG.
+
+        In incremental mode each call to `run_dag()` / `run_leq_node()` is
+        a step of a walk-forward execution and the DAG keeps the state of
+        each node between steps:
+        - the output stored in each node contains only the rows with an index
+          larger than the ones emitted in the previous steps
+        - a node with a streaming contract (see
+          `Node.get_incremental_warmup()`) is run only on the new input rows
+          preceded by the last `warmup` input rows seen
+        - any other node is recomputed on the entire history of its inputs,
+          which is accumulated by the DAG
+
+        This makes the cost of a walk-forward linear in the number of steps
+        when all the nodes support incremental execution.
+
+        Switching the mode resets the incremental state.
+        """
+        hdbg.dassert_isinstance(incremental, bool)
+        self._incremental = incremental
+        self.reset_incremental_state()
+
+    def reset_incremental_state(self) -> None:
+        """
+        Discard the state carried between incremental executions.
+        """
+        self._incremental_state = {}
+
+    def set_scheduler(
+        self, scheduler: str, *, max_workers: Optional[int] = None
+    ) -> None:
+        """
+        Set how the nodes are scheduled when executing the DAG.
+
+        :param scheduler: how to execute the nodes
+            - "serial": run one node at a time following a topological sort
+            - "threads": run the nodes whose predecessors have all been
+              executed concurrently on a thread pool, so that independent
+              branches of the DAG (e.g., the inputs of a `YConnector`) are
+              computed in parallel
+        :param max_workers: max number of nodes to run concurrently with
+            "threads"; `None` to use the `concurrent.futures` default
+        """
+        # Nodes store their outputs and their learned state in memory, so
+        # they can't be executed in a different process.
+        hdbg.dassert_in(scheduler, ("serial", "threads"))
+        if max_workers is not None:
+            hdbg.dassert_lte(1, max_workers)
+        self._scheduler = scheduler
+        self._max_workers = max_workers
+
     # /////////////////////////////////////////////////////////////////////////////
     # Accessor.
     # /////////////////////////////////////////////////////////////////////////////
@@ -493,8 +566,8 @@ class DAG(hobject.PrintableMixin):
             `get_outputs(method)`
         """
         sinks = self.get_sinks()
-        for id_, nid in enumerate(networ.topological_sort(self._nx_dag)):
-            self._run_node(id_, nid, method)
+        nids = list(networ.topological_sort(self._nx_dag))
+        self._run_nodes(nids, method)
         return {sink: self.get_node(sink).get_outputs(method) for sink in sinks}
 
     def run_leq_node(
@@ -523,14 +596,11 @@ class DAG(hobject.PrintableMixin):
         )
         # The `ancestors` filter only returns nodes strictly less than `nid`,
         # and so we need to add `nid` back.
-        nids = itertools.chain(ancestors, [nid])
+        nids = list(itertools.chain(ancestors, [nid]))
         # Execute all the ancestors of `nid`.
-        if progress_bar:
-            nids = tqdm(list(nids), desc="run_leq_node")
-        for id_, pred_nid in enumerate(nids):
-            if _LOG.isEnabledFor(logging.DEBUG):
-                _LOG.debug("Executing node '%s'", pred_nid)
-            self._run_node(id_, pred_nid, method)
+        self._run_nodes(
+            nids, method, progress_bar=progress_bar, desc="run_leq_node"
+        )
         # Retrieve the output the node.
         node = self.get_node(nid)
         node_output = node.get_outputs(method)
@@ -695,6 +765,151 @@ class DAG(hobject.PrintableMixin):
                 obj,
             )
 
+    def _run_nodes(
+        self,
+        nids: List[dtfcornode.NodeId],
+        method: dtfcornode.Method,
+        *,
+        progress_bar: bool = False,
+        desc: str = "",
+    ) -> None:
+        """
+        Run the requested `method` on the nodes according to the scheduler.
+
+        When `force_free_nodes` is set, each output is freed as soon as all
+        the nodes consuming it have been run, while the outputs of the sinks
+        and of the last node are kept.
+
+        :param nids: nodes to run in topological order, including all the
+            predecessors of each node that need to be run
+        """
+        num_pending_consumers = None
+        nids_to_keep: Set[dtfcornode.NodeId] = set()
+        if self.force_free_nodes:
+            num_pending_consumers = self._get_num_consumers(nids)
+            nids_to_keep = set(self.get_sinks()) | {nids[-1]}
+        if self._scheduler == "serial":
+            if progress_bar:
+                nids = tqdm(nids, desc=desc)
+            for id_, nid in enumerate(nids):
+                if _LOG.isEnabledFor(logging.DEBUG):
+                    _LOG.debug("Executing node '%s'", nid)
+                self._run_node(id_, nid, method)
+                if num_pending_consumers is not None:
+                    self._free_consumed_outputs(
+                        nid, method, num_pending_consumers, nids_to_keep
+                    )
+            return
+        hdbg.dassert_eq(self._scheduler, "threads")
+        topological_ids = {nid: id_ for id_, nid in enumerate(nids)}
+        # Map node -> number of predecessors that haven't been run yet.
+        num_pending_preds = {
+            nid: sum(
+                1
+                for pred_nid in self._nx_dag.predecessors(nid)
+                if pred_nid in topological_ids
+            )
+            for nid in nids
+        }
+        pbar = tqdm(total=len(nids), desc=desc) if progress_bar else None
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_workers
+        ) as executor:
+
+            def _submit(nid: dtfcornode.NodeId) -> concurrent.futures.Future:
+                if _LOG.isEnabledFor(logging.DEBUG):
+                    _LOG.debug("Submitting node '%s'", nid)
+                return executor.submit(
+                    self._run_node, topological_ids[nid], nid, method
+                )
+
+            futures = {
+                _submit(nid): nid for nid in nids if num_pending_preds[nid] == 0
+            }
+            while futures:
+                done, _ = concurrent.futures.wait(
+                    futures, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                # Process the completed nodes in topological order so that the
+                # submission order is deterministic.
+                done_futures = sorted(
+                    done, key=lambda future: topological_ids[futures[future]]
+                )
+                for future in done_futures:
+                    nid = futures.pop(future)
+                    # Propagate any exception raised by the node.
+                    future.result()
+                    # Outputs are freed by this thread, after all the
+                    # consumers have completed.
+                    if num_pending_consumers is not None:
+                        self._free_consumed_outputs(
+                            nid, method, num_pending_consumers, nids_to_keep
+                        )
+                    if pbar is not None:
+                        pbar.update(1)
+                    for succ_nid in self._nx_dag.successors(nid):
+                        if succ_nid not in num_pending_preds:
+                            continue
+                        num_pending_preds[succ_nid] -= 1
+                        if num_pending_preds[succ_nid] == 0:
+                            futures[_submit(succ_nid)] = succ_nid
+        if pbar is not None:
+            pbar.close()
+
+    def _get_num_consumers(
+        self, nids: List[dtfcornode.NodeId]
+    ) -> Dict[Tuple[dtfcornode.NodeId, str], int]:
+        """
+        Count how many inputs of the nodes to run consume each output.
+
+        :param nids: nodes to run in topological order
+        :return: (nid, output name) -> number of consumers
+        """
+        num_consumers: Dict[Tuple[dtfcornode.NodeId, str], int] = {}
+        for nid in nids:
+            for output_name in self.get_node(nid).output_names:
+                num_consumers[(nid, output_name)] = 0
+            for pred_nid in self._nx_dag.predecessors(nid):
+                kvs = self._nx_dag.edges[[pred_nid, nid]]
+                for output_name in kvs.values():
+                    num_consumers[(pred_nid, output_name)] += 1
+        return num_consumers
+
+    def _free_consumed_outputs(
+        self,
+        nid: dtfcornode.NodeId,
+        method: dtfcornode.Method,
+        num_pending_consumers: Dict[Tuple[dtfcornode.NodeId, str], int],
+        nids_to_keep: Set[dtfcornode.NodeId],
+    ) -> None:
+        """
+        Free the outputs that are not needed anymore after running `nid`.
+
+        :param num_pending_consumers: (nid, output name) -> number of
+            consumers not run yet, updated in place
+        :param nids_to_keep: nodes whose outputs are never freed
+        """
+        # The outputs of `nid` that are not consumed can be freed right away.
+        candidates = [
+            (nid, output_name) for output_name in self.get_node(nid).output_names
+        ]
+        # `nid` was the last consumer of an output of its predecessors.
+        for pred_nid in self._nx_dag.predecessors(nid):
+            kvs = self._nx_dag.edges[[pred_nid, nid]]
+            for output_name in kvs.values():
+                num_pending_consumers[(pred_nid, output_name)] -= 1
+                candidates.append((pred_nid, output_name))
+        # Remove duplicates preserving the order.
+        for nid_, output_name in dict.fromkeys(candidates):
+            if nid_ in nids_to_keep:
+                continue
+            if num_pending_consumers[(nid_, output_name)] == 0:
+                if _LOG.isEnabledFor(logging.DEBUG):
+                    _LOG.debug(
+                        "Freeing output '%s' of node '%s'", output_name, nid_
+                    )
+                self.get_node(nid_).free(method=method, output_name=output_name)
+
     def _run_node(
         self,
         topological_id: int,
@@ -724,6 +939,8 @@ class DAG(hobject.PrintableMixin):
             run_node_dmemory = htimer.dmemory_start(logging.DEBUG, "run_node")
         # Retrieve the arguments needed to execute the `method` on the node.
         kwargs = {}
+        # Map input name -> (pred_nid, output name) feeding it.
+        input_srcs: Dict[str, Tuple[dtfcornode.NodeId, str]] = {}
         for pred_nid in self._nx_dag.predecessors(nid):
             kvs = self._nx_dag.edges[[pred_nid, nid]]
             if _LOG.isEnabledFor(logging.DEBUG):
@@ -732,20 +949,15 @@ class DAG(hobject.PrintableMixin):
             for input_name, value in kvs.items():
                 # Retrieve output from store.
                 kwargs[input_name] = pred_node.get_output(method, value)
-                if self.force_free_nodes:
-                    _LOG.warning(
-                        "Forcing deallocation of pred_node=%s", pred_node
-                    )
-                    # TODO(gp): We should move this after using the data deallocating
-                    # all the nodes whose output has been used. For linear pipelines,
-                    # this check is not needed.
-                    pred_node.free()
+                input_srcs[input_name] = (pred_nid, value)
             # TODO(gp): Save info for inputs, if needed.
+        node = self.get_node(nid)
+        if self._incremental:
+            kwargs = self._get_incremental_inputs(nid, method, kwargs, input_srcs)
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug("kwargs are %s", kwargs)
         # Execute `node.method()`.
         with htimer.TimedScope(logging.DEBUG, "node_execution") as ts:
-            node = self.get_node(nid)
             try:
                 output = getattr(node, method)(**kwargs)
             except AttributeError as e:
@@ -755,6 +967,10 @@ class DAG(hobject.PrintableMixin):
         # Update the node.
         for output_name in node.output_names:
             value = output[output_name]
+            if self._incremental:
+                value = self._update_incremental_output(
+                    nid, method, output_name, value
+                )
             node._store_output(  # pylint: disable=protected-access
                 method, output_name, value
             )
@@ -767,6 +983,9 @@ class DAG(hobject.PrintableMixin):
         if self._profile_execution:
             file_tag = "after_execution"
             txt = []
+            if self._scheduler != "serial":
+                # Report the thread to make the concurrency of nodes visible.
+                txt.append(f"thread={threading.current_thread().name}")
             txt.append(ts.get_result())
             txt.append(htimer.dtimer_stop(run_node_dtimer)[0])
             txt.append(htimer.dmemory_stop(run_node_dmemory))
@@ -779,6 +998,143 @@ class DAG(hobject.PrintableMixin):
                 extra_txt=txt,
             )
 
+    def _get_incremental_inputs(
+        self,
+        nid: dtfcornode.NodeId,
+        method: dtfcornode.Method,
+        kwargs: Dict[str, Any],
+        input_srcs: Dict[str, Tuple[dtfcornode.NodeId, str]],
+    ) -> Dict[str, Any]:
+        """
+        Build the inputs of a node in incremental mode.
+
+        :param kwargs: input name -> new rows emitted by the predecessor
+        :param input_srcs: input name -> (predecessor nid, output name)
+        :return: input name -> value to pass to the node
+        """
+        node = self.get_node(nid)
+        warmup = node.get_incremental_warmup()
+        state = self._get_incremental_node_state(method, nid)
+        kwargs_out = {}
+        for input_name, new_rows in kwargs.items():
+            if warmup is None:
+                # The node doesn't support incremental execution, so it is
+                # recomputed on the entire history of its input.
+                pred_nid, output_name = input_srcs[input_name]
+                pred_state = self._get_incremental_node_state(method, pred_nid)
+                hdbg.dassert_in(output_name, pred_state.output_histories)
+                kwargs_out[input_name] = pred_state.output_histories[output_name]
+            else:
+                # Prepend the warm-up rows to the new rows.
+                kwargs_out[input_name] = state.prepend_input_tail(
+                    input_name, new_rows, warmup
+                )
+        return kwargs_out
+
+    def _update_incremental_output(
+        self,
+        nid: dtfcornode.NodeId,
+        method: dtfcornode.Method,
+        output_name: str,
+        value: Any,
+    ) -> Any:
+        """
+        Update the incremental state of a node with its output.
+
+        :return: the rows of `value` that were not emitted yet
+        """
+        node = self.get_node(nid)
+        state = self._get_incremental_node_state(method, nid)
+        new_rows = state.trim_to_new_rows(output_name, value)
+        # Keep the entire history of the output only if it is consumed by a
+        # node that is recomputed at every step.
+        needs_history = any(
+            self.get_node(succ_nid).get_incremental_warmup() is None
+            and output_name in self._nx_dag.edges[[nid, succ_nid]].values()
+            for succ_nid in self._nx_dag.successors(nid)
+        )
+        if needs_history:
+            is_recomputed = node.get_incremental_warmup() is None and any(
+                True for _ in self._nx_dag.predecessors(nid)
+            )
+            if is_recomputed:
+                # The output is already computed on the entire history.
+                state.output_histories[output_name] = value
+            else:
+                state.append_to_output_history(output_name, new_rows)
+        return new_rows
+
+    def _get_incremental_node_state(
+        self, method: dtfcornode.Method, nid: dtfcornode.NodeId
+    ) -> "_IncrementalNodeState":
+        key = (method, nid)
+        if key not in self._incremental_state:
+            self._incremental_state[key] = _IncrementalNodeState()
+        return self._incremental_state[key]
+
+
+# #############################################################################
+# _IncrementalNodeState
+# #############################################################################
+
+
+class _IncrementalNodeState:
+    """
+    Carry the state of a node between incremental executions of a DAG.
+
+    Only pandas objects with a sorted index are processed incrementally,
+    while any other object is passed through as it is.
+    """
+
+    def __init__(self) -> None:
+        # Map input name -> last input rows used as warm-up.
+        self.input_tails: Dict[str, Any] = {}
+        # Map output name -> largest index emitted so far.
+        self.last_idxs: Dict[str, Any] = {}
+        # Map output name -> entire history of the output.
+        self.output_histories: Dict[str, Any] = {}
+
+    def prepend_input_tail(
+        self, input_name: str, new_rows: Any, warmup: int
+    ) -> Any:
+        """
+        Prepend the stored warm-up rows to `new_rows` and update the tail.
+        """
+        if not isinstance(new_rows, (pd.DataFrame, pd.Series)):
+            return new_rows
+        tail = self.input_tails.get(input_name)
+        if tail is None or tail.empty:
+            data = new_rows
+        else:
+            data = pd.concat([tail, new_rows])
+        # Note that `iloc[-0:]` would return all the rows.
+        num_rows = min(warmup, data.shape[0])
+        self.input_tails[input_name] = data.iloc[data.shape[0] - num_rows :]
+        return data
+
+    def trim_to_new_rows(self, output_name: str, value: Any) -> Any:
+        """
+        Return the rows of `value` past the largest index emitted so far.
+        """
+        if not isinstance(value, (pd.DataFrame, pd.Series)):
+            return value
+        last_idx = self.last_idxs.get(output_name)
+        if last_idx is not None:
+            hdbg.dassert(value.index.is_monotonic_increasing)
+            # Find the first row after `last_idx` with a binary search.
+            pos = value.index.searchsorted(last_idx, side="right")
+            value = value.iloc[pos:]
+        if not value.empty:
+            self.last_idxs[output_name] = value.index[-1]
+        return value
+
+    def append_to_output_history(self, output_name: str, new_rows: Any) -> None:
+        history = self.output_histories.get(output_name)
+        if history is None or not isinstance(new_rows, (pd.DataFrame, pd.Series)):
+            self.output_histories[output_name] = new_rows
+        elif not new_rows.empty:
+            self.output_histories[output_name] = pd.concat([history, new_rows])
+
 
 # TODO(Grisha): consider creating a class `DagStatsComputer` and moving the
 # function (together with `DAG._write_prof_stats_to_dst_dir()`) there.
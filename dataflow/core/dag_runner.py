@@ -563,6 +563,8 @@ class IncrementalDagRunner(DagRunner):
         end_timestamp: pd.Timestamp,
         freq: str,
         fit_state: cconfig.Config,
+        *,
+        incremental: bool = False,
     ) -> None:
         """
         Constructor.
@@ -576,6 +578,10 @@ class IncrementalDagRunner(DagRunner):
             of the underlying DAG)
         :param fit_state: Config containing any learned state required for
             initializing the DAG
+        :param incremental: if `True`, run the DAG in incremental mode (see
+            `DAG.set_incremental_mode()`) so that each prediction step
+            processes only the data after the previous step and the
+            `ResultBundle` contains only the new rows
         """
         super().__init__(dag)
         self._start_timestamp = start_timestamp
@@ -583,6 +589,10 @@ class IncrementalDagRunner(DagRunner):
         self._freq = freq
         self._fit_state = fit_state
         dtfcorvisi.set_fit_state(self.dag, self._fit_state)
+        self._incremental = incremental
+        self.dag.set_incremental_mode(self._incremental)
+        # Last datetime a prediction was generated at.
+        self._last_dt: Optional[pd.Timestamp] = None
         # Create predict range.
         self._date_range = pd.date_range(
             start=self._start_timestamp, end=self._end_timestamp, freq=self._freq
@@ -613,9 +623,17 @@ class IncrementalDagRunner(DagRunner):
         :param dt: point in time at which to generate a prediction
         :return: populated `ResultBundle`
         """
-        # Cut off data at `end_dt`. Do not restrict the start datetime_ so
-        # so as not to adversely affect any required warm-up period.
-        interval = [(None, dt)]
+        dt = pd.Timestamp(dt)
+        if self._incremental and self._last_dt is not None:
+            hdbg.dassert_lt(self._last_dt, dt)
+            # The DAG carries the warm-up data between steps, so the sources
+            # need to provide only the data after the previous step.
+            interval = [(self._last_dt, dt)]
+        else:
+            # Cut off data at `end_dt`. Do not restrict the start datetime_ so
+            # so as not to adversely affect any required warm-up period.
+            interval = [(None, dt)]
+        self._last_dt = dt
         # Set prediction intervals and predict.
         for input_nid in self.dag.get_sources():
             self.dag.get_node(input_nid).set_predict_intervals(interval)
@@ -148,13 +148,39 @@ class Node(_Node):
         hdbg.dassert_in(method, self._output_vals.keys())
         return self._output_vals[method]
 
-    def free(self, *, only_warning: bool = True) -> None:
+    def get_incremental_warmup(self) -> Optional[int]:
         """
-        Deallocate all the data stored inside the node.
+        Return the streaming contract of the node for incremental execution.
 
-        Note that this should be called only after the node is not
+        A node supporting incremental execution computes the output rows
+        corresponding to new input rows only from the new input rows and the
+        last `warmup` rows preceding them (e.g., `warmup=0` for pointwise
+        transformations, `warmup=window - 1` for a rolling window).
+
+        :return: number of warm-up rows needed by the node or `None` if the
+            node doesn't support incremental execution and needs to be
+            recomputed on the entire history of its inputs
+        """
+        _ = self
+        return None
+
+    def free(
+        self,
+        *,
+        method: Optional[Method] = None,
+        output_name: Optional[str] = None,
+        only_warning: bool = True,
+    ) -> None:
+        """
+        Deallocate the data stored inside the node.
+
+        Note that this should be called only after the data is not
         needed anymore.
 
+        :param method: free only the outputs for `method`; `None` for all
+            the methods
+        :param output_name: free only the output `output_name`; `None` for
+            all the outputs
         :param only_warning=True: raise an assertion or a warning if
         the memory is not actually reported as deallocated.
         """
@@ -162,6 +188,8 @@ class Node(_Node):
         # called rarely, for now.
         import gc
 
+        import pandas as pd
+
         import helpers.hintrospection as hintros
         import helpers.hlogging as hloggin
 
@@ -179,27 +207,42 @@ class Node(_Node):
         _log(msg)
         # Traverse the data structure accumulating used memory.
         rss_used_mem_in_gb = 0.0
-        for method, node_output in self._output_vals.items():
-            for name in node_output:
-                obj = node_output[name]
-                used_mem_tmp = obj.memory_usage(deep=True).sum()
+        for method_, node_output in self._output_vals.items():
+            if method is not None and method_ != method:
+                continue
+            names = [
+                name
+                for name in node_output
+                if output_name is None or name == output_name
+            ]
+            for name in names:
+                obj = node_output.pop(name)
+                used_mem_tmp = 0
+                if isinstance(obj, pd.DataFrame):
+                    used_mem_tmp = obj.memory_usage(deep=True).sum()
+                elif isinstance(obj, pd.Series):
+                    used_mem_tmp = obj.memory_usage(deep=True)
                 if _LOG.isEnabledFor(logging.DEBUG):
                     _LOG.debug(
                         "Removing %s:%s -> type=%s, mem=%s refs=%s",
-                        method,
+                        method_,
                         name,
                         type(obj),
                         hintros.format_size(used_mem_tmp),
                         gc.get_referrers(obj),
                     )
                 rss_used_mem_in_gb += used_mem_tmp / (1024**3)
-        # Remove all the outstanding references to the objects.
-        del obj
-        del self._output_vals
+                # Remove the outstanding reference to the object.
+                del obj
+        # Remove the methods without outputs, so that the node looks like it
+        # was never executed for them.
+        self._output_vals = {
+            method_: node_output
+            for method_, node_output in self._output_vals.items()
+            if node_output
+        }
         # Force garbage collection.
         gc.collect()
-        # Recreate an empty data structure for the next DAG execution.
-        self._output_vals: Dict[Method, NodeOutput] = {}  # type: ignore[no-redef]
         #
         rss_mem_after_in_gb = hloggin.get_memory_usage(process=None)[0]
         memory_as_str = str(hloggin.get_memory_usage_as_str(process=None))
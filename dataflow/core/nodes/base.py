@@ -58,6 +58,9 @@ class FitPredictNode(dtfcornode.Node, abc.ABC):
             outputs = ["df_out"]
         super().__init__(nid, inputs, outputs)
         self._info: collections.OrderedDict = collections.OrderedDict()
+        # Number of warm-up rows needed for incremental execution. Derived
+        # classes supporting incremental execution set it.
+        self._incremental_warmup: Optional[int] = None
 
     # //////////////////////////////////////////////////////////////////////////
     # fit / predict.
@@ -78,6 +81,12 @@ class FitPredictNode(dtfcornode.Node, abc.ABC):
     def set_fit_state(self, fit_state: "FitPredictNode.NodeState") -> None:
         _ = self, fit_state
 
+    def get_incremental_warmup(self) -> Optional[int]:
+        """
+        See `Node.get_incremental_warmup()`.
+        """
+        return self._incremental_warmup
+
     # //////////////////////////////////////////////////////////////////////////
     # Info.
     # //////////////////////////////////////////////////////////////////////////
@@ -291,6 +291,103 @@ datetime,MN0,MN1,MN0,MN1
         return df
 
 
+class TestGroupedColDfToDfTransformer5(hunitest.TestCase):
+    """
+    Check that the vectorized and the parallel modes match the default one.
+    """
+
+    @staticmethod
+    def _compute_spread(df: pd.DataFrame) -> pd.DataFrame:
+        spread = df["mid"] - df["close"]
+        df_out = pd.concat([spread], axis=1, keys=["spread"])
+        return df_out
+
+    def test_vectorized1(self) -> None:
+        """
+        Check a function working column by column.
+        """
+        config = self._get_pct_change_config()
+        self._check(config, vectorized=True)
+
+    def test_vectorized2(self) -> None:
+        """
+        Check a function combining the input cols.
+        """
+        config = self._get_spread_config()
+        # The per-leaf-col function works on single-level columns.
+        expected = self._run(
+            config,
+            transformer_func=lambda df: (df["mid"] - df["close"])
+            .rename("spread")
+            .to_frame(),
+        )
+        actual = self._run(
+            config, transformer_func=self._compute_spread, vectorized=True
+        )
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+
+    def test_parallel1(self) -> None:
+        config = self._get_pct_change_config()
+        self._check(config, num_workers=2)
+
+    def _get_pct_change_config(self) -> dict:
+        config = {
+            "in_col_groups": [
+                ("close",),
+                ("mid",),
+            ],
+            "out_col_group": (),
+            "transformer_func": lambda x: x.pct_change(),
+            "col_mapping": {
+                "close": "close_ret_0",
+                "mid": "mid_ret_0",
+            },
+        }
+        return config
+
+    def _get_spread_config(self) -> dict:
+        config = {
+            "in_col_groups": [
+                ("close",),
+                ("mid",),
+            ],
+            "out_col_group": (),
+        }
+        return config
+
+    def _run(self, config: dict, **kwargs) -> pd.DataFrame:
+        data = self._get_data()
+        node = dtfconotra.GroupedColDfToDfTransformer(
+            "transform", **config, **kwargs
+        )
+        df_out = node.fit(data)["df_out"]
+        return df_out
+
+    def _check(self, config: dict, **kwargs) -> None:
+        expected = self._run(config)
+        actual = self._run(config, **kwargs)
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+
+    def _get_data(self) -> pd.DataFrame:
+        txt = """
+,close,close,close,mid,mid,mid
+datetime,MN0,MN1,MN2,MN0,MN1,MN2
+2016-01-04 09:30:00,100.00,100.00,50.00,101.00,99.00,50.50
+2016-01-04 09:31:00,105.00,98.00,NaN,106.05,97.02,NaN
+2016-01-04 09:32:00,52.50,49.00,51.00,53.025,48.51,51.25
+"""
+        df = pd.read_csv(
+            io.StringIO(txt), index_col=0, parse_dates=True, header=[0, 1]
+        )
+        return df
+
+
 class TestCrossSectionalDfToDfTransformer1(hunitest.TestCase):
     def test_demean(self) -> None:
         data = self._get_data()
@@ -18,6 +18,7 @@ from typing import (
     cast,
 )
 
+import joblib
 import numpy as np
 import pandas as pd
 
@@ -52,6 +53,7 @@ class ColumnTransformer(dtfconobas.Transformer, dtfconobas.ColModeMixin):
         col_rename_func: Optional[Callable[[Any], Any]] = None,
         col_mode: Optional[str] = None,
         nan_mode: Optional[str] = None,
+        incremental_warmup: Optional[int] = None,
     ) -> None:
         """
         :param nid: unique node id
@@ -69,8 +71,15 @@ class ColumnTransformer(dtfconobas.Transformer, dtfconobas.ColModeMixin):
         :param nan_mode: determines how to handle NaNs
             - `leave_unchanged` (default): do not process NaNs
             - `drop`: it applies to all columns simultaneously.
+        :param incremental_warmup: number of warm-up rows needed by
+            `transformer_func` to support incremental execution (e.g., 0 for
+            pointwise transformations); `None` disables incremental execution
+            (see `Node.get_incremental_warmup()`)
         """
         super().__init__(nid)
+        if incremental_warmup is not None:
+            hdbg.dassert_lte(0, incremental_warmup)
+        self._incremental_warmup = incremental_warmup
         if cols is not None:
             hdbg.dassert_isinstance(cols, list)
         self._cols = cols
@@ -285,6 +294,8 @@ class GroupedColDfToDfTransformer(dtfconobas.Transformer):
         drop_nans: bool = False,
         reindex_like_input: bool = True,
         join_output_with_input: bool = True,
+        vectorized: bool = False,
+        num_workers: int = 1,
     ) -> None:
         """
         For reference, let.
@@ -311,11 +322,30 @@ class GroupedColDfToDfTransformer(dtfconobas.Transformer):
         :param join_output_with_input: whether to join the output with the input. A
             common case where this should typically be set to `False` is in
             resampling.
+        :param vectorized: whether `transformer_func` operates on all the
+            leaf cols at once instead of one leaf col at a time
+            - the function is called once on a dataframe with columns
+              `(in_col_name, leaf_col)`, e.g.,
+              ```
+              feat1           feat2
+              MN0 MN1 MN2 MN3 MN0 MN1 MN2 MN3
+              ```
+              and returns a dataframe with columns `(out_col_name, leaf_col)`
+            - a function working column by column (e.g., `pct_change()`)
+              can be used in both modes
+        :param num_workers: number of processes to apply `transformer_func`
+            to chunks of leaf cols in parallel, when not `vectorized`
         """
         super().__init__(nid)
         # TODO(Paul): Add more checks here.
         hdbg.dassert_isinstance(in_col_groups, list)
         hdbg.dassert_isinstance(out_col_group, tuple)
+        hdbg.dassert_lte(1, num_workers)
+        if vectorized:
+            # Dropping NaNs on the whole block would drop data of other leaf
+            # cols.
+            hdbg.dassert(not drop_nans, "`drop_nans` requires `vectorized=False`")
+            hdbg.dassert_eq(num_workers, 1)
         self._in_col_groups = in_col_groups
         self._out_col_group = out_col_group
         self._transformer_func = transformer_func
@@ -325,6 +355,8 @@ class GroupedColDfToDfTransformer(dtfconobas.Transformer):
         self._reindex_like_input = reindex_like_input
         self._join_output_with_input = join_output_with_input
         self._permitted_exceptions = permitted_exceptions
+        self._vectorized = vectorized
+        self._num_workers = num_workers
         # The leaf col names are determined from the dataframe at runtime.
         self._leaf_cols = None
 
@@ -335,18 +367,60 @@ class GroupedColDfToDfTransformer(dtfconobas.Transformer):
         if self._join_output_with_input:
             df_in = df.copy()
         #
-        in_dfs = dtfconobas.GroupedColDfToDfColProcessor.preprocess(
-            df, self._in_col_groups
-        )
-        self._leaf_cols = list(in_dfs.keys())
-        #
         info = collections.OrderedDict()  # type: ignore
-        info["func_info"] = collections.OrderedDict()
-        func_info = info["func_info"]
+        if self._vectorized:
+            df, func_info = self._transform_vectorized(df)
+        else:
+            in_dfs = dtfconobas.GroupedColDfToDfColProcessor.preprocess(
+                df, self._in_col_groups
+            )
+            self._leaf_cols = list(in_dfs.keys())
+            if self._num_workers == 1:
+                out_dfs, func_info = self._apply_func_to_dfs(in_dfs)
+            else:
+                # Apply the function to chunks of leaf cols in parallel.
+                chunks = np.array_split(
+                    np.array(self._leaf_cols, dtype=object), self._num_workers
+                )
+                results = joblib.Parallel(n_jobs=self._num_workers)(
+                    joblib.delayed(self._apply_func_to_dfs)(
+                        {key: in_dfs[key] for key in chunk}
+                    )
+                    for chunk in chunks
+                    if chunk.size > 0
+                )
+                out_dfs = {}
+                func_info = collections.OrderedDict()
+                for chunk_out_dfs, chunk_func_info in results:
+                    out_dfs.update(chunk_out_dfs)
+                    func_info.update(chunk_func_info)
+            df = dtfconobas.GroupedColDfToDfColProcessor.postprocess(
+                out_dfs, self._out_col_group
+            )
+        info["func_info"] = func_info
+        if self._join_output_with_input:
+            df = dtfcorutil.merge_dataframes(df_in, df)
+        # TODO(Grisha): Dag execution time increases. See CmTask6664
+        # for details.
+        # info["df_transformed_info"] = dtfcorutil.get_df_info_as_string(df)
+        info["df_transformed_info"] = ""
+        return df, info
+
+    def _apply_func_to_dfs(
+        self, in_dfs: Dict[dtfcorutil.NodeColumn, pd.DataFrame]
+    ) -> Tuple[
+        Dict[dtfcorutil.NodeColumn, pd.DataFrame], collections.OrderedDict
+    ]:
+        """
+        Apply the transformer function to the dataframe of each leaf col.
+
+        :return: output dataframes and function info, keyed by leaf col
+        """
+        func_info = collections.OrderedDict()
         out_dfs = {}
-        for key in self._leaf_cols:
+        for key, in_df in in_dfs.items():
             df_out, key_info = _apply_func_to_data(
-                in_dfs[key],
+                in_df,
                 self._transformer_func,
                 self._transformer_kwargs,
                 self._drop_nans,
@@ -364,17 +438,52 @@ class GroupedColDfToDfTransformer(dtfconobas.Transformer):
             if self._col_mapping:
                 df_out = df_out.rename(columns=self._col_mapping)
             out_dfs[key] = df_out
-        info["func_info"] = func_info
-        df = dtfconobas.GroupedColDfToDfColProcessor.postprocess(
-            out_dfs, self._out_col_group
+        return out_dfs, func_info
+
+    def _transform_vectorized(
+        self, df: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, Optional[collections.OrderedDict]]:
+        """
+        Apply the transformer function once to all the leaf cols.
+
+        :return: output dataframe with the same column levels as the output
+            of `GroupedColDfToDfColProcessor.postprocess()` and function
+            info
+        """
+        for col_group in self._in_col_groups:
+            hdbg.dassert_isinstance(col_group, tuple)
+            hdbg.dassert_eq(len(col_group), df.columns.nlevels - 1)
+        # Build a dataframe with columns `(in_col_name, leaf_col)`.
+        in_col_names = [col_group[-1] for col_group in self._in_col_groups]
+        hdbg.dassert_no_duplicates(in_col_names)
+        in_df = pd.concat(
+            [df[col_group] for col_group in self._in_col_groups],
+            axis=1,
+            keys=in_col_names,
         )
-        if self._join_output_with_input:
-            df = dtfcorutil.merge_dataframes(df_in, df)
-        # TODO(Grisha): Dag execution time increases. See CmTask6664
-        # for details.
-        # info["df_transformed_info"] = dtfcorutil.get_df_info_as_string(df)
-        info["df_transformed_info"] = ""
-        return df, info
+        in_df = in_df.sort_index(axis=1)
+        # Use the leaf cols of the selected columns, since `levels` can contain
+        # values that are not used any longer after selecting.
+        self._leaf_cols = in_df.columns.get_level_values(1).unique().to_list()
+        df_out, func_info = _apply_func_to_data(
+            in_df,
+            self._transformer_func,
+            self._transformer_kwargs,
+            self._drop_nans,
+            self._reindex_like_input,
+            self._permitted_exceptions,
+        )
+        hdbg.dassert_is_not(df_out, None, "No output for the leaf cols")
+        hdbg.dassert_isinstance(df_out, pd.DataFrame)
+        hdbg.dassert_eq(df_out.columns.nlevels, 2)
+        if self._col_mapping:
+            df_out = df_out.rename(columns=self._col_mapping, level=0)
+        df_out = df_out.sort_index(axis=1)
+        if self._out_col_group:
+            df_out = pd.concat([df_out], axis=1, keys=[self._out_col_group])
+        # Drop the names of the column levels, like `postprocess()` does.
+        df_out = df_out.rename_axis([None] * df_out.columns.nlevels, axis=1)
+        return df_out, func_info
 
 
 class CrossSectionalDfToDfTransformer(dtfconobas.Transformer):
@@ -816,10 +925,20 @@ class FunctionWrapper(dtfconobas.Transformer):
         nid: dtfcornode.NodeId,
         func: Callable,
         func_kwargs: Optional[Dict[str, Any]] = None,
+        incremental_warmup: Optional[int] = None,
     ) -> None:
+        """
+        :param nid: unique node id
+        :param func: df -> df
+        :param func_kwargs: `func` kwargs
+        :param incremental_warmup: same as in `ColumnTransformer`
+        """
         super().__init__(nid)
         self._func = func
         self._func_kwargs = func_kwargs or {}
+        if incremental_warmup is not None:
+            hdbg.dassert_lte(0, incremental_warmup)
+        self._incremental_warmup = incremental_warmup
 
     def _transform(
         self, df: pd.DataFrame
@@ -1,9 +1,15 @@
 import logging
 import os
 
+import pandas as pd
+
 import dataflow.core.dag as dtfcordag
 import dataflow.core.node as dtfcornode
+import dataflow.core.nodes.base as dtfconobas
+import dataflow.core.nodes.sources as dtfconosou
+import dataflow.core.nodes.transformers as dtfconotra
 import dataflow.core.visualization as dtfcorvisu
+import helpers.hpandas as hpandas
 import helpers.hprint as hprint
 import helpers.hunit_test as hunitest
 
@@ -528,3 +534,129 @@ class Test_dataflow_core_DAG5(_TestDataflowHelper):
         #
         dag1.compose(dag2)
         self._check(dag1)
+
+
+# #############################################################################
+# Test_dataflow_core_DAG6
+# #############################################################################
+
+
+class Test_dataflow_core_DAG6(hunitest.TestCase):
+    """
+    Test executing a DAG with independent branches on a thread pool.
+    """
+
+    @staticmethod
+    def get_dag() -> dtfcordag.DAG:
+        """
+        Build a DAG with two branches joined by a `YConnector`.
+        """
+        dag = dtfcordag.DAG(mode="strict")
+        node = dtfconosou.ArmaDataSource(
+            "read_data",
+            frequency="T",
+            start_date="2010-01-04 09:00:00",
+            end_date="2010-01-04 10:30:00",
+            seed=0,
+        )
+        dag.add_node(node)
+        node = dtfconotra.FunctionWrapper(
+            "rolling_mean",
+            func=lambda df: df.rolling(5).mean().add_suffix("_mean"),
+        )
+        dag.add_node(node)
+        dag.connect("read_data", "rolling_mean")
+        node = dtfconotra.FunctionWrapper(
+            "rolling_std",
+            func=lambda df: df.rolling(5).std().add_suffix("_std"),
+        )
+        dag.add_node(node)
+        dag.connect("read_data", "rolling_std")
+        node = dtfconobas.YConnector(
+            "join",
+            connector_func=lambda df_in1, df_in2: df_in1.join(df_in2),
+        )
+        dag.add_node(node)
+        dag.connect(("rolling_mean", "df_out"), ("join", "df_in1"))
+        dag.connect(("rolling_std", "df_out"), ("join", "df_in2"))
+        return dag
+
+    def run_dag(self, scheduler: str) -> pd.DataFrame:
+        dag = self.get_dag()
+        dag.set_scheduler(scheduler, max_workers=2)
+        df_out = dag.run_dag("fit")["join"]["df_out"]
+        return df_out
+
+    def test_run_dag1(self) -> None:
+        """
+        Check that the threads scheduler generates the same output as the
+        serial one.
+        """
+        expected = self.run_dag("serial")
+        actual = self.run_dag("threads")
+        self.assertIn("close_mean", actual.columns)
+        self.assertIn("close_std", actual.columns)
+        self.assert_equal(hpandas.df_to_str(actual), hpandas.df_to_str(expected))
+
+    def test_run_leq_node1(self) -> None:
+        """
+        Check that only the ancestors of the requested node are executed.
+        """
+        dag = self.get_dag()
+        dag.set_scheduler("threads")
+        dag.run_leq_node("rolling_std", "fit", progress_bar=False)
+        df_out = dag.get_node("rolling_std").get_output("fit", "df_out")
+        self.assertIn("close_std", df_out.columns)
+        with self.assertRaises(AssertionError):
+            dag.get_node("join").get_output("fit", "df_out")
+
+
+# #############################################################################
+# Test_dataflow_core_DAG7
+# #############################################################################
+
+
+class Test_dataflow_core_DAG7(hunitest.TestCase):
+    """
+    Test freeing the node outputs once all their consumers have run.
+    """
+
+    def run_dag(self, scheduler: str, force_free_nodes: bool) -> dtfcordag.DAG:
+        dag = Test_dataflow_core_DAG6.get_dag()
+        dag.set_scheduler(scheduler)
+        dag.force_free_nodes = force_free_nodes
+        dag.run_dag("fit")
+        return dag
+
+    def helper(self, scheduler: str) -> None:
+        expected = self.run_dag(scheduler, force_free_nodes=False)
+        actual = self.run_dag(scheduler, force_free_nodes=True)
+        # The intermediate outputs are freed.
+        for nid in ["read_data", "rolling_mean", "rolling_std"]:
+            with self.assertRaises(AssertionError):
+                actual.get_node(nid).get_output("fit", "df_out")
+        # The output of the sink is kept.
+        df_out = actual.get_node("join").get_output("fit", "df_out")
+        df_out_expected = expected.get_node("join").get_output("fit", "df_out")
+        self.assert_equal(
+            hpandas.df_to_str(df_out), hpandas.df_to_str(df_out_expected)
+        )
+
+    def test_run_dag1(self) -> None:
+        self.helper("serial")
+
+    def test_run_dag2(self) -> None:
+        self.helper("threads")
+
+    def test_run_leq_node1(self) -> None:
+        """
+        Check that the output of the requested node is kept.
+        """
+        dag = Test_dataflow_core_DAG6.get_dag()
+        dag.force_free_nodes = True
+        df_out = dag.run_leq_node("rolling_mean", "fit", progress_bar=False)[
+            "df_out"
+        ]
+        self.assertIn("close_mean", df_out.columns)
+        with self.assertRaises(AssertionError):
+            dag.get_node("read_data").get_output("fit", "df_out")
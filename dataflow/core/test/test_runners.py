@@ -2,8 +2,12 @@ import logging
 
 import pandas as pd
 
+import core.finance as cofinanc
+import dataflow.core.dag as dtfcordag
 import dataflow.core.dag_builder_example as dtfcdabuex
 import dataflow.core.dag_runner as dtfcodarun
+import dataflow.core.nodes.sources as dtfconosou
+import dataflow.core.nodes.transformers as dtfconotra
 import dataflow.core.visitors as dtfcorvisi
 import helpers.hpandas as hpandas
 import helpers.hunit_test as hunitest
@@ -125,3 +129,88 @@ class TestIncrementalDagRunner1(hunitest.TestCase):
             srs_i = rb_i.result_df[col]
             srs_i_next = rb_i_next.result_df[col]
             self.assertTrue(srs_i.compare(srs_i_next[:-1]).empty)
+
+
+# #############################################################################
+
+
+class TestIncrementalDagRunner2(hunitest.TestCase):
+    """
+    Test the incremental mode of `IncrementalDagRunner`.
+    """
+
+    @staticmethod
+    def get_dag() -> dtfcordag.DAG:
+        """
+        Build a DAG mixing nodes that support incremental execution and nodes
+        that need to be recomputed.
+        """
+        dag = dtfcordag.DAG(mode="strict")
+        node = dtfconosou.ArmaDataSource(
+            "read_data",
+            frequency="T",
+            start_date="2010-01-04 09:00:00",
+            end_date="2010-01-04 10:30:00",
+            seed=0,
+        )
+        dag.add_node(node)
+        # Computing returns needs the previous row as warm-up.
+        node = dtfconotra.ColumnTransformer(
+            "compute_ret_0",
+            transformer_func=cofinanc.compute_ret_0,
+            transformer_kwargs={"mode": "pct_change"},
+            cols=["close"],
+            col_rename_func=lambda x: x + "_ret_0",
+            col_mode="replace_all",
+            incremental_warmup=1,
+        )
+        dag.add_node(node)
+        dag.connect("read_data", "compute_ret_0")
+        # This node doesn't support incremental execution.
+        node = dtfconotra.FunctionWrapper(
+            "rolling_mean",
+            func=lambda df: df.rolling(5).mean(),
+        )
+        dag.add_node(node)
+        dag.connect("compute_ret_0", "rolling_mean")
+        # Pointwise transformation.
+        node = dtfconotra.ColumnTransformer(
+            "clip",
+            transformer_func=lambda df: df.clip(lower=-0.01, upper=0.01),
+            col_mode="replace_all",
+            incremental_warmup=0,
+        )
+        dag.add_node(node)
+        dag.connect("rolling_mean", "clip")
+        return dag
+
+    def run_dag_runner(self, incremental: bool) -> pd.DataFrame:
+        dag = self.get_dag()
+        fit_state = dtfcorvisi.get_fit_state(dag)
+        dag_runner = dtfcodarun.IncrementalDagRunner(
+            dag=dag,
+            start_timestamp="2010-01-04 09:30",
+            end_timestamp="2010-01-04 10:00",
+            freq="5T",
+            fit_state=fit_state,
+            incremental=incremental,
+        )
+        result_bundles = list(dag_runner.predict())
+        self.assertEqual(len(result_bundles), 7)
+        if incremental:
+            # Concatenate the new rows emitted at each step.
+            df = pd.concat([rb.result_df for rb in result_bundles])
+        else:
+            df = result_bundles[-1].result_df
+        return df
+
+    def test1(self) -> None:
+        """
+        Check that the incremental execution generates the same output as
+        recomputing the DAG at every step.
+        """
+        expected = self.run_dag_runner(incremental=False)
+        actual = self.run_dag_runner(incremental=True)
+        hpandas.dassert_strictly_increasing_index(actual)
+        self.assert_equal(hpandas.df_to_str(actual), hpandas.df_to_str(expected))
+        self.assertTrue(actual.equals(expected))
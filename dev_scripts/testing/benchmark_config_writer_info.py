@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+
+"""
+Measure how much of the time to build a System is spent recording who uses
+the config values.
+
+A `_ConfigWriterInfo` is built every time a config value is marked as used.
+The script measures, both with the lazy `_ConfigWriterInfo`, which only walks
+the frames, and formatting the traceback and the caller eagerly, like it was
+done before:
+- the time to mark a config value as used
+- the time to build the `DagRunner` of a `Mock1` System
+
+> benchmark_config_writer_info.py --num_iters 5
+
+Import as:
+
+import dev_scripts.testing.benchmark_config_writer_info as dtbecowrin
+"""
+
+import argparse
+import inspect
+import logging
+import tempfile
+import traceback
+from typing import Callable, List
+
+import core.config.config_ as cconconf
+import core.finance as cofinanc
+import dataflow_amp.system.mock1.mock1_forecast_system_example as dtfasmmfsex
+import helpers.hasyncio as hasynci
+import helpers.hdbg as hdbg
+import helpers.hparser as hparser
+from helpers.htimer import Timer
+
+_LOG = logging.getLogger(__name__)
+
+# #############################################################################
+
+
+def _build_system(system_log_dir: str) -> int:
+    """
+    Build a System and its `DagRunner`.
+
+    :return: number of `_ConfigWriterInfo` objects built
+    """
+    num_writers = 0
+    init = cconconf._ConfigWriterInfo.__init__
+
+    def _counting_init(self: cconconf._ConfigWriterInfo) -> None:
+        nonlocal num_writers
+        num_writers += 1
+        init(self)
+
+    data, rt_timeout_in_secs_or_time = cofinanc.get_MarketData_df1()
+    cconconf._ConfigWriterInfo.__init__ = _counting_init
+    try:
+        system = dtfasmmfsex.get_Mock1_Time_ForecastSystem_with_DataFramePortfolio_example1(
+            data, rt_timeout_in_secs_or_time
+        )
+        system.config["system_log_dir"] = system_log_dir
+        with hasynci.solipsism_context() as event_loop:
+            system.config["event_loop_object"] = event_loop
+            _ = system.dag_runner
+    finally:
+        cconconf._ConfigWriterInfo.__init__ = init
+    return num_writers
+
+
+def _time_build_system(num_iters: int, system_log_dir: str) -> List[float]:
+    elapsed_times = []
+    for _ in range(num_iters):
+        timer = Timer()
+        num_writers = _build_system(system_log_dir)
+        timer.stop()
+        elapsed_times.append(timer.get_elapsed())
+    _LOG.info("Number of `_ConfigWriterInfo` per System=%s", num_writers)
+    return elapsed_times
+
+
+def _time_mark_as_used(num_iters: int) -> float:
+    """
+    Return the time to mark a config value as used.
+    """
+    config = cconconf.Config.from_dict({"key": "value"})
+    timer = Timer()
+    for _ in range(num_iters):
+        _ = config.get_and_mark_as_used("key")
+    timer.stop()
+    return timer.get_elapsed() / num_iters
+
+
+def _get_eager_init(init: Callable) -> Callable:
+    """
+    Return a constructor capturing the writer info like it was done before.
+    """
+
+    def _eager_init(self: cconconf._ConfigWriterInfo) -> None:
+        init(self)
+        _ = traceback.format_stack()
+        _ = inspect.stack()
+
+    return _eager_init
+
+
+def _parse() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--num_iters",
+        action="store",
+        type=int,
+        default=5,
+        help="Number of Systems to build for each mode",
+    )
+    hparser.add_verbosity_arg(parser)
+    return parser
+
+
+def _main(parser: argparse.ArgumentParser) -> None:
+    args = parser.parse_args()
+    hdbg.init_logger(verbosity=args.log_level, use_exec_path=True)
+    system_log_dir = tempfile.mkdtemp()
+    # Warm up the caches (e.g., imports, source files).
+    _build_system(system_log_dir)
+    # Time the lazy writer info.
+    num_marks = 1000
+    lazy_mark_time = _time_mark_as_used(num_marks)
+    lazy_times = _time_build_system(args.num_iters, system_log_dir)
+    # Time the eager writer info.
+    init = cconconf._ConfigWriterInfo.__init__
+    cconconf._ConfigWriterInfo.__init__ = _get_eager_init(init)
+    try:
+        eager_mark_time = _time_mark_as_used(num_marks)
+        eager_times = _time_build_system(args.num_iters, system_log_dir)
+    finally:
+        cconconf._ConfigWriterInfo.__init__ = init
+    _LOG.info(
+        "Mark as used time: lazy=%.1f usecs, eager=%.1f usecs, speedup=%.1fx",
+        1e6 * lazy_mark_time,
+        1e6 * eager_mark_time,
+        eager_mark_time / lazy_mark_time,
+    )
+    lazy_time = min(lazy_times)
+    eager_time = min(eager_times)
+    _LOG.info(
+        "System build time: lazy=%.3f secs, eager=%.3f secs, saved=%.1f%%",
+        lazy_time,
+        eager_time,
+        100 * (eager_time - lazy_time) / eager_time,
+    )
+
+
+if __name__ == "__main__":
+    _main(_parse())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+
+"""
+Measure the time to run the QA checks on a synthetic day of OHLCV data for a
+full universe.
+
+The script measures:
+- the time of the columnar checks against the row-wise implementations they
+  replaced, i.e., `apply(axis=1)` for `OuterCrossOHLCVDataCheck` and filtering
+  the data for each symbol for `GapsInTimeIntervalBySymbolsCheck`
+- the time to run all the checks with `DataFrameDatasetValidator` using one
+  and multiple threads
+
+> benchmark_qa_checks.py --num_symbols 100 --num_threads 4
+
+Import as:
+
+import dev_scripts.testing.benchmark_qa_checks as dtbeqach
+"""
+
+import argparse
+import logging
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+import helpers.hdbg as hdbg
+import helpers.hpandas as hpandas
+import helpers.hparser as hparser
+import im_v2.common.data.qa.dataset_validator as imvcdqdava
+import im_v2.common.data.qa.qa_check as imvcdqqach
+from helpers.htimer import Timer
+
+_LOG = logging.getLogger(__name__)
+
+# #############################################################################
+
+
+def _get_ohlcv_data(
+    start_timestamp: pd.Timestamp,
+    end_timestamp: pd.Timestamp,
+    num_symbols: int,
+    seed: int,
+) -> pd.DataFrame:
+    """
+    Build OHLCV data with one row per minute and symbol.
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range(start_timestamp, end_timestamp, freq="T")
+    currency_pairs = [f"COIN{i}_USDT" for i in range(num_symbols)]
+    index = pd.MultiIndex.from_product(
+        [timestamps, currency_pairs], names=["timestamp", "currency_pair"]
+    )
+    open_ = 100 + rng.random(len(index))
+    close = 100 + rng.random(len(index))
+    df = pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) + rng.random(len(index)),
+            "low": np.minimum(open_, close) - rng.random(len(index)),
+            "close": close,
+            "volume": rng.random(len(index)) * 1000,
+        },
+        index=index,
+    ).reset_index()
+    return df
+
+
+def _is_valid_row(row: pd.Series) -> bool:
+    """
+    Compare the OHLCV values of a row like `OuterCrossOHLCVDataCheck` did.
+    """
+    for col in ["open", "high", "low", "close", "volume"]:
+        if row[col + "_A"] != row[col + "_B"]:
+            return False
+    return True
+
+
+def _run_row_wise_outer_cross_check(datasets: List[pd.DataFrame]) -> bool:
+    merged_df = pd.merge(
+        datasets[0],
+        datasets[1],
+        on=["timestamp", "currency_pair"],
+        how="outer",
+        suffixes=("_A", "_B"),
+    )
+    merged_df["QAcheck"] = merged_df.apply(_is_valid_row, axis=1)
+    return not (merged_df["QAcheck"] == False).any()
+
+
+def _run_per_symbol_gaps_check(
+    datasets: List[pd.DataFrame],
+    start_timestamp: pd.Timestamp,
+    end_timestamp: pd.Timestamp,
+) -> bool:
+    """
+    Look for gaps filtering the data for each symbol, like
+    `GapsInTimeIntervalBySymbolsCheck` did.
+    """
+    is_ok = True
+    for data in datasets:
+        for currency_pair in data["currency_pair"].unique():
+            current_data = data[data["currency_pair"] == currency_pair]
+            gaps = hpandas.find_gaps_in_time_series(
+                current_data["timestamp"], start_timestamp, end_timestamp, "T"
+            )
+            is_ok &= gaps.empty
+    return is_ok
+
+
+def _time_func(func: Callable[[], bool], num_iters: int) -> float:
+    """
+    Return the minimum time to run `func`.
+    """
+    elapsed_times = []
+    for _ in range(num_iters):
+        timer = Timer()
+        func()
+        timer.stop()
+        elapsed_times.append(timer.get_elapsed())
+    return min(elapsed_times)
+
+
+def _parse() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--num_symbols",
+        action="store",
+        type=int,
+        default=100,
+        help="Number of symbols in the universe",
+    )
+    parser.add_argument(
+        "--num_threads",
+        action="store",
+        type=int,
+        default=4,
+        help="Number of threads used by the validator",
+    )
+    parser.add_argument(
+        "--num_iters",
+        action="store",
+        type=int,
+        default=3,
+        help="Number of times to run each check",
+    )
+    hparser.add_verbosity_arg(parser)
+    return parser
+
+
+def _main(parser: argparse.ArgumentParser) -> None:
+    args = parser.parse_args()
+    hdbg.init_logger(verbosity=args.log_level, use_exec_path=True)
+    start_timestamp = pd.Timestamp("2024-01-01 00:00:00")
+    end_timestamp = pd.Timestamp("2024-01-01 23:59:00")
+    data1 = _get_ohlcv_data(start_timestamp, end_timestamp, args.num_symbols, 1)
+    data2 = data1.copy()
+    _LOG.info("Number of rows per dataset=%s", len(data1))
+    # Time the cross dataset check.
+    outer_cross_check = imvcdqqach.OuterCrossOHLCVDataCheck()
+    columnar_time = _time_func(
+        lambda: outer_cross_check.check([data1, data2]), args.num_iters
+    )
+    row_wise_time = _time_func(
+        lambda: _run_row_wise_outer_cross_check([data1, data2]), 1
+    )
+    _LOG.info(
+        "OuterCrossOHLCVDataCheck: row-wise=%.3f secs, columnar=%.3f secs,"
+        " speedup=%.1fx",
+        row_wise_time,
+        columnar_time,
+        row_wise_time / columnar_time,
+    )
+    # Time the gaps check.
+    gaps_check = imvcdqqach.GapsInTimeIntervalBySymbolsCheck(
+        start_timestamp, end_timestamp, "T"
+    )
+    columnar_time = _time_func(lambda: gaps_check.check([data1]), args.num_iters)
+    per_symbol_time = _time_func(
+        lambda: _run_per_symbol_gaps_check(
+            [data1], start_timestamp, end_timestamp
+        ),
+        args.num_iters,
+    )
+    _LOG.info(
+        "GapsInTimeIntervalBySymbolsCheck: per-symbol=%.3f secs, columnar=%.3f"
+        " secs, speedup=%.1fx",
+        per_symbol_time,
+        columnar_time,
+        per_symbol_time / columnar_time,
+    )
+    # Time the validator.
+    universe = data1["currency_pair"].unique().tolist()
+    qa_checks = [
+        imvcdqqach.NaNChecks(),
+        imvcdqqach.OhlcvLogicalValuesCheck(),
+        imvcdqqach.FullUniversePresentCheck(universe),
+        imvcdqqach.GapsInTimeIntervalBySymbolsCheck(
+            start_timestamp, end_timestamp, "T"
+        ),
+        imvcdqqach.DuplicateDifferingOhlcvCheck(),
+    ]
+    times = []
+    for num_threads in [1, args.num_threads]:
+        validator = imvcdqdava.DataFrameDatasetValidator(
+            qa_checks, num_threads=num_threads
+        )
+        times.append(
+            _time_func(lambda: validator.run_all_checks([data1]), args.num_iters)
+        )
+    _LOG.info(
+        "DataFrameDatasetValidator: 1 thread=%.3f secs, %s threads=%.3f secs,"
+        " speedup=%.1fx",
+        times[0],
+        args.num_threads,
+        times[1],
+        times[0] / times[1],
+    )
+
+
+if __name__ == "__main__":
+    _main(_parse())
@@ -9,14 +9,19 @@ import helpers.hcache as hcache
 import atexit
 import copy
 import functools
+import hashlib
 import logging
 import os
+import shutil
 import time
+import weakref
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
 
 import joblib
 import joblib.func_inspect as jfunci
 import joblib.memory as jmemor
+import numpy as np
+import pandas as pd
 
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
@@ -76,6 +81,32 @@ def enable_clear_cache(val: bool) -> None:
     _IS_CLEAR_CACHE_ENABLED = val
 
 
+# Maximum size of the global memory cache, above which the least recently used
+# values are evicted. `None` for an unbounded cache.
+_MEM_CACHE_MAX_SIZE_IN_BYTES: Optional[int] = None
+
+
+def set_mem_cache_max_size(max_size_in_bytes: Optional[int]) -> None:
+    """
+    Set the maximum size of the global memory cache.
+
+    :param max_size_in_bytes: size above which the least recently used
+        values are evicted from the memory cache
+        - `None` for an unbounded cache
+    """
+    global _MEM_CACHE_MAX_SIZE_IN_BYTES
+    if _TRACE:
+        _LOG.trace("")
+    if max_size_in_bytes is not None:
+        hdbg.dassert_lte(0, max_size_in_bytes)
+    _LOG.warning(
+        "Setting memory cache max size to %s -> %s",
+        _MEM_CACHE_MAX_SIZE_IN_BYTES,
+        max_size_in_bytes,
+    )
+    _MEM_CACHE_MAX_SIZE_IN_BYTES = max_size_in_bytes
+
+
 def get_global_cache_info(
     tag: Optional[str] = None, add_banner: bool = False
 ) -> str:
@@ -371,6 +402,8 @@ class _Cached:
         tag: Optional[str] = None,
         disk_cache_path: Optional[str] = None,
         aws_profile: Optional[str] = "am",
+        copy_result: bool = True,
+        hash_arg_func: Optional[Callable[[Any], str]] = None,
     ):
         """
         Construct the class.
@@ -387,6 +420,19 @@ class _Cached:
             when running unit tests we want to use a different cache)
         :param disk_cache_path: path of the function-specific cache
         :param aws_profile: the AWS profile to use in case of S3 backend
+        :param copy_result: whether to return a copy of the cached value, which
+            the caller can modify
+            - `False` to return the value without copying it, making its NumPy
+              arrays and the NumPy-backed columns of its pandas objects
+              read-only, so that the caller can't modify the cached value
+              (callers that need to modify the value should copy it, e.g.,
+              with `df.copy()`). The values are stored uncompressed in local
+              caches, so that their arrays are memory-mapped from the cache
+              instead of being loaded
+        :param hash_arg_func: function returning the digest of an argument of
+            the function, e.g., `hash_arg_fast()`, to identify the cached
+            values
+            - `None` to hash the arguments with Joblib
         """
         # Make the class have the same attributes (e.g., `__name__`, `__doc__`,
         # `__dict__`) as the called function.
@@ -403,6 +449,8 @@ class _Cached:
         self._tag = tag
         self._disk_cache_path = disk_cache_path
         self._aws_profile = aws_profile
+        self._copy_result = copy_result
+        self._hash_arg_func = hash_arg_func
         #
         self._reset_cache_tracing()
         # Create the memory and disk cache objects for this function.
@@ -448,9 +496,12 @@ class _Cached:
                 self._func.__name__,
                 self.get_last_cache_accessed(),
             )
-            # TODO(gp): Not sure making a deep copy is a good idea. In the end,
-            #  the client should not modify a cached value.
-            obj = copy.deepcopy(obj)
+            if self._copy_result:
+                # TODO(gp): Not sure making a deep copy is a good idea. In the
+                #  end, the client should not modify a cached value.
+                obj = copy.deepcopy(obj)
+            else:
+                _make_read_only(obj)
         # Print caching info.
         if self._is_verbose:
             # Get time.
@@ -687,6 +738,8 @@ class _Cached:
         # For memory always use the global cache.
         cache_type = "mem"
         memory_cache = get_global_cache(cache_type, self._tag)
+        if not self._copy_result:
+            memory_cache = _get_memory_mapped_cache(memory_cache)
         # Get the Joblib object corresponding to the cached function.
         return memory_cache.cache(self._func)
 
@@ -732,12 +785,16 @@ class _Cached:
                 )
             else:
                 path = self._disk_cache_path
+                if not self._copy_result:
+                    memory_kwargs.update({"compress": False, "mmap_mode": "r"})
             _LOG.debug("path='%s'\nmemory_kwargs=\n%s", path, str(memory_kwargs))
             disk_cache = joblib.Memory(path, **memory_kwargs)
         else:
             # Use the global cache.
             cache_type = "disk"
             disk_cache = get_global_cache(cache_type, self._tag)
+            if not self._copy_result:
+                disk_cache = _get_memory_mapped_cache(disk_cache)
         # Get the Joblib object corresponding to the cached function.
         disk_cached_func = disk_cache.cache(self._func)
         return disk_cache, disk_cached_func
@@ -800,9 +857,19 @@ class _Cached:
             "Cache backend not initialized for %s",
             cache_type,
         )
-        func_id, args_id = memorized_result._get_output_identifiers(
-            *args, **kwargs
-        )
+        if self._hash_arg_func is None:
+            func_id, args_id = memorized_result._get_output_identifiers(
+                *args, **kwargs
+            )
+        else:
+            func_id = jmemor._build_func_identifier(self._func)
+            # Map the name of each argument to its value, like Joblib does.
+            args_dict = jfunci.filter_args(self._func, [], args, kwargs)
+            arg_digests = {
+                name: self._hash_arg_func(value)
+                for name, value in args_dict.items()
+            }
+            args_id = joblib.hash(arg_digests)
         _LOG.debug("func_id=%s args_id=%s", func_id, args_id)
         return func_id, args_id
 
@@ -867,7 +934,59 @@ class _Cached:
         memorized_result._write_func_code(func_code, first_line)
         # Store the returned value into the cache.
         memorized_result.store_backend.dump_item([func_id, args_id], obj)
-        #
+        if cache_type == "mem" and _MEM_CACHE_MAX_SIZE_IN_BYTES is not None:
+            # Evict the least recently used values.
+            items = memorized_result.store_backend._get_items_to_delete(
+                _MEM_CACHE_MAX_SIZE_IN_BYTES
+            )
+            for item in items:
+                _LOG.debug("Evicting '%s' from the memory cache", item.path)
+                # Ignore the values already evicted by another process.
+                shutil.rmtree(item.path, ignore_errors=True)
+
+    def _load_cached_version(
+        self, cache_type: str, func_id: str, args_id: str
+    ) -> Any:
+        """
+        Load a value from the cache.
+
+        :param cache_type: type of a cache
+        :param func_id: digest of the function obtained from `_get_identifiers()`
+        :param args_id: digest of arguments obtained from `_get_identifiers()`
+        :return: cached value
+        """
+        memorized_result = self._get_memorized_result(cache_type)
+        # Load the value directly to avoid hashing the arguments again.
+        obj = memorized_result.store_backend.load_item(
+            [func_id, args_id], verbose=0
+        )
+        return obj
+
+    def _mark_cached_version_as_used(
+        self, cache_type: str, func_id: str, args_id: str
+    ) -> None:
+        """
+        Update the access time of a cached value, which determines the order
+        in which values are evicted.
+
+        :param cache_type: type of a cache
+        :param func_id: digest of the function obtained from `_get_identifiers()`
+        :param args_id: digest of arguments obtained from `_get_identifiers()`
+        """
+        memorized_result = self._get_memorized_result(cache_type)
+        # Joblib evicts first the values whose output file was accessed least
+        # recently.
+        output_file_name = os.path.join(
+            memorized_result.store_backend.location,
+            func_id,
+            args_id,
+            "output.pkl",
+        )
+        try:
+            os.utime(output_file_name)
+        except FileNotFoundError:
+            # The value was evicted by another process.
+            pass
 
     # ///////////////////////////////////////////////////////////////////////////
 
@@ -895,7 +1014,7 @@ class _Cached:
             with htimer.TimedScope(
                 logging.INFO, "Loading cached version from disk"
             ):
-                obj = self._disk_cached_func(*args, **kwargs)
+                obj = self._load_cached_version("disk", func_id, args_id)
             if self._check_only_if_present:
                 raise CachedValueException(func_info)
         else:
@@ -913,7 +1032,13 @@ class _Cached:
             with htimer.TimedScope(
                 logging.INFO, "Updating cached version on disk"
             ):
-                obj = self._disk_cached_func(*args, **kwargs)
+                if self._hash_arg_func is None:
+                    obj = self._disk_cached_func(*args, **kwargs)
+                else:
+                    # Joblib identifies the value with its own hashing, so we
+                    # store the value ourselves.
+                    obj = self._execute_intrinsic_function(*args, **kwargs)
+                    self._store_cached_version("disk", func_id, args_id, obj)
             # obj = self._execute_intrinsic_function(*args, **kwargs)
             # The function was not cached in disk, so now we need to update the
             # memory cache.
@@ -936,11 +1061,13 @@ class _Cached:
             _LOG.debug("There is a mem cached version")
             if self._check_only_if_present:
                 raise CachedValueException(func_info)
+            if _MEM_CACHE_MAX_SIZE_IN_BYTES is not None:
+                self._mark_cached_version_as_used("mem", func_id, args_id)
             # The function execution was cached in the mem cache.
             with htimer.TimedScope(
                 logging.INFO, "Loading cached version from memory"
             ):
-                obj = self._memory_cached_func(*args, **kwargs)
+                obj = self._load_cached_version("mem", func_id, args_id)
         else:
             # INV: we know that we didn't hit the memory cache, but we don't know
             # about the disk cache.
@@ -1009,6 +1136,174 @@ class _Cached:
         return obj
 
 
+# #############################################################################
+
+
+def _get_memory_mapped_cache(cache_backend: joblib.Memory) -> joblib.Memory:
+    """
+    Return a cache storing values in the same dir as `cache_backend`, which
+    loads the arrays as read-only memory maps.
+
+    The values are stored uncompressed since compressed values can't be
+    memory-mapped.
+    """
+    return joblib.Memory(
+        cache_backend.location, verbose=0, compress=False, mmap_mode="r"
+    )
+
+
+def _make_read_only(obj: Any) -> None:
+    """
+    Make the NumPy arrays and the NumPy-backed pandas objects in `obj` read-
+    only in place.
+
+    Lists, tuples, and dicts are traversed recursively.
+    """
+    if isinstance(obj, np.ndarray):
+        obj.flags.writeable = False
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        # pandas doesn't expose the arrays storing the data of a dataframe, so
+        # we get them from the block manager.
+        for array in obj._mgr.arrays:
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            _make_read_only(item)
+    elif isinstance(obj, dict):
+        for item in obj.values():
+            _make_read_only(item)
+
+
+# Map the id of a read-only object to a weak reference to the object, the ids
+# of the objects storing its data, and its digest.
+_READ_ONLY_DIGESTS: Dict[int, Tuple[weakref.ref, Tuple[int, ...], str]] = {}
+
+
+def _get_read_only_data_ids(obj: Any) -> Optional[Tuple[int, ...]]:
+    """
+    Return the ids of the objects storing the data of `obj`, if read-only.
+
+    :return: ids of the arrays, the index, and the columns of `obj`, which
+        change when the data of `obj` is replaced
+        - `None` if `obj` can be modified in place
+    """
+    if isinstance(obj, np.ndarray):
+        arrays = [obj]
+        data_ids: Tuple[int, ...] = ()
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        arrays = obj._mgr.arrays
+        # The names of an index can be changed in place.
+        data_ids = (id(obj.index), hash(tuple(obj.index.names)))
+        if isinstance(obj, pd.DataFrame):
+            data_ids += (id(obj.columns), hash(tuple(obj.columns.names)))
+        else:
+            data_ids += (hash(obj.name),)
+    else:
+        return None
+    for array in arrays:
+        if not isinstance(array, np.ndarray) or array.flags.writeable:
+            return None
+    data_ids += tuple(id(array) for array in arrays)
+    return data_ids
+
+
+def _update_hasher_with_values(hasher: Any, values: Any) -> None:
+    """
+    Update `hasher` with the dtype, the shape, and the data of `values`.
+    """
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        hasher.update(f"{values.dtype}{values.shape}".encode())
+        # Hash the underlying buffer.
+        values = np.ascontiguousarray(values)
+        hasher.update(values.reshape(-1).view(np.uint8))
+    elif (
+        isinstance(values, np.ndarray)
+        and pd.api.types.infer_dtype(values, skipna=False) == "string"
+    ):
+        # Hash each string with pandas, which is much faster than pickling.
+        hasher.update(f"string{values.shape}".encode())
+        string_digests = pd.util.hash_array(values.reshape(-1))
+        _update_hasher_with_values(hasher, string_digests)
+    else:
+        # Hash other objects (e.g., strings, extension arrays) with Joblib.
+        hasher.update(joblib.hash(values).encode())
+
+
+def _update_hasher_with_index(hasher: Any, index: pd.Index) -> None:
+    if isinstance(index, pd.DatetimeIndex):
+        # The dtype includes the timezone.
+        hasher.update(f"{index.dtype}{index.name}".encode())
+        _update_hasher_with_values(hasher, index.asi8)
+    elif isinstance(index.dtype, np.dtype) and index.dtype != object:
+        hasher.update(f"{index.name}".encode())
+        _update_hasher_with_values(hasher, index.to_numpy())
+    else:
+        _update_hasher_with_values(hasher, index)
+
+
+def _hash_pandas_or_numpy(obj: Union[np.ndarray, pd.Series, pd.DataFrame]) -> str:
+    hasher = hashlib.sha1(usedforsecurity=False)
+    hasher.update(type(obj).__name__.encode())
+    if isinstance(obj, np.ndarray):
+        _update_hasher_with_values(hasher, obj)
+    elif isinstance(obj, pd.Series):
+        hasher.update(joblib.hash(obj.name).encode())
+        _update_hasher_with_index(hasher, obj.index)
+        _update_hasher_with_values(hasher, obj.to_numpy(copy=False))
+    else:
+        _update_hasher_with_index(hasher, obj.index)
+        _update_hasher_with_index(hasher, obj.columns)
+        for _, srs in obj.items():
+            if isinstance(srs.dtype, np.dtype):
+                values = srs.to_numpy(copy=False)
+            else:
+                values = srs.array
+            _update_hasher_with_values(hasher, values)
+    return hasher.hexdigest()
+
+
+def hash_arg_fast(arg: Any) -> str:
+    """
+    Return the digest of an argument of a cached function.
+
+    NumPy arrays and pandas objects are hashed directly from their buffers,
+    instead of being pickled like Joblib does. The digest of an object that
+    can't be modified in place (e.g., a read-only dataframe returned by a
+    function cached with `copy_result=False`) is computed only the first time
+    the object is hashed.
+
+    Lists, tuples, and dicts are hashed recursively, while the other objects
+    are hashed with Joblib.
+    """
+    if isinstance(arg, (np.ndarray, pd.Series, pd.DataFrame)):
+        data_ids = _get_read_only_data_ids(arg)
+        if data_ids is None:
+            return _hash_pandas_or_numpy(arg)
+        # Look up the digest of the read-only object.
+        entry = _READ_ONLY_DIGESTS.get(id(arg))
+        if entry is not None:
+            ref, cached_data_ids, digest = entry
+            if ref() is arg and cached_data_ids == data_ids:
+                return digest
+        digest = _hash_pandas_or_numpy(arg)
+        obj_id = id(arg)
+        # Remove the entry when the object is garbage collected.
+        ref = weakref.ref(arg, lambda _: _READ_ONLY_DIGESTS.pop(obj_id, None))
+        _READ_ONLY_DIGESTS[obj_id] = (ref, data_ids, digest)
+    elif isinstance(arg, (list, tuple)):
+        digest = joblib.hash(
+            (type(arg).__name__, [hash_arg_fast(item) for item in arg])
+        )
+    elif isinstance(arg, dict):
+        digest = joblib.hash(
+            {key: hash_arg_fast(value) for key, value in arg.items()}
+        )
+    else:
+        digest = joblib.hash(arg)
+    return digest
+
+
 # #############################################################################
 # Decorator
 # #############################################################################
@@ -1021,6 +1316,8 @@ def cache(
     tag: Optional[str] = None,
     disk_cache_path: Optional[str] = None,
     aws_profile: Optional[str] = None,
+    copy_result: bool = True,
+    hash_arg_func: Optional[Callable[[Any], str]] = None,
 ) -> Union[Callable, _Cached]:
     """
     Decorate a function with a cache.
@@ -1038,6 +1335,16 @@ def cache(
     @hcache.cache(use_mem_cache=False)
     def add(x: int, y: int) -> int:
         return x + y
+
+    # Return read-only dataframes without copying them.
+    @hcache.cache(copy_result=False)
+    def load_data(file_name: str) -> pd.DataFrame:
+        return pd.read_csv(file_name)
+
+    # Hash the (large) dataframe arguments by content.
+    @hcache.cache(hash_arg_func=hcache.hash_arg_fast)
+    def resample(df: pd.DataFrame, rule: str) -> pd.DataFrame:
+        return df.resample(rule).mean()
     ```
     """
 
@@ -1050,6 +1357,8 @@ def cache(
             tag=tag,
             disk_cache_path=disk_cache_path,
             aws_profile=aws_profile,
+            copy_result=copy_result,
+            hash_arg_func=hash_arg_func,
         )
 
     return wrapper
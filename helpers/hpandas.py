@@ -586,7 +586,7 @@ def find_gaps_in_time_series(
     """
     _time_series = time_series
     if str(time_series.dtype) in ["int32", "int64"]:
-        _time_series = _time_series.map(hdateti.convert_unix_epoch_to_timestamp)
+        _time_series = pd.to_datetime(_time_series, unit="ms", utc=True)
     correct_time_series = pd.date_range(
         start=start_timestamp, end=end_timestamp, freq=freq
     )
@@ -17,6 +17,7 @@ import pyarrow as pa
 import pyarrow.dataset as ds
 import pyarrow.fs as pafs
 import pyarrow.parquet as pq
+import s3fs
 from tqdm.autonotebook import tqdm
 
 import helpers.hdataframe as hdatafr
@@ -77,6 +78,127 @@ def _get_parquet_tiles_from_file_path(file_path: str) -> List[Tuple[str, Any]]:
     return tiles
 
 
+# #############################################################################
+# Local cache of S3 tiles
+# #############################################################################
+
+# The cache is configured through env vars so that it is inherited by the
+# worker processes, e.g., of `hjoblib.parallel_execute()`.
+_S3_TILE_CACHE_DIR_ENV_VAR = "AM_S3_TILE_CACHE_DIR"
+_S3_TILE_CACHE_MAX_SIZE_ENV_VAR = "AM_S3_TILE_CACHE_MAX_SIZE_IN_BYTES"
+_S3_TILE_CACHE_DEFAULT_MAX_SIZE_IN_BYTES = 50 * 1024**3
+# Maximum number of files whose info is requested one by one instead of
+# listing the dir containing them, which returns the info of 1000 files per
+# request.
+_S3_TILE_CACHE_MAX_NUM_FILE_INFOS = 32
+
+
+def enable_s3_tile_cache(
+    cache_dir: Optional[str],
+    *,
+    max_size_in_bytes: int = _S3_TILE_CACHE_DEFAULT_MAX_SIZE_IN_BYTES,
+) -> None:
+    """
+    Enable or disable caching on local disk the S3 files read by
+    `from_parquet()`.
+
+    The cache applies to the processes started after this call, so it should
+    be enabled before starting the workers of a parallel execution.
+
+    :param cache_dir: local dir storing the cached files
+        - `None` to disable the cache
+    :param max_size_in_bytes: see `hs3.S3FileCache`
+    """
+    if cache_dir is None:
+        os.environ.pop(_S3_TILE_CACHE_DIR_ENV_VAR, None)
+        os.environ.pop(_S3_TILE_CACHE_MAX_SIZE_ENV_VAR, None)
+    else:
+        hdbg.dassert_lte(0, max_size_in_bytes)
+        os.environ[_S3_TILE_CACHE_DIR_ENV_VAR] = cache_dir
+        os.environ[_S3_TILE_CACHE_MAX_SIZE_ENV_VAR] = str(max_size_in_bytes)
+
+
+def get_s3_tile_cache() -> Optional[hs3.S3FileCache]:
+    """
+    Return the local cache of the S3 files, if enabled.
+    """
+    cache_dir = os.environ.get(_S3_TILE_CACHE_DIR_ENV_VAR, "")
+    if cache_dir == "":
+        return None
+    max_size_in_bytes = int(
+        os.environ.get(
+            _S3_TILE_CACHE_MAX_SIZE_ENV_VAR,
+            _S3_TILE_CACHE_DEFAULT_MAX_SIZE_IN_BYTES,
+        )
+    )
+    s3_tile_cache = hs3.S3FileCache(cache_dir, max_size_in_bytes)
+    return s3_tile_cache
+
+
+def _get_cached_parquet_dataset(
+    file_name: str,
+    filesystem: Union[pafs.S3FileSystem, hs3.AwsProfile],
+    filters: Optional[List[Any]],
+    partitioning: Union[ds.Partitioning, ds.PartitioningFactory],
+    s3_tile_cache: hs3.S3FileCache,
+    s3_filesystem: s3fs.core.S3FileSystem,
+) -> pq.ParquetDataset:
+    """
+    Return a dataset reading the local copies of the files of an S3 dataset.
+
+    Only the files of the partitions matching `filters` are downloaded.
+
+    :param file_name: S3 path of the dataset without the `s3://` prefix
+    :param filesystem: filesystem to list the files of the dataset
+    :param s3_filesystem: filesystem to download the files
+    :return: dataset equivalent to the S3 one, see `from_parquet()`
+    """
+    s3_dataset = ds.dataset(
+        file_name,
+        filesystem=filesystem,
+        format="parquet",
+        partitioning=partitioning,
+    )
+    filter_expression = (
+        None if filters is None else pq.filters_to_expression(filters)
+    )
+    s3_paths = [
+        fragment.path
+        for fragment in s3_dataset.get_fragments(filter=filter_expression)
+    ]
+    if not s3_paths:
+        # Read the schema from S3 since there are no files to cache.
+        dataset = pq.ParquetDataset(
+            file_name,
+            filesystem=filesystem,
+            filters=filters,
+            partitioning=partitioning,
+        )
+        return dataset
+    # Get ETag and size of the files to check that the cached copies are up to
+    # date. Request the info of each file when reading a few files (e.g., one
+    # asset and month), and list only the dir containing the files otherwise,
+    # instead of listing the entire dataset at each read.
+    if len(s3_paths) <= _S3_TILE_CACHE_MAX_NUM_FILE_INFOS:
+        infos = None
+    else:
+        dir_name = os.path.commonpath(s3_paths)
+        infos = s3_filesystem.find(dir_name, detail=True)
+    local_paths = s3_tile_cache.get_local_files(
+        s3_paths, s3_filesystem, infos=infos
+    )
+    # The partitioning of the local files is parsed from the partition dirs
+    # (e.g., `currency_pair=BTC_USDT/year=2022/month=1`) that mirror the S3
+    # ones.
+    dataset = pq.ParquetDataset(
+        local_paths, filters=filters, partitioning=partitioning
+    )
+    return dataset
+
+
+# #############################################################################
+
+
 # TODO(Dan): Add mode to allow querying even when some non-existing columns are passed.
 def from_parquet(
     file_name: str,
@@ -88,6 +210,7 @@ def from_parquet(
     log_level: int = logging.DEBUG,
     report_stats: bool = False,
     aws_profile: hs3.AwsProfile = None,
+    filesystem: Optional[pafs.S3FileSystem] = None,
 ) -> pd.DataFrame:
     """
     Load a dataframe from a Parquet file.
@@ -95,6 +218,9 @@ def from_parquet(
     The difference with `pd.read_pq` is that here we use Parquet
     Dataset.
 
+    The S3 files are read through a local cache, if enabled with
+    `enable_s3_tile_cache()`.
+
     :param file_name: path to a Parquet dataset
     :param columns: columns to return, skipping reading columns that are not requested
        - `None` means return all available columns
@@ -106,14 +232,22 @@ def from_parquet(
     :param report_stats: whether to report Parquet file size or not
     :param aws_profile: AWS profile to use if and only if using an S3 path,
         otherwise `None` for local path
+    :param filesystem: Pyarrow S3 filesystem built from `aws_profile` with
+        `get_pyarrow_s3fs()`, to share it across reads (e.g., from multiple
+        threads)
+        - `None` to build a new one
     :return: data from Parquet dataset
     """
     _LOG.debug(hprint.to_str("file_name columns filters schema"))
     hdbg.dassert_isinstance(file_name, str)
     hs3.dassert_is_valid_aws_profile(file_name, aws_profile)
+    if filesystem is not None:
+        hdbg.dassert(hs3.is_s3_path(file_name), "file_name=%s", file_name)
+        hdbg.dassert_isinstance(aws_profile, str)
     if hs3.is_s3_path(file_name):
         if isinstance(aws_profile, str):
-            filesystem = get_pyarrow_s3fs(aws_profile)
+            if filesystem is None:
+                filesystem = get_pyarrow_s3fs(aws_profile)
         else:
             # Note: `s3fs` filesystem is only to be used on exact file path
             # as `pq.ParquetDataset` is not properly handling directory path.
@@ -154,13 +288,24 @@ def from_parquet(
                 # Pass partition columns types explicitly.
                 schema = pa.schema(schema)
             partitioning = ds.partitioning(schema, flavor="hive")
-            dataset = pq.ParquetDataset(
-                # Replace URI with path.
-                file_name,
-                filesystem=filesystem,
-                filters=filters,
-                partitioning=partitioning,
-            )
+            s3_tile_cache = get_s3_tile_cache()
+            if filesystem is not None and s3_tile_cache is not None:
+                dataset = _get_cached_parquet_dataset(
+                    file_name,
+                    filesystem,
+                    filters,
+                    partitioning,
+                    s3_tile_cache,
+                    s3_filesystem,
+                )
+            else:
+                dataset = pq.ParquetDataset(
+                    # Replace URI with path.
+                    file_name,
+                    filesystem=filesystem,
+                    filters=filters,
+                    partitioning=partitioning,
+                )
             if columns:
                 # Note: `schema.names` also includes and index.
                 hdbg.dassert_is_subset(columns, dataset.schema.names)
@@ -7,12 +7,15 @@ import helpers.hs3 as hs3
 import argparse
 import configparser
 import copy
+import fcntl
 import functools
 import gzip
 import logging
 import os
 import pathlib
 import pprint
+import threading
+import time
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 _WARNING = "\033[33mWARNING\033[0m"
@@ -793,6 +796,171 @@ def get_s3fs(aws_profile: AwsProfile) -> s3fs.core.S3FileSystem:
     return s3fs_
 
 
+# #############################################################################
+# S3FileCache
+# #############################################################################
+
+
+class S3FileCache:
+    """
+    Read-through cache of S3 files on local disk.
+
+    A file is cached in `{cache_dir}/{bucket}/{dir}/{etag}_{size}_{file_name}`,
+    so that a file that changes on S3 is downloaded again, and the cache is
+    kept under a size budget evicting the least recently used files.
+
+    The cache can be shared by multiple threads and processes (e.g., the
+    workers of `hjoblib.parallel_execute()`):
+    - a file is downloaded to a temporary file and then renamed, so that a
+      reader never sees a partially written file
+    - only one process at a time evicts files, and files used in the last
+      `min_age_in_secs` are never evicted, so that they are not deleted
+      before they are read
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_size_in_bytes: int,
+        *,
+        min_age_in_secs: float = 600.0,
+    ) -> None:
+        """
+        Constructor.
+
+        :param cache_dir: local dir storing the cached files
+        :param max_size_in_bytes: size of the cache above which the least
+            recently used files are evicted
+            - the size can temporarily exceed the budget with files used in
+              the last `min_age_in_secs`
+        :param min_age_in_secs: minimum time since the last use of a file
+            before it can be evicted
+        """
+        hdbg.dassert_lte(0, max_size_in_bytes)
+        hdbg.dassert_lte(0, min_age_in_secs)
+        self._cache_dir = os.path.abspath(cache_dir)
+        self._max_size_in_bytes = max_size_in_bytes
+        self._min_age_in_secs = min_age_in_secs
+        hio.create_dir(self._cache_dir, incremental=True)
+        self._lock_file_name = os.path.join(self._cache_dir, ".lock")
+
+    def get_local_files(
+        self,
+        s3_paths: List[str],
+        s3fs_: s3fs.core.S3FileSystem,
+        *,
+        infos: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> List[str]:
+        """
+        Return the local copies of S3 files, downloading the missing ones.
+
+        :param s3_paths: S3 paths with or without the `s3://` prefix, e.g.,
+            `bucket/dir/file.parquet`
+        :param s3fs_: filesystem to get the info of the files and download
+            them
+        :param infos: the `s3fs` info of the files by path without the
+            `s3://` prefix, e.g., from `s3fs_.find(dir_name, detail=True)`
+            - `None` to request the info of each file
+        :return: local paths in the same order as `s3_paths`
+        """
+        local_paths = []
+        num_downloaded_files = 0
+        for s3_path in s3_paths:
+            path = s3_path[len("s3://") :] if is_s3_path(s3_path) else s3_path
+            info = None if infos is None else infos.get(path)
+            if info is None:
+                info = s3fs_.info(path)
+            local_path = self._get_local_path(path, info)
+            try:
+                # Mark the file as recently used.
+                os.utime(local_path)
+            except FileNotFoundError:
+                self._download(path, local_path, s3fs_)
+                num_downloaded_files += 1
+            local_paths.append(local_path)
+        _LOG.debug(
+            "Downloaded %s / %s files to '%s'",
+            num_downloaded_files,
+            len(s3_paths),
+            self._cache_dir,
+        )
+        if num_downloaded_files > 0:
+            self._evict()
+        return local_paths
+
+    def _get_local_path(self, path: str, info: Dict[str, Any]) -> str:
+        """
+        Return the local path of the version of an S3 file described by
+        `info`.
+        """
+        etag = info["ETag"].strip('"')
+        dir_name, file_name = os.path.split(path)
+        local_path = os.path.join(
+            self._cache_dir, dir_name, f"{etag}_{info['size']}_{file_name}"
+        )
+        return local_path
+
+    def _download(
+        self, path: str, local_path: str, s3fs_: s3fs.core.S3FileSystem
+    ) -> None:
+        hio.create_enclosing_dir(local_path, incremental=True)
+        # Use a temporary file unique to the process and the thread.
+        tmp_local_path = f"{local_path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        try:
+            s3fs_.get_file(path, tmp_local_path)
+            # Renaming is atomic, so concurrent readers see either no file or
+            # the complete file.
+            os.replace(tmp_local_path, local_path)
+        finally:
+            if os.path.exists(tmp_local_path):
+                os.remove(tmp_local_path)
+
+    def _evict(self) -> None:
+        """
+        Evict the least recently used files until the cache fits the budget.
+        """
+        with open(self._lock_file_name, "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Another process is evicting files.
+                return
+            # Get modification time, size, and path of the cached files.
+            files = []
+            for dir_name, _, file_names in os.walk(self._cache_dir):
+                for file_name in file_names:
+                    path = os.path.join(dir_name, file_name)
+                    if path == self._lock_file_name:
+                        continue
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+            cache_size = sum(size for _, size, _ in files)
+            if cache_size <= self._max_size_in_bytes:
+                return
+            # Evict from the least recently used file.
+            files.sort()
+            max_mtime = time.time() - self._min_age_in_secs
+            num_evicted_files = 0
+            for mtime, size, path in files:
+                if cache_size <= self._max_size_in_bytes or mtime > max_mtime:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                cache_size -= size
+                num_evicted_files += 1
+            _LOG.debug(
+                "Evicted %s files from '%s' (size=%s)",
+                num_evicted_files,
+                self._cache_dir,
+                hintros.format_size(cache_size),
+            )
+
+
 # #############################################################################
 # Archive and retrieve data from S3.
 # #############################################################################
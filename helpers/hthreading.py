@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 """
-`timeout` decorator which is used to limit function execution time.
+Utilities for threads, e.g., the `timeout` decorator which is used to limit
+function execution time.
 
 Import as:
 
@@ -8,9 +9,22 @@ import helpers.hthreading as hthread
 """
 
 import _thread
+import abc
+import atexit
+import logging
+import queue
 import sys
 import threading
-from typing import Any
+from typing import Any, List, Optional
+
+import helpers.hdbg as hdbg
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+# Timeout
+# #############################################################################
 
 
 def _timeout_handler() -> None:
@@ -41,3 +55,119 @@ def timeout(timeout_sec: int) -> Any:
         return inner
 
     return outer
+
+
+# #############################################################################
+# BackgroundWriter
+# #############################################################################
+
+
+class BackgroundWriter(abc.ABC):
+    """
+    Write items queued by the caller from a background thread.
+
+    The caller queues the items with `_put()` and never blocks on file I/O
+    (e.g., a coroutine running on the event loop). The background thread
+    writes all the items queued since its previous write in one call to
+    `_write_items()`, so that the subclasses can batch the writes.
+
+    The queued items are written when the writer is flushed or closed, which
+    happens also when the interpreter exits. After a failure to write, the
+    background thread stops writing and the failure is raised to the caller.
+    """
+
+    def __init__(self) -> None:
+        # Each item is an item to write or `None` to stop the background
+        # thread.
+        self._queue: queue.Queue = queue.Queue()
+        # Exception raised by the background thread, if any.
+        self._exception: Optional[Exception] = None
+        self._is_closed = False
+        self._thread = threading.Thread(
+            target=self._write_queued_items,
+            name=self.__class__.__name__,
+            daemon=True,
+        )
+        self._thread.start()
+        # Write the queued items before exiting.
+        atexit.register(self.close)
+
+    def flush(self) -> None:
+        """
+        Wait until all the queued items are written.
+        """
+        self._queue.join()
+        self._raise_if_failed()
+
+    def close(self) -> None:
+        """
+        Write all the queued items and stop the background thread.
+        """
+        if self._is_closed:
+            return
+        self._is_closed = True
+        self._queue.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
+        self._raise_if_failed()
+
+    def _put(self, item: Any) -> None:
+        """
+        Queue an item to be written by the background thread.
+        """
+        hdbg.dassert(not self._is_closed, "The writer is closed")
+        hdbg.dassert_is_not(item, None)
+        self._raise_if_failed()
+        self._queue.put(item)
+
+    @abc.abstractmethod
+    def _write_items(self, items: List[Any]) -> None:
+        """
+        Write items from the background thread, in the order they were queued.
+        """
+        ...
+
+    def _on_close(self) -> None:
+        """
+        Release the resources of the background thread, e.g., open files.
+        """
+
+    def _raise_if_failed(self) -> None:
+        if self._exception is not None:
+            raise RuntimeError(
+                "The background thread failed to write"
+            ) from self._exception
+
+    def _write_queued_items(self) -> None:
+        """
+        Write the queued items in batches until the writer is closed.
+        """
+        is_closed = False
+        while not is_closed:
+            # Wait for an item and get all the items queued in the meantime.
+            items: List[Any] = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            # No item is queued after the writer is closed.
+            is_closed = items[-1] is None
+            items_to_write = items[:-1] if is_closed else items
+            try:
+                # Stop writing after a failure, since the written data is not
+                # complete any longer.
+                if items_to_write and self._exception is None:
+                    self._write_items(items_to_write)
+            except Exception as e:  # pylint: disable=broad-except
+                _LOG.exception("%s failed to write", self._thread.name)
+                self._exception = e
+            try:
+                if is_closed:
+                    self._on_close()
+            except Exception as e:  # pylint: disable=broad-except
+                _LOG.exception("%s failed to close", self._thread.name)
+                self._exception = self._exception or e
+            finally:
+                for _ in items:
+                    self._queue.task_done()
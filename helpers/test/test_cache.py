@@ -931,5 +931,165 @@ class TestCacheEnableCheckOnlyIfPresent1(_ResetGlobalCacheHelper):
         self._execute_and_check_state(f, cf, 2, 2, exp_cf_state=cache_from)
 
 
+# #############################################################################
+
+
+class TestCacheCopyResult1(_ResetGlobalCacheHelper):
+    def test_mem_cache1(self) -> None:
+        self._helper(cache_from="mem", use_mem_cache=True, use_disk_cache=False)
+
+    def test_disk_cache1(self) -> None:
+        self._helper(cache_from="disk", use_mem_cache=False, use_disk_cache=True)
+
+    def _helper(self, cache_from: str, **kwargs: Any) -> None:
+        """
+        Test that with `copy_result=False` the cached dataframes are read-only.
+        """
+
+        def get_df(num_rows: int) -> pd.DataFrame:
+            return pd.DataFrame({"A": np.arange(num_rows, dtype=float)})
+
+        cf = hcache._Cached(
+            get_df, tag=self.cache_tag, copy_result=False, **kwargs
+        )
+        for exp_cf_state in ["no_cache", cache_from]:
+            df = cf(3)
+            self.assertEqual(cf.get_last_cache_accessed(), exp_cf_state)
+            self.assertEqual(df["A"].tolist(), [0.0, 1.0, 2.0])
+            # The cached dataframe can't be modified.
+            with self.assertRaises(ValueError):
+                df.loc[0, "A"] = 10.0
+            # A copy can be modified.
+            df = df.copy()
+            df.loc[0, "A"] = 10.0
+        # Check that the cached value is unchanged.
+        df = cf(3)
+        self.assertEqual(df["A"].tolist(), [0.0, 1.0, 2.0])
+
+
+# #############################################################################
+
+
+class TestSetMemCacheMaxSize1(_ResetGlobalCacheHelper):
+    def tear_down_test(self) -> None:
+        hcache.set_mem_cache_max_size(None)
+        super().tear_down_test()
+
+    def test1(self) -> None:
+        """
+        Test that the least recently used values are evicted from the memory
+        cache.
+        """
+        f, cf = self._get_f_cf_functions(use_mem_cache=True, use_disk_cache=False)
+        # Bound the cache to the size of 2 values.
+        self._execute_and_check_state(f, cf, 1, 1, exp_cf_state="no_cache")
+        store_backend = cf._get_memorized_result("mem").store_backend
+        value_size = sum(item.size for item in store_backend.get_items())
+        hcache.set_mem_cache_max_size(int(2.5 * value_size))
+        self._execute_and_check_state(f, cf, 2, 2, exp_cf_state="no_cache")
+        # Use the first value so that the second one is the least recently
+        # used.
+        self._execute_and_check_state(f, cf, 1, 1, exp_cf_state="mem")
+        # Storing a third value evicts the second one.
+        self._execute_and_check_state(f, cf, 3, 3, exp_cf_state="no_cache")
+        self._execute_and_check_state(f, cf, 1, 1, exp_cf_state="mem")
+        self._execute_and_check_state(f, cf, 2, 2, exp_cf_state="no_cache")
+
+
+# #############################################################################
+
+
+class TestHashArgFast1(hunitest.TestCase):
+    def test_dataframe1(self) -> None:
+        """
+        Test that the digest of a dataframe depends on its data and metadata.
+        """
+        df = pd.DataFrame(
+            {"A": [1.0, 2.0, 3.0], "B": ["x", "y", "z"]},
+            index=pd.date_range("2022-01-01", periods=3, tz="UTC"),
+        )
+        digest = hcache.hash_arg_fast(df)
+        self.assertEqual(hcache.hash_arg_fast(df.copy()), digest)
+        # Change the data.
+        df2 = df.copy()
+        df2.loc[df2.index[0], "A"] = 10.0
+        self.assertNotEqual(hcache.hash_arg_fast(df2), digest)
+        df2 = df.copy()
+        df2.loc[df2.index[0], "B"] = "w"
+        self.assertNotEqual(hcache.hash_arg_fast(df2), digest)
+        # Change the metadata.
+        df2 = df.astype({"A": np.float32})
+        self.assertNotEqual(hcache.hash_arg_fast(df2), digest)
+        df2 = df.tz_convert("America/New_York")
+        self.assertNotEqual(hcache.hash_arg_fast(df2), digest)
+        df2 = df.rename(columns={"A": "C"})
+        self.assertNotEqual(hcache.hash_arg_fast(df2), digest)
+
+    def test_read_only1(self) -> None:
+        """
+        Test that the digest of a read-only dataframe is updated when the
+        dataframe is changed.
+        """
+        df = pd.DataFrame({"A": [1.0, 2.0, 3.0]})
+        hcache._make_read_only(df)
+        digest = hcache.hash_arg_fast(df)
+        self.assertEqual(hcache.hash_arg_fast(df), digest)
+        # Add a column.
+        df["B"] = 1.0
+        digest2 = hcache.hash_arg_fast(df)
+        self.assertNotEqual(digest2, digest)
+        self.assertEqual(
+            digest2,
+            hcache.hash_arg_fast(pd.DataFrame({"A": [1.0, 2.0, 3.0], "B": 1.0})),
+        )
+
+
+# #############################################################################
+
+
+class TestCacheHashArgFunc1(_ResetGlobalCacheHelper):
+    def test_mem_cache1(self) -> None:
+        self._helper(cache_from="mem", use_mem_cache=True, use_disk_cache=False)
+
+    def test_disk_cache1(self) -> None:
+        self._helper(cache_from="disk", use_mem_cache=False, use_disk_cache=True)
+
+    def test_mem_disk_cache1(self) -> None:
+        self._helper(cache_from="mem", use_mem_cache=True, use_disk_cache=True)
+
+    def _helper(self, cache_from: str, **kwargs: Any) -> None:
+        """
+        Test caching a function with the arguments hashed by
+        `hash_arg_fast()`.
+        """
+
+        def get_sum(df: pd.DataFrame, *, col: str) -> float:
+            get_sum.executed = True  # type: ignore[attr-defined]
+            return float(df[col].sum())
+
+        cf = hcache._Cached(
+            get_sum,
+            tag=self.cache_tag,
+            hash_arg_func=hcache.hash_arg_fast,
+            **kwargs,
+        )
+        df = pd.DataFrame({"A": [1.0, 2.0], "B": [3.0, 4.0]})
+        for df_tmp, col, exp, exp_cf_state in [
+            (df, "A", 3.0, "no_cache"),
+            (df.copy(), "A", 3.0, cache_from),
+            (df, "B", 7.0, "no_cache"),
+            (df * 2, "A", 6.0, "no_cache"),
+            (df, "B", 7.0, cache_from),
+        ]:
+            get_sum.executed = False  # type: ignore[attr-defined]
+            act = cf(df_tmp, col=col)
+            self.assertEqual(act, exp)
+            self.assertEqual(cf.get_last_cache_accessed(), exp_cf_state)
+            self.assertEqual(
+                get_sum.executed,  # type: ignore[attr-defined]
+                exp_cf_state == "no_cache",
+            )
+
+
 # TODO(gp): Add a test for verbose mode in __call__
 # TODO(gp): get_function_cache_info
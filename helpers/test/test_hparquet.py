@@ -2,6 +2,7 @@ import datetime
 import logging
 import os
 import random
+import unittest.mock as umock
 from typing import Any, List, Optional, Tuple
 
 import pandas as pd
@@ -1118,6 +1119,59 @@ class TestListAndMergePqFiles(hmoto.S3Mock_TestCase):
 # #############################################################################
 
 
+@pytest.mark.requires_ck_infra
+@pytest.mark.requires_aws
+@pytest.mark.skipif(
+    not henv.execute_repo_config_code("is_CK_S3_available()"),
+    reason="Run only if CK S3 is available",
+)
+class TestFromParquetWithS3TileCache1(hmoto.S3Mock_TestCase):
+    def test_from_parquet1(self) -> None:
+        """
+        Check that reading through the cache returns the same data as reading
+        from S3 and downloads only the filtered tiles.
+        """
+        # Upload test daily Parquet files to the mocked S3 bucket.
+        test_dir = self.get_scratch_space()
+        imvct.generate_parquet_files(
+            "2022-02-02",
+            "2022-02-04",
+            ["A", "B", "C"],
+            "asset",
+            test_dir,
+            partition_mode="by_year_month",
+            custom_partition_cols="asset,year,month",
+        )
+        s3fs_ = hs3.get_s3fs(self.mock_aws_profile)
+        s3_bucket = f"s3://{self.bucket_name}"
+        s3fs_.put(test_dir, s3_bucket, recursive=True)
+        filters = [("asset", "in", ["A", "B"])]
+        expected = hparque.from_parquet(
+            s3_bucket, filters=filters, aws_profile=s3fs_
+        )
+        # Read through the cache twice.
+        cache_dir = os.path.join(test_dir, "tmp.s3_tile_cache")
+        with umock.patch.dict(os.environ):
+            hparque.enable_s3_tile_cache(cache_dir)
+            actual1 = hparque.from_parquet(
+                s3_bucket, filters=filters, aws_profile=s3fs_
+            )
+            actual2 = hparque.from_parquet(
+                s3_bucket, filters=filters, aws_profile=s3fs_
+            )
+        # Check.
+        expected = hpandas.df_to_str(expected, num_rows=None)
+        self.assert_equal(hpandas.df_to_str(actual1, num_rows=None), expected)
+        self.assert_equal(hpandas.df_to_str(actual2, num_rows=None), expected)
+        cached_files = hs3.listdir(
+            cache_dir, "*.parquet", only_files=True, use_relative_paths=True
+        )
+        self.assertEqual(len(cached_files), 2)
+
+
+# #############################################################################
+
+
 class TestListAndMergePqFilesMixedUnits(hunitest.TestCase):
     def test_parquet_files_with_mixed_time_units_1(self) -> None:
         """
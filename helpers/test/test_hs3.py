@@ -270,6 +270,53 @@ class TestDu1(hmoto.S3Mock_TestCase):
         self.assert_equal(size, expected_size)
 
 
+@pytest.mark.requires_ck_infra
+@pytest.mark.requires_aws
+@pytest.mark.skipif(
+    not henv.execute_repo_config_code("is_CK_S3_available()"),
+    reason="Run only if CK S3 is available",
+)
+class TestS3FileCache1(hmoto.S3Mock_TestCase):
+    def test_get_local_files1(self) -> None:
+        """
+        Verify that the files are downloaded once and that the least recently
+        used ones are evicted.
+        """
+        moto_s3fs = hs3.get_s3fs(self.mock_aws_profile)
+        s3_paths = []
+        for i in range(3):
+            s3_path = f"{self.bucket_name}/dir/mock{i}.txt"
+            with moto_s3fs.open(s3_path, "wb") as s3_file:
+                s3_file.write(b"0123456789")
+            s3_paths.append(s3_path)
+        cache_dir = self.get_scratch_space()
+        # The cache fits 2 files.
+        s3_file_cache = hs3.S3FileCache(cache_dir, 20, min_age_in_secs=0)
+        local_paths = s3_file_cache.get_local_files(s3_paths[:2], moto_s3fs)
+        self.assert_equal(hio.from_file(local_paths[0]), "0123456789")
+        # Mark the first file as used before the second one.
+        os.utime(local_paths[0], (0, 0))
+        os.utime(local_paths[1], (1, 1))
+        # The second file is read from the cache and is now the most recently
+        # used.
+        local_paths2 = s3_file_cache.get_local_files(
+            [f"s3://{s3_paths[1]}"], moto_s3fs
+        )
+        self.assertEqual(local_paths2, local_paths[1:])
+        # Downloading the third file evicts the first one.
+        local_paths3 = s3_file_cache.get_local_files(s3_paths[2:], moto_s3fs)
+        self.assertFalse(os.path.exists(local_paths[0]))
+        self.assertTrue(os.path.exists(local_paths[1]))
+        self.assertTrue(os.path.exists(local_paths3[0]))
+        # A modified file is downloaded again.
+        with moto_s3fs.open(s3_paths[1], "wb") as s3_file:
+            s3_file.write(b"9876543210")
+        moto_s3fs.invalidate_cache()
+        local_paths4 = s3_file_cache.get_local_files(s3_paths[1:2], moto_s3fs)
+        self.assertNotEqual(local_paths4, local_paths[1:])
+        self.assert_equal(hio.from_file(local_paths4[0]), "9876543210")
+
+
 class TestGenerateAwsFiles(hunitest.TestCase):
     # This will be run before and after each test.
     @pytest.fixture(autouse=True)
@@ -0,0 +1,63 @@
+from typing import Any, List
+
+import helpers.hthreading as hthread
+import helpers.hunit_test as hunitest
+
+
+class _ListWriter(hthread.BackgroundWriter):
+    """
+    Store the written items in a list, failing on negative items.
+    """
+
+    def __init__(self) -> None:
+        self.batches: List[List[Any]] = []
+        self.is_released = False
+        super().__init__()
+
+    def append(self, item: int) -> None:
+        self._put(item)
+
+    def _write_items(self, items: List[Any]) -> None:
+        if any(item < 0 for item in items):
+            raise ValueError(f"Invalid items={items}")
+        self.batches.append(items)
+
+    def _on_close(self) -> None:
+        self.is_released = True
+
+
+# #############################################################################
+# TestBackgroundWriter1
+# #############################################################################
+
+
+class TestBackgroundWriter1(hunitest.TestCase):
+    def test_write1(self) -> None:
+        """
+        Verify that the items are written in order and the writer is closed.
+        """
+        writer = _ListWriter()
+        for item in range(5):
+            writer.append(item)
+        writer.flush()
+        items = [item for batch in writer.batches for item in batch]
+        self.assertEqual(items, list(range(5)))
+        writer.close()
+        self.assertTrue(writer.is_released)
+        # Check that the writer can't be used after closing it.
+        with self.assertRaises(AssertionError):
+            writer.append(5)
+
+    def test_failure1(self) -> None:
+        """
+        Verify that a failure of the background thread is raised.
+        """
+        writer = _ListWriter()
+        writer.append(-1)
+        with self.assertRaises(RuntimeError):
+            writer.flush()
+        with self.assertRaises(RuntimeError):
+            writer.append(1)
+        with self.assertRaises(RuntimeError):
+            writer.close()
+        self.assertTrue(writer.is_released)
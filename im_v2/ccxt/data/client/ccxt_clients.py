@@ -438,6 +438,7 @@ class CcxtHistoricalPqByTileClient(
         tag: str = "",
         aws_profile: Optional[str] = None,
         resample_1min: bool = False,
+        num_concurrent_reads: int = 1,
     ) -> None:
         """
         Constructor.
@@ -458,4 +459,5 @@ class CcxtHistoricalPqByTileClient(
             tag=tag,
             aws_profile=aws_profile,
             resample_1min=resample_1min,
+            num_concurrent_reads=num_concurrent_reads,
         )
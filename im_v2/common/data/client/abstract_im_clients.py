@@ -8,6 +8,7 @@ import abc
 import logging
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 import core.finance.bid_ask as cfibiask
@@ -250,42 +251,29 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
         )
         # Rename index.
         df.index.name = self._timestamp_col_name
-        # Normalize data for each symbol.
-        _LOG.debug("full_symbols=%s", df[full_symbol_col_name].unique())
-        dfs = []
-        for full_symbol, df_tmp in df.groupby(full_symbol_col_name):
-            _LOG.debug("apply_im_normalization: full_symbol=%s", full_symbol)
-            df_tmp = self._apply_im_normalizations(
-                df_tmp,
-                full_symbol_col_name,
-                self._resample_1min,
-                start_ts,
-                end_ts,
-            )
-            if not df_tmp.empty:
-                # Validate data that remained after normalization and append it
-                # to the result.
-                # TODO(gp): Difference between amp and cmamp.
-                self._dassert_output_data_is_valid(
-                    df_tmp,
-                    full_symbol_col_name,
-                    self._resample_1min,
-                    start_ts,
-                    end_ts,
-                    self._timestamp_col_name,
-                )
-                dfs.append(df_tmp)
-            else:
-                _LOG.debug("Df for full_symbol=%s is empty", full_symbol)
+        # Normalize and validate the data of all the symbols at once.
         hdbg.dassert_lt(0, df.shape[0], "Empty df=\n%s", df)
-        df = pd.concat(dfs, axis=0)
+        df = self._apply_im_normalizations(
+            df,
+            full_symbol_col_name,
+            self._resample_1min,
+            start_ts,
+            end_ts,
+        )
         _LOG.debug("After im_normalization: df=\n%s", hpandas.df_to_str(df))
-        # Sort by index and `full_symbol_col_name`.
-        # There is not a simple way to sort by index and columns in Pandas,
-        # so we convert the index into a column, sort, and convert back.
-        df = df.reset_index()
-        df = df.sort_values(by=[self._timestamp_col_name, full_symbol_col_name])
-        df = df.set_index(self._timestamp_col_name, drop=True)
+        hdbg.dassert_lt(0, df.shape[0], "No data left after normalization")
+        # Sort by index and `full_symbol_col_name` with a single stable sort.
+        codes, _ = pd.factorize(df[full_symbol_col_name], sort=True)
+        df = df.iloc[np.lexsort((codes, df.index.asi8))]
+        # TODO(gp): Difference between amp and cmamp.
+        self._dassert_output_data_is_valid(
+            df,
+            full_symbol_col_name,
+            self._resample_1min,
+            start_ts,
+            end_ts,
+            self._timestamp_col_name,
+        )
         # The full_symbol should be a string.
         hdbg.dassert_isinstance(df[full_symbol_col_name].values[0], str)
         _LOG.debug("After sorting: df=\n%s", hpandas.df_to_str(df))
@@ -352,25 +340,33 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
     ) -> pd.DataFrame:
         """
         Apply normalizations to IM data.
+
+        The data of all the symbols is normalized at once, so the output is
+        not sorted.
         """
         _LOG.debug(hprint.to_str("full_symbol_col_name start_ts end_ts"))
+        # Rows without a full symbol don't belong to any symbol.
+        df = df[df[full_symbol_col_name].notna()]
         # 1) Drop duplicated timestamps.
         use_index = True
-        df = hpandas.drop_duplicates(df, use_index)
+        # Copy the data since `drop_duplicates()` adds a column to its input.
+        df = hpandas.drop_duplicates(df.copy(), use_index)
         # TODO(Grisha): Consider adding "knowledge_timestamp" to every dataset
         # and removing the condition, otherwise some tests fail, see CmTask3630.
         if "knowledge_timestamp" in df.columns:
             duplicate_columns = [full_symbol_col_name]
             # Sort values by "knowledge_timestamp" to keep the latest ones while
             # removing duplicates.
-            df = df.sort_values("knowledge_timestamp", ascending=True)
+            df = df.sort_values(
+                "knowledge_timestamp", ascending=True, kind="stable"
+            )
             use_index = True
             df = hpandas.drop_duplicates(
                 df,
                 use_index,
                 column_subset=duplicate_columns,
                 keep="last",
-            ).sort_index()
+            )
         # 2) Trim the data keeping only the data with index in [start_ts, end_ts].
         # Trimming of the data is done because:
         # - some data sources can be only queried at day resolution, so we get
@@ -384,16 +380,61 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
             df, ts_col_name, start_ts, end_ts, left_close, right_close
         )
         # 3) Resample index to 1 min frequency if specified.
-        if resample_1min:
-            df = hpandas.resample_df(df, "T")
-            # Fill NaN values appeared after resampling in full symbol column.
-            # Combination of full symbol and timestamp is a unique identifier,
-            # so full symbol cannot be NaN.
-            df[full_symbol_col_name] = df[full_symbol_col_name].bfill()
+        if resample_1min and not df.empty:
+            df = ImClient._resample_1min(df, full_symbol_col_name)
         # 4) Convert to UTC.
         df.index = df.index.tz_convert("UTC")
         return df
 
+    @staticmethod
+    def _resample_1min(
+        df: pd.DataFrame, full_symbol_col_name: str
+    ) -> pd.DataFrame:
+        """
+        Resample the data of each symbol to 1 min frequency.
+
+        Like `hpandas.resample_df()` for each symbol, the data of a symbol is
+        reindexed on a 1 min grid from the first to the last timestamp of the
+        symbol, placing NaN in the missing locations.
+        """
+        codes, full_symbols = pd.factorize(df[full_symbol_col_name])
+        timestamps = df.index.asi8
+        keys = pd.DataFrame({"code": codes, "ts": timestamps})
+        is_duplicated = keys.duplicated()
+        hdbg.dassert(
+            not is_duplicated.any(), "Index must have only unique values"
+        )
+        # Compute the first and last timestamp of each symbol, as nanoseconds.
+        ts_bounds = pd.Series(timestamps).groupby(codes).agg(["min", "max"])
+        min_ts = ts_bounds["min"].to_numpy()
+        max_ts = ts_bounds["max"].to_numpy()
+        # Lay out the 1 min grids of all the symbols one after the other.
+        step = pd.Timedelta(minutes=1).value
+        grid_lengths = (max_ts - min_ts) // step + 1
+        grid_offsets = np.cumsum(grid_lengths) - grid_lengths
+        grid_codes = np.repeat(np.arange(len(full_symbols)), grid_lengths)
+        grid_pos = np.arange(grid_lengths.sum()) - grid_offsets[grid_codes]
+        grid_timestamps = min_ts[grid_codes] + grid_pos * step
+        # Find the row of each grid point, if any. The rows with a timestamp
+        # not on the grid of their symbol are dropped.
+        ts_deltas = timestamps - min_ts[codes]
+        is_on_grid = ts_deltas % step == 0
+        grid_idxs = (
+            grid_offsets[codes[is_on_grid]] + ts_deltas[is_on_grid] // step
+        )
+        row_idxs = np.full(len(grid_timestamps), -1)
+        row_idxs[grid_idxs] = np.flatnonzero(is_on_grid)
+        # Reindex the data of all the symbols on their grids at once.
+        df_out = df.reset_index(drop=True).reindex(row_idxs)
+        # Fill NaN values appeared after resampling in full symbol column.
+        # Combination of full symbol and timestamp is a unique identifier,
+        # so full symbol cannot be NaN.
+        if (row_idxs == -1).any():
+            df_out[full_symbol_col_name] = full_symbols.take(grid_codes)
+        grid_index = pd.DatetimeIndex(grid_timestamps, name=df.index.name)
+        df_out.index = grid_index.tz_localize("UTC").tz_convert(df.index.tz)
+        return df_out
+
     @staticmethod
     def _dassert_output_data_is_valid(
         df: pd.DataFrame,
@@ -404,18 +445,28 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
         timestamp_col_name: str,
     ) -> None:
         """
-        Verify that the normalized data is valid.
+        Verify that the normalized data of all the symbols is valid.
         """
         # TODO(Grisha): consider using `hpandas.dassert_time_indexed_df()`.
         # Check that data is not empty.
         hdbg.dassert_lt(0, df.shape[0])
         # Check that index is `pd.DatetimeIndex`.
         hpandas.dassert_index_is_datetime(df)
+        # Check that full symbol column has no NaNs.
+        codes, _ = pd.factorize(df[full_symbol_col_name])
+        hdbg.dassert(
+            (codes != -1).all(), "The full symbol column must have no NaNs"
+        )
+        timestamps = pd.Series(df.index.asi8)
         if resample_1min:
-            # Check that index is monotonic increasing.
-            hpandas.dassert_strictly_increasing_index(df)
-            # Verify that index frequency is 1 minute.
-            hdbg.dassert_eq(df.index.freq, "T")
+            # Check that the index of each symbol is strictly increasing with a
+            # frequency of 1 minute.
+            ts_diffs = timestamps.groupby(codes).diff().dropna()
+            step = pd.Timedelta(minutes=1).value
+            hdbg.dassert(
+                (ts_diffs == step).all(),
+                "The index of each symbol must have a 1 minute frequency",
+            )
         # Check that timezone info is correct.
         expected_tz = ["UTC"]
         # Assume that the first value of an index is representative.
@@ -423,13 +474,9 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
             df.index[0],
             expected_tz,
         )
-        # Check that full symbol column has no NaNs.
-        hdbg.dassert(df[full_symbol_col_name].notna().all())
         # Check that there are no duplicates in data by index and full symbol.
         n_duplicated_rows = (
-            df.reset_index()
-            .duplicated(subset=[timestamp_col_name, full_symbol_col_name])
-            .sum()
+            pd.DataFrame({"code": codes, "ts": timestamps}).duplicated().sum()
         )
         hdbg.dassert_eq(
             n_duplicated_rows, 0, msg="There are duplicated rows in the data"
@@ -447,11 +494,11 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
             # is 20:00:40. That means that the data was downloaded before the bar
             # ends, i.e. incomplete data is received.
             mask = df["knowledge_timestamp"] <= (df.index)
-            early_data = df.loc[mask]
-            if not early_data.empty:
+            num_early_rows = mask.sum()
+            if num_early_rows > 0:
                 _LOG.warning(
                     "Data that is downloaded before a bar ends accounts for=%s",
-                    hprint.perc(early_data.shape[0], df.shape[0]),
+                    hprint.perc(num_early_rows, df.shape[0]),
                 )
 
     @staticmethod
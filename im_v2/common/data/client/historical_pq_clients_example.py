@@ -4,9 +4,11 @@ Import as:
 import im_v2.common.data.client.historical_pq_clients_example as imvcdchpce
 """
 
+import collections
 import os
-from typing import Any, List
+from typing import Any, Dict, List
 
+import helpers.hparquet as hparque
 import im_v2.common.data.client.historical_pq_clients as imvcdchpcl
 import im_v2.common.test as imvct
 import im_v2.common.universe as ivcu
@@ -17,6 +19,30 @@ class MockHistoricalByTileClient(imvcdchpcl.HistoricalPqByTileClient):
         return ["binance::BTC_USDT", "kucoin::FIL_USDT"]
 
 
+class MockHistoricalByExchangeTileClient(MockHistoricalByTileClient):
+    """
+    Read the data of each exchange from a different root dir, e.g.,
+    `{root_dir}/binance`.
+    """
+
+    def _get_root_dirs_symbol_filters(
+        self, full_symbols: List[ivcu.FullSymbol], full_symbol_col_name: str
+    ) -> Dict[str, hparque.ParquetFilter]:
+        exchange_to_full_symbols = collections.defaultdict(list)
+        for full_symbol in full_symbols:
+            exchange, _ = ivcu.parse_full_symbol(full_symbol)
+            exchange_to_full_symbols[exchange].append(full_symbol)
+        res_dict = {
+            os.path.join(self._root_dir, exchange): (
+                full_symbol_col_name,
+                "in",
+                exchange_full_symbols,
+            )
+            for exchange, exchange_full_symbols in exchange_to_full_symbols.items()
+        }
+        return res_dict
+
+
 def get_MockHistoricalByTileClient_example1(
     self_: Any,
     full_symbols: List[ivcu.FullSymbol],
@@ -147,3 +173,47 @@ def get_MockHistoricalByTileClient_example3(
         resample_1min=resample_1min,
     )
     return im_client
+
+
+def get_MockHistoricalByExchangeTileClient_example1(
+    self_: Any,
+    full_symbols: List[ivcu.FullSymbol],
+    num_concurrent_reads: int,
+) -> imvcdchpcl.HistoricalPqByTileClient:
+    """
+    Build mock client example to test reading data from multiple root dirs.
+    """
+    # Specify parameters for test data generation and client initialization.
+    start_date = "2021-12-30"
+    end_date = "2022-01-02"
+    asset_col_name = "full_symbol"
+    test_data_dir = self_.get_scratch_space()
+    freq = "1H"
+    output_type = "cm_task_1103"
+    partition_mode = "by_year_month"
+    # Generate test data for each exchange in a different dir.
+    for full_symbol in full_symbols:
+        exchange, _ = ivcu.parse_full_symbol(full_symbol)
+        imvct.generate_parquet_files(
+            start_date,
+            end_date,
+            [full_symbol],
+            asset_col_name,
+            os.path.join(test_data_dir, exchange, "tiled.bar_data"),
+            freq=freq,
+            output_type=output_type,
+            partition_mode=partition_mode,
+        )
+    # Init client for testing.
+    vendor = "mock"
+    universe_version = "small"
+    infer_exchange_id = False
+    im_client = MockHistoricalByExchangeTileClient(
+        vendor,
+        universe_version,
+        test_data_dir,
+        partition_mode,
+        infer_exchange_id,
+        num_concurrent_reads=num_concurrent_reads,
+    )
+    return im_client
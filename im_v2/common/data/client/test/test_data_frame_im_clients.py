@@ -3,6 +3,7 @@ from typing import List
 import pandas as pd
 
 import core.finance as cofinanc
+import helpers.hpandas as hpandas
 import im_v2.common.data.client.data_frame_im_clients as imvcdcdfimc
 import im_v2.common.data.client.data_frame_im_clients_example as imvcdcdfimce
 import im_v2.common.data.client.im_client_test_case as imvcdcimctc
@@ -280,6 +281,56 @@ class TestDataFrameImClient1(imvcdcimctc.ImClientTestCase):
     # generated for these tests should alternate every 5 rows and does not
     # contain any data gaps. Thus, resampling cannot be tested properly.
 
+    def test_read_data_with_gaps1(self) -> None:
+        """
+        Test that the data of each symbol is resampled on its own 1 minute
+        grid.
+        """
+        universe = self.get_universe()
+        df = cofinanc.get_MarketData_df6(universe)
+        df = df[df.index <= pd.Timestamp("2000-01-01 14:36:00+00:00")]
+        # Remove some bars of each symbol.
+        is_ada = df["full_symbol"] == "binance::ADA_USDT"
+        ada_ts = pd.to_datetime(
+            ["2000-01-01 14:31:00+00:00", "2000-01-01 14:33:00+00:00"]
+        )
+        btc_ts = pd.to_datetime(
+            ["2000-01-01 14:34:00+00:00", "2000-01-01 14:35:00+00:00"]
+        )
+        mask = (is_ada & df.index.isin(ada_ts)) | (
+            ~is_ada & df.index.isin(btc_ts)
+        )
+        df = df[~mask]
+        im_client = imvcdcdfimc.DataFrameImClient(
+            df, universe, resample_1min=True
+        )
+        # Run.
+        start_ts = None
+        end_ts = None
+        columns = None
+        filter_data_mode = "assert"
+        actual = im_client.read_data(
+            universe, start_ts, end_ts, columns, filter_data_mode
+        )
+        # Check.
+        actual = hpandas.df_to_str(actual, num_rows=None)
+        expected = r"""
+                                         full_symbol   open   high   low  close  volume  feature1
+        timestamp
+        2000-01-01 14:31:00+00:00  binance::BTC_USDT  100.0  101.0  99.0  101.0     0.0       1.0
+        2000-01-01 14:32:00+00:00  binance::ADA_USDT  100.0  101.0  99.0  101.0     1.0       1.0
+        2000-01-01 14:32:00+00:00  binance::BTC_USDT  100.0  101.0  99.0  101.0     1.0       1.0
+        2000-01-01 14:33:00+00:00  binance::ADA_USDT    NaN    NaN   NaN    NaN     NaN       NaN
+        2000-01-01 14:33:00+00:00  binance::BTC_USDT  100.0  101.0  99.0  101.0     2.0       1.0
+        2000-01-01 14:34:00+00:00  binance::ADA_USDT  100.0  101.0  99.0  101.0     3.0       1.0
+        2000-01-01 14:34:00+00:00  binance::BTC_USDT    NaN    NaN   NaN    NaN     NaN       NaN
+        2000-01-01 14:35:00+00:00  binance::ADA_USDT  100.0  101.0  99.0  101.0     4.0       1.0
+        2000-01-01 14:35:00+00:00  binance::BTC_USDT    NaN    NaN   NaN    NaN     NaN       NaN
+        2000-01-01 14:36:00+00:00  binance::ADA_USDT  100.0  101.0  99.0  100.0     5.0      -1.0
+        2000-01-01 14:36:00+00:00  binance::BTC_USDT  100.0  101.0  99.0  100.0     5.0      -1.0
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
     # ////////////////////////////////////////////////////////////////////////
 
     def test_get_start_ts_for_symbol1(self) -> None:
@@ -6,6 +6,7 @@ import pandas as pd
 import pytest
 
 import helpers.hdatetime as hdateti
+import helpers.hpandas as hpandas
 import im_v2.common.data.client as icdc
 import im_v2.common.data.client.historical_pq_clients_example as imvcdchpce
 import im_v2.common.universe as ivcu
@@ -831,3 +832,42 @@ class TestHistoricalPqByTileClient3(icdc.ImClientTestCase):
         self.assert_equal(str(actual_df.shape[0]), str(expected_length))
         self.assert_equal(str(actual_df.index[0]), str(start_ts))
         self.assert_equal(str(actual_df.index[-1]), str(end_ts))
+
+
+# #############################################################################
+# TestHistoricalPqByTileClient4
+# #############################################################################
+
+
+class TestHistoricalPqByTileClient4(icdc.ImClientTestCase):
+    """
+    Test reading data from multiple root dirs concurrently.
+    """
+
+    def test_read_data_concurrently1(self) -> None:
+        """
+        Check that reading the root dirs concurrently returns the same data as
+        reading them one at a time.
+        """
+        full_symbols = ["binance::BTC_USDT", "kucoin::FIL_USDT"]
+        start_ts = pd.Timestamp("2021-12-31 00:00:00+00:00")
+        end_ts = pd.Timestamp("2022-01-01 00:00:00+00:00")
+        columns = None
+        filter_data_mode = "assert"
+        dfs = []
+        for num_concurrent_reads in [1, 2]:
+            im_client = (
+                imvcdchpce.get_MockHistoricalByExchangeTileClient_example1(
+                    self, full_symbols, num_concurrent_reads
+                )
+            )
+            df = im_client.read_data(
+                full_symbols, start_ts, end_ts, columns, filter_data_mode
+            )
+            dfs.append(df)
+        # Check.
+        self.assert_equal(str(dfs[0].shape), "(50, 2)")
+        self.assert_equal(
+            hpandas.df_to_str(dfs[1], num_rows=None),
+            hpandas.df_to_str(dfs[0], num_rows=None),
+        )
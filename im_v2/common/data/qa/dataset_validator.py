@@ -4,6 +4,7 @@ Import as:
 import im_v2.common.data.qa.dataset_validator as imvcdqdava
 """
 
+import concurrent.futures
 import logging
 from typing import List
 
@@ -14,8 +15,21 @@ _LOG = logging.getLogger(__name__)
 
 
 class DataFrameDatasetValidator(ssacoval.DatasetValidator):
+    def __init__(
+        self, qa_checks: List[ssacoval.QaCheck], *, num_threads: int = 1
+    ) -> None:
+        """
+        Constructor.
+
+        :param qa_checks: QA checks to run
+        :param num_threads: number of checks to run concurrently
+            - the checks are independent and don't modify the datasets, so
+              they can run in parallel while NumPy and pandas release the GIL
+        """
+        super().__init__(qa_checks)
+        hdbg.dassert_lte(1, num_threads)
+        self._num_threads = num_threads
 
-    # TODO(Sameep): Add unit test for the function.
     def run_all_checks(self, datasets: List, *, abort_on_error: bool = True) -> str:
         """
         Run all quality assurance (QA) checks on the provided datasets.
@@ -29,8 +43,22 @@ class DataFrameDatasetValidator(ssacoval.DatasetValidator):
         """
         error_msgs: List[str] = []
         _LOG.info("Running all QA checks:")
-        for qa_check in self.qa_checks:
-            if qa_check.check(datasets):
+        num_threads = min(self._num_threads, len(self.qa_checks))
+        if num_threads <= 1:
+            results = [qa_check.check(datasets) for qa_check in self.qa_checks]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=num_threads
+            ) as executor:
+                results = list(
+                    executor.map(
+                        lambda qa_check: qa_check.check(datasets),
+                        self.qa_checks,
+                    )
+                )
+        # Report the statuses in the order of the checks.
+        for qa_check, result in zip(self.qa_checks, results):
+            if result:
                 _LOG.info("\t" + qa_check.get_status())
             else:
                 error_msgs.append("\t" + qa_check.get_status())
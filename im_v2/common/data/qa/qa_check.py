@@ -7,10 +7,10 @@ import im_v2.common.data.qa.qa_check as imvcdqqach
 """
 from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 import core.config as cconfig
-import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hpandas as hpandas
 import im_v2.common.data.transform.transform_utils as imvcdttrut
@@ -123,24 +123,47 @@ class GapsInTimeIntervalBySymbolsCheck(ssacoval.QaCheck):
         :return: result of checking
         """
         status = []
+        gaps_check_name = GapsInTimeIntervalCheck.__name__
+        correct_time_series = pd.date_range(
+            start=self.start_timestamp,
+            end=self.end_timestamp,
+            freq=self.data_frequency,
+        )
         for data in datasets:
             if self.align:
                 data = self._align(data.copy(), freq=self.data_frequency)
             if data.empty:
                 self._status = "FAILED: The dataset is empty."
                 return False
-            for currency_pair in data["currency_pair"].unique():
-                current_data = data[data["currency_pair"] == currency_pair]
-                gaps_check = GapsInTimeIntervalCheck(
-                    start_timestamp=self.start_timestamp,
-                    end_timestamp=self.end_timestamp,
-                    data_frequency=self.data_frequency,
+            # Mark the timestamps present for each currency pair in a matrix
+            # with a row per currency pair and a column per timestamp, instead
+            # of filtering the data for each currency pair.
+            # A missing currency pair is reported as its own pair, instead of
+            # getting the code -1 that indexes the last currency pair.
+            currency_pair_codes, currency_pairs = pd.factorize(
+                data["currency_pair"], use_na_sentinel=False
+            )
+            timestamps = data["timestamp"]
+            if str(timestamps.dtype) in ["int32", "int64"]:
+                timestamps = pd.to_datetime(timestamps, unit="ms", utc=True)
+            timestamp_idxs = correct_time_series.get_indexer(timestamps)
+            is_present = np.zeros(
+                (len(currency_pairs), len(correct_time_series)), dtype=bool
+            )
+            is_in_interval = timestamp_idxs != -1
+            is_present[
+                currency_pair_codes[is_in_interval],
+                timestamp_idxs[is_in_interval],
+            ] = True
+            for code in np.flatnonzero(~is_present.all(axis=1)):
+                # Drop the frequency, like `DatetimeIndex.difference()`.
+                current_gaps = pd.DatetimeIndex(
+                    correct_time_series[~is_present[code]], freq=None
+                )
+                status.append(
+                    f"{gaps_check_name}: FAILED: Found gaps {current_gaps} in"
+                    f" the dataset.. Currency pair = {currency_pairs[code]}."
                 )
-                if not gaps_check.check(datasets=[current_data]):
-                    status.append(
-                        f"{gaps_check.get_status()}. "
-                        f"Currency pair = {currency_pair}."
-                    )
         if len(status) > 0:
             self._status = "\n".join(status)
             return False
@@ -157,9 +180,7 @@ class GapsInTimeIntervalBySymbolsCheck(ssacoval.QaCheck):
         """
         df.reset_index(inplace=True)
         if str(df["timestamp"].dtype) in ["int32", "int64"]:
-            df["timestamp"] = df["timestamp"].apply(
-                lambda x: hdateti.convert_unix_epoch_to_timestamp(x)
-            )
+            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
         df["timestamp"] = df["timestamp"].dt.round(freq)
         return df
 
@@ -325,8 +346,8 @@ class OuterCrossOHLCVDataCheck(ssacoval.QaCheck):
         hdbg.dassert_eq(len(datasets), 2)
         # Perform a full outer join
         merged_df = pd.merge(datasets[0], datasets[1], on=['timestamp', 'currency_pair'], how='outer', suffixes=('_A', '_B'))
-        merged_df["QAcheck"] = merged_df.apply(self._is_valid_row, axis=1)
-        qa_check_failed = merged_df[merged_df["QAcheck"] == False]
+        merged_df["QAcheck"] = self._are_valid_rows(merged_df)
+        qa_check_failed = merged_df[~merged_df["QAcheck"]]
         if len(qa_check_failed) > 0:
             qa_check_failed = qa_check_failed.to_string()
             self._status = f"FAILED: Different data found:\n\t{qa_check_failed}"
@@ -334,15 +355,21 @@ class OuterCrossOHLCVDataCheck(ssacoval.QaCheck):
         self._status = "PASSED"
         return True
 
-    def _is_valid_row(self, row: pd.Series) -> bool:
+    @staticmethod
+    def _are_valid_rows(merged_df: pd.DataFrame) -> np.ndarray:
         """
-        Check if the OHLCV is similar.
+        Check if the OHLCV is similar for each row.
+
+        :return: boolean mask of the rows where the OHLCV values are equal
+            (a missing value is different from any value)
         """
         cols = ["open", "high", "low", "close", "volume"]
-        for col in cols:
-            if row[col + "_A"] != row[col + "_B"]:
-                return False
-        return True
+        cols_a = [col + "_A" for col in cols]
+        cols_b = [col + "_B" for col in cols]
+        is_valid = (
+            merged_df[cols_a].to_numpy() == merged_df[cols_b].to_numpy()
+        ).all(axis=1)
+        return is_valid
 
 class BidAskDataFramesSimilarityCheck(ssacoval.QaCheck):
     """
@@ -374,35 +401,32 @@ class BidAskDataFramesSimilarityCheck(ssacoval.QaCheck):
         """
         data = self._preprocess_datasets(datasets)
         bid_ask_cols = get_multilevel_bid_ask_column_names()
-        # Each bid ask value will have a notional and a relative difference between two sources.
-        for col in bid_ask_cols:
-            # Notional difference: Dataset1 - Dataset2.
-            data[f"{col}_diff"] = data[f"{col}_cc"] - data[f"{col}_ccxt"]
-            # Relative value: (Dataset1 - Dataset2)/Dataset1.
-            data[f"{col}_relative_diff_pct"] = (
-                100
-                * (data[f"{col}_cc"] - data[f"{col}_ccxt"])
-                / data[f"{col}_ccxt"]
-            )
+        # Compute the relative difference between the two sources for all the
+        # bid ask values at once: (Dataset1 - Dataset2)/Dataset1.
+        values_cc = data[[f"{col}_cc" for col in bid_ask_cols]].to_numpy()
+        values_ccxt = data[[f"{col}_ccxt" for col in bid_ask_cols]].to_numpy()
+        relative_diff_pct = pd.DataFrame(
+            100 * (values_cc - values_ccxt) / values_ccxt,
+            index=data.index.get_level_values("currency_pair"),
+            columns=bid_ask_cols,
+        )
         # Calculate the mean value of differences for each coin.
-        diff_stats = []
-        grouper = data.groupby(["currency_pair"])
-        for col in bid_ask_cols:
-            diff_stats.append(grouper[f"{col}_diff"].mean())
-            diff_stats.append(grouper[f"{col}_relative_diff_pct"].mean())
-        diff_stats = pd.concat(diff_stats, axis=1)
+        diff_stats = relative_diff_pct.groupby(level="currency_pair").mean()
+        thresholds = np.array(
+            [self.accuracy_threshold_dict[col] for col in bid_ask_cols]
+        )
+        abs_diff_stats = diff_stats.abs().to_numpy()
         error_message = []
         # Log the difference.
-        for index, row in diff_stats.iterrows():
-            for col in get_multilevel_bid_ask_column_names():
-                cur_threshold = self.accuracy_threshold_dict[col]
-                cur_col = f"{col}_relative_diff_pct"
-                if abs(row[cur_col]) > cur_threshold:
-                    message = (
-                        f"Difference in {col}"
-                        f" for `{index}` coin is {abs(row[cur_col])}% (> {cur_threshold}% threshold)."
-                    )
-                    error_message.append(message)
+        for row_idx, col_idx in zip(*np.nonzero(abs_diff_stats > thresholds)):
+            col = bid_ask_cols[col_idx]
+            message = (
+                f"Difference in {col}"
+                f" for `{diff_stats.index[row_idx]}` coin is"
+                f" {abs_diff_stats[row_idx, col_idx]}%"
+                f" (> {self.accuracy_threshold_dict[col]}% threshold)."
+            )
+            error_message.append(message)
         if error_message:
             error_message = "\n".join(error_message)
             self._status = f"FAILED :\n\t{error_message}"
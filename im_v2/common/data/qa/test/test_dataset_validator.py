@@ -0,0 +1,53 @@
+import datetime
+
+import pandas as pd
+
+import helpers.hunit_test as hunitest
+import im_v2.common.data.qa.dataset_validator as imvcdqdava
+import im_v2.common.data.qa.qa_check as imvcdqqach
+
+
+class TestDataFrameDatasetValidator(hunitest.TestCase):
+    def test_run_all_checks1(self) -> None:
+        """
+        Test that the failed checks are reported in the order of the checks,
+        running them sequentially and concurrently.
+        """
+        # Prepare data.
+        start_timestamp = pd.Timestamp("2023-01-15T00:00:00+00:00")
+        end_timestamp = start_timestamp + datetime.timedelta(minutes=5)
+        data = pd.DataFrame(
+            {
+                "timestamp": pd.date_range(
+                    start_timestamp, end_timestamp, freq="T"
+                ),
+                "open": 1.0,
+                "high": 2.0,
+                "low": 0.5,
+                "close": 1.5,
+                "volume": 10.0,
+                "currency_pair": "BTC_USDT",
+            }
+        )
+        data = data.drop([2])
+        qa_checks = [
+            imvcdqqach.FullUniversePresentCheck(["BTC_USDT", "ETH_USDT"]),
+            imvcdqqach.NaNChecks(),
+            imvcdqqach.GapsInTimeIntervalBySymbolsCheck(
+                start_timestamp, end_timestamp, "T"
+            ),
+            imvcdqqach.OhlcvLogicalValuesCheck(),
+        ]
+        expected = r"""
+            FullUniversePresentCheck: FAILED: Found missing symbols in dataset:
+                {'ETH_USDT'}
+            GapsInTimeIntervalBySymbolsCheck: GapsInTimeIntervalCheck: FAILED: Found gaps DatetimeIndex(['2023-01-15 00:02:00+00:00'], dtype='datetime64[ns, UTC]', freq=None) in the dataset.. Currency pair = BTC_USDT.
+        """
+        for num_threads in [1, 3]:
+            validator = imvcdqdava.DataFrameDatasetValidator(
+                qa_checks, num_threads=num_threads
+            )
+            # Execute.
+            actual = validator.run_all_checks([data], abort_on_error=False)
+            # Check results.
+            self.assert_equal(actual, expected, fuzzy_match=True)
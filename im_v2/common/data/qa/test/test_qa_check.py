@@ -107,6 +107,65 @@ class TestGapsInTimeIntervalBySymbolsCheck(QAChecksTestCase):
         self.assertFalse(check_result)
         self.assertIn("BTC_USDT", check_instance.get_status())
 
+    def test_multiple_symbols(self) -> None:
+        """
+        Test that the gaps are reported for each symbol with timestamps in
+        unix epoch format.
+        """
+        # Get the data.
+        minutes = 5
+        start_timestamp = pd.Timestamp("2023-01-15T00:00:00+00:00")
+        end_timestamp = start_timestamp + datetime.timedelta(minutes=minutes)
+        data1 = self._get_data(start_timestamp=start_timestamp, minutes=minutes)
+        data2 = data1.assign(currency_pair="ETH_USDT")
+        data3 = data1.assign(currency_pair="SOL_USDT")
+        data = pd.concat([data1.drop([1]), data2, data3.drop([3, 4])])
+        data["timestamp"] = (
+            data["timestamp"].astype("int64") // 10**6
+        ).astype("int64")
+        # Check.
+        check_instance = imvcdqqach.GapsInTimeIntervalBySymbolsCheck(
+            start_timestamp=start_timestamp,
+            end_timestamp=end_timestamp,
+            data_frequency="T",
+        )
+        check_result = check_instance.check(datasets=[data])
+        self.assertFalse(check_result)
+        actual = check_instance.get_status()
+        expected = r"""
+        GapsInTimeIntervalBySymbolsCheck: GapsInTimeIntervalCheck: FAILED: Found gaps DatetimeIndex(['2023-01-15 00:01:00+00:00'], dtype='datetime64[ns, UTC]', freq=None) in the dataset.. Currency pair = BTC_USDT.
+        GapsInTimeIntervalCheck: FAILED: Found gaps DatetimeIndex(['2023-01-15 00:03:00+00:00', '2023-01-15 00:04:00+00:00'], dtype='datetime64[ns, UTC]', freq=None) in the dataset.. Currency pair = SOL_USDT.
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_missing_symbol(self) -> None:
+        """
+        Test that the rows with a missing symbol are reported as a separate
+        symbol and don't hide the gaps of the other symbols.
+        """
+        # Get the data.
+        minutes = 3
+        start_timestamp = pd.Timestamp("2023-01-15T00:00:00+00:00")
+        end_timestamp = start_timestamp + datetime.timedelta(minutes=minutes)
+        data1 = self._get_data(start_timestamp=start_timestamp, minutes=minutes)
+        data2 = data1.assign(currency_pair="ETH_USDT")
+        data3 = data1.assign(currency_pair=np.nan)
+        data = pd.concat([data1, data2.drop([1]), data3.drop([2])])
+        # Check.
+        check_instance = imvcdqqach.GapsInTimeIntervalBySymbolsCheck(
+            start_timestamp=start_timestamp,
+            end_timestamp=end_timestamp,
+            data_frequency="T",
+        )
+        check_result = check_instance.check(datasets=[data])
+        self.assertFalse(check_result)
+        actual = check_instance.get_status()
+        expected = r"""
+        GapsInTimeIntervalBySymbolsCheck: GapsInTimeIntervalCheck: FAILED: Found gaps DatetimeIndex(['2023-01-15 00:01:00+00:00'], dtype='datetime64[ns, UTC]', freq=None) in the dataset.. Currency pair = ETH_USDT.
+        GapsInTimeIntervalCheck: FAILED: Found gaps DatetimeIndex(['2023-01-15 00:02:00+00:00'], dtype='datetime64[ns, UTC]', freq=None) in the dataset.. Currency pair = nan.
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
 
 class TestNaNChecks(QAChecksTestCase):
     def test_main(self):
@@ -253,6 +312,82 @@ class TestIdenticalDataFramesCheck(QAChecksTestCase):
         )
 
 
+class TestOuterCrossOHLCVDataCheck(QAChecksTestCase):
+    def test_same_data(self) -> None:
+        """
+        Test that the check passes for datasets with the same OHLCV data.
+        """
+        # Prepare data.
+        start_timestamp = pd.Timestamp("2023-01-15T00:00:00+00:00")
+        dataset = self._get_data(start_timestamp, 5)
+        # Execute.
+        check_instance = imvcdqqach.OuterCrossOHLCVDataCheck()
+        check_result = check_instance.check([dataset, dataset.copy()])
+        # Check results.
+        self.assertTrue(check_result)
+        self.assertIn("PASSED", check_instance.get_status())
+
+    def test_different_data(self) -> None:
+        """
+        Test that the check reports the rows with different values and the
+        rows missing in one of the datasets.
+        """
+        # Prepare data.
+        start_timestamp = pd.Timestamp("2023-01-15T00:00:00+00:00")
+        dataset1 = self._get_data(start_timestamp, 3)
+        dataset2 = dataset1.drop([3])
+        dataset2.loc[1, "close"] = 0.5
+        # Execute.
+        check_instance = imvcdqqach.OuterCrossOHLCVDataCheck()
+        check_result = check_instance.check([dataset1, dataset2])
+        # Check results.
+        self.assertFalse(check_result)
+        actual = check_instance.get_status()
+        expected = r"""
+        OuterCrossOHLCVDataCheck: FAILED: Different data found:
+                          timestamp  open_A  high_A   low_A  close_A  volume_A currency_pair  open_B  high_B   low_B  close_B  volume_B  QAcheck
+        1 2023-01-15 00:01:00+00:00  0.4055  0.4056  0.4049   0.4049   65023.8      BTC_USDT  0.4055  0.4056  0.4049      0.5   65023.8    False
+        3 2023-01-15 00:03:00+00:00  0.4055  0.4056  0.4049   0.4049   65023.8      BTC_USDT     NaN     NaN     NaN      NaN       NaN    False
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+
+class TestBidAskDataFramesSimilarityCheck(hunitest.TestCase):
+    def test_main(self) -> None:
+        """
+        Test that the coins and the columns with a mean relative difference
+        above the threshold are reported.
+        """
+        # Prepare data.
+        bid_ask_cols = imvcdqqach.get_multilevel_bid_ask_column_names()
+        timestamps = pd.date_range("2023-01-15 00:00:00", periods=2, freq="S")
+        index = pd.MultiIndex.from_product(
+            [timestamps, ["BTC_USDT", "ETH_USDT"]],
+            names=["timestamp", "currency_pair"],
+        )
+        dataset1 = pd.DataFrame(100.0, index=index, columns=bid_ask_cols)
+        dataset2 = dataset1.copy()
+        # The mean relative difference is 1.5% for BTC and 0.5% for ETH.
+        dataset2.loc[(slice(None), "BTC_USDT"), "bid_price_l1"] = [101.0, 102.0]
+        dataset2.loc[(slice(None), "ETH_USDT"), "ask_size_l2"] = [100.0, 101.0]
+        dataset1 = dataset1.reset_index()
+        dataset2 = dataset2.reset_index()
+        accuracy_threshold_dict = {col: 1 for col in bid_ask_cols}
+        # Execute.
+        check_instance = imvcdqqach.BidAskDataFramesSimilarityCheck(
+            accuracy_threshold_dict
+        )
+        check_result = check_instance.check([dataset1, dataset2])
+        # Check results.
+        self.assertFalse(check_result)
+        actual = check_instance.get_status()
+        expected = r"""
+        BidAskDataFramesSimilarityCheck: FAILED :
+            Difference in bid_price_l1 for `BTC_USDT` coin is 1.5% (> 1% threshold).
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+
 class TestDuplicateDifferingOhlcvCheck(QAChecksTestCase):
     def test_duplicates_with_same_ohlcv(self) -> None:
         """
@@ -39,6 +39,7 @@ class CryptoChassisHistoricalPqByTileClient(
         tag: str = "",
         aws_profile: Optional[str] = None,
         resample_1min: bool = False,
+        num_concurrent_reads: int = 1,
     ) -> None:
         """
         Constructor.
@@ -60,4 +61,5 @@ class CryptoChassisHistoricalPqByTileClient(
             tag=tag,
             aws_profile=aws_profile,
             resample_1min=resample_1min,
+            num_concurrent_reads=num_concurrent_reads,
         )
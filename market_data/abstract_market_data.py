@@ -29,6 +29,73 @@ _TRACE = False
 AssetId = int
 
 
+# #############################################################################
+# TWAP
+# #############################################################################
+
+
+def compute_twap_prices(
+    timestamps: np.ndarray,
+    prices: np.ndarray,
+    start_timestamps: np.ndarray,
+    end_timestamps: np.ndarray,
+    *,
+    left_close: bool = False,
+    right_close: bool = True,
+) -> np.ndarray:
+    """
+    Compute the TWAP of many series of prices for many intervals at once.
+
+    The prefix sums of the prices of each series are computed once, so that
+    the TWAP of an interval is the difference of two prefix sums, found with
+    a binary search. The missing prices are skipped, like `mean()` in
+    `MarketData.get_twap_price()`.
+
+    :param timestamps: sorted timestamps of the prices, as UTC nanoseconds
+    :param prices: array with one row per timestamp and one column per series
+        (e.g., asset)
+    :param start_timestamps, end_timestamps: bounds of the intervals, as UTC
+        nanoseconds
+    :param left_close, right_close: type of the intervals, as in
+        `MarketData.get_data_for_interval()`
+    :return: array with one row per interval and one column per series, with
+        NaN when an interval has no prices
+    """
+    prices = np.asarray(prices, dtype=float)
+    hdbg.dassert_eq(prices.ndim, 2)
+    hdbg.dassert_eq(len(timestamps), prices.shape[0])
+    hdbg.dassert_eq(len(start_timestamps), len(end_timestamps))
+    num_series = prices.shape[1]
+    if prices.shape[0] == 0:
+        return np.full((len(start_timestamps), num_series), np.nan)
+    is_valid = ~np.isnan(prices)
+    # Sum the differences from a reference price of each series to limit the
+    # round-off errors of the prefix sums.
+    first_valid_idxs = is_valid.argmax(axis=0)
+    reference_prices = np.where(
+        is_valid.any(axis=0),
+        prices[first_valid_idxs, np.arange(num_series)],
+        0.0,
+    )
+    deviations = np.where(is_valid, prices - reference_prices, 0.0)
+    # Prefix sums with a leading row of zeros, so that the sum over the rows
+    # in [i, j) is `cum[j] - cum[i]`.
+    zeros = np.zeros((1, num_series))
+    cum_deviations = np.vstack([zeros, np.cumsum(deviations, axis=0)])
+    cum_counts = np.vstack([zeros, np.cumsum(is_valid, axis=0)])
+    start_side = "left" if left_close else "right"
+    end_side = "right" if right_close else "left"
+    start_idxs = np.searchsorted(timestamps, start_timestamps, side=start_side)
+    end_idxs = np.searchsorted(timestamps, end_timestamps, side=end_side)
+    counts = cum_counts[end_idxs] - cum_counts[start_idxs]
+    sums = cum_deviations[end_idxs] - cum_deviations[start_idxs]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        twap_prices = np.where(
+            counts > 0, reference_prices + sums / counts, np.nan
+        )
+    return twap_prices
+
+
 # #############################################################################
 # MarketData
 # #############################################################################
@@ -179,6 +246,28 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
             max_iterations = None
             _LOG.warning("No time limit is set via `max_iterations`.")
         self._max_iterations = max_iterations
+        # Event set by `notify_new_data()` to wake up `wait_for_latest_data()`.
+        # It is created on the first notification, so that pollers keep
+        # sleeping `sleep_in_secs` when no producer notifies.
+        self._new_data_event: Optional[asyncio.Event] = None
+
+    def __str__(
+        self,
+        attr_names_to_skip: Optional[List[str]] = None,
+    ) -> str:
+        if attr_names_to_skip is None:
+            attr_names_to_skip = []
+        attr_names_to_skip.append("_new_data_event")
+        return super().__str__(attr_names_to_skip=attr_names_to_skip)
+
+    def __repr__(
+        self,
+        attr_names_to_skip: Optional[List[str]] = None,
+    ) -> str:
+        if attr_names_to_skip is None:
+            attr_names_to_skip = []
+        attr_names_to_skip.append("_new_data_event")
+        return super().__repr__(attr_names_to_skip=attr_names_to_skip)
 
     # TODO(gp): Who needs this? It seems an implementation detail.
     @property
@@ -495,6 +584,104 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
         # ```
         return twap_df
 
+    def get_twap_prices(
+        self,
+        intervals: pd.DataFrame,
+        ts_col_name: str,
+        column: str,
+        *,
+        left_close: bool = False,
+        right_close: bool = True,
+        ignore_delay: bool = False,
+    ) -> pd.Series:
+        """
+        Compute TWAP of the column `column` for many intervals at once.
+
+        This is equivalent to calling `get_twap_price()` for each interval,
+        but all the intervals are answered from a single call to
+        `get_data_for_interval()` and one call to `compute_twap_prices()` for
+        each asset.
+
+        :param intervals: one row per interval with the columns `asset_id`,
+            `start_timestamp`, `end_timestamp`, e.g.,
+            ```
+               asset_id           start_timestamp             end_timestamp
+            0       101 2000-01-01 09:30:00-05:00 2000-01-01 09:35:00-05:00
+            1       101 2000-01-01 09:35:00-05:00 2000-01-01 09:40:00-05:00
+            2       202 2000-01-01 09:30:00-05:00 2000-01-01 09:35:00-05:00
+            ```
+        :param ts_col_name: column to use to filter the intervals (e.g.,
+            `start_datetime` or `end_datetime`)
+        :param column: column to use to compute the TWAP (e.g., `bid`, `ask`,
+            `price`)
+        :param left_close, right_close: type of the intervals, as in
+            `get_data_for_interval()`; the default (start, end] is the same as
+            in `get_twap_price()`
+        :return: TWAP prices indexed like `intervals`, with NaN for the
+            intervals without prices
+        """
+        hdbg.dassert_isinstance(intervals, pd.DataFrame)
+        hdbg.dassert_is_subset(
+            ["asset_id", "start_timestamp", "end_timestamp"], intervals.columns
+        )
+        twap_srs = pd.Series(np.nan, index=intervals.index, name=column)
+        if intervals.empty:
+            return twap_srs
+        asset_ids = sorted(intervals["asset_id"].unique().tolist())
+        self._dassert_valid_asset_ids(asset_ids)
+        start_timestamps = pd.DatetimeIndex(intervals["start_timestamp"])
+        end_timestamps = pd.DatetimeIndex(intervals["end_timestamp"])
+        if left_close and right_close:
+            hdbg.dassert((start_timestamps <= end_timestamps).all())
+        else:
+            hdbg.dassert((start_timestamps < end_timestamps).all())
+        # Get the data for all the intervals at once.
+        prices = self.get_data_for_interval(
+            start_timestamps.min(),
+            end_timestamps.max(),
+            ts_col_name,
+            asset_ids,
+            left_close=True,
+            right_close=True,
+            limit=None,
+            ignore_delay=ignore_delay,
+        )
+        # We don't need to remap columns since `get_data_for_interval()` has
+        # already done it.
+        hdbg.dassert_in(column, prices.columns)
+        if prices.empty:
+            return twap_srs
+        # The end timestamp is used as index of the data.
+        if ts_col_name == self._end_time_col_name:
+            timestamps = prices.index
+        else:
+            hdbg.dassert_in(ts_col_name, prices.columns)
+            timestamps = pd.DatetimeIndex(prices[ts_col_name])
+        # Compare the timestamps as UTC nanoseconds, independently of the
+        # timezone.
+        prices = pd.DataFrame(
+            {
+                "asset_id": prices[self._asset_id_col].to_numpy(),
+                "timestamp": timestamps.asi8,
+                "price": prices[column].to_numpy(dtype=float),
+            }
+        )
+        interval_asset_ids = intervals["asset_id"].to_numpy()
+        twap_values = twap_srs.to_numpy(copy=True)
+        for asset_id, asset_prices in prices.groupby("asset_id"):
+            asset_prices = asset_prices.sort_values("timestamp", kind="stable")
+            mask = interval_asset_ids == asset_id
+            twap_values[mask] = compute_twap_prices(
+                asset_prices["timestamp"].to_numpy(),
+                asset_prices[["price"]].to_numpy(),
+                start_timestamps.asi8[mask],
+                end_timestamps.asi8[mask],
+                left_close=left_close,
+                right_close=right_close,
+            )[:, 0]
+        twap_srs = pd.Series(twap_values, index=intervals.index, name=column)
+        return twap_srs
+
     # TODO(gp): When we want to evaluate a TWAP price in (a, b] we need to:
     #  1) wait until `MarketData` is updated
     #  2) assert that all the requested prices are actually available
@@ -647,6 +834,18 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
             _LOG.trace("-> ret=%s", ret)
         return ret
 
+    def notify_new_data(self) -> None:
+        """
+        Notify that new data is available.
+
+        Producers (e.g., the code writing bars to the DB) can call this to wake
+        up `wait_for_latest_data()` as soon as a new bar lands, instead of
+        waiting for the next poll after `sleep_in_secs`.
+        """
+        if self._new_data_event is None:
+            self._new_data_event = asyncio.Event()
+        self._new_data_event.set()
+
     async def wait_for_latest_data(
         self,
     ) -> Tuple[pd.Timestamp, pd.Timestamp, int]:
@@ -673,6 +872,10 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
         hprint.log_frame(_LOG, "Waiting on last bar ...")
         num_iter = 0
         while True:
+            if self._new_data_event is not None:
+                # Clear before checking, so that a notification arriving after
+                # the check wakes up the wait below.
+                self._new_data_event.clear()
             wall_clock_time = self.get_wall_clock_time()
             last_db_end_time = self.get_last_end_time()
             # TODO(gp): Cleanup. We should use the new hasynci.poll().
@@ -707,7 +910,7 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
             num_iter += 1
             if _TRACE:
                 _LOG.trace("Sleep for %s secs", self._sleep_in_secs)
-            await asyncio.sleep(self._sleep_in_secs)
+            await self._wait_for_new_data()
         if _TRACE:
             _LOG.trace(
                 "-> %s",
@@ -756,6 +959,20 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
             _LOG.trace("last_start_time=%s", last_start_time)
         return last_start_time
 
+    async def _wait_for_new_data(self) -> None:
+        """
+        Wait until new data is notified or for `sleep_in_secs` seconds.
+        """
+        if self._new_data_event is None:
+            await asyncio.sleep(self._sleep_in_secs)
+            return
+        try:
+            await asyncio.wait_for(
+                self._new_data_event.wait(), timeout=self._sleep_in_secs
+            )
+        except asyncio.TimeoutError:
+            pass
+
     # /////////////////////////////////////////////////////////////////////////////
     # Derived class interface.
     # /////////////////////////////////////////////////////////////////////////////
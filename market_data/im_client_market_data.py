@@ -5,7 +5,7 @@ import market_data.im_client_market_data as mdimcmada
 """
 
 import logging
-from typing import Any, List, Optional, cast
+from typing import Any, Dict, List, Optional, cast
 
 import pandas as pd
 
@@ -33,6 +33,11 @@ class ImClientMarketData(mdabmada.MarketData):
         super().__init__(*args, **kwargs)
         hdbg.dassert_isinstance(im_client, icdc.ImClient)
         self._im_client = im_client
+        # Map from full symbol to its last end timestamp, updated by
+        # `_get_last_end_time()`.
+        self._last_end_time_per_symbol: Dict[str, pd.Timestamp] = {}
+        # Wall clock time of the last update of the index above.
+        self._last_end_time_index_end_ts: Optional[pd.Timestamp] = None
 
     def get_last_price(
         self,
@@ -177,6 +182,72 @@ class ImClientMarketData(mdabmada.MarketData):
         )
         return market_data
 
+    def _update_last_end_time_per_symbol(
+        self, start_ts: pd.Timestamp, end_ts: pd.Timestamp
+    ) -> Dict[str, pd.Timestamp]:
+        """
+        Update the index storing the last end timestamp of each full symbol in
+        `[start_ts, end_ts)` and return it.
+
+        The index is kept across calls so that only the data that can change
+        it is read. Once every full symbol has data in the period, the data
+        before the oldest last end timestamp can't change the index, so the
+        read starts from there instead of from `start_ts`, i.e., it covers
+        about one bar instead of the entire period. A full symbol without data
+        in the period requires reading the entire period, like when the index
+        is empty.
+
+        The read is still needed since `ImClient` doesn't notify new data,
+        but it reads only the full symbol column and skips the normalization.
+        """
+        if (
+            self._last_end_time_index_end_ts is not None
+            and end_ts < self._last_end_time_index_end_ts
+        ):
+            # The clock went back, e.g., when replaying again, so the index
+            # can contain timestamps in the future.
+            self._last_end_time_per_symbol = {}
+        self._last_end_time_index_end_ts = end_ts
+        # Drop the full symbols without data in the period.
+        last_end_time_per_symbol = {
+            full_symbol: last_end_time
+            for full_symbol, last_end_time in self._last_end_time_per_symbol.items()
+            if last_end_time >= start_ts
+        }
+        if self._asset_ids is None:
+            full_symbols = self._im_client.get_universe()
+        else:
+            full_symbols = self._im_client.get_full_symbols_from_asset_ids(
+                self._asset_ids
+            )
+        ivcu.dassert_valid_full_symbols(full_symbols)
+        read_start_ts = start_ts
+        if set(full_symbols).issubset(last_end_time_per_symbol.keys()):
+            read_start_ts = max(start_ts, min(last_end_time_per_symbol.values()))
+        _LOG.debug(hprint.to_str("start_ts read_start_ts end_ts"))
+        full_symbol_col_name = self._im_client._get_full_symbol_col_name(None)
+        # Subtract one millisecond not to include the right boundary, like in
+        # `_get_data()`.
+        df = self._im_client.read_data(
+            full_symbols,
+            read_start_ts,
+            end_ts - pd.Timedelta(1, "ms"),
+            [full_symbol_col_name],
+            self._filter_data_mode,
+        )
+        if not df.empty:
+            max_ts_per_symbol = (
+                df.index.to_series()
+                .groupby(df[full_symbol_col_name].to_numpy())
+                .max()
+            )
+            for full_symbol, max_ts in max_ts_per_symbol.items():
+                last_end_time = last_end_time_per_symbol.get(full_symbol)
+                if last_end_time is None or max_ts > last_end_time:
+                    last_end_time_per_symbol[full_symbol] = max_ts
+        self._last_end_time_per_symbol = last_end_time_per_symbol
+        return last_end_time_per_symbol
+
     def _convert_data_for_normalization(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Convert data to format required by normalization in parent class.
@@ -218,14 +289,13 @@ class ImClientMarketData(mdabmada.MarketData):
         # `bar_length_in_minutes * 2`. In order not to complicate the interface
         #  use 15T (the longest bar length) * 2.
         timedelta = pd.Timedelta("30T")
-        df = self.get_data_for_last_period(timedelta)
-        _LOG.debug(
-            hpandas.df_to_str(
-                df, print_shape_info=True, tag="after get_data_for_last_period"
-            )
+        wall_clock_time = self.get_wall_clock_time()
+        start_ts = self._process_period(timedelta, wall_clock_time)
+        last_end_time_per_symbol = self._update_last_end_time_per_symbol(
+            start_ts, wall_clock_time
         )
-        if df.empty:
-            wall_clock_time = self.get_wall_clock_time()
+        _LOG.debug("latest timestamp per asset=%s", last_end_time_per_symbol)
+        if not last_end_time_per_symbol:
             _LOG.warning(
                 "No data found near wall_clock_time=%s", wall_clock_time
             )
@@ -241,18 +311,6 @@ class ImClientMarketData(mdabmada.MarketData):
             # We are looking for end timestamp that is present for all the assets.
             # In this case, it is 15:59 because at 16:00 the data is available
             # only for `asset1` and `asset3`.
-            df_max_ts_per_asset = (
-                df.reset_index()
-                .groupby(by=[self._asset_id_col])
-                .max()[self._end_time_col_name]
-            )
-            _LOG.debug(
-                hpandas.df_to_str(
-                    df_max_ts_per_asset,
-                    print_shape_info=True,
-                    tag="latest timestamp per asset",
-                )
-            )
-            ret = df_max_ts_per_asset.min()
+            ret = min(last_end_time_per_symbol.values())
         _LOG.debug("-> ret=%s", ret)
         return ret
@@ -120,54 +120,39 @@ class RealTimeMarketData(mdabmada.MarketData):
         Return the last `end_time` available in the DB.
         """
         # We assume that all the bars are inserted together in a single
-        # transaction, so we can check for the max timestamp.
-        # Get the latest `start_time` (which is an index) with a query like:
+        # transaction, so we can check for the last bar of a single asset.
+        # Get the latest `start_time` (which is an index) and the corresponding
+        # `end_time` with a single query like:
         #   ```
-        #   SELECT MAX(start_time)
+        #   SELECT start_time, end_time
         #     FROM bars_qa
         #     WHERE interval=60 AND region='AM' AND asset_id = '17085'
+        #     ORDER BY start_time DESC
+        #     LIMIT 1
         #   ```
+        # which is answered by reading the last entry of the index.
         query = []
-        query.append(f"SELECT MAX({self._start_time_col_name})")
+        query.append(
+            f"SELECT {self._start_time_col_name}, {self._end_time_col_name}"
+        )
         query.append(f"FROM {self._table_name}")
         query.append("WHERE")
         if self._where_clause:
             query.append(f"{self._where_clause} AND")
         query.append(f"{self._asset_id_col} = '{self._valid_id}'")
+        query.append(f"ORDER BY {self._start_time_col_name} DESC")
+        query.append("LIMIT 1")
         query = " ".join(query)
         # _LOG.debug("query=%s", query)
         df = hsql.execute_query_to_df(self.connection, query)
-        # Check that the `start_time` is a single value.
-        hdbg.dassert_eq(df.shape, (1, 1))
+        if df.empty:
+            # There is no data yet.
+            return None
+        # Check that the `start_time` and `end_time` are single values.
+        hdbg.dassert_eq(df.shape, (1, 2))
         start_time = df.iloc[0, 0]
-        # _LOG.debug("start_time from DB=%s", start_time)
-        # Get the `end_time` that corresponds to the last `start_time` with a
-        # query like:
-        #   ```
-        #   SELECT end_time
-        #     FROM bars_qa
-        #     WHERE interval=60 AND
-        #         region='AM' AND
-        #         start_time = '2021-10-07 15:50:00' AND
-        #         asset_id = '17085'
-        #   ```
-        query = []
-        query.append(f"SELECT {self._end_time_col_name}")
-        query.append(f"FROM {self._table_name}")
-        query.append("WHERE")
-        if self._where_clause:
-            query.append(f"{self._where_clause} AND")
-        query.append(
-            f"{self._start_time_col_name} = '{start_time}' AND "
-            + f"{self._asset_id_col} = '{self._valid_id}'"
-        )
-        query = " ".join(query)
-        # _LOG.debug("query=%s", query)
-        df = hsql.execute_query_to_df(self.connection, query)
-        # Check that the `end_time` is a single value.
-        hdbg.dassert_eq(df.shape, (1, 1))
-        end_time = df.iloc[0, 0]
-        # _LOG.debug("end_time from DB=%s", end_time)
+        end_time = df.iloc[0, 1]
+        # _LOG.debug("start_time end_time from DB=%s %s", start_time, end_time)
         # We know that it should be `end_time = start_time + 1 minute`.
         start_time = pd.Timestamp(start_time, tz="UTC")
         end_time = pd.Timestamp(end_time, tz="UTC")
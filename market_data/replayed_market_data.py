@@ -4,12 +4,14 @@ Import as:
 import market_data.replayed_market_data as mdremada
 """
 
+import datetime
 import logging
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
-import core.real_time as creatime
+import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hpandas as hpandas
 import helpers.hprint as hprint
@@ -78,10 +80,125 @@ class ReplayedMarketData(mdabmada.MarketData):
             self._df.sort_values(
                 [self._end_time_col_name, self._asset_id_col], inplace=True
             )
+        self._build_index()
+
+    def __str__(
+        self,
+        attr_names_to_skip: Optional[List[str]] = None,
+    ) -> str:
+        if attr_names_to_skip is None:
+            attr_names_to_skip = []
+        attr_names_to_skip.extend(self._get_index_attr_names())
+        return super().__str__(attr_names_to_skip=attr_names_to_skip)
+
+    def __repr__(
+        self,
+        attr_names_to_skip: Optional[List[str]] = None,
+    ) -> str:
+        if attr_names_to_skip is None:
+            attr_names_to_skip = []
+        attr_names_to_skip.extend(self._get_index_attr_names())
+        return super().__repr__(attr_names_to_skip=attr_names_to_skip)
 
     def should_be_online(self, wall_clock_time: pd.Timestamp) -> bool:
         return True
 
+    @staticmethod
+    def _get_index_attr_names() -> List[str]:
+        """
+        Return the names of the attributes derived from `self._df`.
+        """
+        return [
+            "_knowledge_times",
+            "_asset_id_to_positions",
+            "_df_asset_ids",
+            "_is_sorted_ts_col",
+            "_sorted_knowledge_times",
+            "_last_end_time_positions",
+        ]
+
+    def _build_index(self) -> None:
+        """
+        Build the indices used to answer queries without scanning `self._df`.
+
+        The data is static, so the indices are computed once:
+        - the set of asset ids in the data
+        - the positions of the rows of each asset in `self._df`
+        - the knowledge time of each row
+        - whether each timestamp column is sorted, computed lazily
+        - the position of the row with the max end time among the rows of
+          `self._asset_ids` known up to each knowledge time
+        """
+        hdbg.dassert_in(self._knowledge_datetime_col_name, self._df.columns)
+        # Store the knowledge times as nanoseconds (in UTC for tz-aware
+        # timestamps) to compare them with `pd.Timestamp.value`.
+        self._knowledge_times = (
+            pd.DatetimeIndex(self._df[self._knowledge_datetime_col_name])
+            .as_unit("ns")
+            .asi8
+        )
+        self._asset_id_to_positions: Dict[int, np.ndarray] = {}
+        if self._asset_id_col in self._df.columns:
+            # The positions of each asset are sorted in increasing order.
+            self._asset_id_to_positions = {
+                asset_id: np.sort(positions)
+                for asset_id, positions in self._df.groupby(
+                    self._asset_id_col, sort=False
+                ).indices.items()
+            }
+        self._df_asset_ids = set(self._asset_id_to_positions.keys())
+        # Map timestamp column name -> whether it is sorted.
+        self._is_sorted_ts_col: Dict[str, bool] = {}
+        self._build_last_end_time_index()
+
+    def _build_last_end_time_index(self) -> None:
+        """
+        Build the index used by `_get_last_end_time()`.
+
+        The rows of `self._asset_ids` are sorted by knowledge time, and for
+        each prefix we store the position in `self._df` of the row with the
+        max end time. The row with the max end time known at a given time is
+        then found with a binary search on the knowledge times.
+        """
+        if self._end_time_col_name not in self._df.columns:
+            self._sorted_knowledge_times = np.array([], dtype=np.int64)
+            self._last_end_time_positions = np.array([], dtype=np.int64)
+            return
+        # Select the rows of the assets returned by `get_last_end_time()`.
+        if self._asset_ids is not None and self._asset_id_to_positions:
+            asset_positions = [
+                self._asset_id_to_positions[asset_id]
+                for asset_id in set(self._asset_ids)
+                if asset_id in self._asset_id_to_positions
+            ]
+            if asset_positions:
+                positions = np.concatenate(asset_positions)
+            else:
+                positions = np.array([], dtype=np.int64)
+        else:
+            positions = np.arange(self._df.shape[0])
+        # Sort the rows by knowledge time.
+        knowledge_times = self._knowledge_times[positions]
+        order = np.argsort(knowledge_times, kind="stable")
+        positions = positions[order]
+        self._sorted_knowledge_times = knowledge_times[order]
+        # Compute the running argmax of the end times. `NaT` is stored as the
+        # smallest int64, so it is never the max unless all the values are
+        # `NaT`.
+        end_times = (
+            pd.DatetimeIndex(self._df[self._end_time_col_name])
+            .as_unit("ns")
+            .asi8[positions]
+        )
+        if end_times.size == 0:
+            self._last_end_time_positions = positions
+            return
+        is_new_max = end_times == np.maximum.accumulate(end_times)
+        idxs = np.where(is_new_max, np.arange(end_times.size), 0)
+        self._last_end_time_positions = positions[
+            np.maximum.accumulate(idxs)
+        ]
+
     def _get_data(
         self,
         start_ts: pd.Timestamp,
@@ -105,65 +222,163 @@ class ReplayedMarketData(mdabmada.MarketData):
             delay_in_secs = 0
         else:
             delay_in_secs = self._delay_in_secs
-        # TODO(gp): This assertion seems very slow. Move this check in a
-        #  centralized place instead of calling it every time, if possible.
         if asset_ids is not None:
             # Make sure that the requested asset_ids are in the df at some point.
             # This avoids mistakes when mocking data for certain assets, but request
             # data for assets that don't exist, which can make us wait for data that
             # will never come.
-            hdbg.dassert_is_subset(
-                asset_ids, self._df[self._asset_id_col].unique()
-            )
-        # Filter the data by the current time.
+            hdbg.dassert_is_subset(asset_ids, self._df_asset_ids)
+        # Find the positions of the rows in the requested period.
+        if self._columns is not None:
+            hdbg.dassert_in(ts_col_name, self._columns)
+        hdbg.dassert_in(ts_col_name, self._df.columns)
+        positions = self._get_positions_in_period(
+            ts_col_name, start_ts, end_ts, left_close, right_close
+        )
+        # Handle `asset_ids`.
+        if asset_ids is not None:
+            positions = self._filter_positions_by_asset_ids(positions, asset_ids)
+        # Filter the data by the current time, i.e., keep only the rows with
+        # knowledge time before and including the current time minus the delay.
         wall_clock_time = self.get_wall_clock_time()
         if _TRACE:
             _LOG.trace(hprint.to_str("wall_clock_time"))
-        df_tmp = creatime.get_data_as_of_datetime(
-            self._df,
-            self._knowledge_datetime_col_name,
-            wall_clock_time,
-            delay_in_secs=delay_in_secs,
+        hdateti.dassert_tz_compatible_timestamp_with_df(
+            wall_clock_time, self._df, self._knowledge_datetime_col_name
         )
+        hdbg.dassert_lte(0, delay_in_secs)
+        datetime_eff = wall_clock_time - datetime.timedelta(seconds=delay_in_secs)
+        knowledge_times = self._knowledge_times[positions]
+        positions = positions[knowledge_times <= datetime_eff.value]
+        # Handle `limit`.
+        if limit:
+            hdbg.dassert_lte(1, limit)
+            positions = positions[:limit]
+        df_tmp = self._df.iloc[positions]
         # Handle `columns`.
         if self._columns is not None:
             hdbg.dassert_is_subset(self._columns, df_tmp.columns)
             df_tmp = df_tmp[self._columns]
-        # Handle `period`.
-        hdbg.dassert_in(ts_col_name, df_tmp.columns)
-        df_tmp = hpandas.trim_df(
-            df_tmp, ts_col_name, start_ts, end_ts, left_close, right_close
-        )
-        # Handle `asset_ids`
-        if _TRACE:
-            _LOG.trace("before df_tmp=\n%s", hpandas.df_to_str(df_tmp))
-        if asset_ids is not None:
-            hdbg.dassert_in(self._asset_id_col, df_tmp.columns)
-            mask = df_tmp[self._asset_id_col].isin(set(asset_ids))
-            df_tmp = df_tmp[mask]
-        if _TRACE:
-            _LOG.trace("after df_tmp=\n%s", hpandas.df_to_str(df_tmp))
-        # Handle `limit`.
-        if limit:
-            hdbg.dassert_lte(1, limit)
-            df_tmp = df_tmp.head(limit)
         if _TRACE:
             _LOG.trace("-> df_tmp=\n%s", hpandas.df_to_str(df_tmp))
         return df_tmp
 
+    def _get_positions_in_period(
+        self,
+        ts_col_name: str,
+        start_ts: Optional[pd.Timestamp],
+        end_ts: Optional[pd.Timestamp],
+        left_close: bool,
+        right_close: bool,
+    ) -> np.ndarray:
+        """
+        Return the sorted positions of the rows with `ts_col_name` in the
+        period.
+
+        Same semantics as `hpandas.trim_df()`, but using a binary search when
+        the column is sorted.
+        """
+        if ts_col_name not in self._is_sorted_ts_col:
+            self._is_sorted_ts_col[ts_col_name] = self._df[
+                ts_col_name
+            ].is_monotonic_increasing
+        num_rows = self._df.shape[0]
+        if self._is_sorted_ts_col[ts_col_name]:
+            values = self._df[ts_col_name]
+            left_idx = 0
+            if start_ts is not None:
+                side = "left" if left_close else "right"
+                left_idx = values.searchsorted(start_ts, side)
+            right_idx = num_rows
+            if end_ts is not None:
+                side = "right" if right_close else "left"
+                right_idx = values.searchsorted(end_ts, side)
+            positions = np.arange(left_idx, max(left_idx, right_idx))
+        else:
+            # Fall back to scanning the entire column.
+            df_tmp = pd.DataFrame(
+                {ts_col_name: self._df[ts_col_name].to_numpy()},
+            )
+            df_tmp = hpandas.trim_df(
+                df_tmp, ts_col_name, start_ts, end_ts, left_close, right_close
+            )
+            positions = np.sort(df_tmp.index.to_numpy())
+        return positions
+
+    def _filter_positions_by_asset_ids(
+        self, positions: np.ndarray, asset_ids: List[int]
+    ) -> np.ndarray:
+        """
+        Keep the positions corresponding to rows of `asset_ids`.
+
+        :param positions: sorted positions of rows
+        :return: sorted positions
+        """
+        if positions.size == 0:
+            return positions
+        is_contiguous = positions[-1] - positions[0] + 1 == positions.size
+        asset_positions = []
+        for asset_id in set(asset_ids):
+            positions_tmp = self._asset_id_to_positions[asset_id]
+            if is_contiguous:
+                # Slice the positions of the asset with a binary search.
+                left_idx, right_idx = np.searchsorted(
+                    positions_tmp, [positions[0], positions[-1]], side="left"
+                )
+                if (
+                    right_idx < positions_tmp.size
+                    and positions_tmp[right_idx] == positions[-1]
+                ):
+                    right_idx += 1
+                positions_tmp = positions_tmp[left_idx:right_idx]
+            else:
+                positions_tmp = np.intersect1d(
+                    positions_tmp, positions, assume_unique=True
+                )
+            asset_positions.append(positions_tmp)
+        positions = np.sort(np.concatenate(asset_positions))
+        return positions
+
     def _get_last_end_time(self) -> Optional[pd.Timestamp]:
-        # We need to find the last timestamp before the current time. We use
-        # `7W` but could also use all the data since we don't call the DB.
-        # TODO(gp): SELECT MAX(start_time) instead of getting all the data
-        #  and then find the max and use `start_time`
+        # We need to find the last timestamp before the current time, among
+        # the data with `start_time` in the last `7D`.
         timedelta = pd.Timedelta("7D")
+        wall_clock_time = self.get_wall_clock_time()
+        ret = None
+        if self._sorted_knowledge_times.size > 0:
+            hdateti.dassert_tz_compatible_timestamp_with_df(
+                wall_clock_time, self._df, self._knowledge_datetime_col_name
+            )
+            datetime_eff = wall_clock_time - datetime.timedelta(
+                seconds=self._delay_in_secs
+            )
+            # Find the row with the max end time among the rows already known.
+            idx = np.searchsorted(
+                self._sorted_knowledge_times, datetime_eff.value, side="right"
+            )
+            if idx == 0:
+                # No data is available yet.
+                _LOG.debug("-> ret=%s", ret)
+                return ret
+            position = self._last_end_time_positions[idx - 1]
+            start_time = self._df[self._start_time_col_name].iloc[position]
+            end_time = self._df[self._end_time_col_name].iloc[position]
+            start_ts = self._process_period(timedelta, wall_clock_time)
+            if start_ts <= start_time < wall_clock_time and not pd.isna(
+                end_time
+            ):
+                # The row is in the period, so its end time is the max also
+                # among the rows in the period.
+                ret = end_time.tz_convert(self._timezone)
+                _LOG.debug("-> ret=%s", ret)
+                return ret
+        # Fall back to scanning the data in the period, e.g., when the last
+        # row is outside the period.
         df = self.get_data_for_last_period(timedelta)
         _LOG.debug(
             hpandas.df_to_str(df, print_shape_info=True, tag="after get_data")
         )
-        if df.empty:
-            ret = None
-        else:
+        if not df.empty:
             ret = df.index.max()
         _LOG.debug("-> ret=%s", ret)
         return ret
@@ -1049,6 +1049,50 @@ class TestImClientMarketData2(mdata.MarketData_get_data_TestCase):
         # Run.
         self._test_get_last_end_time1(market_data, exp_last_end_time)
 
+    def test_get_last_end_time2(self) -> None:
+        """
+        Check that the last end time computed incrementally while the clock
+        moves, also backwards, is the same as computing it from scratch.
+        """
+        # Prepare inputs.
+        asset_ids = [1467591036, 3303714233]
+        columns = None
+        column_remap = None
+        im_client = self.get_ImClient()
+        wall_clock_times = [
+            pd.Timestamp("2000-01-01T10:00:00-05:00"),
+            pd.Timestamp("2000-01-01T10:00:30-05:00"),
+            pd.Timestamp("2000-01-01T10:03:00-05:00"),
+            pd.Timestamp("2000-01-01T10:40:00-05:00"),
+            pd.Timestamp("2000-01-01T09:45:00-05:00"),
+            pd.Timestamp("2000-01-01T12:30:00-05:00"),
+        ]
+        curr_wall_clock_time = [wall_clock_times[0]]
+        market_data = mdata.ImClientMarketData(
+            "asset_id",
+            asset_ids,
+            "start_ts",
+            "end_ts",
+            columns,
+            lambda: curr_wall_clock_time[0],
+            im_client=im_client,
+            column_remap=column_remap,
+        )
+        # Run.
+        for wall_clock_time in wall_clock_times:
+            curr_wall_clock_time[0] = wall_clock_time
+            actual = market_data.get_last_end_time()
+            # Compute the expected value with a new object.
+            market_data_ref = mdata.get_HistoricalImClientMarketData_example1(
+                im_client,
+                asset_ids,
+                columns,
+                column_remap,
+                wall_clock_time=wall_clock_time,
+            )
+            expected = market_data_ref.get_last_end_time()
+            self.assertEqual(actual, expected)
+
     def test_get_last_price1(self) -> None:
         # Prepare inputs.
         asset_ids = [1467591036, 3303714233]
@@ -1,8 +1,11 @@
+import asyncio
 import logging
-from typing import Any, Callable, Tuple, Union
+from typing import Any, Callable, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+import core.real_time as creatime
 import helpers.hasyncio as hasynci
 import helpers.hdatetime as hdateti
 import helpers.hpandas as hpandas
@@ -733,3 +736,350 @@ class TestReplayedMarketData4(hunitest.TestCase):
                 event_loop=event_loop,
             )
         return start_time, end_time, num_iter
+
+
+# #############################################################################
+# TestReplayedMarketData5
+# #############################################################################
+
+
+class TestReplayedMarketData5(hunitest.TestCase):
+    """
+    Check `ReplayedMarketData._get_data()` against filtering the entire data.
+    """
+
+    @staticmethod
+    def get_expected_data(
+        market_data: mdremada.ReplayedMarketData,
+        start_ts: pd.Timestamp,
+        end_ts: pd.Timestamp,
+        ts_col_name: str,
+        asset_ids: Optional[List[int]],
+    ) -> pd.DataFrame:
+        """
+        Filter the data scanning the entire df.
+        """
+        df = creatime.get_data_as_of_datetime(
+            market_data._df,
+            market_data._knowledge_datetime_col_name,
+            market_data.get_wall_clock_time(),
+            delay_in_secs=market_data._delay_in_secs,
+        )
+        df = hpandas.trim_df(df, ts_col_name, start_ts, end_ts, True, False)
+        if asset_ids is not None:
+            df = df[df["asset_id"].isin(asset_ids)]
+        return df
+
+    def test1(self) -> None:
+        with hasynci.solipsism_context() as event_loop:
+            (market_data, _,) = mdmadaex.get_ReplayedTimeMarketData_example2(
+                event_loop,
+                pd.Timestamp("2000-01-01 09:30:00-05:00"),
+                pd.Timestamp("2000-01-01 10:29:00-05:00"),
+                # The current time is 10:00.
+                30,
+                [101, 202, 303],
+                delay_in_secs=10,
+            )
+            # Remove some rows of an asset so that the assets are not aligned.
+            df = market_data._df
+            market_data._df = df[
+                ~((df["asset_id"] == 202) & (df.index % 7 == 0))
+            ].reset_index(drop=True)
+            market_data._build_index()
+            intervals = [
+                ("2000-01-01 09:30:00-05:00", "2000-01-01 10:30:00-05:00"),
+                ("2000-01-01 09:35:00-05:00", "2000-01-01 09:45:00-05:00"),
+                ("2000-01-01 09:59:00-05:00", "2000-01-01 10:01:00-05:00"),
+                ("2000-01-01 10:05:00-05:00", "2000-01-01 10:10:00-05:00"),
+            ]
+            ts_col_names = ["start_datetime", "end_datetime", "timestamp_db"]
+            asset_ids_list = [None, [202], [101, 303]]
+            num_rows = 0
+            for start_ts, end_ts in intervals:
+                start_ts = pd.Timestamp(start_ts)
+                end_ts = pd.Timestamp(end_ts)
+                for ts_col_name in ts_col_names:
+                    for asset_ids in asset_ids_list:
+                        actual = market_data._get_data(
+                            start_ts,
+                            end_ts,
+                            ts_col_name,
+                            asset_ids,
+                            left_close=True,
+                            right_close=False,
+                            limit=None,
+                            ignore_delay=False,
+                        )
+                        expected = self.get_expected_data(
+                            market_data, start_ts, end_ts, ts_col_name, asset_ids
+                        )
+                        self.assert_equal(
+                            hpandas.df_to_str(actual, num_rows=None),
+                            hpandas.df_to_str(expected, num_rows=None),
+                        )
+                        num_rows += actual.shape[0]
+        # Make sure that the queries are not trivial.
+        self.assertGreater(num_rows, 0)
+
+
+# #############################################################################
+# TestReplayedMarketData6
+# #############################################################################
+
+
+class TestReplayedMarketData6(hunitest.TestCase):
+    """
+    Check `ReplayedMarketData.get_last_end_time()` against scanning the data.
+    """
+
+    @staticmethod
+    def get_expected_last_end_time(
+        market_data: mdremada.ReplayedMarketData,
+    ) -> Optional[pd.Timestamp]:
+        """
+        Compute the last end time from the data in the last period.
+        """
+        df = market_data.get_data_for_last_period(pd.Timedelta("7D"))
+        if df.empty:
+            return None
+        return df.index.max()
+
+    def check_last_end_time(
+        self, market_data: mdremada.ReplayedMarketData
+    ) -> int:
+        """
+        Compare `get_last_end_time()` and the expected value advancing the time.
+
+        :return: number of times the last end time is not `None`
+        """
+        num_not_none = 0
+        for _ in range(8):
+            actual = market_data.get_last_end_time()
+            expected = self.get_expected_last_end_time(market_data)
+            self.assertEqual(actual, expected)
+            num_not_none += actual is not None
+            # Advance the replayed time by 10 minutes.
+            hasynci.run(
+                asyncio.sleep(10 * 60),
+                event_loop=self._event_loop,
+                close_event_loop=False,
+            )
+        return num_not_none
+
+    def test1(self) -> None:
+        """
+        Check all the assets with assets that are not aligned.
+        """
+        num_not_none = self._run([101, 202, 303])
+        self.assertGreater(num_not_none, 0)
+
+    def test2(self) -> None:
+        """
+        Check a subset of the assets in the data.
+        """
+        num_not_none = self._run([202])
+        self.assertGreater(num_not_none, 0)
+
+    def _run(self, asset_ids: List[int]) -> int:
+        with hasynci.solipsism_context() as event_loop:
+            self._event_loop = event_loop
+            (market_data, _,) = mdmadaex.get_ReplayedTimeMarketData_example2(
+                event_loop,
+                pd.Timestamp("2000-01-01 09:30:00-05:00"),
+                pd.Timestamp("2000-01-01 10:29:00-05:00"),
+                # The current time is 09:25, before the data starts.
+                -5,
+                [101, 202, 303],
+                delay_in_secs=10,
+            )
+            # Remove the last rows of an asset so that the assets are not
+            # aligned.
+            df = market_data._df
+            last_end_time = df["end_datetime"].iloc[-40]
+            market_data._df = df[
+                ~((df["asset_id"] == 303) & (df["end_datetime"] > last_end_time))
+            ].reset_index(drop=True)
+            market_data._asset_ids = asset_ids
+            market_data._build_index()
+            num_not_none = self.check_last_end_time(market_data)
+        return num_not_none
+
+
+# #############################################################################
+# TestReplayedMarketData7
+# #############################################################################
+
+
+class TestReplayedMarketData7(hunitest.TestCase):
+    """
+    Test `MarketData.wait_for_latest_data()` with new data notifications.
+    """
+
+    def test1(self) -> None:
+        """
+        Check that a notification wakes up the poller before `sleep_in_secs`.
+        """
+        with hasynci.solipsism_context() as event_loop:
+            (market_data, _,) = mdmadaex.get_ReplayedTimeMarketData_example4(
+                event_loop,
+                # Replay data starting at `2000-01-03 09:32:00-05:00`.
+                replayed_delay_in_mins_or_timestamp=1,
+                start_datetime=pd.Timestamp(
+                    "2000-01-03 09:31:00-05:00", tz="America/New_York"
+                ),
+                end_datetime=pd.Timestamp(
+                    "2000-01-03 09:31:00-05:00", tz="America/New_York"
+                ),
+                asset_ids=[101, 202, 303],
+            )
+            current_timestamp = market_data.get_wall_clock_time()
+            bar_duration_in_secs = 60
+            hdateti.set_current_bar_timestamp(
+                current_timestamp, bar_duration_in_secs
+            )
+
+            async def _notify() -> None:
+                # The bar is written in the DB at `09:31:10`.
+                await asyncio.sleep(15)
+                market_data.notify_new_data()
+
+            # Enable the notifications.
+            market_data.notify_new_data()
+            coroutines = [market_data.wait_for_latest_data(), _notify()]
+            (start_time, end_time, num_iter), _ = hasynci.run(
+                asyncio.gather(*coroutines),
+                event_loop=event_loop,
+            )
+        # Check.
+        expected_start_time = pd.Timestamp(
+            "2000-01-03 09:31:00-05:00", tz="America/New_York"
+        )
+        self.assertEqual(start_time, expected_start_time)
+        # Without the notification, the poller would wake up at `09:31:30`.
+        expected_end_time = pd.Timestamp(
+            "2000-01-03 09:31:15-05:00", tz="America/New_York"
+        )
+        self.assertEqual(end_time, expected_end_time)
+        #
+        expected_num_iter = 1
+        self.assertEqual(num_iter, expected_num_iter)
+
+
+# #############################################################################
+
+
+class TestReplayedMarketData8(hunitest.TestCase):
+    """
+    Test `get_twap_prices()`.
+    """
+
+    def test_get_twap_prices1(self) -> None:
+        """
+        Check that the TWAP prices of many intervals are the same as calling
+        `get_twap_price()` for each interval.
+        """
+        intervals = pd.DataFrame(
+            [
+                [101, "09:30:00", "09:35:00"],
+                [101, "09:35:00", "09:40:00"],
+                [101, "09:31:00", "09:32:00"],
+                [102, "09:30:00", "09:35:00"],
+                [102, "09:32:30", "09:38:10"],
+                [102, "09:40:00", "09:45:00"],
+            ],
+            columns=["asset_id", "start_timestamp", "end_timestamp"],
+        )
+        for col in ["start_timestamp", "end_timestamp"]:
+            intervals[col] = pd.to_datetime(
+                "2000-01-01 " + intervals[col]
+            ).dt.tz_localize("America/New_York")
+        ts_col_name = "end_datetime"
+        column = "midpoint"
+        with hasynci.solipsism_context() as event_loop:
+            market_data = self._get_market_data(event_loop)
+            actual = market_data.get_twap_prices(intervals, ts_col_name, column)
+            expected = []
+            for _, row in intervals.iterrows():
+                twap_df = market_data.get_twap_price(
+                    row["start_timestamp"],
+                    row["end_timestamp"],
+                    ts_col_name,
+                    [row["asset_id"]],
+                    column,
+                )
+                expected.append(twap_df[column].iloc[0])
+        expected = pd.Series(expected, index=intervals.index, name=column)
+        hpandas.dassert_approx_eq(actual, expected)
+
+    def test_get_twap_prices2(self) -> None:
+        """
+        Check the prices at given timestamps using closed-open intervals, like
+        `get_data_at_timestamp()`.
+
+        The intervals without data have a NaN price.
+        """
+        timestamps = pd.DatetimeIndex(
+            [
+                "2000-01-01 09:35:00",
+                "2000-01-01 09:36:00",
+                "2000-01-01 09:35:00",
+                # There is no data for this timestamp yet.
+                "2000-01-01 10:05:00",
+            ],
+            tz="America/New_York",
+        )
+        intervals = pd.DataFrame(
+            {
+                "asset_id": [101, 101, 102, 102],
+                "start_timestamp": timestamps - pd.Timedelta("1S"),
+                "end_timestamp": timestamps + pd.Timedelta("1S"),
+            }
+        )
+        ts_col_name = "end_datetime"
+        column = "midpoint"
+        with hasynci.solipsism_context() as event_loop:
+            market_data = self._get_market_data(event_loop)
+            actual = market_data.get_twap_prices(
+                intervals,
+                ts_col_name,
+                column,
+                left_close=True,
+                right_close=False,
+            )
+            expected = []
+            for timestamp, asset_id in zip(
+                timestamps[:-1], intervals["asset_id"].iloc[:-1]
+            ):
+                df = market_data.get_data_at_timestamp(
+                    timestamp, ts_col_name, [asset_id]
+                )
+                expected.append(df[column].iloc[0])
+        expected.append(np.nan)
+        expected = pd.Series(expected, index=intervals.index, name=column)
+        hpandas.dassert_approx_eq(actual, expected)
+        self.assertTrue(np.isnan(actual.iloc[-1]))
+
+    @staticmethod
+    def _get_market_data(
+        event_loop: asyncio.AbstractEventLoop,
+    ) -> mdremada.ReplayedMarketData:
+        """
+        Build a `ReplayedMarketData` with bars in [9:30, 10:00] and the current
+        time at 10:00.
+        """
+        start_datetime = pd.Timestamp(
+            "2000-01-01 09:30:00-05:00", tz="America/New_York"
+        )
+        end_datetime = pd.Timestamp(
+            "2000-01-01 10:00:00-05:00", tz="America/New_York"
+        )
+        asset_ids = [101, 102]
+        market_data, _ = mdmadaex.get_ReplayedTimeMarketData_example5(
+            event_loop,
+            start_datetime,
+            end_datetime,
+            asset_ids,
+            replayed_delay_in_mins_or_timestamp=end_datetime,
+        )
+        return market_data
@@ -80,67 +80,80 @@ def _extract_order_properties(
 
 def _get_price_per_share(
     market_data: mdata.MarketData,
-    start_timestamp: pd.Timestamp,
-    end_timestamp: pd.Timestamp,
+    orders: List[oordorde.Order],
     timestamp_col_name: str,
-    asset_ids: List[int],
     column: str,
     timing: str,
-) -> pd.DataFrame:
+) -> pd.Series:
     """
     Get the price corresponding to a certain column and timing (e.g., `start`,
-    `end`, `twap`).
+    `end`, `twap`) for each order.
+
+    The prices of all the orders are computed at once with
+    `MarketData.get_twap_prices()`, so that the data is retrieved only once
+    even if the orders have different intervals (e.g., child orders).
 
     :param timestamp_col_name: column to use to filter looking for start / end
         timestamp, typically the end of the interval `end_datetime`.
     :param column: column to use to compute the price
-    :return: a df, e.g.,
+    :return: a series indexed by order id, e.g.,
         ```
-                         price
-        asset_id
-        101             997.93
+        order_id
+        0           997.93
+        1           1001.41
+        Name: price, dtype: float64
         ```
     """
-    _LOG.debug(
-        hprint.to_str(
-            "start_timestamp end_timestamp timestamp_col_name"
-            " asset_ids column timing"
-        )
+    _LOG.debug(hprint.to_str("orders timestamp_col_name column timing"))
+    hdbg.dassert_isinstance(orders, List)
+    hdbg.dassert_lte(1, len(orders))
+    intervals = pd.DataFrame(
+        {
+            "asset_id": [order.asset_id for order in orders],
+            "start_timestamp": [order.start_timestamp for order in orders],
+            "end_timestamp": [order.end_timestamp for order in orders],
+        },
+        index=pd.Index([order.order_id for order in orders], name="order_id"),
     )
-    hdbg.dassert_isinstance(asset_ids, List)
-    if timing == "start":
-        # Align to the nearest bar, `MarketData` works with 1-minute OHLCV bars.
-        # `start_timestamp` is typically equal to the bar start timestamp plus
-        # the DAG execution time (e.g., 09:40:10 when we submit an order at 9:40,
-        # after 10 seconds computation). We need to round the timestamp down to
-        # the closest bar, since `MarketData` currently works on 1 min grid.
-        # TODO(Grisha): remove the 1 minute bar length assumption, `MarketData`
-        # should know bar length internally.
-        # TODO(Grisha): unclear if we should round here or delegate it to
-        # `MarketData`.
-        bar_duration_in_secs = 60
-        # Allow order generation to take some time. E.g., a bar starts at
-        # 08:15:00 and orders are generated at 08:15:20, then it is okay that
-        # there is a 20 seconds distance between the order creation timestamp
-        # and bar start timestamp. But ensure that it does not spill over in
-        # the next minute.
-        max_distance_in_secs = 60
-        # Round down to the last bar, because rounding up leads to future
-        # peeking. E.g., at 16:45:45 use prices that correspond to 16:45:00.
-        mode = "floor"
-        start_timestamp = hdateti.find_bar_timestamp(
-            start_timestamp,
-            bar_duration_in_secs,
-            mode=mode,
-            max_distance_in_secs=max_distance_in_secs,
-        )
-        prices_df = market_data.get_data_at_timestamp(
-            start_timestamp, timestamp_col_name, asset_ids
-        )
-    elif timing == "end":
-        prices_df = market_data.get_data_at_timestamp(
-            end_timestamp, timestamp_col_name, asset_ids
-        )
+    if timing in ("start", "end"):
+        if timing == "start":
+            # Align to the nearest bar, `MarketData` works with 1-minute OHLCV
+            # bars. `start_timestamp` is typically equal to the bar start
+            # timestamp plus the DAG execution time (e.g., 09:40:10 when we
+            # submit an order at 9:40, after 10 seconds computation). We need to
+            # round the timestamp down to the closest bar, since `MarketData`
+            # currently works on 1 min grid.
+            # TODO(Grisha): remove the 1 minute bar length assumption,
+            # `MarketData` should know bar length internally.
+            # TODO(Grisha): unclear if we should round here or delegate it to
+            # `MarketData`.
+            bar_duration_in_secs = 60
+            # Allow order generation to take some time. E.g., a bar starts at
+            # 08:15:00 and orders are generated at 08:15:20, then it is okay
+            # that there is a 20 seconds distance between the order creation
+            # timestamp and bar start timestamp. But ensure that it does not
+            # spill over in the next minute.
+            max_distance_in_secs = 60
+            # Round down to the last bar, because rounding up leads to future
+            # peeking. E.g., at 16:45:45 use prices that correspond to 16:45:00.
+            mode = "floor"
+            timestamps = intervals["start_timestamp"].map(
+                lambda timestamp: hdateti.find_bar_timestamp(
+                    timestamp,
+                    bar_duration_in_secs,
+                    mode=mode,
+                    max_distance_in_secs=max_distance_in_secs,
+                )
+            )
+        else:
+            timestamps = intervals["end_timestamp"]
+        # Get the data at each timestamp, like
+        # `MarketData.get_data_at_timestamp()`.
+        intervals["start_timestamp"] = timestamps - pd.Timedelta("1S")
+        intervals["end_timestamp"] = timestamps + pd.Timedelta("1S")
+        left_close = True
+        right_close = False
+        ignore_delay = False
     elif timing == "twap":
         # In simulation, for bar 9:35-9:40 we make the assumption that a TWAP
         # order covers an interval (a, b] where a is the time where we actually
@@ -157,31 +170,23 @@ def _get_price_per_share(
         # to True.
         # See CmTask #3369 "Fix `Order.end_timestamp` and allow to ignore market
         # delay".
+        left_close = False
+        right_close = True
         ignore_delay = True
-        prices_df = market_data.get_twap_price(
-            start_timestamp,
-            end_timestamp,
-            timestamp_col_name,
-            asset_ids,
-            column,
-            ignore_delay=ignore_delay,
-        )
     else:
         raise ValueError(f"Invalid timing='{timing}'")
-    if _TRACE:
-        _LOG.trace("prices_df=\n%s", hpandas.df_to_str(prices_df, precision=2))
-    # prices_df looks like:
-    # ```
-    #                            asset_id            start_datetime   price
-    # end_datetime
-    # 2000-01-01 09:35:00-05:00       101 2000-01-01 09:30:00-05:00  997.93
-    # ```
-    prices_srs = market_data.to_price_series(prices_df, column)
+    prices_srs = market_data.get_twap_prices(
+        intervals,
+        timestamp_col_name,
+        column,
+        left_close=left_close,
+        right_close=right_close,
+        ignore_delay=ignore_delay,
+    )
     # Check output.
     if _TRACE:
         _LOG.trace("prices_srs=\n%s", hpandas.df_to_str(prices_srs, precision=2))
     hdbg.dassert_isinstance(prices_srs, pd.Series)
-    hdbg.dassert_is_not(prices_srs, None)
     hdbg.dassert(not prices_srs.isna().all(), "price_srs=%s", prices_srs)
     return prices_srs
 
@@ -193,22 +198,20 @@ def _get_execution_prices(
     # TODO(gp): Remove these defaults, if possible.
     timestamp_col: str = "end_datetime",
     column_remap: Optional[Dict[str, str]] = None,
-) -> pd.DataFrame:
+) -> pd.Series:
     """
     Get the simulated execution prices of a list of orders.
 
-    This method assumes that all orders in the list share a common:
-      - order type
-      - order start timestamp
-      - order end timestamp
+    This method assumes that all orders in the list share a common order
+    type, while they can have different start and end timestamps.
 
     :param column_remap: remap columns from `market_data` to the canonical
         columns (e.g., "bid", "ask", "price", "midpoint")
-    :return: a df, e.g.,
+    :return: a series indexed by order id, e.g.,
         ```
-                         price
-        asset_id
-        101             997.93
+        order_id
+        0           997.93
+        Name: price, dtype: float64
         ```
     """
     _LOG.debug(hprint.to_str("orders"))
@@ -216,17 +219,13 @@ def _get_execution_prices(
     if column_remap is None:
         column_remap = {col_name: col_name for col_name in needed_columns}
     hdbg.dassert_set_eq(column_remap.keys(), needed_columns)
-    # Extract the property of the orders.
-    (
-        order_type,
-        start_timestamp,
-        end_timestamp,
-        asset_ids,
-    ) = _extract_order_properties(orders)
+    # Extract the order type.
+    hdbg.dassert(orders)
+    order_types = {order.type_ for order in orders}
+    hdbg.dassert_eq(len(order_types), 1)
+    order_type = order_types.pop()
     # Parse the order type.
-    _LOG.debug(
-        hprint.to_str("order_type start_timestamp end_timestamp asset_ids")
-    )
+    _LOG.debug(hprint.to_str("order_type"))
     config = order_type.split("@")
     hdbg.dassert_eq(len(config), 2, "Invalid type_='%s'", order_type)
     price_type, timing = config
@@ -235,10 +234,8 @@ def _get_execution_prices(
         column = column_remap[price_type]
         prices = _get_price_per_share(
             market_data,
-            start_timestamp,
-            end_timestamp,
+            orders,
             timestamp_col,
-            asset_ids,
             column,
             timing,
         )
@@ -249,30 +246,22 @@ def _get_execution_prices(
         bid_col = column_remap["bid"]
         bids = _get_price_per_share(
             market_data,
-            start_timestamp,
-            end_timestamp,
+            orders,
             timestamp_col,
-            asset_ids,
             bid_col,
             timing,
         )
         ask_col = column_remap["ask"]
         asks = _get_price_per_share(
             market_data,
-            start_timestamp,
-            end_timestamp,
+            orders,
             timestamp_col,
-            asset_ids,
             ask_col,
             timing,
         )
-        is_buy = []
-        for order in orders:
-            if order.diff_num_shares >= 0:
-                is_buy.append(True)
-            else:
-                is_buy.append(False)
-        is_buy = pd.Series(is_buy, bids.index)
+        is_buy = pd.Series(
+            [order.diff_num_shares >= 0 for order in orders], bids.index
+        )
         is_sell = ~is_buy
         # If perc == 0, we buy at the bid and sell at the ask (we collect the
         # spread).
@@ -284,7 +273,6 @@ def _get_execution_prices(
         prices = is_buy * buy_prices + is_sell * sell_prices
     else:
         raise ValueError(f"Invalid type='{order_type}'")
-    _LOG.debug(hprint.to_str("order_type start_timestamp end_timestamp"))
     #
     hdbg.dassert_isinstance(prices, pd.Series)
     if _TRACE:
@@ -420,14 +408,13 @@ def fill_orders_fully_at_once(
         timestamp_col=timestamp_col,
         column_remap=column_remap,
     )
+    hdbg.dassert_eq(len(prices), len(orders))
     fills = []
-    for order in orders:
+    for order, price in zip(orders, prices.to_numpy()):
         _LOG.debug(hprint.to_str("order"))
         # Extract the information from the order.
         end_timestamp = order.end_timestamp
         num_shares = order.diff_num_shares
-        hdbg.dassert_in(order.asset_id, prices.index)
-        price = prices[order.asset_id]
         if not np.isfinite(price):
             _LOG.warning("Unable to fill order=\n%s", order)
             continue
@@ -513,14 +500,12 @@ def fill_orders_fully_twap(
     )
     # Split the orders in child orders over the period of time.
     child_orders = _split_in_child_twap_orders(orders, freq_as_pd_string)
-    #
-    fills = []
-    for order in child_orders:
-        fills_tmp = fill_orders_fully_at_once(
-            market_data, timestamp_col, column_remap, [order]
-        )
-        hdbg.dassert_eq(len(fills_tmp), 1)
-        fills.append(fills_tmp[0])
+    # Fill all the child orders at once, so that the prices of all the child
+    # intervals are computed from a single data pull. The child orders whose
+    # interval has no prices are not filled.
+    fills = fill_orders_fully_at_once(
+        market_data, timestamp_col, column_remap, child_orders
+    )
     return fills
 
 
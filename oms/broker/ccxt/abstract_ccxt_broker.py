@@ -76,6 +76,8 @@ class AbstractCcxtBroker(obrobrok.Broker):
         max_order_cancel_retries: int = 2,
         bid_ask_raw_data_reader: Optional[imvcdcimrdc.RawDataReader] = None,
         bid_ask_lookback: str = "60S",
+        use_bid_ask_cache: bool = False,
+        bid_ask_cache_overlap: str = "10S",
         sanity_check_cached_open_positions: bool = False,
         **kwargs: Any,
     ) -> None:
@@ -97,6 +99,17 @@ class AbstractCcxtBroker(obrobrok.Broker):
         :param max_order_submit_retries: maximum number of attempts to submit
             an order if the first try is unsuccessful
         :param bid_ask_lookback: lookback period in pd.Timedelta-compatible string format, e.g. '10S'
+        :param use_bid_ask_cache: keep the bid / ask data of the lookback
+            period in memory and load from the DB only the data newer than
+            the last loaded timestamp
+            - it requires a reader that filters the data by timestamp (e.g.,
+              `RawDataReader` and not `ReplayDataReader`)
+        :param bid_ask_cache_overlap: period before the last cached timestamp
+            to load again when `use_bid_ask_cache=True`, in
+            pd.Timedelta-compatible string format, e.g. '10S'
+            - the data is filtered by the exchange timestamp, so it should be
+              longer than the max ingestion lag of the bid / ask data, to
+              load the rows stored after rows with a later timestamp
         :param sanity_check_cached_open_positions: compare cached open
             positions to the current value and raise if there is a mismatch
         :param *args: `obrobrok.Broker` positional arguments
@@ -174,6 +187,11 @@ class AbstractCcxtBroker(obrobrok.Broker):
                     are supported."
             )
         self.bid_ask_lookback = bid_ask_lookback
+        self._use_bid_ask_cache = use_bid_ask_cache
+        self._bid_ask_cache_overlap = bid_ask_cache_overlap
+        # Bid / ask data loaded in the lookback period, in the format returned
+        # by `RawDataReader.load_db_table()`, when `use_bid_ask_cache=True`.
+        self._bid_ask_cache: Optional[pd.DataFrame] = None
 
     # ////////////////////////////////////////////////////////////////////////
 
@@ -254,22 +272,12 @@ class AbstractCcxtBroker(obrobrok.Broker):
         end_timestamp = pd.Timestamp.utcnow()
         start_timestamp = end_timestamp - pd.Timedelta(self.bid_ask_lookback)
         # Load raw data.
-        bid_ask_data = self._bid_ask_raw_data_reader.load_db_table(
-            start_timestamp,
-            end_timestamp,
-            bid_ask_levels=[1],
-            # At this point we drop fully duplicated data entries.
-            deduplicate=True,
-            subset=[
-                "timestamp",
-                "currency_pair",
-                "bid_price",
-                "bid_size",
-                "ask_price",
-                "ask_size",
-                "level",
-            ],
-        )
+        if self._use_bid_ask_cache:
+            bid_ask_data = self._update_bid_ask_cache(
+                start_timestamp, end_timestamp
+            )
+        else:
+            bid_ask_data = self._load_bid_ask_data(start_timestamp, end_timestamp)
         self._logger.log_bid_ask_data(self._get_wall_clock_time, bid_ask_data)
         # Drop duplicates from the bid/ask data.
         # TODO(Grisha): pass `max_num_dups` via SystemConfig["broker_config"].
@@ -278,10 +286,16 @@ class AbstractCcxtBroker(obrobrok.Broker):
         )
         # Filter loaded data to only the broker's universe symbols.
         # Convert currency pairs to full CCXT symbol format, e.g. 'BTC_USDT' ->
-        # 'BTC/USDT:USDT'
-        bid_ask_data["ccxt_symbols"] = bid_ask_data["currency_pair"].apply(
-            imv2ccuti.convert_currency_pair_to_ccxt_format,
-            args=(self._exchange_id, self._contract_type),
+        # 'BTC/USDT:USDT'. Each currency pair is converted once.
+        currency_pairs = bid_ask_data["currency_pair"]
+        currency_pair_to_ccxt_symbol = {
+            currency_pair: imv2ccuti.convert_currency_pair_to_ccxt_format(
+                currency_pair, self._exchange_id, self._contract_type
+            )
+            for currency_pair in currency_pairs.unique()
+        }
+        bid_ask_data["ccxt_symbols"] = currency_pairs.map(
+            currency_pair_to_ccxt_symbol
         )
         # Map CCXT symbols to asset IDs.
         bid_ask_data = bid_ask_data.loc[
@@ -289,8 +303,8 @@ class AbstractCcxtBroker(obrobrok.Broker):
                 self.ccxt_symbol_to_asset_id_mapping
             )
         ]
-        bid_ask_data["asset_id"] = bid_ask_data["ccxt_symbols"].apply(
-            lambda x: self.ccxt_symbol_to_asset_id_mapping[x]
+        bid_ask_data["asset_id"] = bid_ask_data["ccxt_symbols"].map(
+            self.ccxt_symbol_to_asset_id_mapping
         )
         # When creating a set from a dictionary, only the keys are included
         # in the set by default.
@@ -302,12 +316,89 @@ class AbstractCcxtBroker(obrobrok.Broker):
         # Convert original index from unix epoch to Timestamp, e.g.
         # 1691758182667 ->
         #   pd.Timestamp('2023-08-11 12:50:01.987000+0000', tz='UTC')
-        bid_ask_data.index = bid_ask_data.index.to_series().apply(
-            lambda x: hdateti.convert_unix_epoch_to_timestamp(x)
+        bid_ask_data.index = pd.to_datetime(
+            bid_ask_data.index, unit="ms", utc=True
         )
         bid_ask_data = bid_ask_data.sort_index()
         return bid_ask_data
 
+    def _load_bid_ask_data(
+        self, start_timestamp: pd.Timestamp, end_timestamp: pd.Timestamp
+    ) -> pd.DataFrame:
+        """
+        Load level 1 bid / ask data in `[start_timestamp, end_timestamp]`.
+
+        :return: data indexed by unix epoch in ms, as returned by
+            `RawDataReader.load_db_table()`
+        """
+        bid_ask_data = self._bid_ask_raw_data_reader.load_db_table(
+            start_timestamp,
+            end_timestamp,
+            bid_ask_levels=[1],
+            # At this point we drop fully duplicated data entries.
+            deduplicate=True,
+            subset=[
+                "timestamp",
+                "currency_pair",
+                "bid_price",
+                "bid_size",
+                "ask_price",
+                "ask_size",
+                "level",
+            ],
+        )
+        return bid_ask_data
+
+    def _update_bid_ask_cache(
+        self, start_timestamp: pd.Timestamp, end_timestamp: pd.Timestamp
+    ) -> pd.DataFrame:
+        """
+        Load the bid / ask data newer than the cached one, minus the overlap
+        period, and evict the data older than `start_timestamp`.
+
+        :return: same as `_load_bid_ask_data()` for the entire period
+        """
+        start_epoch = hdateti.convert_timestamp_to_unix_epoch(start_timestamp)
+        cache = self._bid_ask_cache
+        if cache is not None:
+            cache = cache.loc[cache.index >= start_epoch]
+        if cache is None or cache.empty:
+            bid_ask_data = self._load_bid_ask_data(start_timestamp, end_timestamp)
+        else:
+            # Load again the data of the overlap period before the last cached
+            # timestamp, since the data for different symbols is stored with
+            # different latency and rows with a timestamp older than the last
+            # cached one might have been stored after it was loaded.
+            last_timestamp = hdateti.convert_unix_epoch_to_timestamp(
+                cache.index.max()
+            )
+            reload_start_timestamp = max(
+                start_timestamp,
+                last_timestamp - pd.Timedelta(self._bid_ask_cache_overlap),
+            )
+            new_bid_ask_data = self._load_bid_ask_data(
+                reload_start_timestamp, end_timestamp
+            )
+            bid_ask_data = pd.concat([cache, new_bid_ask_data])
+            # Drop the data loaded twice, like `load_db_table()` does with
+            # `deduplicate=True`.
+            subset = [
+                "currency_pair",
+                "bid_price_l1",
+                "bid_size_l1",
+                "ask_price_l1",
+                "ask_size_l1",
+            ]
+            is_duplicated = (
+                bid_ask_data[subset]
+                .assign(timestamp=bid_ask_data.index)
+                .duplicated()
+            )
+            bid_ask_data = bid_ask_data.loc[~is_duplicated]
+        self._bid_ask_cache = bid_ask_data
+        # Return a copy, since the caller modifies the data.
+        return bid_ask_data.copy()
+
     # ////////////////////////////////////////////////////////////////////////
 
     # TODO(gp): Can it be private?
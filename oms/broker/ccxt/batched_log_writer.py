@@ -0,0 +1,124 @@
+"""
+Import as:
+
+import oms.broker.ccxt.batched_log_writer as obcblowr
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Tuple
+
+import helpers.hdbg as hdbg
+import helpers.hio as hio
+import helpers.hthreading as hthread
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+# JSONL serialization
+# #############################################################################
+
+
+def to_jsonl_line(obj: Any) -> str:
+    """
+    Serialize an object into a single line of JSON, preserving its types.
+    """
+    import jsonpickle
+
+    # Without indentation the output is on a single line, since newlines inside
+    # strings are escaped.
+    line: str = jsonpickle.encode(obj)
+    return line
+
+
+def read_jsonl_lines(file_name: str) -> List[str]:
+    """
+    Read the lines of a JSONL file, each storing an object.
+
+    The last line is skipped if it is not terminated by a newline, e.g., if
+    the process crashed while writing it.
+
+    :param file_name: path to a file written by `BatchedJsonlWriter`
+    :return: lines in the order they were written
+    """
+    hdbg.dassert(
+        file_name.endswith(".jsonl"), "Invalid file_name='%s'", file_name
+    )
+    txt = hio.from_file(file_name)
+    txt, _, truncated_line = txt.rpartition("\n")
+    if truncated_line:
+        _LOG.warning(
+            "Skipping the truncated last line of '%s': '%s'",
+            file_name,
+            truncated_line,
+        )
+    lines = [line for line in txt.split("\n") if line]
+    return lines
+
+
+def from_jsonl(file_name: str) -> List[Any]:
+    """
+    Read the objects stored in a JSONL file, one per line.
+
+    :param file_name: same as in `read_jsonl_lines()`
+    :return: objects in the order they were written
+    """
+    import jsonpickle
+
+    lines = read_jsonl_lines(file_name)
+    objs = [jsonpickle.decode(line) for line in lines]
+    return objs
+
+
+# #############################################################################
+# BatchedJsonlWriter
+# #############################################################################
+
+
+class BatchedJsonlWriter(hthread.BackgroundWriter):
+    """
+    Append objects to JSONL files from a background thread.
+
+    The objects are serialized when they are appended, so that later changes
+    to them don't affect what is written, and then queued. The background
+    thread writes all the queued objects, opening each file once per batch.
+    """
+
+    def __init__(self, *, use_fsync: bool = False):
+        """
+        Constructor.
+
+        :param use_fsync: whether to sync each file to disk after writing a
+            batch, so that the written objects survive a machine crash
+        """
+        self._use_fsync = use_fsync
+        super().__init__()
+
+    def append(self, file_name: str, obj: Any) -> None:
+        """
+        Queue an object to be appended to a JSONL file.
+
+        :param file_name: path to the file, which is created with its
+            enclosing dir, if needed
+        :param obj: object to append
+        """
+        hdbg.dassert(
+            file_name.endswith(".jsonl"), "Invalid file_name='%s'", file_name
+        )
+        line = to_jsonl_line(obj)
+        self._put((file_name, line))
+
+    def _write_items(self, items: List[Tuple[str, str]]) -> None:
+        lines_per_file: Dict[str, List[str]] = {}
+        for file_name, line in items:
+            lines_per_file.setdefault(file_name, []).append(line)
+        for file_name, lines in lines_per_file.items():
+            hio.create_enclosing_dir(file_name, incremental=True)
+            txt = "".join(line + "\n" for line in lines)
+            with open(file_name, "a") as f:
+                f.write(txt)
+                if self._use_fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            _LOG.debug("Appended %s lines to '%s'", len(lines), file_name)
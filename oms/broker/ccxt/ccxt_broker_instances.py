@@ -134,7 +134,12 @@ def get_CcxtBroker_prod_instance1(
     contract_type = "swap"
     portfolio_id = "ccxt_portfolio_1"
     # Build logger.
-    logger = obcccclo.CcxtLogger(log_dir, mode="write")
+    # Write the logs of child orders from a background thread, so that they
+    # don't block submitting the orders, and sync them to disk, so that the
+    # written logs are not lost if the machine crashes.
+    logger = obcccclo.CcxtLogger(
+        log_dir, mode="write", use_batched_writer=True, use_fsync=True
+    )
     # Build ImClient.
     bid_ask_table = "ccxt_bid_ask_futures_raw"
     db_stage = stage
@@ -180,6 +185,9 @@ def get_CcxtBroker_prod_instance1(
         bid_ask_im_client=im_client,
         max_order_submit_retries=max_order_submit_retries,
         bid_ask_raw_data_reader=bid_ask_raw_data_reader,
+        # Load only the bid / ask data newer than the one loaded in the
+        # previous wave.
+        use_bid_ask_cache=True,
         log_dir=log_dir,
         sync_exchange=sync_exchange,
         async_exchange=async_exchange,
@@ -4,10 +4,13 @@ Import as:
 import oms.broker.ccxt.ccxt_logger as obcccclo
 """
 
+import itertools
 import logging
 import os
-from typing import Any, Callable, Dict, List, Optional, Union
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+import joblib
 import numpy as np
 import pandas as pd
 from tqdm.autonotebook import tqdm
@@ -16,8 +19,10 @@ import core.config as cconfig
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hio as hio
+import helpers.hparquet as hparque
 import helpers.hprint as hprint
 import helpers.hwall_clock_time as hwacltim
+import oms.broker.ccxt.batched_log_writer as obcblowr
 import oms.fill as omfill
 import oms.order.order as oordorde
 
@@ -107,8 +112,19 @@ class CcxtLogger:
     BALANCES = "balances"
     BROKER_CONFIG = "broker_config.json"
     ARGS_FILE = "args.json"
+    # Location of the Parquet files caching the content of the log dirs.
+    PARQUET_CACHE = "parquet_cache"
 
-    def __init__(self, log_dir: str, *, mode: str = "read"):
+    def __init__(
+        self,
+        log_dir: str,
+        *,
+        mode: str = "read",
+        use_batched_writer: bool = False,
+        use_fsync: bool = False,
+        num_workers: int = 1,
+        use_parquet_cache: bool = False,
+    ):
         """
         Constructor.
 
@@ -117,9 +133,34 @@ class CcxtLogger:
         :param mode: there are two modes:
             - write: the logger will write log files in `log_dir`
             - read: the logger will read log files from `log_dir`
+        :param use_batched_writer: whether to append the child orders, the
+            CCXT fills and trades, the positions, and the balances to one JSONL
+            file per bar and type of data, written from a background thread,
+            instead of writing one JSON file for each of them
+            - the child orders and the CCXT order responses are appended to
+              one JSONL file per bar and asset, so that they can be loaded by
+              asset
+            - the logs are complete only after calling `flush()` or `close()`,
+              which is done also when the interpreter exits
+        :param use_fsync: whether the batched writer syncs each file to disk
+            after writing a batch, so that the written logs survive a machine
+            crash
+        :param num_workers: number of processes reading the log files in
+            parallel
+        :param use_parquet_cache: whether to store the content of the log
+            files of each dir in a Parquet file under
+            `{log_dir}/parquet_cache`, which is read instead of the log files
+            that didn't change since the previous load
         """
         self._log_dir = log_dir
         hdbg.dassert_is_not(self._log_dir, None)
+        hdbg.dassert_lte(1, num_workers)
+        self._num_workers = num_workers
+        self._use_parquet_cache = use_parquet_cache
+        self._writer: Optional[obcblowr.BatchedJsonlWriter] = None
+        if use_batched_writer:
+            hdbg.dassert_eq(mode, "write")
+            self._writer = obcblowr.BatchedJsonlWriter(use_fsync=use_fsync)
         if mode == "read":
             fields = [
                 "args",
@@ -182,6 +223,20 @@ class CcxtLogger:
         file_path = os.path.join(self._log_dir, self.BROKER_CONFIG)
         hio.to_json(file_path, broker_configuration)
 
+    def flush(self) -> None:
+        """
+        Wait until all the logs are written, when using the batched writer.
+        """
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """
+        Write all the logs and stop the batched writer, if any.
+        """
+        if self._writer is not None:
+            self._writer.close()
+
     def log_child_order(
         self,
         get_wall_clock_time: Callable,
@@ -235,16 +290,20 @@ class CcxtLogger:
         )
         order_asset_id = logged_oms_child_order["asset_id"]
         # 1) Save OMS child orders.
-        incremental = True
         oms_order_log_dir = os.path.join(
             child_orders_log_dir, self.OMS_CHILD_ORDERS
         )
-        hio.create_dir(oms_order_log_dir, incremental)
         oms_order_file_name = (
             f"{order_asset_id}_{bar_timestamp}.{wall_clock_time_str}.json"
         )
-        oms_order_file_name = os.path.join(oms_order_log_dir, oms_order_file_name)
-        hio.to_json(oms_order_file_name, logged_oms_child_order, use_types=True)
+        oms_order_file_name = self._write_json(
+            oms_order_log_dir,
+            oms_order_file_name,
+            "oms_child_orders",
+            get_wall_clock_time,
+            logged_oms_child_order,
+            asset_id=order_asset_id,
+        )
         _LOG.debug(
             "Saved OMS child orders log file %s",
             hprint.to_str("oms_order_file_name"),
@@ -253,12 +312,17 @@ class CcxtLogger:
         ccxt_log_dir = os.path.join(
             child_orders_log_dir, self.CCXT_CHILD_ORDER_RESPONSE
         )
-        hio.create_dir(ccxt_log_dir, incremental)
         response_file_name = (
             f"{order_asset_id}_{bar_timestamp}.{wall_clock_time_str}.json"
         )
-        response_file_name = os.path.join(ccxt_log_dir, response_file_name)
-        hio.to_json(response_file_name, ccxt_child_order_response, use_types=True)
+        response_file_name = self._write_json(
+            ccxt_log_dir,
+            response_file_name,
+            "ccxt_child_order_responses",
+            get_wall_clock_time,
+            ccxt_child_order_response,
+            asset_id=order_asset_id,
+        )
         _LOG.debug(
             "Saved CCXT child order response log file %s",
             hprint.to_str("response_file_name"),
@@ -288,11 +352,14 @@ class CcxtLogger:
         # Save CCXT fills, e.g.,
         # log_dir/child_order_fills/ccxt_fills/ccxt_fills_20230511-114405.json
         timestamp_str = hdateti.timestamp_to_str(get_wall_clock_time())
-        ccxt_fills_file_name = os.path.join(
-            self._log_dir, self.CCXT_FILLS, f"ccxt_fills_{timestamp_str}.json"
+        ccxt_fills_file_name = self._write_json(
+            os.path.join(self._log_dir, self.CCXT_FILLS),
+            f"ccxt_fills_{timestamp_str}.json",
+            "ccxt_fills",
+            get_wall_clock_time,
+            ccxt_fills,
         )
         _LOG.debug(hprint.to_str("ccxt_fills_file_name"))
-        hio.to_json(ccxt_fills_file_name, ccxt_fills, use_types=True)
 
     def log_ccxt_trades(
         self,
@@ -315,13 +382,14 @@ class CcxtLogger:
         timestamp_str = hdateti.timestamp_to_str(wall_clock_time())
         # Save CCXT trades, e.g.,
         # log_dir/child_order_fills/ccxt_trades/ccxt_trades_20230511-114405.json
-        ccxt_trades_file_name = os.path.join(
-            self._log_dir,
-            self.CCXT_CHILD_ORDER_TRADES,
+        ccxt_trades_file_name = self._write_json(
+            os.path.join(self._log_dir, self.CCXT_CHILD_ORDER_TRADES),
             f"ccxt_trades_{timestamp_str}.json",
+            "ccxt_trades",
+            wall_clock_time,
+            ccxt_trades,
         )
         _LOG.debug(hprint.to_str("ccxt_trades_file_name"))
-        hio.to_json(ccxt_trades_file_name, ccxt_trades, use_types=True)
 
     def log_oms_fills(
         self, get_wall_clock_time: Callable, oms_fills: List[omfill.Fill]
@@ -635,6 +703,8 @@ class CcxtLogger:
         convert_to_dataframe: bool = False,
         abort_on_missing_data: bool = True,
         reduce_only: bool = False,
+        bar_timestamp: Optional[pd.Timestamp] = None,
+        asset_ids: Optional[List[int]] = None,
     ) -> Union[pd.DataFrame, List[Dict[str, Any]]]:
         """
         Load CCXT order responses from the JSON files in the log directory as
@@ -643,6 +713,8 @@ class CcxtLogger:
         :param convert_to_dataframe: same interface as `load_all_data()`.
         :param abort_on_missing_data: same interface as `load_all_data()`.
         :param reduce_only parameter if True, only reduce_only orders are loaded.
+        :param bar_timestamp: same interface as `_load_raw_data()`
+        :param asset_ids: same interface as `_load_raw_data()`
 
         The order response is a CCXT order structure, as described in
         https://docs.ccxt.com/#/?id=order-structure.
@@ -689,7 +761,9 @@ class CcxtLogger:
                 self._fatal_missing_data(data_key, abort_on_missing_data)
                 return []
             dir_name = self._ccxt_order_responses_dir
-        ccxt_order_responses = self._load_raw_data(dir_name)
+        ccxt_order_responses = self._load_raw_data(
+            dir_name, bar_timestamp=bar_timestamp, asset_ids=asset_ids
+        )
         if convert_to_dataframe:
             ccxt_order_responses = (
                 self._convert_ccxt_order_structures_to_dataframe(
@@ -749,6 +823,8 @@ class CcxtLogger:
         convert_to_dataframe: bool = False,
         abort_on_missing_data: bool = True,
         reduce_only: bool = False,
+        bar_timestamp: Optional[pd.Timestamp] = None,
+        asset_ids: Optional[List[int]] = None,
     ) -> Union[pd.DataFrame, List[Dict[str, Any]]]:
         """
         Load child orders from the JSON files in the log directory as Dict or
@@ -759,6 +835,8 @@ class CcxtLogger:
         :param convert_to_dataframe: same interface as `load_all_data()`.
         :param abort_on_missing_data: same interface as `load_all_data()`.
         :param reduce_only parameter if True, only reduce_only orders are loaded.
+        :param bar_timestamp: same interface as `_load_raw_data()`
+        :param asset_ids: same interface as `_load_raw_data()`
 
         Example of data returned as DataFrame:
         ```
@@ -802,7 +880,9 @@ class CcxtLogger:
                 self._fatal_missing_data(data_key, abort_on_missing_data)
                 return []
             dir_name = self._oms_child_orders_dir
-        child_orders = self._load_raw_data(dir_name)
+        child_orders = self._load_raw_data(
+            dir_name, bar_timestamp=bar_timestamp, asset_ids=asset_ids
+        )
         if convert_to_dataframe:
             child_orders = self._convert_oms_child_orders_to_dataframe(
                 child_orders,
@@ -1898,38 +1978,308 @@ class CcxtLogger:
         """
         # Generate file name based on the bar timestamp.
         wall_clock_time = hdateti.timestamp_to_str(get_wall_clock_time())
-        # Create enclosing dir.
-        log_filename = os.path.join(
-            self._log_dir,
-            dir_name,
+        log_filename = self._write_json(
+            os.path.join(self._log_dir, dir_name),
             f"{file_name_tag}.{wall_clock_time}.json",
+            file_name_tag,
+            get_wall_clock_time,
+            data,
         )
-        # Create enclosing dir.
-        hio.to_json(log_filename, data, use_types=True)
         _LOG.debug(hprint.to_str("log_filename"))
 
+    def _write_json(
+        self,
+        dir_name: str,
+        file_name: str,
+        segment_tag: str,
+        get_wall_clock_time: Callable,
+        data: Any,
+        *,
+        asset_id: Optional[int] = None,
+    ) -> str:
+        """
+        Write data to a JSON file or append it to the JSONL file of the bar.
+
+        When using the batched writer, the data is appended to a file like
+        `{dir_name}/{segment_tag}.{bar_timestamp}.jsonl`, or like
+        `{dir_name}/{asset_id}_{bar_timestamp}.{segment_tag}.jsonl` for the
+        data of an asset, otherwise it is written to `{dir_name}/{file_name}`.
+
+        :param get_wall_clock_time: retrieve the current wall clock time,
+            used instead of the bar timestamp when it is not set
+        :param asset_id: asset the data refers to, which is stored in the
+            name of the JSONL file like in the name of the JSON file
+            - `None` if the data doesn't refer to an asset
+        :return: path to the written file
+        """
+        if self._writer is None:
+            file_path = os.path.join(dir_name, file_name)
+            hio.to_json(file_path, data, use_types=True)
+        else:
+            bar_timestamp = hwacltim.get_current_bar_timestamp(
+                as_str=True, include_msec=True
+            )
+            if bar_timestamp is None:
+                bar_timestamp = hdateti.timestamp_to_str(get_wall_clock_time())
+            if asset_id is None:
+                segment_file_name = f"{segment_tag}.{bar_timestamp}.jsonl"
+            else:
+                segment_file_name = (
+                    f"{asset_id}_{bar_timestamp}.{segment_tag}.jsonl"
+                )
+            file_path = os.path.join(dir_name, segment_file_name)
+            self._writer.append(file_path, data)
+        return file_path
+
     def _load_raw_data(
         self,
         dir_name: str,
         *,
         append_list: bool = True,
+        bar_timestamp: Optional[pd.Timestamp] = None,
+        asset_ids: Optional[List[int]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Load raw data from the JSON files in the log directory.
 
         :param append_list: Set to True for DataFrame.extend() or False
             for DataFrame.append().
+        :param bar_timestamp: load only the data logged during this bar,
+            which is known for the child orders and for the data written by
+            the batched writer
+            - `None` to load the data of all the bars
+        :param asset_ids: load only the data of these assets, which are known
+            only for the child orders and for the order responses
+            - `None` to load the data of all the assets
         """
         files = self._get_files(dir_name)
+        if self._use_parquet_cache:
+            rows = self._load_rows_with_parquet_cache(dir_name, files)
+        else:
+            rows = pd.DataFrame(
+                self._read_files(files, decode=True, desc=dir_name),
+                columns=_LOG_FILE_ROW_COLUMNS + ["data"],
+            )
+        # Filter the data, before decoding it from the cache.
+        mask = pd.Series(True, index=rows.index)
+        if bar_timestamp is not None:
+            # Format the bar timestamp like in the file names.
+            bar_timestamp_str = hwacltim.to_timestamp_str(
+                bar_timestamp, include_msec=True
+            )
+            mask &= rows["bar_timestamp"] == bar_timestamp_str
+        if asset_ids is not None:
+            hdbg.dassert(
+                rows["asset_id"].notna().all(),
+                "Can't filter by asset the data in '%s' with unknown asset ids",
+                dir_name,
+            )
+            mask &= rows["asset_id"].isin(asset_ids)
+        rows = rows[mask]
+        if self._use_parquet_cache:
+            data = self._execute_in_parallel(
+                _decode_json_texts, rows["text"].tolist()
+            )
+        else:
+            data = rows["data"].tolist()
         data_list = []
-        for path in tqdm(files, desc=f"Loading '{dir_name}'"):
-            data = hio.from_json(path, use_types=True)
+        for file_data in data:
             if append_list:
-                data_list.append(data)
+                data_list.append(file_data)
             else:
-                data_list.extend(data)
+                data_list.extend(file_data)
         return data_list
 
+    def _read_files(
+        self, files: List[str], *, decode: bool, desc: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Read log files in parallel.
+
+        :param desc: description of the progress bar, when reading
+            sequentially
+        :return: same as `_read_log_files()`
+        """
+        if self._num_workers == 1:
+            rows = _read_log_files(files, decode=decode, desc=desc)
+        else:
+            rows = self._execute_in_parallel(
+                _read_log_files, files, decode=decode
+            )
+        return rows
+
+    def _execute_in_parallel(
+        self, func: Callable, items: List[Any], **kwargs: Any
+    ) -> List[Any]:
+        """
+        Apply a function to chunks of items in parallel.
+
+        :param func: function taking a list of items and returning a list of
+            results
+        :return: results of all the items in the same order of the items
+        """
+        num_chunks = min(self._num_workers, len(items))
+        if num_chunks <= 1:
+            return func(items, **kwargs)
+        chunks = [
+            chunk.tolist()
+            for chunk in np.array_split(np.array(items, dtype=object), num_chunks)
+        ]
+        results = joblib.Parallel(n_jobs=self._num_workers)(
+            joblib.delayed(func)(chunk, **kwargs) for chunk in chunks
+        )
+        return list(itertools.chain.from_iterable(results))
+
+    def _load_rows_with_parquet_cache(
+        self, dir_name: str, files: List[str]
+    ) -> pd.DataFrame:
+        """
+        Load the content of the log files from the Parquet cache of a dir.
+
+        The log files that are not in the cache or whose size changed (e.g.,
+        a JSONL file being appended to) are read and the cache is updated.
+
+        :return: one row for each JSON file and each line of a JSONL file with
+            the columns of `_read_log_files()` and the JSON text of the data
+        """
+        columns = _LOG_FILE_ROW_COLUMNS + ["text"]
+        rel_dir_name = os.path.relpath(dir_name, self._log_dir)
+        cache_file_name = os.path.join(
+            self._log_dir,
+            self.PARQUET_CACHE,
+            rel_dir_name.replace(os.sep, ".") + ".parquet",
+        )
+        if os.path.exists(cache_file_name):
+            cached_rows = hparque.from_parquet(cache_file_name)
+        else:
+            cached_rows = pd.DataFrame(columns=columns)
+        # Find the files to read.
+        file_sizes = pd.Series(
+            [os.path.getsize(file) for file in files],
+            index=[os.path.relpath(file, dir_name) for file in files],
+            dtype=int,
+        )
+        cached_file_sizes = cached_rows.groupby("file_name")["file_size"].first()
+        is_changed = file_sizes.ne(cached_file_sizes.reindex(file_sizes.index))
+        changed_files = file_sizes.index[is_changed].tolist()
+        is_stale = ~cached_rows["file_name"].isin(file_sizes.index[~is_changed])
+        if not changed_files and not is_stale.any():
+            _LOG.debug("Loaded '%s' from '%s'", dir_name, cache_file_name)
+            return cached_rows
+        _LOG.info(
+            "Updating '%s' with %s files", cache_file_name, len(changed_files)
+        )
+        new_rows = pd.DataFrame(
+            self._read_files(
+                [os.path.join(dir_name, file) for file in changed_files],
+                decode=False,
+                desc=dir_name,
+            ),
+            columns=columns,
+        )
+        new_rows["file_name"] = [
+            os.path.relpath(file, dir_name) for file in new_rows["file_name"]
+        ]
+        rows = pd.concat([cached_rows[~is_stale], new_rows], ignore_index=True)
+        # Keep the order of the files, and of the lines in each file.
+        rows = rows.sort_values("file_name", kind="stable", ignore_index=True)
+        rows["asset_id"] = rows["asset_id"].astype("Int64")
+        # Replace the cache, in case it is read concurrently.
+        tmp_cache_file_name = cache_file_name.replace(
+            ".parquet", f".tmp.{os.getpid()}.parquet"
+        )
+        try:
+            hio.create_enclosing_dir(cache_file_name, incremental=True)
+            hparque.to_parquet(rows, tmp_cache_file_name)
+            os.replace(tmp_cache_file_name, cache_file_name)
+        except OSError as e:
+            # E.g., the log dir is read-only.
+            _LOG.warning("Can't update '%s': %s", cache_file_name, e)
+        return rows
+
+
+# #############################################################################
+# Read log files
+# #############################################################################
+
+
+# Columns describing each JSON file and each line of a JSONL file.
+_LOG_FILE_ROW_COLUMNS = ["file_name", "file_size", "bar_timestamp", "asset_id"]
+# E.g., `8717633868_20230315_16350000.20230315_163537_825.json` for the
+# child orders and the order responses written one per file, and
+# `8717633868_20230315_16350000.oms_child_orders.jsonl` for the ones written
+# by the batched writer.
+_CHILD_ORDER_FILE_NAME_REGEX = re.compile(r"^(\d+)_(\d{8}_\d+)\.")
+# E.g., `balance.20230315_16350000.jsonl` for the rest of the data written by
+# the batched writer.
+_SEGMENT_FILE_NAME_REGEX = re.compile(r"\.(\d{8}_\d+)\.jsonl$")
+
+
+def _parse_log_file_name(file_name: str) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Get the bar timestamp and the asset id from the name of a log file.
+
+    :return: bar timestamp formatted as in the file name and asset id, or
+        `None` when they are not in the file name
+    """
+    base_name = os.path.basename(file_name)
+    match = _CHILD_ORDER_FILE_NAME_REGEX.match(base_name)
+    if match:
+        return match.group(2), int(match.group(1))
+    match = _SEGMENT_FILE_NAME_REGEX.search(base_name)
+    if match:
+        return match.group(1), None
+    return None, None
+
+
+def _read_log_files(
+    files: List[str], *, decode: bool, desc: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Read the data stored in JSON and JSONL log files.
+
+    :param files: paths to the files
+    :param decode: whether to return the data or its JSON text, e.g., to
+        decode it only after filtering
+    :param desc: description of the progress bar
+        - `None` to not show a progress bar
+    :return: one row for each JSON file and each line of a JSONL file with:
+        - `file_name`, `file_size`: path to the file and its size
+        - `bar_timestamp`, `asset_id`: from the file name, or `None`
+        - `data`: data stored in the file or in the line, if `decode`
+        - `text`: JSON text of the data, otherwise
+    """
+    rows = []
+    for file in tqdm(files, desc=f"Loading '{desc}'", disable=desc is None):
+        file_size = os.path.getsize(file)
+        if file.endswith(".jsonl"):
+            texts = obcblowr.read_jsonl_lines(file)
+        else:
+            # Same as `hio.from_json()`, since the log files have no comments.
+            texts = [hio.from_file(file)]
+        bar_timestamp, asset_id = _parse_log_file_name(file)
+        if decode:
+            values = _decode_json_texts(texts)
+        else:
+            values = texts
+        value_column = "data" if decode else "text"
+        for value in values:
+            row = {
+                "file_name": file,
+                "file_size": file_size,
+                "bar_timestamp": bar_timestamp,
+                "asset_id": asset_id,
+                value_column: value,
+            }
+            rows.append(row)
+    return rows
+
+
+def _decode_json_texts(texts: List[str]) -> List[Any]:
+    import jsonpickle
+
+    return [jsonpickle.decode(text) for text in texts]
+
 
 # #############################################################################
 # Config loading
@@ -17,6 +17,7 @@ import pandas as pd
 import pytest
 
 import helpers.hasyncio as hasynci
+import helpers.hdatetime as hdateti
 import helpers.hio as hio
 import helpers.hpandas as hpandas
 import helpers.hprint as hprint
@@ -773,6 +774,118 @@ class TestCcxtBroker_TestCase(hunitest.TestCase, abc.ABC):
         """
         self.assert_equal(actual, expected, fuzzy_match=True)
 
+    @umock.patch.object(
+        obcaccbr.AbstractCcxtBroker, "_build_asset_id_to_ccxt_symbol_mapping"
+    )
+    @umock.patch("oms.broker.ccxt.abstract_ccxt_broker.pd.Timestamp.utcnow")
+    def test_get_bid_ask_data_for_last_period2(
+        self,
+        mock_utcnow: umock.MagicMock,
+        mock_build_asset_id_to_ccxt_symbol_mapping: umock.MagicMock,
+    ) -> None:
+        """
+        Verify that the bid ask data returned using the cache is the same as
+        the data loaded for the entire period.
+        """
+        # Create the brokers.
+        mock_build_asset_id_to_ccxt_symbol_mapping.return_value = {
+            1467591036: "BTC/USDT",
+            1464553467: "ETH/USDT",
+        }
+        broker = self._get_local_test_broker(use_mock_data_reader=True)
+        cached_broker = self._get_local_test_broker(
+            use_mock_data_reader=True, use_bid_ask_cache=True
+        )
+        load_db_table = cached_broker._bid_ask_raw_data_reader.load_db_table
+        cached_broker._bid_ask_raw_data_reader.load_db_table = umock.MagicMock(
+            side_effect=load_db_table
+        )
+        # Load the data in overlapping periods and in a period after the
+        # lookback.
+        for timestamp in [
+            pd.Timestamp("2023-09-13 15:30:00", tz="UTC"),
+            pd.Timestamp("2023-09-13 15:30:10.500", tz="UTC"),
+            pd.Timestamp("2023-09-13 15:32:00", tz="UTC"),
+        ]:
+            mock_utcnow.return_value = timestamp
+            expected = broker.get_bid_ask_data_for_last_period()
+            actual = cached_broker.get_bid_ask_data_for_last_period()
+            # The order of the rows with the same timestamp is not defined.
+            expected = expected.set_index("asset_id", append=True).sort_index()
+            actual = actual.set_index("asset_id", append=True).sort_index()
+            self.assert_equal(
+                hpandas.df_to_str(actual, num_rows=None),
+                hpandas.df_to_str(expected, num_rows=None),
+            )
+        # Check the loaded periods.
+        load_db_table_mock = cached_broker._bid_ask_raw_data_reader.load_db_table
+        actual = "\n".join(
+            f"{call.args[0]} {call.args[1]}"
+            for call in load_db_table_mock.call_args_list
+        )
+        expected = r"""
+        2023-09-13 15:29:00+00:00 2023-09-13 15:30:00+00:00
+        2023-09-13 15:29:50+00:00 2023-09-13 15:30:10.500000+00:00
+        2023-09-13 15:31:00+00:00 2023-09-13 15:32:00+00:00
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    @umock.patch.object(
+        obcaccbr.AbstractCcxtBroker, "_build_asset_id_to_ccxt_symbol_mapping"
+    )
+    @umock.patch("oms.broker.ccxt.abstract_ccxt_broker.pd.Timestamp.utcnow")
+    def test_get_bid_ask_data_for_last_period3(
+        self,
+        mock_utcnow: umock.MagicMock,
+        mock_build_asset_id_to_ccxt_symbol_mapping: umock.MagicMock,
+    ) -> None:
+        """
+        Verify that the bid ask data returned using the cache contains the
+        rows stored after the rows with a later timestamp.
+        """
+        # Create the brokers.
+        mock_build_asset_id_to_ccxt_symbol_mapping.return_value = {
+            1467591036: "BTC/USDT",
+            1464553467: "ETH/USDT",
+        }
+        broker = self._get_local_test_broker(use_mock_data_reader=True)
+        cached_broker = self._get_local_test_broker(
+            use_mock_data_reader=True, use_bid_ask_cache=True
+        )
+        # Emulate the BTC data stored with a 2 seconds delay with respect to
+        # the ETH data.
+        is_late_data_stored = False
+        late_data_start_epoch = hdateti.convert_timestamp_to_unix_epoch(
+            pd.Timestamp("2023-09-13 15:29:58", tz="UTC")
+        )
+
+        def _load_db_table(*args: Any, **kwargs: Any) -> pd.DataFrame:
+            df = obcttcut._generate_raw_data_reader_bid_ask_data(*args, **kwargs)
+            if not is_late_data_stored:
+                is_late_data = (df["currency_pair"] == "BTC_USDT") & (
+                    df.index > late_data_start_epoch
+                )
+                df = df.loc[~is_late_data]
+            return df
+
+        for broker_ in [broker, cached_broker]:
+            broker_._bid_ask_raw_data_reader.load_db_table = _load_db_table
+        # Load the data before the BTC data is stored.
+        mock_utcnow.return_value = pd.Timestamp("2023-09-13 15:30:00", tz="UTC")
+        cached_broker.get_bid_ask_data_for_last_period()
+        # Load the data after the BTC data is stored.
+        is_late_data_stored = True
+        mock_utcnow.return_value = pd.Timestamp("2023-09-13 15:30:01", tz="UTC")
+        expected = broker.get_bid_ask_data_for_last_period()
+        actual = cached_broker.get_bid_ask_data_for_last_period()
+        # The order of the rows with the same timestamp is not defined.
+        expected = expected.set_index("asset_id", append=True).sort_index()
+        actual = actual.set_index("asset_id", append=True).sort_index()
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+
     def test_get_ccxt_trades(self) -> None:
         """
         Verify that the ccxt trades we get are correct.
@@ -1287,6 +1400,7 @@ class TestCcxtBroker_TestCase(hunitest.TestCase, abc.ABC):
         passivity_factor: float = 0.1,
         use_mock_data_reader: Optional[bool] = False,
         max_order_cancel_retries: int = 2,
+        use_bid_ask_cache: bool = False,
     ) -> obcaccbr.AbstractCcxtBroker:
         """
         Build the mocked `AbstractCcxtBroker` for unit testing.
@@ -1331,6 +1445,7 @@ class TestCcxtBroker_TestCase(hunitest.TestCase, abc.ABC):
             max_order_submit_retries=3,
             max_order_cancel_retries=max_order_cancel_retries,
             bid_ask_raw_data_reader=mock_data_reader,
+            use_bid_ask_cache=use_bid_ask_cache,
             sync_exchange=sync_exchange,
             async_exchange=async_exchange,
         )
@@ -1339,6 +1454,8 @@ class TestCcxtBroker_TestCase(hunitest.TestCase, abc.ABC):
     def _get_local_test_broker(
         self,
         use_mock_data_reader: Optional[bool] = False,
+        *,
+        use_bid_ask_cache: bool = False,
     ) -> obcaccbr.AbstractCcxtBroker:
         """
         Return a CCXT Broker for local testing.
@@ -1355,6 +1472,7 @@ class TestCcxtBroker_TestCase(hunitest.TestCase, abc.ABC):
             secret_id,
             bid_ask_im_client,
             use_mock_data_reader=use_mock_data_reader,
+            use_bid_ask_cache=use_bid_ask_cache,
         )
         return broker
 
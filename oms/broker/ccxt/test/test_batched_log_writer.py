@@ -0,0 +1,56 @@
+import os
+
+import pandas as pd
+
+import helpers.hio as hio
+import helpers.hunit_test as hunitest
+import oms.broker.ccxt.batched_log_writer as obcblowr
+
+
+# #############################################################################
+# TestBatchedJsonlWriter1
+# #############################################################################
+
+
+class TestBatchedJsonlWriter1(hunitest.TestCase):
+    def test_append1(self) -> None:
+        """
+        Verify that the appended objects are read back with their types.
+        """
+        scratch_dir = self.get_scratch_space()
+        file_name1 = os.path.join(scratch_dir, "dir1", "data1.jsonl")
+        file_name2 = os.path.join(scratch_dir, "dir2", "data2.jsonl")
+        writer = obcblowr.BatchedJsonlWriter()
+        objs = [
+            {"timestamp": pd.Timestamp("2022-08-05 10:36:00-04:00"), "id": 1},
+            [{"text": "a\nb", "price": float("nan")}],
+            {"id": 3},
+        ]
+        writer.append(file_name1, objs[0])
+        writer.append(file_name2, objs[1])
+        writer.append(file_name1, objs[2])
+        writer.flush()
+        # Check.
+        actual = str(obcblowr.from_jsonl(file_name1))
+        expected = str([objs[0], objs[2]])
+        self.assert_equal(actual, expected)
+        actual = str(obcblowr.from_jsonl(file_name2))
+        expected = str([objs[1]])
+        self.assert_equal(actual, expected)
+        # Check that the writer can't be used after closing it.
+        writer.close()
+        with self.assertRaises(AssertionError):
+            writer.append(file_name1, objs[0])
+
+    def test_from_jsonl1(self) -> None:
+        """
+        Verify that a truncated last line is skipped.
+        """
+        scratch_dir = self.get_scratch_space()
+        file_name = os.path.join(scratch_dir, "data.jsonl")
+        txt = '{"id": 1}\n{"id": 2}\n{"id": '
+        hio.to_file(file_name, txt)
+        # Check.
+        actual = str(obcblowr.from_jsonl(file_name))
+        expected = "[{'id': 1}, {'id': 2}]"
+        self.assert_equal(actual, expected)
@@ -387,6 +387,8 @@ class TestCcxtBroker(obccbteca.TestCcxtBroker_TestCase):
         self,
         use_mock_data_reader: Optional[bool] = False,
         max_order_cancel_retries: int = 3,
+        *,
+        use_bid_ask_cache: bool = False,
     ) -> obcaccbr.AbstractCcxtBroker:
         """
         Return a CCXT Broker for local testing.
@@ -406,6 +408,7 @@ class TestCcxtBroker(obccbteca.TestCcxtBroker_TestCase):
             passivity_factor=passivity_factor,
             use_mock_data_reader=use_mock_data_reader,
             max_order_cancel_retries=max_order_cancel_retries,
+            use_bid_ask_cache=use_bid_ask_cache,
         )
         return broker
 
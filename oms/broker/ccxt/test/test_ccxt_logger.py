@@ -14,7 +14,9 @@ import helpers.hpandas as hpandas
 import helpers.hprint as hprint
 import helpers.hsystem as hsystem
 import helpers.hunit_test as hunitest
+import helpers.hwall_clock_time as hwacltim
 import oms.broker.ccxt.abstract_ccxt_broker as obcaccbr
+import oms.broker.ccxt.batched_log_writer as obcblowr
 import oms.broker.ccxt.ccxt_logger as obcccclo
 import oms.fill as omfill
 import oms.order.order as oordorde
@@ -2792,6 +2794,261 @@ class TestCcxtLogger2(hunitest.TestCase):
         self.assert_equal(actual, expected_ccxt_order_response, fuzzy_match=True)
 
 
+def _log_test_data(
+    log_dir: str, *, use_batched_writer: bool, use_fsync: bool = False
+) -> None:
+    """
+    Log child orders and balances for 2 bars and CCXT fills and trades for
+    the first bar with `CcxtLogger`.
+
+    :param log_dir: the target directory to write into
+    :param use_batched_writer, use_fsync: same as in `CcxtLogger`
+    """
+    logger = obcccclo.CcxtLogger(
+        log_dir,
+        mode="write",
+        use_batched_writer=use_batched_writer,
+        use_fsync=use_fsync,
+    )
+    wall_clock_time = pd.Timestamp("2022-08-05 10:36:00-04:00")
+
+    def get_wall_clock_time() -> pd.Timestamp:
+        return wall_clock_time
+
+    hwacltim.reset_current_bar_timestamp()
+    try:
+        child_order_responses = _get_dummy_ccxt_child_order_responses()
+        # Asset ids corresponding to the responses.
+        asset_ids = [6051632686, 8717633868]
+        for bar_timestamp in [
+            pd.Timestamp("2022-08-05 10:36:00-04:00"),
+            pd.Timestamp("2022-08-05 10:37:00-04:00"),
+        ]:
+            hwacltim.set_current_bar_timestamp(bar_timestamp)
+            # Log a child order for each CCXT order response.
+            for asset_id, child_order_response in zip(
+                asset_ids, child_order_responses
+            ):
+                wall_clock_time += pd.Timedelta(seconds=1)
+                order_str = (
+                    "Order: order_id=0"
+                    f" creation_timestamp={wall_clock_time}"
+                    f" asset_id={asset_id} type_=limit"
+                    f" start_timestamp={wall_clock_time}"
+                    f" end_timestamp={bar_timestamp + pd.Timedelta('1T')}"
+                    " curr_num_shares=0.0 diff_num_shares=10.0 tz=UTC"
+                    " extra_params={}"
+                )
+                child_order = oordorde.orders_from_string(order_str)[0]
+                logger.log_child_order(
+                    get_wall_clock_time, child_order, child_order_response, {}
+                )
+            logger.log_balance(get_wall_clock_time, _get_dummy_ccxt_balance())
+            if bar_timestamp == pd.Timestamp("2022-08-05 10:36:00-04:00"):
+                logger.log_ccxt_fills(
+                    get_wall_clock_time, _get_dummy_ccxt_fills()[0]
+                )
+                logger.log_ccxt_trades(
+                    get_wall_clock_time, _get_dummy_ccxt_trades()[0]
+                )
+    finally:
+        hwacltim.reset_current_bar_timestamp()
+    logger.close()
+
+
+# #############################################################################
+# TestCcxtLogger3
+# #############################################################################
+
+
+class TestCcxtLogger3(hunitest.TestCase):
+    """
+    Check the logs written with the batched writer.
+    """
+
+    def test_batched_writer1(self) -> None:
+        """
+        Verify that the logs are written to one file per bar and type of data
+        and read back like the logs written to one file per call.
+
+        The child orders and the CCXT order responses are written to one file
+        per bar and asset.
+        """
+        scratch_dir = self.get_scratch_space()
+        log_dir = os.path.join(scratch_dir, "log")
+        _log_test_data(log_dir, use_batched_writer=False)
+        batched_log_dir = os.path.join(scratch_dir, "batched_log")
+        _log_test_data(batched_log_dir, use_batched_writer=True, use_fsync=True)
+        # Check the files.
+        cmd = f"cd {batched_log_dir} && find . -type f | sort"
+        _, actual = hsystem.system_to_string(cmd)
+        expected = r"""
+        ./balances/balance.20220805_10360000.jsonl
+        ./balances/balance.20220805_10370000.jsonl
+        ./ccxt_child_order_responses/6051632686_20220805_10360000.ccxt_child_order_responses.jsonl
+        ./ccxt_child_order_responses/6051632686_20220805_10370000.ccxt_child_order_responses.jsonl
+        ./ccxt_child_order_responses/8717633868_20220805_10360000.ccxt_child_order_responses.jsonl
+        ./ccxt_child_order_responses/8717633868_20220805_10370000.ccxt_child_order_responses.jsonl
+        ./child_order_fills/ccxt_fills/ccxt_fills.20220805_10360000.jsonl
+        ./child_order_fills/ccxt_trades/ccxt_trades.20220805_10360000.jsonl
+        ./oms_child_orders/6051632686_20220805_10360000.oms_child_orders.jsonl
+        ./oms_child_orders/6051632686_20220805_10370000.oms_child_orders.jsonl
+        ./oms_child_orders/8717633868_20220805_10360000.oms_child_orders.jsonl
+        ./oms_child_orders/8717633868_20220805_10370000.oms_child_orders.jsonl
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+        # Check that the logs are read in the same way. The files written one
+        # per call are sorted by asset, so we compare the sorted data.
+        reader = obcccclo.CcxtLogger(log_dir)
+        batched_reader = obcccclo.CcxtLogger(batched_log_dir)
+        for load_func_name in [
+            "load_oms_child_order",
+            "load_ccxt_order_response",
+            "load_ccxt_fills",
+            "load_ccxt_trades",
+            "load_balances",
+        ]:
+            expected = sorted(
+                pprint.pformat(data) for data in getattr(reader, load_func_name)()
+            )
+            actual = sorted(
+                pprint.pformat(data)
+                for data in getattr(batched_reader, load_func_name)()
+            )
+            self.assert_equal("\n".join(actual), "\n".join(expected))
+
+
+# #############################################################################
+# TestCcxtLogger4
+# #############################################################################
+
+
+class TestCcxtLogger4(hunitest.TestCase):
+    """
+    Check loading the logs in parallel and with the Parquet cache.
+    """
+
+    def test_load_all_data1(self) -> None:
+        """
+        Verify that the data is loaded like with the default reader.
+        """
+        target_dir = self.get_scratch_space()
+        _write_test_data(target_dir)
+        reader = obcccclo.CcxtLogger(target_dir)
+        expected = pprint.pformat(reader.load_all_data())
+        for num_workers, use_parquet_cache in [(2, False), (1, True), (2, True)]:
+            reader = obcccclo.CcxtLogger(
+                target_dir,
+                num_workers=num_workers,
+                use_parquet_cache=use_parquet_cache,
+            )
+            actual = pprint.pformat(reader.load_all_data())
+            self.assert_equal(actual, expected)
+        # Check the cache files.
+        cache_dir = os.path.join(target_dir, obcccclo.CcxtLogger.PARQUET_CACHE)
+        cmd = f"cd {cache_dir} && ls"
+        _, actual = hsystem.system_to_string(cmd)
+        expected = r"""
+        balances.parquet
+        ccxt_child_order_responses.parquet
+        child_order_fills.ccxt_fills.parquet
+        child_order_fills.ccxt_trades.parquet
+        child_order_fills.oms_fills.parquet
+        exchange_markets.parquet
+        leverage_info.parquet
+        oms_child_orders.parquet
+        positions.parquet
+        reduce_only.ccxt_child_order_responses.parquet
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_update_parquet_cache1(self) -> None:
+        """
+        Verify that the Parquet cache is updated when log files are added.
+        """
+        target_dir = self.get_scratch_space()
+        _log_test_data(target_dir, use_batched_writer=True)
+        reader = obcccclo.CcxtLogger(target_dir, use_parquet_cache=True)
+        self.assertEqual(len(reader.load_oms_child_order()), 4)
+        # Append a child order to a JSONL file and add a JSON file.
+        child_orders_dir = os.path.join(target_dir, reader.OMS_CHILD_ORDERS)
+        child_order = _get_dummy_oms_child_orders()[0]
+        writer = obcblowr.BatchedJsonlWriter()
+        writer.append(
+            os.path.join(
+                child_orders_dir,
+                "8717633868_20220805_10370000.oms_child_orders.jsonl",
+            ),
+            child_order,
+        )
+        writer.close()
+        hio.to_json(
+            os.path.join(
+                child_orders_dir, "20230315_123500.20230315_123538.json"
+            ),
+            child_order,
+            use_types=True,
+        )
+        # Check.
+        self.assertEqual(len(reader.load_oms_child_order()), 6)
+
+    def test_filter1(self) -> None:
+        """
+        Verify that the child orders and the CCXT order responses are filtered
+        by bar and by asset.
+        """
+        scratch_dir = self.get_scratch_space()
+        for use_batched_writer in [False, True]:
+            log_dir = os.path.join(
+                scratch_dir, f"use_batched_writer={use_batched_writer}"
+            )
+            _log_test_data(log_dir, use_batched_writer=use_batched_writer)
+            for use_parquet_cache in [False, True]:
+                reader = obcccclo.CcxtLogger(
+                    log_dir, use_parquet_cache=use_parquet_cache
+                )
+                # Filter by bar.
+                child_orders = reader.load_oms_child_order(
+                    bar_timestamp=pd.Timestamp("2022-08-05 10:37:00-04:00")
+                )
+                actual = self._get_creation_timestamps(child_orders)
+                expected = r"""
+                6051632686 2022-08-05 14:36:03+00:00
+                8717633868 2022-08-05 14:36:04+00:00
+                """
+                self.assert_equal(actual, expected, fuzzy_match=True)
+                # Filter by asset.
+                child_orders = reader.load_oms_child_order(asset_ids=[8717633868])
+                actual = self._get_creation_timestamps(child_orders)
+                expected = r"""
+                8717633868 2022-08-05 14:36:02+00:00
+                8717633868 2022-08-05 14:36:04+00:00
+                """
+                self.assert_equal(actual, expected, fuzzy_match=True)
+                # Filter the CCXT order responses, which have no asset id, by
+                # asset.
+                ccxt_order_responses = reader.load_ccxt_order_response(
+                    asset_ids=[8717633868]
+                )
+                actual = "\n".join(
+                    f"{response['id']} {response['symbol']}"
+                    for response in ccxt_order_responses
+                )
+                expected = r"""
+                14412582631 AVAX/USDT
+                14412582631 AVAX/USDT
+                """
+                self.assert_equal(actual, expected, fuzzy_match=True)
+
+    @staticmethod
+    def _get_creation_timestamps(child_orders: List[Dict[str, Any]]) -> str:
+        creation_timestamps = sorted(
+            f"{child_order['asset_id']} {child_order['creation_timestamp']}"
+            for child_order in child_orders
+        )
+        return "\n".join(creation_timestamps)
+
+
 @pytest.mark.skip("CMTask5079: Disabled due to obsolete data format.")
 class Test_read_rt_data1(hunitest.TestCase):
     """
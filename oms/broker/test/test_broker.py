@@ -1,3 +1,4 @@
+import io
 import logging
 from typing import List
 
@@ -344,3 +345,46 @@ class Test_fill_orders1(hunitest.TestCase):
         # There should be no difference.
         asset_ids = [101, 102]
         self.helper(asset_ids, order, mode, exp)
+
+    def test_fill_orders_fully_twap2(self) -> None:
+        """
+        Test that the child orders of an interval without prices are not
+        filled.
+        """
+        type_ = "price@twap"
+        start_timestamp = pd.Timestamp(
+            "2000-01-01 09:30:00-05:00", tz="America/New_York"
+        )
+        order = self.get_order_example(type_, start_timestamp)
+        # Build market data without the bars ending at 09:32 and 09:33.
+        txt = r"""
+        start_datetime,end_datetime,timestamp_db,asset_id,price
+        2000-01-01 09:30:00-05:00,2000-01-01 09:31:00-05:00,2000-01-01 09:31:01-05:00,101,998.93
+        2000-01-01 09:33:00-05:00,2000-01-01 09:34:00-05:00,2000-01-01 09:34:01-05:00,101,997.70
+        2000-01-01 09:34:00-05:00,2000-01-01 09:35:00-05:00,2000-01-01 09:35:01-05:00,101,997.425
+        """
+        df = pd.read_csv(
+            io.StringIO(hprint.dedent(txt)),
+            parse_dates=["start_datetime", "end_datetime", "timestamp_db"],
+        )
+        with hasynci.solipsism_context() as event_loop:
+            market_data, _ = mdata.get_ReplayedTimeMarketData_from_df(
+                event_loop,
+                pd.Timestamp("2000-01-01 09:40:00-05:00", tz="America/New_York"),
+                df,
+            )
+            fills = obrobrok.fill_orders_fully_twap(
+                market_data,
+                "end_datetime",
+                None,
+                [order],
+                freq_as_pd_string="1T",
+            )
+        # Check.
+        actual = "\n".join(str(fill) for fill in fills)
+        expected = r"""
+        Fill: asset_id=101 fill_id=0 timestamp=2000-01-01 09:31:00-05:00 num_shares=20.0 price=998.93
+        Fill: asset_id=101 fill_id=3 timestamp=2000-01-01 09:34:00-05:00 num_shares=20.0 price=997.7
+        Fill: asset_id=101 fill_id=4 timestamp=2000-01-01 09:35:00-05:00 num_shares=20.0 price=997.425
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
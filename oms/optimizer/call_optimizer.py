@@ -60,25 +60,9 @@ def compute_target_holdings_and_trades_notional(
     #
     predictions = df["prediction"].rename(0).to_frame().T
     volatility = df["volatility"].rename(0).to_frame().T
-    if style == "cross_sectional":
-        target_holdings_notional = (
-            cofinanc.compute_target_positions_cross_sectionally(
-                predictions,
-                volatility,
-                **kwargs,
-            )
-        )
-    elif style == "longitudinal":
-        target_holdings_notional = (
-            cofinanc.compute_target_positions_longitudinally(
-                predictions,
-                volatility,
-                spread=None,
-                **kwargs,
-            )
-        )
-    else:
-        raise ValueError("Unsupported `style`=%s", style)
+    target_holdings_notional = compute_target_holdings_notional(
+        predictions, volatility, style=style, **kwargs
+    )
     hdbg.dassert_eq(target_holdings_notional.shape[0], 1)
     target_holdings_notional = pd.Series(
         target_holdings_notional.values[0],
@@ -108,6 +92,43 @@ def compute_target_holdings_and_trades_notional(
     return df
 
 
+def compute_target_holdings_notional(
+    predictions: pd.DataFrame,
+    volatility: pd.DataFrame,
+    *,
+    style: str,
+    **kwargs: Dict[str, Any],
+) -> pd.DataFrame:
+    """
+    Compute target holdings (dollar-valued) from predictions.
+
+    :param predictions: predictions with one row per bar and one column per
+        asset
+    :param volatility: like `predictions`, but for volatility
+    :return: target holdings in dollars with the same shape as `predictions`
+    """
+    if style == "cross_sectional":
+        target_holdings_notional = (
+            cofinanc.compute_target_positions_cross_sectionally(
+                predictions,
+                volatility,
+                **kwargs,
+            )
+        )
+    elif style == "longitudinal":
+        target_holdings_notional = (
+            cofinanc.compute_target_positions_longitudinally(
+                predictions,
+                volatility,
+                spread=None,
+                **kwargs,
+            )
+        )
+    else:
+        raise ValueError("Unsupported `style`=%s", style)
+    return target_holdings_notional
+
+
 def convert_target_holdings_and_trades_to_shares_and_adjust_notional(
     df: pd.DataFrame,
     *,
@@ -191,11 +212,16 @@ def run_optimizer(
     df: pd.DataFrame,
     *,
     tmp_dir: str = "tmp.optimizer_stub",
+    in_process: bool = False,
 ) -> pd.DataFrame:
     """
-    Run the optimizer through Docker.
+    Run the optimizer in the current process or through Docker.
+
+    When running in process, the optimization problem is built once per
+    config and universe and then re-solved with warm start at each call,
+    which avoids starting a container and compiling a problem for each bar.
 
-    The flow is:
+    The Docker flow is:
        - Save the input data in a temp dir
        - Start an `opt` Docker container
        - Run the optimizer
@@ -203,7 +229,15 @@ def run_optimizer(
 
     :param tmp_dir: local dir to use to exchange parameters with the "remote"
         optimizer
+    :param in_process: whether to run the optimizer in the current process,
+        which requires `cvxpy`, instead of through Docker
     """
+    if in_process:
+        # Import the optimizer only when needed, since it requires `cvxpy`.
+        import optimizer.single_period_optimization as osipeopt
+
+        output_df = osipeopt.optimize(config, df, warm_start=True)
+        return output_df
     # Login in the Docker on AWS to pull the `opt` image.
     # TODO(Grisha): Move this inside the `opt_docker_cmd`.
     # TODO(Grisha): maybe move `docker_login` to the entrypoint?
@@ -9,6 +9,7 @@ import logging
 import re
 from typing import Any, Dict, List, Match, Optional, cast
 
+import numpy as np
 import pandas as pd
 
 import helpers.hdatetime as hdateti
@@ -71,25 +72,21 @@ class Order:
         if order_id is None:
             order_id = self._get_next_order_id()
         self.order_id = order_id
-        #
-        hdbg.dassert_isinstance(creation_timestamp, pd.Timestamp)
-        hdateti.dassert_has_tz(creation_timestamp)
+        if extra_params is None:
+            extra_params = {}
+        self._dassert_shared_params(
+            creation_timestamp,
+            type_,
+            start_timestamp,
+            end_timestamp,
+            extra_params,
+        )
         self.creation_timestamp = creation_timestamp
         # By convention, we use `asset_id = -1` for cash.
         hdbg.dassert_lte(0, asset_id)
         self.asset_id = asset_id
         self.type_ = type_
-        hdbg.dassert_lte(
-            creation_timestamp,
-            start_timestamp,
-            msg="An order should not start in the past",
-        )
         # The order is in [start_timestamp, end_timestamp).
-        hdbg.dassert_isinstance(start_timestamp, pd.Timestamp)
-        hdateti.dassert_has_tz(start_timestamp)
-        hdbg.dassert_isinstance(end_timestamp, pd.Timestamp)
-        hdateti.dassert_has_tz(end_timestamp)
-        hdbg.dassert_lt(start_timestamp, end_timestamp)
         self.start_timestamp = start_timestamp
         self.end_timestamp = end_timestamp
         # TODO(gp): Check for finite.
@@ -97,15 +94,9 @@ class Order:
         # TODO(gp): Check for finite.
         hdbg.dassert_ne(diff_num_shares, 0)
         self.diff_num_shares = float(diff_num_shares)
-        # Extract the timestamp.
-        hdateti.dassert_have_same_tz(creation_timestamp, start_timestamp)
-        hdateti.dassert_have_same_tz(creation_timestamp, end_timestamp)
         # TODO(gp): Why do we store the timezone?
         self.tz = creation_timestamp.tz
         # Auxiliary parameters.
-        if extra_params is None:
-            extra_params = {}
-        hdbg.dassert_isinstance(extra_params, dict)
         self.extra_params = extra_params
 
     # TODO(gp): Do not allow orders to be changed in place disabling setters, or
@@ -256,6 +247,68 @@ class Order:
 
     # //////////////////////////////////////////////////////////////////////////
 
+    @classmethod
+    def _from_checked_params(
+        cls,
+        order_id: int,
+        creation_timestamp: pd.Timestamp,
+        asset_id: int,
+        type_: str,
+        start_timestamp: pd.Timestamp,
+        end_timestamp: pd.Timestamp,
+        curr_num_shares: float,
+        diff_num_shares: float,
+        extra_params: Dict[str, Any],
+    ) -> "Order":
+        """
+        Build an order from params that have already been checked, e.g., with
+        vectorized operations for many orders at once.
+
+        Keep this in sync with `__init__()`.
+        """
+        order = cls.__new__(cls)
+        order.order_id = order_id
+        order.creation_timestamp = creation_timestamp
+        order.asset_id = asset_id
+        order.type_ = type_
+        order.start_timestamp = start_timestamp
+        order.end_timestamp = end_timestamp
+        order.curr_num_shares = curr_num_shares
+        order.diff_num_shares = diff_num_shares
+        order.tz = creation_timestamp.tz
+        order.extra_params = extra_params
+        return order
+
+    @staticmethod
+    def _dassert_shared_params(
+        creation_timestamp: pd.Timestamp,
+        type_: str,
+        start_timestamp: pd.Timestamp,
+        end_timestamp: pd.Timestamp,
+        extra_params: Dict[str, Any],
+    ) -> None:
+        """
+        Check the params that don't depend on the asset, which can be shared
+        by many orders.
+        """
+        hdbg.dassert_isinstance(creation_timestamp, pd.Timestamp)
+        hdateti.dassert_has_tz(creation_timestamp)
+        hdbg.dassert_isinstance(type_, str)
+        hdbg.dassert(type_, "Invalid type_='%s'", type_)
+        hdbg.dassert_lte(
+            creation_timestamp,
+            start_timestamp,
+            msg="An order should not start in the past",
+        )
+        hdbg.dassert_isinstance(start_timestamp, pd.Timestamp)
+        hdateti.dassert_has_tz(start_timestamp)
+        hdbg.dassert_isinstance(end_timestamp, pd.Timestamp)
+        hdateti.dassert_has_tz(end_timestamp)
+        hdbg.dassert_lt(start_timestamp, end_timestamp)
+        hdateti.dassert_have_same_tz(creation_timestamp, start_timestamp)
+        hdateti.dassert_have_same_tz(creation_timestamp, end_timestamp)
+        hdbg.dassert_isinstance(extra_params, dict)
+
     @staticmethod
     def _get_next_order_id() -> int:
         order_id = Order._order_id
@@ -301,6 +354,72 @@ def orders_from_string(txt: str) -> List[Order]:
     return orders
 
 
+def orders_from_arrays(
+    creation_timestamp: pd.Timestamp,
+    asset_ids: np.ndarray,
+    type_: str,
+    start_timestamp: pd.Timestamp,
+    end_timestamp: pd.Timestamp,
+    curr_num_shares: np.ndarray,
+    diff_num_shares: np.ndarray,
+) -> List[Order]:
+    """
+    Build orders with the same type and interval, one per asset.
+
+    The result is the same as building an `Order` for each element of the
+    arrays, but the params shared by all the orders are checked only once
+    and the arrays are checked with vectorized operations.
+
+    :param asset_ids: ids of the assets
+    :param curr_num_shares: the number of currently owned shares for each
+        asset
+    :param diff_num_shares: the number of shares to buy / sell for each
+        asset
+    :return: orders in the order of the arrays with consecutive ids
+    """
+    # Check the params shared by all the orders with the same checks as
+    # `Order.__init__()`.
+    Order._dassert_shared_params(
+        creation_timestamp, type_, start_timestamp, end_timestamp, {}
+    )
+    # Check the arrays, like `Order.__init__()` checks each element.
+    asset_ids = np.asarray(asset_ids)
+    curr_num_shares = np.asarray(curr_num_shares, dtype=float)
+    diff_num_shares = np.asarray(diff_num_shares, dtype=float)
+    hdbg.dassert_eq(len(asset_ids), len(curr_num_shares))
+    hdbg.dassert_eq(len(asset_ids), len(diff_num_shares))
+    # By convention, we use `asset_id = -1` for cash.
+    hdbg.dassert((asset_ids >= 0).all(), "Invalid asset_ids=%s", asset_ids)
+    hdbg.dassert(
+        (diff_num_shares != 0).all(),
+        "Invalid diff_num_shares=%s",
+        diff_num_shares,
+    )
+    # Reserve the order ids.
+    first_order_id = Order._order_id
+    Order._order_id += len(asset_ids)
+    # Build the orders without checking the params again.
+    orders: List[Order] = []
+    for idx, (asset_id, curr_num_shares_, diff_num_shares_) in enumerate(
+        zip(
+            asset_ids.tolist(), curr_num_shares.tolist(), diff_num_shares.tolist()
+        )
+    ):
+        order = Order._from_checked_params(
+            first_order_id + idx,
+            creation_timestamp,
+            asset_id,
+            type_,
+            start_timestamp,
+            end_timestamp,
+            curr_num_shares_,
+            diff_num_shares_,
+            {},
+        )
+        orders.append(order)
+    return orders
+
+
 # /////////////////////////////////////////////////////////////////////////////
 
 # TODO(gp): Likely obsolete since it is used only in oms/obsolete/pnl_simulator.py
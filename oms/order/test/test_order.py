@@ -1,5 +1,6 @@
 import logging
 
+import numpy as np
 import pandas as pd
 
 import helpers.hunit_test as hunitest
@@ -177,3 +178,125 @@ Order: order_id=0 creation_timestamp=2000-01-01 09:30:00-05:00 asset_id=101 type
         # Check.
         actual = oordorde.orders_to_string(orders, mode="repr")
         self.assert_equal(actual, exp, fuzzy_match=True)
+
+
+class TestOrdersFromArrays1(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check that the orders are the same as building them one by one.
+        """
+        creation_timestamp = pd.Timestamp(
+            "2000-01-01 09:30:00-05:00", tz="America/New_York"
+        )
+        type_ = "price@twap"
+        start_timestamp = pd.Timestamp(
+            "2000-01-01 09:35:00-05:00", tz="America/New_York"
+        )
+        end_timestamp = pd.Timestamp(
+            "2000-01-01 09:40:00-05:00", tz="America/New_York"
+        )
+        asset_ids = np.array([101, 202, 303])
+        curr_num_shares = np.array([0.0, 10.0, -5.0])
+        diff_num_shares = np.array([100.0, -10.0, 2.5])
+        # Build the orders one by one.
+        oordorde.Order._order_id = 0
+        expected_orders = [
+            oordorde.Order(
+                creation_timestamp,
+                asset_id,
+                type_,
+                start_timestamp,
+                end_timestamp,
+                curr_num_shares_,
+                diff_num_shares_,
+            )
+            for asset_id, curr_num_shares_, diff_num_shares_ in zip(
+                asset_ids.tolist(), curr_num_shares, diff_num_shares
+            )
+        ]
+        # Build the orders at once.
+        oordorde.Order._order_id = 0
+        orders = oordorde.orders_from_arrays(
+            creation_timestamp,
+            asset_ids,
+            type_,
+            start_timestamp,
+            end_timestamp,
+            curr_num_shares,
+            diff_num_shares,
+        )
+        self.assertEqual(oordorde.Order._order_id, 3)
+        oordorde.Order._order_id = 0
+        # Check.
+        self.assertEqual(
+            [order.to_dict() for order in orders],
+            [order.to_dict() for order in expected_orders],
+        )
+        actual = oordorde.orders_to_string(orders)
+        expected = r"""
+        Order: order_id=0 creation_timestamp=2000-01-01 09:30:00-05:00 asset_id=101 type_=price@twap start_timestamp=2000-01-01 09:35:00-05:00 end_timestamp=2000-01-01 09:40:00-05:00 curr_num_shares=0.0 diff_num_shares=100.0 tz=America/New_York extra_params={}
+        Order: order_id=1 creation_timestamp=2000-01-01 09:30:00-05:00 asset_id=202 type_=price@twap start_timestamp=2000-01-01 09:35:00-05:00 end_timestamp=2000-01-01 09:40:00-05:00 curr_num_shares=10.0 diff_num_shares=-10.0 tz=America/New_York extra_params={}
+        Order: order_id=2 creation_timestamp=2000-01-01 09:30:00-05:00 asset_id=303 type_=price@twap start_timestamp=2000-01-01 09:35:00-05:00 end_timestamp=2000-01-01 09:40:00-05:00 curr_num_shares=-5.0 diff_num_shares=2.5 tz=America/New_York extra_params={}
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test2(self) -> None:
+        """
+        Check that the params are validated like when building one order.
+        """
+        creation_timestamp = pd.Timestamp(
+            "2000-01-01 09:30:00-05:00", tz="America/New_York"
+        )
+        start_timestamp = pd.Timestamp(
+            "2000-01-01 09:35:00-05:00", tz="America/New_York"
+        )
+        end_timestamp = pd.Timestamp(
+            "2000-01-01 09:40:00-05:00", tz="America/New_York"
+        )
+        asset_ids = np.array([101, 202])
+        curr_num_shares = np.array([0.0, 10.0])
+        diff_num_shares = np.array([100.0, -10.0])
+        # Invalid type.
+        for type_ in [None, ""]:
+            with self.assertRaises(AssertionError):
+                oordorde.Order(
+                    creation_timestamp,
+                    101,
+                    type_,
+                    start_timestamp,
+                    end_timestamp,
+                    0.0,
+                    100.0,
+                )
+            with self.assertRaises(AssertionError):
+                oordorde.orders_from_arrays(
+                    creation_timestamp,
+                    asset_ids,
+                    type_,
+                    start_timestamp,
+                    end_timestamp,
+                    curr_num_shares,
+                    diff_num_shares,
+                )
+        # Order starting in the past.
+        with self.assertRaises(AssertionError):
+            oordorde.orders_from_arrays(
+                start_timestamp,
+                asset_ids,
+                "price@twap",
+                creation_timestamp,
+                end_timestamp,
+                curr_num_shares,
+                diff_num_shares,
+            )
+        # Order without shares to trade.
+        with self.assertRaises(AssertionError):
+            oordorde.orders_from_arrays(
+                creation_timestamp,
+                asset_ids,
+                "price@twap",
+                start_timestamp,
+                end_timestamp,
+                curr_num_shares,
+                np.array([100.0, 0.0]),
+            )
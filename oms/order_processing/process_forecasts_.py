@@ -7,8 +7,9 @@ import oms.order_processing.process_forecasts_ as oopprfo
 import asyncio
 import datetime
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from tqdm.autonotebook import tqdm
 
@@ -20,11 +21,17 @@ import helpers.hpandas as hpandas
 import helpers.hprint as hprint
 import helpers.htqdm as htqdm
 import helpers.hwall_clock_time as hwacltim
+import market_data as mdata
+import oms.optimizer.call_optimizer as oopcaopt
 import oms.order_processing.target_position_and_order_generator as ooptpaog
 import oms.portfolio.portfolio as oporport
 
 _LOG = logging.getLogger(__name__)
 
+# Time to wait after the beginning of a bar before marking to market and
+# submitting orders, to give all open orders sufficient time to close.
+_WAIT_FOR_OPEN_ORDERS_IN_SECS = 0.1
+
 
 # `ProcessForecastsNode`
 # - Adapts `process_forecasts()` to a DataFlow node
@@ -100,6 +107,7 @@ async def process_forecasts(
             #   trading_end_time, which must be not None.
             "liquidate_at_trading_end_time": bool
             "log_dir": Optional[str],
+            "use_state_log": Optional[bool],
           }
           ```
         - `execution_mode`:
@@ -108,6 +116,8 @@ async def process_forecasts(
             - `real_time`: place the trades only for the last prediction in the df
               (used in real-time mode)
         - `log_dir`: directory for logging state
+        - `use_state_log`: append the state to the state log instead of
+          writing one CSV file per bar (see `oms.portfolio.state_log`)
     """
     if _LOG.isEnabledFor(logging.DEBUG):
         _LOG.debug("\n%s", hprint.frame("process_forecast"))
@@ -192,6 +202,7 @@ async def process_forecasts(
     # Get log dir.
     log_dir = config.get("log_dir", None)
     _LOG.info("log_dir=%s", log_dir)
+    use_state_log = config.get("use_state_log", False)
     #
     # 3) Process the predictions.
     #
@@ -232,6 +243,7 @@ async def process_forecasts(
             restrictions_df,
             share_quantization,
             log_dir=log_dir,
+            use_state_log=use_state_log,
         )
     )
     if execution_mode == "batch":
@@ -288,7 +300,7 @@ async def process_forecasts(
             _LOG.debug("Event: awaiting asyncio.sleep()...")
         # TODO(Grisha): check if the System needs to go to sleep at all.
         # Wait a bit to give all open orders sufficient time to close.
-        await asyncio.sleep(0.1)
+        await asyncio.sleep(_WAIT_FOR_OPEN_ORDERS_IN_SECS)
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug("Event: awaiting asyncio.sleep() done.")
         skip_generating_orders = _skip_generating_orders(
@@ -368,6 +380,268 @@ async def process_forecasts(
         _LOG.debug("Event: exiting process_forecasts() for loop.")
 
 
+def simulate_process_forecasts(
+    prediction_df: pd.DataFrame,
+    volatility_df: pd.DataFrame,
+    market_data_df: pd.DataFrame,
+    initial_holdings_shares: pd.Series,
+    config: Dict[str, Any],
+    *,
+    restrictions_df: Optional[pd.DataFrame] = None,
+    mark_to_market_col: str = "price",
+    pricing_method: str = "last",
+    column_remap: Optional[Dict[str, str]] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Simulate `process_forecasts()` in batch mode without an event loop.
+
+    The result is the same as running `process_forecasts()` with
+    `execution_mode="batch"` on a `DataFramePortfolio` with a
+    `DataFrameBroker`, but instead of waiting for each bar to mark the
+    portfolio to market, submit the orders, and get the fills:
+    - the target holdings of all the bars are computed at once
+    - the mark-to-market and the execution prices of all the bars are computed
+      at once from `market_data_df`
+    - only the holdings, which depend on the fills of the previous bar, are
+      updated bar by bar using NumPy arrays
+
+    The timing and the pricing are the same as in the event-driven flow:
+    - each bar is processed `_WAIT_FOR_OPEN_ORDERS_IN_SECS` after it starts,
+      when the portfolio is marked to market and the orders are placed
+    - the orders end at the end of the bar of `order_duration_in_mins` and are
+      filled fully at the price of their type (e.g., the TWAP of the bars
+      ending in (start, end] for `price@twap`), or not at all if the price is
+      missing
+    - the orders placed at the last bar are not filled
+    - no fees are charged
+
+    The supported configurations are:
+    - the "pomo" optimizer backend without CC limits
+    - the "price" and "midpoint" order types
+    - 1-minute bars that are available as soon as they end, i.e., like
+      `MarketData` with no delay
+
+    :param prediction_df: same as in `process_forecasts()`
+    :param volatility_df: same as in `process_forecasts()`
+    :param market_data_df: bars of the simulated period as returned by
+        `MarketData.get_data_for_interval()`, i.e., indexed by the end
+        timestamp of the bars and with an `asset_id` column
+    :param initial_holdings_shares: initial holdings indexed by asset id,
+        including cash, which define the universe of the portfolio
+    :param config: same as in `process_forecasts()`
+    :param restrictions_df: same as in `process_forecasts()`
+    :param mark_to_market_col: same as in `Portfolio`
+    :param pricing_method: same as in `Portfolio`
+    :param column_remap: same as in `Broker`
+    :return: the portfolio and the statistics dfs in the same format as
+        `Portfolio.read_state()`, indexed by the timestamps when the bars are
+        processed
+    """
+    #
+    # 1) Check the validity of the inputs and extract the parameters.
+    #
+    hpandas.dassert_time_indexed_df(
+        prediction_df, allow_empty=False, strictly_increasing=True
+    )
+    hpandas.dassert_axes_equal(prediction_df, volatility_df)
+    hdbg.dassert_eq(0, prediction_df.isna().sum().sum())
+    hpandas.dassert_time_indexed_df(
+        market_data_df, allow_empty=False, strictly_increasing=False
+    )
+    hdbg.dassert_isinstance(initial_holdings_shares, pd.Series)
+    cash_id = oporport.Portfolio.CASH_ID
+    hdbg.dassert_in(cash_id, initial_holdings_shares.index)
+    hdbg.dassert_isinstance(config, dict)
+    execution_mode = hdict.typed_get(config, "execution_mode", expected_type=str)
+    hdbg.dassert_eq(execution_mode, "batch")
+    NoneType = type(None)
+    order_dict = hdict.typed_get(config, "order_config", expected_type=dict)
+    optimizer_dict = hdict.typed_get(
+        config, "optimizer_config", expected_type=dict
+    )
+    ath_start_time = hdict.typed_get(
+        config, "ath_start_time", expected_type=(datetime.time, NoneType)
+    )
+    trading_start_time = hdict.typed_get(
+        config, "trading_start_time", expected_type=(datetime.time, NoneType)
+    )
+    ath_end_time = hdict.typed_get(
+        config, "ath_end_time", expected_type=(datetime.time, NoneType)
+    )
+    trading_end_time = hdict.typed_get(
+        config, "trading_end_time", expected_type=(datetime.time, NoneType)
+    )
+    liquidate_at_trading_end_time = hdict.typed_get(
+        config,
+        "liquidate_at_trading_end_time",
+        expected_type=bool,
+    )
+    # Without CC limits there are no per-asset decimals, so the quantization
+    # must be specified.
+    share_quantization = hdict.typed_get(
+        config, "share_quantization", expected_type=int
+    )
+    _validate_trading_time(
+        ath_start_time,
+        ath_end_time,
+        trading_start_time,
+        trading_end_time,
+        liquidate_at_trading_end_time,
+    )
+    backend = hdict.checked_get(optimizer_dict, "backend")
+    hdbg.dassert_eq(backend, "pomo", "Unsupported `backend`")
+    asset_class = hdict.checked_get(optimizer_dict, "asset_class")
+    apply_cc_limits = hdict.checked_get(optimizer_dict, "apply_cc_limits")
+    hdbg.dassert(
+        not (asset_class == "crypto" and apply_cc_limits),
+        "CC limits are not supported",
+    )
+    if "remove_weekends" in config and config["remove_weekends"]:
+        prediction_df = cofinanc.remove_weekends(prediction_df)
+        volatility_df = cofinanc.remove_weekends(volatility_df)
+    # The universe is given by the initial holdings, like for a `Portfolio`
+    # initialized with the trading universe.
+    asset_ids = initial_holdings_shares.index.drop(cash_id).sort_values()
+    hdbg.dassert_is_subset(prediction_df.columns, asset_ids)
+    #
+    # 2) Compute the timing of the bars and of the orders.
+    #
+    wall_clock_timestamps = prediction_df.index + pd.Timedelta(
+        seconds=_WAIT_FOR_OPEN_ORDERS_IN_SECS
+    )
+    # The orders end at the end of the current bar, like in
+    # `TargetPositionAndOrderGenerator`.
+    order_duration = pd.Timedelta(minutes=order_dict["order_duration_in_mins"])
+    order_end_timestamps = (
+        wall_clock_timestamps.floor(order_duration) + order_duration
+    )
+    # The orders are filled when the portfolio is marked to market at the next
+    # bar, which must happen after they end.
+    hdbg.dassert(
+        (order_end_timestamps[:-1] <= wall_clock_timestamps[1:]).all(),
+        "The orders must end before the next bar is processed",
+    )
+    #
+    # 3) Compute the prices of all the bars.
+    #
+    mark_to_market_prices = _get_mark_to_market_prices(
+        market_data_df,
+        asset_ids,
+        mark_to_market_col,
+        pricing_method,
+        wall_clock_timestamps,
+    )
+    execution_prices = _get_execution_prices(
+        market_data_df,
+        asset_ids,
+        order_dict["order_type"],
+        column_remap,
+        wall_clock_timestamps,
+        order_end_timestamps,
+    )
+    #
+    # 4) Compute the target holdings of all the bars.
+    #
+    # Impute the predictions and the volatility like
+    # `TargetPositionAndOrderGenerator`, i.e., zero for the missing predictions
+    # and the mean of each bar, including the cash volatility equal to 1, for
+    # the missing volatility.
+    predictions = prediction_df.reindex(columns=asset_ids, fill_value=0.0)
+    volatility = volatility_df.reindex(columns=asset_ids)
+    volatility_mean = (volatility.sum(axis=1) + 1) / (
+        volatility.count(axis=1) + 1
+    )
+    volatility = volatility.mask(volatility.isna(), volatility_mean, axis=0)
+    target_holdings_notional = _compute_target_holdings_notional(
+        predictions, volatility, optimizer_dict["params"]
+    )
+    #
+    # 5) Simulate the holdings bar by bar.
+    #
+    bar_times = [timestamp.time() for timestamp in prediction_df.index]
+    skip_generating_orders = [
+        _skip_generating_orders(
+            bar_time,
+            ath_start_time,
+            ath_end_time,
+            trading_start_time,
+            trading_end_time,
+        )
+        for bar_time in bar_times
+    ]
+    liquidate_holdings = [
+        liquidate_at_trading_end_time and bar_time >= trading_end_time
+        for bar_time in bar_times
+    ]
+    restrictions_by_asset_id = None
+    if restrictions_df is not None:
+        restrictions_by_asset_id = ooptpaog.index_restrictions_by_asset_id(
+            restrictions_df
+        )
+    asset_ids_as_array = asset_ids.to_numpy()
+    target_holdings_notional = target_holdings_notional.to_numpy(dtype=float)
+    mark_to_market_prices_as_array = mark_to_market_prices.to_numpy(dtype=float)
+    execution_prices = execution_prices.to_numpy(dtype=float)
+    num_bars = len(prediction_df)
+    num_assets = len(asset_ids)
+    holdings_shares = np.empty((num_bars, num_assets))
+    executed_trades_notional = np.full((num_bars, num_assets), np.nan)
+    cash = np.empty(num_bars)
+    curr_holdings_shares = initial_holdings_shares[asset_ids].to_numpy(
+        dtype=float
+    )
+    curr_cash = float(initial_holdings_shares[cash_id])
+    # Shares to trade with the orders placed at the previous bar.
+    diff_num_shares = np.zeros(num_assets)
+    for idx in range(num_bars):
+        if idx > 0:
+            # Fill the orders placed at the previous bar that have a price.
+            prices = execution_prices[idx - 1]
+            is_filled = (diff_num_shares != 0) & np.isfinite(prices)
+            filled_notional = np.where(is_filled, diff_num_shares * prices, 0.0)
+            curr_holdings_shares = np.where(
+                is_filled,
+                curr_holdings_shares + diff_num_shares,
+                curr_holdings_shares,
+            )
+            curr_cash -= filled_notional.sum()
+            executed_trades_notional[idx] = filled_notional
+        holdings_shares[idx] = curr_holdings_shares
+        cash[idx] = curr_cash
+        if skip_generating_orders[idx]:
+            diff_num_shares = np.zeros(num_assets)
+            continue
+        if liquidate_holdings[idx]:
+            diff_num_shares = -curr_holdings_shares
+        else:
+            diff_num_shares = _compute_target_trades_shares(
+                target_holdings_notional[idx],
+                curr_holdings_shares,
+                mark_to_market_prices_as_array[idx],
+                share_quantization,
+            )
+        if restrictions_by_asset_id is not None:
+            is_restricted = ooptpaog.get_restricted_trades_mask(
+                restrictions_by_asset_id,
+                asset_ids_as_array,
+                curr_holdings_shares,
+                diff_num_shares,
+            )
+            diff_num_shares = np.where(is_restricted, 0.0, diff_num_shares)
+    #
+    # 6) Package the state like `Portfolio`.
+    #
+    portfolio_df, stats_df = _package_simulated_state(
+        wall_clock_timestamps,
+        asset_ids,
+        holdings_shares,
+        mark_to_market_prices.to_numpy(dtype=float),
+        executed_trades_notional,
+        cash,
+    )
+    return portfolio_df, stats_df
+
+
 # /////////////////////////////////////////////////////////////////////////////
 
 
@@ -465,3 +739,253 @@ def _skip_generating_orders(
     if _LOG.isEnabledFor(logging.DEBUG):
         _LOG.debug(hprint.to_str("skip_bar_cond"))
     return skip_bar_cond
+
+
+# /////////////////////////////////////////////////////////////////////////////
+
+
+def _pivot_market_data(
+    market_data_df: pd.DataFrame, asset_ids: pd.Index, column: str
+) -> pd.DataFrame:
+    """
+    Return the values of `column` indexed by bar end timestamp and asset id.
+    """
+    hdbg.dassert_in(column, market_data_df.columns)
+    hdbg.dassert_in("asset_id", market_data_df.columns)
+    df = market_data_df.pivot_table(
+        index=market_data_df.index,
+        columns="asset_id",
+        values=column,
+        aggfunc="last",
+        dropna=False,
+    )
+    df = df.sort_index().reindex(columns=asset_ids)
+    return df
+
+
+def _get_prices_at(
+    prices: pd.DataFrame, timestamps: pd.DatetimeIndex
+) -> np.ndarray:
+    """
+    Return the prices of the bars ending exactly at `timestamps`.
+
+    :return: array with one row per timestamp and NaN when there is no bar
+    """
+    bar_end_timestamps = prices.index
+    idxs = bar_end_timestamps.searchsorted(timestamps, side="left")
+    idxs = np.minimum(idxs, len(bar_end_timestamps) - 1)
+    is_found = bar_end_timestamps[idxs] == timestamps
+    values = prices.to_numpy(dtype=float)[idxs]
+    values[~is_found] = np.nan
+    return values
+
+
+def _get_twap_prices(
+    prices: pd.DataFrame,
+    start_timestamps: pd.DatetimeIndex,
+    end_timestamps: pd.DatetimeIndex,
+) -> np.ndarray:
+    """
+    Return the TWAP of the bars ending in (start, end] for each interval.
+
+    The missing prices are skipped, like in `MarketData.get_twap_price()`.
+
+    :return: array with one row per interval and NaN when there are no prices
+    """
+    twap_prices = mdata.compute_twap_prices(
+        prices.index.asi8,
+        prices.to_numpy(dtype=float),
+        start_timestamps.asi8,
+        end_timestamps.asi8,
+        left_close=False,
+        right_close=True,
+    )
+    return twap_prices
+
+
+def _get_mark_to_market_prices(
+    market_data_df: pd.DataFrame,
+    asset_ids: pd.Index,
+    mark_to_market_col: str,
+    pricing_method: str,
+    wall_clock_timestamps: pd.DatetimeIndex,
+) -> pd.DataFrame:
+    """
+    Compute the prices used by `Portfolio` to mark to market at each bar.
+
+    :return: prices indexed by `wall_clock_timestamps` with one column per
+        asset
+    """
+    prices = _pivot_market_data(market_data_df, asset_ids, mark_to_market_col)
+    # Find the end of the last bar available at each timestamp, like
+    # `MarketData.get_last_end_time()`.
+    bar_end_timestamps = prices.index
+    idxs = bar_end_timestamps.searchsorted(wall_clock_timestamps, side="right")
+    hdbg.dassert_lte(1, idxs.min(), "No bars before the first timestamp")
+    last_end_timestamps = bar_end_timestamps[idxs - 1]
+    pricing_type, bar_duration_as_pd_str = oporport.parse_pricing_method(
+        pricing_method
+    )
+    if pricing_type == "last":
+        values = _get_prices_at(prices, last_end_timestamps)
+    elif pricing_type == "twap":
+        # Align on a bar, like `MarketData.get_last_twap_price()`.
+        bar_duration = pd.Timedelta(bar_duration_as_pd_str)
+        last_end_timestamps = last_end_timestamps.floor(bar_duration)
+        values = _get_twap_prices(
+            prices, last_end_timestamps - bar_duration, last_end_timestamps
+        )
+    else:
+        raise ValueError(f"Unsupported pricing_type='{pricing_type}'")
+    df = pd.DataFrame(values, wall_clock_timestamps, asset_ids)
+    return df
+
+
+def _get_execution_prices(
+    market_data_df: pd.DataFrame,
+    asset_ids: pd.Index,
+    order_type: str,
+    column_remap: Optional[Dict[str, str]],
+    order_start_timestamps: pd.DatetimeIndex,
+    order_end_timestamps: pd.DatetimeIndex,
+) -> pd.DataFrame:
+    """
+    Compute the prices used by `DataFrameBroker` to fill the orders of each
+    bar.
+
+    :return: prices indexed by `order_start_timestamps` with one column per
+        asset
+    """
+    config = order_type.split("@")
+    hdbg.dassert_eq(len(config), 2, "Invalid type_='%s'", order_type)
+    price_type, timing = config
+    hdbg.dassert_in(price_type, ("price", "midpoint"))
+    if column_remap is not None:
+        column = column_remap[price_type]
+    else:
+        column = price_type
+    prices = _pivot_market_data(market_data_df, asset_ids, column)
+    if timing == "start":
+        # Round down to the last 1-minute bar, like `_get_price_per_share()`.
+        values = _get_prices_at(prices, order_start_timestamps.floor("1T"))
+    elif timing == "end":
+        values = _get_prices_at(prices, order_end_timestamps)
+    elif timing == "twap":
+        values = _get_twap_prices(
+            prices, order_start_timestamps, order_end_timestamps
+        )
+    else:
+        raise ValueError(f"Invalid timing='{timing}'")
+    df = pd.DataFrame(values, order_start_timestamps, asset_ids)
+    return df
+
+
+def _compute_target_holdings_notional(
+    predictions: pd.DataFrame,
+    volatility: pd.DataFrame,
+    optimizer_params: Dict[str, Any],
+) -> pd.DataFrame:
+    """
+    Compute the target holdings in notional of all the bars at once.
+    """
+    style = optimizer_params["style"]
+    kwargs = optimizer_params["kwargs"]
+    if style == "cross_sectional":
+        fill_method = kwargs.get("bulk_fill_method")
+    else:
+        fill_method = kwargs.get("fill_method")
+    if fill_method == "ffill":
+        # Forward filling uses the previous bars, which the optimizer doesn't
+        # see when it is called bar by bar, so call it bar by bar.
+        dfs = [
+            oopcaopt.compute_target_holdings_notional(
+                predictions.iloc[[idx]],
+                volatility.iloc[[idx]],
+                style=style,
+                **kwargs,
+            )
+            for idx in range(len(predictions))
+        ]
+        target_holdings_notional = pd.concat(dfs)
+    else:
+        target_holdings_notional = oopcaopt.compute_target_holdings_notional(
+            predictions, volatility, style=style, **kwargs
+        )
+    return target_holdings_notional
+
+
+def _compute_target_trades_shares(
+    target_holdings_notional: np.ndarray,
+    holdings_shares: np.ndarray,
+    prices: np.ndarray,
+    share_quantization: int,
+) -> np.ndarray:
+    """
+    Compute the shares to trade to reach the target holdings.
+
+    This is the same as `TargetPositionAndOrderGenerator` with the "pomo"
+    optimizer, which imputes zero for the missing prices and holdings and
+    doesn't trade when the shares are not finite.
+    """
+    prices = np.nan_to_num(prices, nan=0.0)
+    holdings_notional = np.nan_to_num(holdings_shares * prices, nan=0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        diff_num_shares = (target_holdings_notional - holdings_notional) / prices
+    diff_num_shares = np.where(np.isfinite(diff_num_shares), diff_num_shares, 0.0)
+    # Round like `cofinanc.quantize_shares()`.
+    diff_num_shares = np.round(diff_num_shares, share_quantization)
+    return diff_num_shares
+
+
+def _package_simulated_state(
+    wall_clock_timestamps: pd.DatetimeIndex,
+    asset_ids: pd.Index,
+    holdings_shares: np.ndarray,
+    prices: np.ndarray,
+    executed_trades_notional: np.ndarray,
+    cash: np.ndarray,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Compute the portfolio and statistics dfs like `Portfolio.read_state()`.
+    """
+    columns = pd.Index(asset_ids, name="asset_id")
+    holdings_shares = pd.DataFrame(
+        holdings_shares, wall_clock_timestamps, columns
+    )
+    holdings_notional = holdings_shares * prices
+    executed_trades_shares = holdings_shares.subtract(
+        holdings_shares.shift(1), fill_value=0
+    )
+    executed_trades_notional = pd.DataFrame(
+        executed_trades_notional, wall_clock_timestamps, columns
+    )
+    pnl = oporport.compute_pnl(holdings_notional, executed_trades_notional)
+    dfs = {
+        "holdings_shares": holdings_shares,
+        "holdings_notional": holdings_notional,
+        "executed_trades_shares": executed_trades_shares,
+        "executed_trades_notional": executed_trades_notional,
+        "pnl": pnl,
+    }
+    portfolio_df = pd.concat(dfs.values(), axis=1, keys=dfs.keys())
+    # Compute the statistics like `Portfolio._compute_statistics()`.
+    finite_holdings_notional = holdings_notional.where(
+        np.isfinite(holdings_notional)
+    )
+    net_market_value = finite_holdings_notional.sum(axis=1)
+    gross_market_value = finite_holdings_notional.abs().sum(axis=1)
+    cash = pd.Series(cash, wall_clock_timestamps)
+    net_wealth = net_market_value + cash
+    stats_df = pd.DataFrame(
+        {
+            "pnl": pnl.sum(axis=1, min_count=1),
+            "gross_volume": executed_trades_notional.abs().sum(axis=1),
+            "net_volume": executed_trades_notional.sum(axis=1),
+            "gmv": gross_market_value,
+            "nmv": net_market_value,
+            "cash": cash,
+            "net_wealth": net_wealth,
+            "leverage": gross_market_value / net_wealth,
+        }
+    )
+    return portfolio_df, stats_df
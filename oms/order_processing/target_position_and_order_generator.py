@@ -27,9 +27,19 @@ import oms.optimizer.call_optimizer as oopcaopt
 import oms.optimizer.cc_optimizer_utils as ooccoput
 import oms.order.order as oordorde
 import oms.portfolio.portfolio as oporport
+import oms.portfolio.state_log as opstalog
 
 _LOG = logging.getLogger(__name__)
 
+# Columns of the restrictions dataframe flagging the trades that are not
+# allowed for an asset.
+_RESTRICTION_COLS = (
+    "is_buy_restricted",
+    "is_buy_cover_restricted",
+    "is_sell_short_restricted",
+    "is_sell_long_restricted",
+)
+
 
 class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
     """
@@ -51,6 +61,7 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         share_quantization: Optional[int],
         *,
         log_dir: Optional[str] = None,
+        use_state_log: bool = False,
     ) -> None:
         """
         Build the object.
@@ -79,6 +90,9 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
                   asset_id, curr_num_shares, price, etc.
             - `portfolio`
                 - Store the output of the included `Portfolio`
+        :param use_state_log: append the target positions and the state of
+            the `Portfolio` to the state log (see `oms.portfolio.state_log`)
+            instead of writing one CSV file per bar
         """
         self._portfolio = portfolio
         self._get_wall_clock_time = portfolio.market_data.get_wall_clock_time
@@ -98,8 +112,15 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         self._optimizer_dict = optimizer_dict
         #
         self._restrictions = restrictions
+        # Restrictions indexed by asset id.
+        self._restrictions_by_asset_id: Optional[pd.DataFrame] = None
+        if restrictions is not None:
+            self._restrictions_by_asset_id = index_restrictions_by_asset_id(
+                restrictions
+            )
         self._share_quantization = share_quantization
         self._log_dir = log_dir
+        self._use_state_log = use_state_log
         # Dict from timestamp to target positions.
         self._target_positions = cksoordi.KeySortedOrderedDict(pd.Timestamp)
         # Dict from timestamp to orders.
@@ -167,25 +188,28 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         ```
         """
         sub_dir = "target_positions"
+        dir_name = os.path.join(log_dir, sub_dir)
+        if opstalog.has_state_log(dir_name):
+            # Read all the bars at once from the state log and process them
+            # like a single file.
+            df = opstalog.read_state_log(dir_name)
+            df = TargetPositionAndOrderGenerator._process_target_positions(
+                df, tz, rename_col_map
+            )
+            hdbg.dassert_is_not(df, None)
+            return df
         files = TargetPositionAndOrderGenerator._get_files(log_dir, sub_dir)
         dfs = []
         for path in tqdm(files, desc=f"Loading `{sub_dir}` files..."):
             df = pd.read_csv(
                 path, index_col=0, parse_dates=["wall_clock_timestamp"]
             )
-            # Change the index from `asset_id` to the timestamp.
-            df = df.reset_index().set_index("wall_clock_timestamp")
-            # TODO(Dan): Research why column names are being incorrect sometimes
-            #  and save the data with the proper names.
-            if rename_col_map:
-                df = df.rename(columns=rename_col_map)
-            hpandas.dassert_series_type_is(df["asset_id"], np.int64)
-            if not isinstance(df.index, pd.DatetimeIndex):
+            df = TargetPositionAndOrderGenerator._process_target_positions(
+                df, tz, rename_col_map
+            )
+            if df is None:
                 _LOG.info("Skipping file_name=%s", path)
                 continue
-            df.index = df.index.tz_convert(tz)
-            # Pivot to multiple column levels.
-            df = df.pivot(columns="asset_id")
             dfs.append(df)
         df = pd.concat(dfs)
         return df
@@ -306,12 +330,41 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         # Log the state of this object and Portfolio.
         if self._log_dir:
             self._log_state()
-            self._portfolio.log_state(os.path.join(self._log_dir, "portfolio"))
+            self._portfolio.log_state(
+                os.path.join(self._log_dir, "portfolio"),
+                use_state_log=self._use_state_log,
+            )
 
     # /////////////////////////////////////////////////////////////////////////////
     # Private methods.
     # /////////////////////////////////////////////////////////////////////////////
 
+    @staticmethod
+    def _process_target_positions(
+        df: pd.DataFrame,
+        tz: str,
+        rename_col_map: Optional[Dict[str, str]],
+    ) -> Optional[pd.DataFrame]:
+        """
+        Index logged target positions by timestamp and pivot them by asset.
+
+        :return: processed target positions or `None` if `df` is not indexed
+            by timestamps
+        """
+        # Change the index from `asset_id` to the timestamp.
+        df = df.reset_index().set_index("wall_clock_timestamp")
+        # TODO(Dan): Research why column names are being incorrect sometimes
+        #  and save the data with the proper names.
+        if rename_col_map:
+            df = df.rename(columns=rename_col_map)
+        hpandas.dassert_series_type_is(df["asset_id"], np.int64)
+        if not isinstance(df.index, pd.DatetimeIndex):
+            return None
+        df.index = df.index.tz_convert(tz)
+        # Pivot to multiple column levels.
+        df = df.pivot(columns="asset_id")
+        return df
+
     @staticmethod
     def _get_files(log_dir: str, sub_dir: str) -> List[str]:
         """
@@ -395,14 +448,26 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         if self._target_positions:
             _, last_target_positions = self._target_positions.peek()
             # TODO(gp): Check that last_key matches the current bar timestamp.
-            last_target_positions_filename = os.path.join(
-                self._log_dir, "target_positions", filename
-            )
-            hio.create_enclosing_dir(
-                last_target_positions_filename, incremental=True
-            )
-            last_target_positions.to_csv(last_target_positions_filename)
-        # Log the orders.
+            if self._use_state_log:
+                # Use the wall clock time when there is no bar, like in the
+                # file names.
+                state_log_bar_timestamp = (
+                    hwacltim.get_current_bar_timestamp() or wall_clock_time
+                )
+                opstalog.get_state_log_writer().append(
+                    os.path.join(self._log_dir, "target_positions"),
+                    last_target_positions,
+                    state_log_bar_timestamp,
+                )
+            else:
+                last_target_positions_filename = os.path.join(
+                    self._log_dir, "target_positions", filename
+                )
+                hio.create_enclosing_dir(
+                    last_target_positions_filename, incremental=True
+                )
+                last_target_positions.to_csv(last_target_positions_filename)
+        # Log the orders, which are parsed from their text representation.
         if self._orders:
             _, last_orders = self._orders.peek()
             last_orders_filename = os.path.join(self._log_dir, "orders", filename)
@@ -781,80 +846,134 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         hdbg.dassert_is_subset(
             ("holdings_shares", "target_trades_shares"), shares_df.columns
         )
-        orders: List[oordorde.Order] = []
-        for asset_id, shares_row in shares_df.iterrows():
-            curr_num_shares = shares_row["holdings_shares"]
-            diff_num_shares = shares_row["target_trades_shares"]
-            hdbg.dassert(
-                np.isfinite(curr_num_shares),
-                "The curr_num_share value must be finite.",
-            )
-            if not np.isfinite(diff_num_shares):
-                if _LOG.isEnabledFor(logging.DEBUG):
-                    _LOG.debug(
-                        "`diff_num_shares`=%f for `asset_id`=%i",
-                        diff_num_shares,
-                        asset_id,
-                    )
-                diff_num_shares = 0.0
-            diff_num_shares = self._enforce_restrictions(
-                asset_id, curr_num_shares, diff_num_shares
-            )
-            if diff_num_shares == 0.0:
-                # No need to place trades.
-                continue
-            order = oordorde.Order(
-                asset_id=asset_id,
-                curr_num_shares=curr_num_shares,
-                diff_num_shares=diff_num_shares,
-                **order_dict,
-            )
+        asset_ids = shares_df.index.to_numpy()
+        curr_num_shares = shares_df["holdings_shares"].to_numpy(dtype=float)
+        diff_num_shares = shares_df["target_trades_shares"].to_numpy(dtype=float)
+        hdbg.dassert(
+            np.isfinite(curr_num_shares).all(),
+            "The curr_num_share value must be finite.",
+        )
+        is_finite = np.isfinite(diff_num_shares)
+        if not is_finite.all():
             if _LOG.isEnabledFor(logging.DEBUG):
-                _LOG.debug("order=%s", order.order_id)
-            orders.append(order)
+                _LOG.debug(
+                    "`diff_num_shares`=%s for `asset_id`=%s",
+                    diff_num_shares[~is_finite],
+                    asset_ids[~is_finite],
+                )
+            diff_num_shares = np.where(is_finite, diff_num_shares, 0.0)
+        diff_num_shares = self._enforce_restrictions(
+            asset_ids, curr_num_shares, diff_num_shares
+        )
+        # No need to place trades for zero-share orders.
+        mask = diff_num_shares != 0.0
+        orders = oordorde.orders_from_arrays(
+            order_dict["creation_timestamp"],
+            asset_ids[mask],
+            order_dict["type_"],
+            order_dict["start_timestamp"],
+            order_dict["end_timestamp"],
+            curr_num_shares[mask],
+            diff_num_shares[mask],
+        )
         if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("orders=%s", [order.order_id for order in orders])
             _LOG.debug("Number of orders generated=%i", len(orders))
         return orders
 
     def _enforce_restrictions(
         self,
-        asset_id: int,
-        curr_num_shares: float,
-        diff_num_shares: float,
-    ) -> float:
-        if self._restrictions is None:
-            return diff_num_shares
-        filter_ = self._restrictions["asset_id"] == asset_id
-        restrictions = self._restrictions[filter_]
-        if restrictions.empty:
+        asset_ids: np.ndarray,
+        curr_num_shares: np.ndarray,
+        diff_num_shares: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Zero out the trades that are not allowed by the restrictions.
+
+        :param asset_ids: ids of the assets
+        :param curr_num_shares: currently owned shares for each asset
+        :param diff_num_shares: shares to trade for each asset
+        :return: shares to trade for each asset after enforcing restrictions
+        """
+        if self._restrictions_by_asset_id is None:
             return diff_num_shares
+        is_restricted = get_restricted_trades_mask(
+            self._restrictions_by_asset_id,
+            asset_ids,
+            curr_num_shares,
+            diff_num_shares,
+        )
+        has_restrictions = np.isin(
+            asset_ids, self._restrictions_by_asset_id.index
+        )
+        for asset_id in asset_ids[has_restrictions]:
+            _LOG.warning("Enforcing restriction for asset_id=%i", asset_id)
+        diff_num_shares = np.where(is_restricted, 0.0, diff_num_shares)
+        return diff_num_shares
+
+
+def index_restrictions_by_asset_id(restrictions: pd.DataFrame) -> pd.DataFrame:
+    """
+    Index the restrictions by asset id, so that they can be looked up for all
+    the assets at once.
+
+    :param restrictions: restrictions with the columns `asset_id` and
+        `_RESTRICTION_COLS`
+    :return: boolean columns `_RESTRICTION_COLS` indexed by `asset_id`
+    """
+    hdbg.dassert_is_subset(
+        ("asset_id",) + _RESTRICTION_COLS, restrictions.columns
+    )
+    hdbg.dassert_no_duplicates(restrictions["asset_id"])
+    restrictions_by_asset_id = restrictions.set_index("asset_id")[
+        list(_RESTRICTION_COLS)
+    ].astype(bool)
+    return restrictions_by_asset_id
+
+
+def get_restricted_trades_mask(
+    restrictions_by_asset_id: pd.DataFrame,
+    asset_ids: np.ndarray,
+    curr_num_shares: np.ndarray,
+    diff_num_shares: np.ndarray,
+) -> np.ndarray:
+    """
+    Return which trades are not allowed by the restrictions.
+
+    :param restrictions_by_asset_id: as returned by
+        `index_restrictions_by_asset_id()`
+    :param asset_ids, curr_num_shares, diff_num_shares: as in
+        `TargetPositionAndOrderGenerator._enforce_restrictions()`
+    :return: boolean mask, `True` for the trades to zero out
+    """
+    # Assets without restrictions are not restricted.
+    restrictions = restrictions_by_asset_id.reindex(asset_ids, fill_value=False)
+    is_buy = diff_num_shares > 0
+    is_sell = diff_num_shares < 0
+    is_restricted = (
         # Enforce "is_buy_restricted".
-        if (
-            restrictions.loc["is_buy_restricted"]
-            and curr_num_shares >= 0
-            and diff_num_shares > 0
-        ):
-            diff_num_shares = 0.0
+        (
+            restrictions["is_buy_restricted"].to_numpy()
+            & (curr_num_shares >= 0)
+            & is_buy
+        )
         # Enforce "is_buy_cover_restricted".
-        if (
-            restrictions.loc["is_buy_cover_restricted"]
-            and curr_num_shares < 0
-            and diff_num_shares > 0
-        ):
-            diff_num_shares = 0.0
+        | (
+            restrictions["is_buy_cover_restricted"].to_numpy()
+            & (curr_num_shares < 0)
+            & is_buy
+        )
         # Enforce "is_sell_short_restricted".
-        if (
-            restrictions.loc["is_sell_short_restricted"]
-            and curr_num_shares <= 0
-            and diff_num_shares < 0
-        ):
-            diff_num_shares = 0.0
+        | (
+            restrictions["is_sell_short_restricted"].to_numpy()
+            & (curr_num_shares <= 0)
+            & is_sell
+        )
         # Enforce "is_sell_long_restricted".
-        if (
-            restrictions.loc["is_sell_long_restricted"]
-            and curr_num_shares > 0
-            and diff_num_shares < 0
-        ):
-            diff_num_shares = 0.0
-        _LOG.warning("Enforcing restriction for asset_id=%i", asset_id)
-        return diff_num_shares
+        | (
+            restrictions["is_sell_long_restricted"].to_numpy()
+            & (curr_num_shares > 0)
+            & is_sell
+        )
+    )
+    return is_restricted
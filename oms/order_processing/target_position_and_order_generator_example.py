@@ -8,6 +8,8 @@ import asyncio
 import logging
 from typing import Optional
 
+import pandas as pd
+
 import oms.order_processing.target_position_and_order_generator as ooptpaoge
 import oms.portfolio.portfolio_example as opopoexa
 
@@ -17,6 +19,8 @@ _LOG = logging.getLogger(__name__)
 def get_TargetPositionAndOrderGenerator_example1(
     event_loop: Optional[asyncio.AbstractEventLoop],
     market_data,
+    *,
+    restrictions: Optional[pd.DataFrame] = None,
 ) -> ooptpaoge.TargetPositionAndOrderGenerator:
     portfolio = opopoexa.get_DataFramePortfolio_example1(
         event_loop,
@@ -46,7 +50,7 @@ def get_TargetPositionAndOrderGenerator_example1(
             portfolio,
             order_dict,
             optimizer_dict,
-            None,
+            restrictions,
             share_quantization,
         )
     )
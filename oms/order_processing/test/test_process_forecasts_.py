@@ -1,8 +1,11 @@
 import asyncio
 import datetime
+import glob
 import logging
-from typing import Any, Dict, List, Tuple, Union
+import os
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -16,10 +19,12 @@ import market_data as mdata
 import oms.db.oms_db as odbomdb
 import oms.order_processing.order_processor as ooprorpr
 import oms.order_processing.process_forecasts_ as oopprfo
+import oms.order_processing.target_position_and_order_generator as ooptpaoge
 import oms.portfolio.database_portfolio as opdapor
 import oms.portfolio.dataframe_portfolio as opodapor
 import oms.portfolio.portfolio as oporport
 import oms.portfolio.portfolio_example as opopoexa
+import oms.portfolio.state_log as opstalog
 import oms.test.oms_db_helper as omtodh
 
 # TODO(gp): Why does this file ends with _.py?
@@ -36,14 +41,20 @@ _LOG = logging.getLogger(__name__)
 class TestSimulatedProcessForecasts1(hunitest.TestCase):
     @staticmethod
     def get_portfolio(
-        event_loop: asyncio.AbstractEventLoop, asset_ids: List[int]
+        event_loop: asyncio.AbstractEventLoop,
+        asset_ids: List[int],
+        *,
+        bookkeeping_storage: str = "ordered_dict",
     ) -> opodapor.DataFramePortfolio:
         (
             market_data,
             get_wall_clock_time,
         ) = mdata.get_ReplayedTimeMarketData_example3(event_loop)
         portfolio = opopoexa.get_DataFramePortfolio_example1(
-            event_loop, market_data=market_data, asset_ids=asset_ids
+            event_loop,
+            market_data=market_data,
+            asset_ids=asset_ids,
+            bookkeeping_storage=bookkeeping_storage,
         )
         return portfolio
 
@@ -53,9 +64,25 @@ class TestSimulatedProcessForecasts1(hunitest.TestCase):
                 self._test_simulated_system1(event_loop), event_loop=event_loop
             )
 
+    def test_ring_buffer1(self) -> None:
+        """
+        Check that storing the Portfolio state in ring buffers gives the same
+        results.
+        """
+        with hasynci.solipsism_context() as event_loop:
+            hasynci.run(
+                self._test_simulated_system1(
+                    event_loop, bookkeeping_storage="ring_buffer"
+                ),
+                event_loop=event_loop,
+            )
+
     # TODO(gp): -> run_simulated_system1
     async def _test_simulated_system1(
-        self, event_loop: asyncio.AbstractEventLoop
+        self,
+        event_loop: asyncio.AbstractEventLoop,
+        *,
+        bookkeeping_storage: str = "ordered_dict",
     ) -> None:
         """
         Run `process_forecasts()` logic with a given prediction df to update a
@@ -81,7 +108,9 @@ class TestSimulatedProcessForecasts1(hunitest.TestCase):
         ]
         volatility = pd.DataFrame(volatility_data, index, asset_ids)
         # Build a Portfolio.
-        portfolio = self.get_portfolio(event_loop, asset_ids)
+        portfolio = self.get_portfolio(
+            event_loop, asset_ids, bookkeeping_storage=bookkeeping_storage
+        )
         # Get process forecasts config.
         order_type = "price@twap"
         dict_ = _get_process_forecasts_dict(order_type)
@@ -132,6 +161,99 @@ class TestSimulatedProcessForecasts1(hunitest.TestCase):
         self.assert_equal(actual, expected, purify_text=True, fuzzy_match=True)
 
 
+# #############################################################################
+# TestSimulatedProcessForecastsStateLog1
+# #############################################################################
+
+
+class TestSimulatedProcessForecastsStateLog1(hunitest.TestCase):
+    """
+    Check that the state log stores the same state as the CSV files.
+    """
+
+    def test_state_log1(self) -> None:
+        csv_log_dir = os.path.join(self.get_scratch_space(), "csv")
+        state_log_dir = os.path.join(self.get_scratch_space(), "state_log")
+        for log_dir, use_state_log in [
+            (csv_log_dir, False),
+            (state_log_dir, True),
+        ]:
+            with hasynci.solipsism_context() as event_loop:
+                hasynci.run(
+                    self._run_process_forecasts(
+                        event_loop, log_dir, use_state_log
+                    ),
+                    event_loop=event_loop,
+                )
+        # Check that the state is logged in the state log.
+        portfolio_log_dir = os.path.join(state_log_dir, "portfolio")
+        self.assertFalse(glob.glob(os.path.join(portfolio_log_dir, "*", "*.csv")))
+        self.assertTrue(
+            opstalog.has_state_log(
+                os.path.join(portfolio_log_dir, "holdings_shares")
+            )
+        )
+        # Check the Portfolio state.
+        expected_portfolio_df, expected_stats_df = oporport.Portfolio.read_state(
+            os.path.join(csv_log_dir, "portfolio")
+        )
+        actual_portfolio_df, actual_stats_df = oporport.Portfolio.read_state(
+            portfolio_log_dir
+        )
+        self.assert_equal(
+            hpandas.df_to_str(actual_portfolio_df, num_rows=None),
+            hpandas.df_to_str(expected_portfolio_df, num_rows=None),
+        )
+        self.assert_equal(
+            hpandas.df_to_str(actual_stats_df, num_rows=None),
+            hpandas.df_to_str(expected_stats_df, num_rows=None),
+        )
+        # Check the target positions.
+        load_target_positions = (
+            ooptpaoge.TargetPositionAndOrderGenerator.load_target_positions
+        )
+        expected_target_positions = load_target_positions(csv_log_dir)
+        actual_target_positions = load_target_positions(state_log_dir)
+        self.assert_equal(
+            hpandas.df_to_str(actual_target_positions, num_rows=None),
+            hpandas.df_to_str(expected_target_positions, num_rows=None),
+        )
+
+    async def _run_process_forecasts(
+        self,
+        event_loop: asyncio.AbstractEventLoop,
+        log_dir: str,
+        use_state_log: bool,
+    ) -> None:
+        asset_ids = [101, 202]
+        index = [
+            pd.Timestamp("2000-01-01 09:35:00-05:00", tz="America/New_York"),
+            pd.Timestamp("2000-01-01 09:40:00-05:00", tz="America/New_York"),
+            pd.Timestamp("2000-01-01 09:45:00-05:00", tz="America/New_York"),
+        ]
+        prediction_data = [
+            [0.1, 0.2],
+            [-0.1, 0.3],
+            [-0.3, 0.0],
+        ]
+        predictions = pd.DataFrame(prediction_data, index, asset_ids)
+        volatility = pd.DataFrame(1, index, asset_ids)
+        portfolio = TestSimulatedProcessForecasts1.get_portfolio(
+            event_loop, asset_ids
+        )
+        dict_ = _get_process_forecasts_dict("price@twap")
+        dict_["log_dir"] = log_dir
+        dict_["use_state_log"] = use_state_log
+        await oopprfo.process_forecasts(
+            predictions,
+            volatility,
+            portfolio,
+            dict_,
+            spread_df=None,
+            restrictions_df=None,
+        )
+
+
 # #############################################################################
 # TestSimulatedProcessForecasts2
 # #############################################################################
@@ -780,6 +902,209 @@ class TestMockedProcessForecasts2(omtodh.TestOmsDbHelper):
         self.check_string(actual, purify_text=True)
 
 
+# #############################################################################
+# TestSimulateProcessForecasts1
+# #############################################################################
+
+
+class TestSimulateProcessForecasts1(hunitest.TestCase):
+    """
+    Check that `simulate_process_forecasts()` computes the same state as
+    running `process_forecasts()` on a `DataFramePortfolio`.
+    """
+
+    def test_twap_orders1(self) -> None:
+        order_type = "price@twap"
+        pricing_method = "last"
+        self._test_parity(order_type, pricing_method)
+
+    def test_end_orders1(self) -> None:
+        order_type = "price@end"
+        pricing_method = "twap.5T"
+        self._test_parity(order_type, pricing_method)
+
+    def test_start_orders1(self) -> None:
+        order_type = "price@start"
+        pricing_method = "last"
+        self._test_parity(order_type, pricing_method)
+
+    def test_liquidate_holdings1(self) -> None:
+        """
+        Liquidate the holdings at the end of the trading day and skip the bars
+        after it.
+        """
+        order_type = "price@twap"
+        pricing_method = "last"
+        config_overrides = {
+            "trading_end_time": datetime.time(10, 15),
+            "ath_end_time": datetime.time(10, 20),
+            "liquidate_at_trading_end_time": True,
+        }
+        portfolio_df, _ = self._test_parity(
+            order_type, pricing_method, config_overrides=config_overrides
+        )
+        # Check that the holdings are liquidated.
+        last_holdings_shares = portfolio_df["holdings_shares"].iloc[-1]
+        self.assertTrue((last_holdings_shares == 0).all())
+
+    def test_restrictions1(self) -> None:
+        order_type = "price@twap"
+        pricing_method = "last"
+        restrictions_df = pd.DataFrame(
+            {
+                "asset_id": [202],
+                "is_restricted": [False],
+                "is_buy_restricted": [True],
+                "is_buy_cover_restricted": [True],
+                "is_sell_short_restricted": [False],
+                "is_sell_long_restricted": [False],
+            }
+        )
+        portfolio_df, _ = self._test_parity(
+            order_type, pricing_method, restrictions_df=restrictions_df
+        )
+        # Check that the asset is never bought.
+        executed_trades_shares = portfolio_df["executed_trades_shares"][202]
+        self.assertTrue((executed_trades_shares <= 0).all())
+
+    @staticmethod
+    def _get_market_data_df() -> pd.DataFrame:
+        """
+        Build 1-minute bars with different prices for each asset.
+        """
+        start_datetime = pd.Timestamp(
+            "2000-01-01 09:30:00-05:00", tz="America/New_York"
+        )
+        end_datetime = pd.Timestamp(
+            "2000-01-01 10:30:00-05:00", tz="America/New_York"
+        )
+        columns = ["price"]
+        dfs = [
+            cofinanc.generate_random_price_data(
+                start_datetime, end_datetime, columns, [asset_id], seed=seed
+            )
+            for asset_id, seed in [(101, 1), (202, 2), (303, 3)]
+        ]
+        df = pd.concat(dfs).sort_values(["end_datetime", "asset_id"])
+        df = df.reset_index(drop=True)
+        return df
+
+    @staticmethod
+    def _get_predictions_and_volatility() -> Tuple[pd.DataFrame, pd.DataFrame]:
+        index = pd.date_range(
+            "2000-01-01 09:35:00",
+            "2000-01-01 10:25:00",
+            freq="5T",
+            tz="America/New_York",
+        )
+        # Asset 303 has no predictions and it is traded only because of the
+        # Gaussian ranking of the imputed zero predictions.
+        asset_ids = [101, 202]
+        prediction_data = [
+            [0.1, 0.2],
+            [-0.1, 0.3],
+            [-0.3, 0.0],
+            [0.2, -0.1],
+            [0.4, 0.1],
+            [-0.2, -0.3],
+            [0.1, 0.5],
+            [0.3, -0.2],
+            [-0.1, 0.1],
+            [0.2, 0.4],
+            [-0.4, 0.2],
+        ]
+        predictions = pd.DataFrame(prediction_data, index, asset_ids)
+        volatility_data = [[1.0, 2.0]] * len(index)
+        volatility = pd.DataFrame(volatility_data, index, asset_ids)
+        # Missing volatility is imputed with the mean.
+        volatility.iloc[3, 1] = np.nan
+        return predictions, volatility
+
+    def _test_parity(
+        self,
+        order_type: str,
+        pricing_method: str,
+        *,
+        config_overrides: Optional[Dict[str, Any]] = None,
+        restrictions_df: Optional[pd.DataFrame] = None,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Compare the state of the event-driven and of the batch simulation.
+
+        :return: the portfolio and statistics dfs of the batch simulation
+        """
+        df = self._get_market_data_df()
+        predictions, volatility = self._get_predictions_and_volatility()
+        config = _get_process_forecasts_dict(order_type)
+        if config_overrides is not None:
+            config.update(config_overrides)
+        asset_ids = [101, 202, 303]
+        # Run the event-driven simulation.
+        with hasynci.solipsism_context() as event_loop:
+            market_data, _ = mdata.get_ReplayedTimeMarketData_from_df(
+                event_loop,
+                5,
+                df,
+                delay_in_secs=0,
+                sleep_in_secs=30,
+                time_out_in_secs=60 * 5,
+            )
+            portfolio = opopoexa.get_DataFramePortfolio_example1(
+                event_loop,
+                market_data=market_data,
+                asset_ids=asset_ids,
+                pricing_method=pricing_method,
+            )
+            coroutine = oopprfo.process_forecasts(
+                predictions,
+                volatility,
+                portfolio,
+                config,
+                spread_df=None,
+                restrictions_df=restrictions_df,
+            )
+            hasynci.run(coroutine, event_loop=event_loop)
+            market_data_df = market_data.get_data_for_interval(
+                None, None, "end_datetime", asset_ids, ignore_delay=True
+            )
+        # Run the batch simulation.
+        initial_holdings_shares = pd.Series(
+            [0.0, 0.0, 0.0, 1e6], [101, 202, 303, oporport.Portfolio.CASH_ID]
+        )
+        portfolio_df, stats_df = oopprfo.simulate_process_forecasts(
+            predictions,
+            volatility,
+            market_data_df,
+            initial_holdings_shares,
+            config,
+            restrictions_df=restrictions_df,
+            pricing_method=pricing_method,
+        )
+        # Compare.
+        expected_dfs = {
+            "holdings_shares": portfolio.get_historical_holdings_shares(None),
+            "holdings_notional": portfolio.get_historical_holdings_notional(None),
+            "executed_trades_notional": portfolio.get_historical_executed_trades_notional(
+                None
+            ),
+            "pnl": portfolio.get_historical_pnl(None),
+        }
+        # The holdings can differ by round-off errors, e.g., 1e-15 shares
+        # instead of 0.
+        atol = 1e-6
+        for key, expected_df in expected_dfs.items():
+            actual_df = portfolio_df[key].loc[expected_df.index]
+            self.assert_dfs_close(
+                actual_df, expected_df, equal_nan=True, atol=atol
+            )
+        expected_stats_df = portfolio.get_historical_statistics(None)
+        actual_stats_df = stats_df.loc[expected_stats_df.index]
+        self.assert_dfs_close(
+            actual_stats_df, expected_stats_df, equal_nan=True, atol=atol
+        )
+        return portfolio_df, stats_df
+
+
 def _get_process_forecasts_dict(order_type: str) -> Dict[str, Any]:
     """
     Build process forecasts config.
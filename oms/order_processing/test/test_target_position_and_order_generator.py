@@ -1,5 +1,6 @@
 import logging
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -181,3 +182,90 @@ class TestTargetPositionAndOrderGenerator2(hunitest.TestCase):
             purify_text=True,
             fuzzy_match=True,
         )
+
+
+# #############################################################################
+# TestTargetPositionAndOrderGenerator3
+# #############################################################################
+
+
+class TestTargetPositionAndOrderGenerator3(hunitest.TestCase):
+    """
+    Check generating orders while enforcing restrictions.
+    """
+
+    # This will be run before and after each test.
+    @pytest.fixture(autouse=True)
+    def setup_teardown_test(self):
+        # Run before each test.
+        self.set_up_test()
+        yield
+        # Run after each test.
+        self.tear_down_test()
+
+    def set_up_test(self) -> None:
+        TestTargetPositionAndOrderGenerator1.reset()
+
+    def tear_down_test(self) -> None:
+        TestTargetPositionAndOrderGenerator1.reset()
+
+    def test_generate_orders1(self) -> None:
+        restrictions = pd.DataFrame(
+            {
+                "asset_id": [101, 202, 303, 404],
+                "is_buy_restricted": [True, False, False, False],
+                "is_buy_cover_restricted": [False, True, False, False],
+                "is_sell_short_restricted": [False, False, True, False],
+                "is_sell_long_restricted": [False, False, False, True],
+            }
+        )
+        with hasynci.solipsism_context() as event_loop:
+            market_data, _ = mdata.get_ReplayedTimeMarketData_example3(event_loop)
+            target_position_and_order_generator = (
+                otpaogeex.get_TargetPositionAndOrderGenerator_example1(
+                    event_loop, market_data, restrictions=restrictions
+                )
+            )
+        # For each restricted asset, the first trade is restricted and the
+        # second is allowed. Asset 505 has no restrictions.
+        shares_df = pd.DataFrame(
+            [
+                [0.0, 10.0],
+                [-10.0, 5.0],
+                [-10.0, 5.0],
+                [10.0, 5.0],
+                [0.0, -10.0],
+                [10.0, -10.0],
+                [10.0, -10.0],
+                [-10.0, -10.0],
+                [0.0, 10.0],
+                [0.0, np.nan],
+            ],
+            index=[101, 101, 202, 202, 303, 303, 404, 404, 505, 505],
+            columns=["holdings_shares", "target_trades_shares"],
+        )
+        timestamp = pd.Timestamp(
+            "2000-01-01 09:35:00-05:00", tz="America/New_York"
+        )
+        order_dict = {
+            "type_": "price@twap",
+            "creation_timestamp": timestamp,
+            "start_timestamp": timestamp,
+            "end_timestamp": timestamp + pd.Timedelta(minutes=5),
+        }
+        orders = target_position_and_order_generator._generate_orders(
+            shares_df, order_dict
+        )
+        actual = "\n".join(
+            f"{order.order_id} {order.asset_id} {order.curr_num_shares}"
+            f" {order.diff_num_shares}"
+            for order in orders
+        )
+        expected = r"""
+        0 101 -10.0 5.0
+        1 202 10.0 5.0
+        2 303 10.0 -10.0
+        3 404 -10.0 -10.0
+        4 505 0.0 10.0
+        """
+        self.assert_equal(actual, expected, dedent=True)
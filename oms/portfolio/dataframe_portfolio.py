@@ -4,16 +4,13 @@ Import as:
 import oms.portfolio.dataframe_portfolio as opdapor
 """
 
-import collections
 import logging
-from typing import Any, Dict
 
 import numpy as np
 import pandas as pd
 
 import helpers.hdbg as hdbg
 import helpers.hpandas as hpandas
-import helpers.hprint as hprint
 import oms.portfolio.portfolio as oporport
 
 _LOG = logging.getLogger(__name__)
@@ -195,39 +192,21 @@ class DataFramePortfolio(oporport.Portfolio):
             _LOG.debug("")
         # Get the fills from the broker.
         fills = self.broker.get_fills()
-        # Convert the fills into a `fills_df`.
-        fill_rows = []
-        for fill in fills:
-            if _LOG.isEnabledFor(logging.DEBUG):
-                _LOG.debug("# Processing fill=%s", fill)
-            # Copy contents of the fill.
-            fill_row: Dict[str, Any] = collections.OrderedDict()
-            fill_row.update(fill.to_dict())
-            #
-            fill_rows.append(pd.Series(fill_row))
-        #
-        if fill_rows:
-            # Infer type and timezone from the first fill since they are the
-            # same across fills.
-            timestamp_type = pd.Series([fill_rows[0]["timestamp"]]).dtype
-            if _LOG.isEnabledFor(logging.DEBUG):
-                _LOG.debug(hprint.to_str("timestamp_type"))
-            fills_df = pd.concat(fill_rows, axis=1).transpose()
+        if fills:
+            # Convert the fills into a `fills_df` at once, instead of building
+            # a row per fill and transposing, which loses the column types.
+            fills_df = pd.DataFrame([fill.to_dict() for fill in fills])
             # Coerce numerical data types.
             # - asset_id coercion to int64 may fail if there are NaNs (there
             #     should not be any NaNs)
             # - in general, num_shares and price should be floats, but without
             #   being this specific, they may get coerced to ints in certain
             #   edge cases
-            # - when transposing a df a timestamp type is lost (i.e. the type
-            #    becomes `object`), refer to
-            #   `https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.transpose.html`.
             fills_df = fills_df.astype(
                 {
                     "asset_id": "int64",
                     "num_shares": "float64",
                     "price": "float64",
-                    "timestamp": timestamp_type,
                 }
             )
         else:
@@ -15,6 +15,7 @@ import pandas as pd
 from tqdm.autonotebook import tqdm
 
 import core.key_sorted_ordered_dict as cksoordi
+import core.key_sorted_ring_buffer as cksoribu
 import helpers.hdbg as hdbg
 import helpers.hio as hio
 import helpers.hobject as hobject
@@ -22,6 +23,7 @@ import helpers.hpandas as hpandas
 import helpers.hprint as hprint
 import helpers.hwall_clock_time as hwacltim
 import oms.broker.broker as obrobrok
+import oms.portfolio.state_log as opstalog
 
 _LOG = logging.getLogger(__name__)
 
@@ -67,6 +69,17 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
     # TODO(Paul): Change "value" to "holdings_notional".
     PRICE_COLS = ["price", "value"]
 
+    # Statistics computed at each bar.
+    STATISTICS_COLS = [
+        "gross_volume",
+        "net_volume",
+        "gmv",
+        "nmv",
+        "cash",
+        "net_wealth",
+        "leverage",
+    ]
+
     def __init__(
         self,
         broker: obrobrok.Broker,
@@ -76,6 +89,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         *,
         retrieve_initial_holdings_from_db: bool = False,
         max_num_bars: Optional[int] = 100,
+        bookkeeping_storage: str = "ordered_dict",
     ):
         """
         Constructor.
@@ -95,6 +109,11 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
             holdings_shares must be a subset of the index of `initial_holdings`.
         :param max_num_bars: maximum number of market data bars to store in memory;
             if `None`, then impose no restriction
+        :param bookkeeping_storage: how to store the state over time
+            - "ordered_dict": one pandas object per bar
+            - "ring_buffer": NumPy arrays with one row per bar and one column
+              per asset, so that the historical accessors slice the arrays
+              instead of building dataframes from one object per bar
         """
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug(
@@ -104,7 +123,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
                     "pricing_method "
                     "initial_holdings_shares "
                     "retrieve_initial_holdings_from_db "
-                    "max_num_bars"
+                    "max_num_bars bookkeeping_storage"
                 )
             )
         # Set and unpack broker.
@@ -121,36 +140,33 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         (
             self._pricing_type,
             self._bar_duration_as_pd_str,
-        ) = self._parse_pricing_method(pricing_method)
+        ) = parse_pricing_method(pricing_method)
         # Initialize bookkeeping dictionaries.
         # At each call to `mark_to_market()`, we capture `wall_clock_time` and
         # perform a sequence of updates to the following dictionaries.
         self._max_num_bars = max_num_bars
-        # We use `KeySortedOrderedDict` keyed `timestamp` to:
+        hdbg.dassert_in(bookkeeping_storage, ["ordered_dict", "ring_buffer"])
+        self._bookkeeping_storage = bookkeeping_storage
+        # We use `KeySortedOrderedDict` (or `KeySortedRingBuffer`) keyed
+        # `timestamp` to:
         # - enforce that inserted new keys are always increasing according to the
         #   key order (i.e., increasing in time)
         # - simplify extracting the last timestamp
         # We initialize the collection of dictionaries from `holdings_shares_df`.
         # - timestamp to pd.Series of holdings in shares (indexed by asset_id)
         # - this does not include the "cash asset".
-        self._holdings_shares = cksoordi.KeySortedOrderedDict(
-            pd.Timestamp, self._max_num_bars
-        )
+        self._holdings_shares = self._get_bookkeeping_dict()
         # - timestamp to float value of cash
-        self._cash = cksoordi.KeySortedOrderedDict(
-            pd.Timestamp, self._max_num_bars
-        )
+        self._cash = self._get_bookkeeping_dict(is_scalar=True)
         # - timestamp to pd.DataFrame of price, value (indexed by asset_id)
-        self._holdings_notional = cksoordi.KeySortedOrderedDict(
-            pd.Timestamp, self._max_num_bars
+        self._holdings_notional = self._get_bookkeeping_dict(
+            fields=Portfolio.PRICE_COLS
         )
         # - timestamp to pd.Series of notional trades (indexed by asset_id)
-        self._executed_trades_notional = cksoordi.KeySortedOrderedDict(
-            pd.Timestamp, self._max_num_bars
-        )
+        self._executed_trades_notional = self._get_bookkeeping_dict()
         # - timestamp to pd.Series of statistics
-        self._statistics = cksoordi.KeySortedOrderedDict(
-            pd.Timestamp, self._max_num_bars
+        self._statistics = self._get_bookkeeping_dict(
+            columns=Portfolio.STATISTICS_COLS
         )
         # Validate universe and holdings_shares.
         self._retrieve_initial_holdings_shares_from_db = (
@@ -294,7 +310,8 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         Read and process logged Portfolio state.
 
         :param log_dir: store the state of a Portfolio in terms of its
-            components, one per dir
+            components, one per dir, either as CSV files or as a state log
+            (see `log_state()`)
         """
         holdings_shares_df = Portfolio._load_df_from_files(
             log_dir, "holdings_shares", tz
@@ -322,9 +339,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
             executed_trades_notional_df.columns = (
                 executed_trades_notional_df.columns.astype("int64")
             )
-        pnl_df = Portfolio._compute_pnl(
-            holdings_notional_df, executed_trades_notional_df
-        )
+        pnl_df = compute_pnl(holdings_notional_df, executed_trades_notional_df)
         dfs = {
             "holdings_shares": holdings_shares_df,
             "holdings_notional": holdings_notional_df,
@@ -554,8 +569,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return a dataframe of portfolio statistics over time.
         """
-        stats_odict = self._statistics.get_ordered_dict(num_periods)
-        df = pd.DataFrame(stats_odict).transpose()
+        df = self._get_historical_df(self._statistics, num_periods)
         # Add `pnl` by diffing the snapshots of `net_wealth`.
         # ```
         # pnl = df["net_wealth"].diff().rename("pnl").to_frame()
@@ -578,12 +592,9 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return a dataframe of portfolio holdings_shares in shares over time.
         """
-        asset_holdings_shares_odict = self._holdings_shares.get_ordered_dict(
-            num_periods
+        asset_holdings_shares = self._get_historical_df(
+            self._holdings_shares, num_periods
         )
-        asset_holdings_shares = pd.DataFrame(
-            asset_holdings_shares_odict
-        ).transpose()
         # # TODO(gp): @all there is a little repetition that we would like to remove.
         # # Explicitly cast to float. This makes the string representation of
         # # the dataframe more uniform and better.
@@ -599,10 +610,9 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return a dataframe of portfolio holdings_shares in dollars over time.
         """
-        holdings_notional = collections.OrderedDict()
-        for k, v in self._holdings_notional.get_ordered_dict(num_periods).items():
-            holdings_notional[k] = v["value"]
-        holdings_notional = pd.DataFrame(holdings_notional).transpose()
+        holdings_notional = self._get_historical_df(
+            self._holdings_notional, num_periods, field="value"
+        )
         holdings_notional.columns.name = self._asset_id_col
         # Explicitly cast to float. This makes the string representation of
         # the dataframe more uniform and better.
@@ -644,12 +654,9 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Return a dataframe of notional executed trades over time.
         """
-        executed_trades_notional_odict = (
-            self._executed_trades_notional.get_ordered_dict(num_periods)
+        executed_trades_notional = self._get_historical_df(
+            self._executed_trades_notional, num_periods
         )
-        executed_trades_notional = pd.DataFrame(
-            executed_trades_notional_odict
-        ).transpose()
         executed_trades_notional.columns.name = self._asset_id_col
         # Explicitly cast to float. This makes the string representation of
         # the dataframe more uniform and better.
@@ -680,7 +687,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
             num_periods
         )
         # Compute PnL.
-        pnl = self._compute_pnl(holdings_notional, executed_trades_notional)
+        pnl = compute_pnl(holdings_notional, executed_trades_notional)
         #
         pnl.columns.name = self._asset_id_col
         pnl = pnl.astype("float")
@@ -690,7 +697,22 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
 
     # /////////////////////////////////////////////////////////////////////////////
 
-    def log_state(self, log_dir: str, *, num_periods: Optional[int] = 1) -> str:
+    def log_state(
+        self,
+        log_dir: str,
+        *,
+        num_periods: Optional[int] = 1,
+        use_state_log: bool = False,
+    ) -> str:
+        """
+        Log the state of the Portfolio to `log_dir`, one dir per component.
+
+        :param num_periods: number of most recent periods to log
+        :param use_state_log: append the state to the per-day segments of the
+            state log (see `oms.portfolio.state_log`) from a background
+            thread, instead of writing one CSV file per component and bar
+        :return: name of the CSV files
+        """
         hdbg.dassert(log_dir, "Must specify `log_dir` to log state.")
         #
         bar_timestamp = hwacltim.get_current_bar_timestamp(as_str=True)
@@ -699,34 +721,33 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         wall_clock_time_str = wall_clock_time.strftime("%Y%m%d_%H%M%S")
         file_name = f"{bar_timestamp}.{wall_clock_time_str}.csv"
         #
-        holdings_shares_df = self.get_historical_holdings_shares(num_periods)
-        Portfolio._write_df(
-            holdings_shares_df, log_dir, "holdings_shares", file_name
-        )
-        #
-        holdings_notional_df = self.get_historical_holdings_notional(num_periods)
-        Portfolio._write_df(
-            holdings_notional_df, log_dir, "holdings_notional", file_name
-        )
-        #
-        executed_trades_shares = self.get_historical_executed_trades_shares(
-            num_periods
-        )
-        Portfolio._write_df(
-            executed_trades_shares, log_dir, "executed_trades_shares", file_name
-        )
-        executed_trades_notional_df = (
-            self.get_historical_executed_trades_notional(num_periods)
-        )
-        Portfolio._write_df(
-            executed_trades_notional_df,
-            log_dir,
-            "executed_trades_notional",
-            file_name,
-        )
-        #
-        stats_df = self.get_historical_statistics(num_periods)
-        Portfolio._write_df(stats_df, log_dir, "statistics", file_name)
+        dfs = {
+            "holdings_shares": self.get_historical_holdings_shares(num_periods),
+            "holdings_notional": self.get_historical_holdings_notional(
+                num_periods
+            ),
+            "executed_trades_shares": self.get_historical_executed_trades_shares(
+                num_periods
+            ),
+            "executed_trades_notional": self.get_historical_executed_trades_notional(
+                num_periods
+            ),
+            "statistics": self.get_historical_statistics(num_periods),
+        }
+        if use_state_log:
+            # Use the wall clock time when there is no bar, like in the file
+            # names.
+            state_log_bar_timestamp = (
+                hwacltim.get_current_bar_timestamp() or wall_clock_time
+            )
+            writer = opstalog.get_state_log_writer()
+            for name, df in dfs.items():
+                writer.append(
+                    os.path.join(log_dir, name), df, state_log_bar_timestamp
+                )
+        else:
+            for name, df in dfs.items():
+                Portfolio._write_df(df, log_dir, name, file_name)
         return file_name
 
     def price_assets(self, asset_ids: List[int]) -> pd.Series:
@@ -771,20 +792,28 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         name: str,
         tz: str,
     ) -> pd.DataFrame:
-        # Find the files under `log_dir/{name}`.
         dir_name = os.path.join(log_dir, name)
-        pattern = "*"
-        only_files = True
-        use_relative_paths = True
-        files = hio.listdir(dir_name, pattern, only_files, use_relative_paths)
-        files.sort()
-        # Read each file as dataframe.
-        dfs = []
-        for file_name in tqdm(files, desc=f"Loading `{name}` files..."):
-            df = Portfolio._read_df(log_dir, name, file_name, tz)
-            dfs.append(df)
-        # Concatenate.
-        df = pd.concat(dfs)
+        if opstalog.has_state_log(dir_name):
+            # Read all the bars at once from the state log.
+            df = opstalog.read_state_log(dir_name)
+            # The dataframes without rows (e.g., when there are no trades) may
+            # not have a DatetimeIndex, like when reading them from CSV files.
+            if isinstance(df.index, pd.DatetimeIndex):
+                df.index = df.index.tz_convert(tz)
+        else:
+            # Find the files under `log_dir/{name}`.
+            pattern = "*"
+            only_files = True
+            use_relative_paths = True
+            files = hio.listdir(dir_name, pattern, only_files, use_relative_paths)
+            files.sort()
+            # Read each file as dataframe.
+            dfs = []
+            for file_name in tqdm(files, desc=f"Loading `{name}` files..."):
+                df = Portfolio._read_df(log_dir, name, file_name, tz)
+                dfs.append(df)
+            # Concatenate.
+            df = pd.concat(dfs)
         hdbg.dassert(
             not df.index.has_duplicates,
             "Duplicated indices for `%s`=\n%s",
@@ -822,46 +851,31 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
     # //////////////////////////////////////////////////////////////////////////////
 
     @staticmethod
-    def _parse_pricing_method(pricing_method: str) -> Tuple[str, Optional[str]]:
+    def _get_historical_df(
+        bookkeeping_dict: Any,
+        num_periods: Optional[int],
+        *,
+        field: Optional[str] = None,
+    ) -> pd.DataFrame:
         """
-        Parse a pricing method string (e.g., `last`, `twap.5T`) in terms of:
+        Return the last `num_periods` values of a bookkeeping dict as a
+        dataframe indexed by timestamp.
 
-        - Pricing type (e.g., `last`, `twap`, `vwap`)
-        - Bar duration as a Pandas duration string (e.g., `5T`)
+        :param bookkeeping_dict: a `KeySortedOrderedDict` or a
+            `KeySortedRingBuffer`
+        :param field: the column to extract from dataframe values
         """
-
-        hdbg.dassert_isinstance(pricing_method, str)
-        if pricing_method == "last":
-            pricing_type = "last"
-            bar_duration_as_pd_str = None
+        if isinstance(bookkeeping_dict, cksoribu.KeySortedRingBuffer):
+            # Slice the buffer directly.
+            df = bookkeeping_dict.get_df(num_periods, field=field)
         else:
-            split_str = pricing_method.split(".")
-            hdbg.dassert_eq(len(split_str), 2)
-            #
-            pricing_type = split_str[0]
-            hdbg.dassert_in(pricing_type, ["twap", "vwap"])
-            #
-            bar_duration_as_pd_str = split_str[1]
-            hdbg.dassert(
-                pd.Timedelta(bar_duration_as_pd_str),
-                "Cannot convert %s to `pd.Timedelta`",
-                bar_duration_as_pd_str,
-            )
-        return pricing_type, bar_duration_as_pd_str
-
-    @staticmethod
-    def _compute_pnl(
-        holdings_notional: pd.DataFrame,
-        executed_trades_notional: pd.DataFrame,
-    ) -> pd.DataFrame:
-        hdbg.dassert_not_in(Portfolio.CASH_ID, holdings_notional.columns)
-        hdbg.dassert_not_in(Portfolio.CASH_ID, executed_trades_notional.columns)
-        # TODO(Grisha): enable the check, see "Add missing assets to the
-        # executed_trades_notional" CmTask5223 for details.
-        # hpandas.dassert_columns_equal(holdings_notional, executed_trades_notional)
-        # Get per-bar flows and compute PnL.
-        pnl = holdings_notional.diff().subtract(executed_trades_notional)
-        return pnl
+            odict = bookkeeping_dict.get_ordered_dict(num_periods)
+            if field is not None:
+                odict = collections.OrderedDict(
+                    (k, v[field]) for k, v in odict.items()
+                )
+            df = pd.DataFrame(odict).transpose()
+        return df
 
     @staticmethod
     def _create_holdings_df_from_cash(
@@ -938,6 +952,36 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         if initial_cash < 0:
             _LOG.warning("Initial cash balance=%0.2f", initial_cash)
 
+    def _get_bookkeeping_dict(
+        self,
+        *,
+        columns: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None,
+        is_scalar: bool = False,
+    ) -> Any:
+        """
+        Build a dict keyed by timestamp to store the state over time.
+
+        See `KeySortedRingBuffer` for the params.
+        """
+        if self._bookkeeping_storage == "ordered_dict":
+            bookkeeping_dict = cksoordi.KeySortedOrderedDict(
+                pd.Timestamp, self._max_num_bars
+            )
+        elif self._bookkeeping_storage == "ring_buffer":
+            bookkeeping_dict = cksoribu.KeySortedRingBuffer(
+                pd.Timestamp,
+                self._max_num_bars,
+                columns=columns,
+                fields=fields,
+                is_scalar=is_scalar,
+            )
+        else:
+            raise ValueError(
+                f"Invalid bookkeeping_storage='{self._bookkeeping_storage}'"
+            )
+        return bookkeeping_dict
+
     def _set_holdings_shares(self, holdings_shares: pd.Series) -> None:
         """
         Set portfolio holdings_shares in shares and price the portfolio.
@@ -1083,5 +1127,55 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
             "net_wealth": net_wealth,
             "leverage": leverage,
         }
+        hdbg.dassert_eq(list(dict_.keys()), Portfolio.STATISTICS_COLS)
         statistics = pd.Series(dict_, name=cash_timestamp)
         self._statistics[cash_timestamp] = statistics
+
+
+# #############################################################################
+# Utils
+# #############################################################################
+
+
+def parse_pricing_method(pricing_method: str) -> Tuple[str, Optional[str]]:
+    """
+    Parse a pricing method string (e.g., `last`, `twap.5T`) in terms of:
+
+    - Pricing type (e.g., `last`, `twap`, `vwap`)
+    - Bar duration as a Pandas duration string (e.g., `5T`)
+    """
+    hdbg.dassert_isinstance(pricing_method, str)
+    if pricing_method == "last":
+        pricing_type = "last"
+        bar_duration_as_pd_str = None
+    else:
+        split_str = pricing_method.split(".")
+        hdbg.dassert_eq(len(split_str), 2)
+        #
+        pricing_type = split_str[0]
+        hdbg.dassert_in(pricing_type, ["twap", "vwap"])
+        #
+        bar_duration_as_pd_str = split_str[1]
+        hdbg.dassert(
+            pd.Timedelta(bar_duration_as_pd_str),
+            "Cannot convert %s to `pd.Timedelta`",
+            bar_duration_as_pd_str,
+        )
+    return pricing_type, bar_duration_as_pd_str
+
+
+def compute_pnl(
+    holdings_notional: pd.DataFrame,
+    executed_trades_notional: pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Compute the per-bar PnL of each asset from the holdings and the trades.
+    """
+    hdbg.dassert_not_in(Portfolio.CASH_ID, holdings_notional.columns)
+    hdbg.dassert_not_in(Portfolio.CASH_ID, executed_trades_notional.columns)
+    # TODO(Grisha): enable the check, see "Add missing assets to the
+    # executed_trades_notional" CmTask5223 for details.
+    # hpandas.dassert_columns_equal(holdings_notional, executed_trades_notional)
+    # Get per-bar flows and compute PnL.
+    pnl = holdings_notional.diff().subtract(executed_trades_notional)
+    return pnl
@@ -37,6 +37,7 @@ def get_DataFramePortfolio_example1(
     timestamp_col: str = "end_datetime",
     asset_ids: Optional[List[int]] = None,
     column_remap: Optional[Dict[str, str]] = None,
+    bookkeeping_storage: str = "ordered_dict",
 ) -> opodapor.DataFramePortfolio:
     """
     Contain:
@@ -61,6 +62,7 @@ def get_DataFramePortfolio_example1(
         #
         initial_cash=initial_cash,
         asset_ids=asset_ids,
+        bookkeeping_storage=bookkeeping_storage,
     )
     return portfolio
 
@@ -0,0 +1,317 @@
+"""
+Store the state logged every bar in append-only columnar segments.
+
+The state of `Portfolio` and `TargetPositionAndOrderGenerator` is logged
+every bar as a small dataframe (e.g., `holdings_shares`, `target_positions`).
+Instead of writing one CSV file per bar and dataframe, the rows of each bar
+are appended as a record batch to an Arrow IPC stream, one segment per day
+and dir, e.g.,
+```
+{log_dir}/holdings_shares/20000101_093500.arrows
+{log_dir}/holdings_shares/20000102_093500.arrows
+```
+so that the state of a day, or of a range of bars, is loaded with a single
+read per segment and one conversion to pandas.
+
+Import as:
+
+import oms.portfolio.state_log as opstalog
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+import helpers.hdbg as hdbg
+import helpers.hio as hio
+import helpers.hthreading as hthread
+
+_LOG = logging.getLogger(__name__)
+
+# Extension of the segment files.
+_SEGMENT_EXT = ".arrows"
+# Column storing the bar timestamp of each row.
+_BAR_TIMESTAMP_COL = "__bar_timestamp__"
+# Column storing the index of unnamed dataframes, as in `pa.Table.from_pandas()`.
+_UNNAMED_INDEX_COL = "__index_level_0__"
+
+
+# #############################################################################
+# Read state log
+# #############################################################################
+
+
+def has_state_log(dir_name: str) -> bool:
+    """
+    Return whether `dir_name` contains a state log.
+    """
+    if not os.path.isdir(dir_name):
+        return False
+    has_segments = any(
+        file_name.endswith(_SEGMENT_EXT) for file_name in os.listdir(dir_name)
+    )
+    return has_segments
+
+
+def read_state_log(
+    dir_name: str,
+    *,
+    start_bar_timestamp: Optional[pd.Timestamp] = None,
+    end_bar_timestamp: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """
+    Read the dataframes appended to the state log in `dir_name`.
+
+    The rows of all the bars are concatenated, like reading all the CSV files
+    written by `df.to_csv()` and concatenating them, e.g.,
+    ```
+                               101     202
+    2000-01-01 09:35:00-05:00  0.0   100.0
+    2000-01-01 09:40:00-05:00  0.0  -100.0
+    ```
+    The column names are strings, since Arrow column names are strings.
+
+    :param dir_name: dir with the segments written by `StateLogWriter`
+    :param start_bar_timestamp: first bar to read, if not `None`
+    :param end_bar_timestamp: last bar to read, if not `None`
+    :return: rows of the selected bars, in the order they were logged
+    """
+    # Make sure that the rows queued in this process are on disk.
+    if _STATE_LOG_WRITER is not None:
+        _STATE_LOG_WRITER.flush()
+    file_names = _get_segment_file_names(
+        dir_name, start_bar_timestamp, end_bar_timestamp
+    )
+    hdbg.dassert_lte(1, len(file_names), "No segments in '%s'", dir_name)
+    tables = [_read_segment(file_name) for file_name in file_names]
+    # Skip the segments without rows, e.g., written for the bars without
+    # trades, unless there are no rows at all, so that an empty dataframe
+    # with the logged columns is returned.
+    non_empty_tables = [table for table in tables if table.num_rows > 0]
+    if non_empty_tables:
+        tables = non_empty_tables
+    # Concatenate all the segments once, filling the columns missing in some
+    # segments (e.g., assets that were not always traded) with nulls and
+    # upcasting the types that differ (e.g., int and float holdings), like
+    # `pd.concat()`.
+    table = pa.concat_tables(tables, promote_options="permissive")
+    # Filter the bars.
+    bar_timestamps = table.column(_BAR_TIMESTAMP_COL).to_pandas()
+    mask = pd.Series(True, index=bar_timestamps.index)
+    if start_bar_timestamp is not None:
+        mask &= bar_timestamps >= start_bar_timestamp
+    if end_bar_timestamp is not None:
+        mask &= bar_timestamps <= end_bar_timestamp
+    if not mask.all():
+        table = table.filter(pa.array(mask.to_numpy()))
+    # Convert to pandas using the index column, ignoring the pandas metadata
+    # of the single segments.
+    pandas_metadata = table.schema.pandas_metadata
+    hdbg.dassert_is_not(pandas_metadata, None)
+    index_cols = pandas_metadata["index_columns"]
+    hdbg.dassert_eq(len(index_cols), 1, "Invalid index in '%s'", dir_name)
+    index_col = index_cols[0]
+    table = table.drop([_BAR_TIMESTAMP_COL]).replace_schema_metadata(None)
+    df = table.to_pandas()
+    df = df.set_index(index_col)
+    if index_col == _UNNAMED_INDEX_COL:
+        df.index.name = None
+    return df
+
+
+def _get_segment_file_names(
+    dir_name: str,
+    start_bar_timestamp: Optional[pd.Timestamp],
+    end_bar_timestamp: Optional[pd.Timestamp],
+) -> List[str]:
+    """
+    Return the segments in `dir_name` that can contain the requested bars.
+    """
+    pattern = f"*{_SEGMENT_EXT}"
+    only_files = True
+    use_relative_paths = True
+    file_names = hio.listdir(dir_name, pattern, only_files, use_relative_paths)
+    file_names.sort(key=_get_segment_sort_key)
+    # The name of a segment starts with the day of its bars in the timezone of
+    # the bar timestamps, which can differ from the one of the requested
+    # timestamps, so keep one day of margin.
+    one_day = pd.Timedelta(days=1)
+    if start_bar_timestamp is not None:
+        start_day = (start_bar_timestamp - one_day).strftime("%Y%m%d")
+        file_names = [
+            file_name for file_name in file_names if file_name[:8] >= start_day
+        ]
+    if end_bar_timestamp is not None:
+        end_day = (end_bar_timestamp + one_day).strftime("%Y%m%d")
+        file_names = [
+            file_name for file_name in file_names if file_name[:8] <= end_day
+        ]
+    file_names = [os.path.join(dir_name, file_name) for file_name in file_names]
+    return file_names
+
+
+def _get_segment_sort_key(file_name: str) -> Tuple[str, int]:
+    """
+    Return the key to sort the segments in the order they were written.
+
+    A segment started by a rerun on the bar of an existing segment has a
+    collision index, e.g., `20000101_093500.2.arrows`, that is sorted as a
+    number after the segment without it, e.g., `20000101_093500.arrows`.
+    """
+    hdbg.dassert(file_name.endswith(_SEGMENT_EXT), "Invalid file '%s'", file_name)
+    prefix, _, idx = file_name[: -len(_SEGMENT_EXT)].partition(".")
+    key = (prefix, int(idx) if idx else 0)
+    return key
+
+
+def _read_segment(file_name: str) -> pa.Table:
+    """
+    Read the record batches of a segment.
+
+    The last batch is skipped if it is incomplete, e.g., if the process
+    crashed while writing it.
+    """
+    batches = []
+    with pa.OSFile(file_name, "rb") as f:
+        reader = pa.ipc.open_stream(f)
+        try:
+            for batch in reader:
+                batches.append(batch)
+        except pa.ArrowInvalid as e:
+            _LOG.warning(
+                "Skipping the truncated last batch of '%s': %s", file_name, e
+            )
+        table = pa.Table.from_batches(batches, schema=reader.schema)
+    return table
+
+
+# #############################################################################
+# StateLogWriter
+# #############################################################################
+
+
+class StateLogWriter(hthread.BackgroundWriter):
+    """
+    Append dataframes to state logs from a background thread.
+
+    The dataframes are converted to Arrow record batches when they are
+    appended, so that later changes to them don't affect what is written,
+    and then queued. The background thread appends the batches to the
+    current segment of each dir, which is kept open and flushed after each
+    write, so that the rows are readable as soon as they are written.
+
+    A new segment is started when the day of the bars changes or when the
+    columns of the dataframes change (e.g., a new asset is traded), since all
+    the batches of an Arrow stream have the same schema.
+    """
+
+    def __init__(self) -> None:
+        # Map from dir to the current segment as `(day, schema, file, stream
+        # writer)`. It is accessed only by the background thread.
+        self._segments: Dict[
+            str, Tuple[str, pa.Schema, Any, pa.ipc.RecordBatchStreamWriter]
+        ] = {}
+        super().__init__()
+
+    def append(
+        self, dir_name: str, df: pd.DataFrame, bar_timestamp: pd.Timestamp
+    ) -> None:
+        """
+        Queue the rows of a dataframe to be appended to the state log.
+
+        :param dir_name: dir of the state log, which is created if needed
+        :param df: dataframe to append; an empty dataframe (e.g., the trades
+            of a bar without trades) is written only when the dir has no
+            segment yet, so that the state log exists and keeps the columns
+        :param bar_timestamp: bar the rows refer to, used to select the rows
+            when reading them back
+        """
+        hdbg.dassert_isinstance(df, pd.DataFrame)
+        hdbg.dassert_isinstance(bar_timestamp, pd.Timestamp)
+        # Arrow column names must be strings, e.g., asset ids become strings
+        # like when reading a CSV file.
+        df = df.rename(columns=str)
+        hdbg.dassert_not_in(_BAR_TIMESTAMP_COL, df.columns)
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        bar_timestamps = pa.array(
+            [bar_timestamp] * len(df),
+            type=pa.timestamp("ns", tz=bar_timestamp.tz),
+        )
+        table = table.append_column(_BAR_TIMESTAMP_COL, bar_timestamps)
+        batches = table.combine_chunks().to_batches()
+        if batches:
+            batch = batches[0]
+        else:
+            # A table without rows has no batches.
+            batch = pa.RecordBatch.from_pylist([], schema=table.schema)
+        self._put((dir_name, bar_timestamp, batch))
+
+    def _write_items(
+        self, items: List[Tuple[str, pd.Timestamp, pa.RecordBatch]]
+    ) -> None:
+        for dir_name, bar_timestamp, batch in items:
+            self._write_batch(dir_name, bar_timestamp, batch)
+
+    def _on_close(self) -> None:
+        for _, _, f, writer in self._segments.values():
+            writer.close()
+            f.close()
+        self._segments = {}
+
+    def _write_batch(
+        self, dir_name: str, bar_timestamp: pd.Timestamp, batch: pa.RecordBatch
+    ) -> None:
+        segment = self._segments.get(dir_name)
+        if batch.num_rows == 0 and segment is not None:
+            # The dir already has a segment, so there is nothing to write.
+            return
+        bar_timestamp_str = bar_timestamp.strftime("%Y%m%d_%H%M%S")
+        day = bar_timestamp_str[:8]
+        if segment is not None:
+            segment_day, schema, f, writer = segment
+            if segment_day != day or not schema.equals(
+                batch.schema, check_metadata=False
+            ):
+                writer.close()
+                f.close()
+                segment = None
+        if segment is None:
+            # Start a new segment, without overwriting the ones written by
+            # previous runs.
+            hio.create_dir(dir_name, incremental=True)
+            file_name = os.path.join(dir_name, bar_timestamp_str + _SEGMENT_EXT)
+            idx = 1
+            while os.path.exists(file_name):
+                file_name = os.path.join(
+                    dir_name, f"{bar_timestamp_str}.{idx}{_SEGMENT_EXT}"
+                )
+                idx += 1
+            _LOG.debug("Starting segment '%s'", file_name)
+            f = open(file_name, "wb")
+            writer = pa.ipc.new_stream(f, batch.schema)
+            segment = (day, batch.schema, f, writer)
+            self._segments[dir_name] = segment
+        _, _, f, writer = segment
+        writer.write_batch(batch)
+        f.flush()
+
+
+# The writer shared by all the objects logging state in this process, so that
+# the segments stay open across objects built for each bar.
+_STATE_LOG_WRITER: Optional[StateLogWriter] = None
+_STATE_LOG_WRITER_LOCK = threading.Lock()
+
+
+def get_state_log_writer() -> StateLogWriter:
+    """
+    Return the state log writer of this process, creating it if needed.
+    """
+    global _STATE_LOG_WRITER
+    with _STATE_LOG_WRITER_LOCK:
+        if _STATE_LOG_WRITER is None or _STATE_LOG_WRITER._is_closed:
+            _STATE_LOG_WRITER = StateLogWriter()
+        return _STATE_LOG_WRITER
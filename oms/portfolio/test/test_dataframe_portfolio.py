@@ -1,16 +1,21 @@
+import asyncio
 import io
 import logging
+import os
 
 import pandas as pd
 
 import core.real_time as creatime
 import helpers.hasyncio as hasynci
+import helpers.hpandas as hpandas
 import helpers.hprint as hprint
 import helpers.hunit_test as hunitest
 import market_data as mdata
 import oms.broker.broker_example as obrbrexa
 import oms.portfolio.dataframe_portfolio as opodapor
+import oms.portfolio.portfolio as oporport
 import oms.portfolio.portfolio_example as opopoexa
+import oms.portfolio.state_log as opstalog
 
 _LOG = logging.getLogger(__name__)
 
@@ -242,3 +247,66 @@ class TestDataFramePortfolio2(hunitest.TestCase):
             leverage                            0.0"""
             actual = portfolio.get_historical_statistics().transpose()
             self.assert_equal(str(actual), expected, fuzzy_match=True)
+
+
+# #############################################################################
+# TestDataFramePortfolio3
+# #############################################################################
+
+
+class TestDataFramePortfolio3(hunitest.TestCase):
+    """
+    Check the `log_state()`/`read_state()` round trip without trades.
+    """
+
+    def test_state_log1(self) -> None:
+        """
+        Verify that the state log is read like the CSV files.
+        """
+        csv_log_dir = os.path.join(self.get_scratch_space(), "csv")
+        state_log_dir = os.path.join(self.get_scratch_space(), "state_log")
+        for log_dir, use_state_log in [
+            (csv_log_dir, False),
+            (state_log_dir, True),
+        ]:
+            with hasynci.solipsism_context() as event_loop:
+                coroutine = self._log_state(event_loop, log_dir, use_state_log)
+                hasynci.run(coroutine, event_loop=event_loop)
+        opstalog.get_state_log_writer().flush()
+        self.assertTrue(
+            opstalog.has_state_log(
+                os.path.join(state_log_dir, "executed_trades_shares")
+            )
+        )
+        # Check.
+        expected_portfolio_df, expected_stats_df = oporport.Portfolio.read_state(
+            csv_log_dir
+        )
+        actual_portfolio_df, actual_stats_df = oporport.Portfolio.read_state(
+            state_log_dir
+        )
+        self.assert_equal(
+            hpandas.df_to_str(actual_portfolio_df, num_rows=None),
+            hpandas.df_to_str(expected_portfolio_df, num_rows=None),
+        )
+        self.assert_equal(
+            hpandas.df_to_str(actual_stats_df, num_rows=None),
+            hpandas.df_to_str(expected_stats_df, num_rows=None),
+        )
+
+    @staticmethod
+    async def _log_state(
+        event_loop: asyncio.AbstractEventLoop, log_dir: str, use_state_log: bool
+    ) -> None:
+        """
+        Log the state of a Portfolio with only cash for 2 bars.
+        """
+        market_data, _ = mdata.get_ReplayedTimeMarketData_example3(event_loop)
+        portfolio = opopoexa.get_DataFramePortfolio_example1(
+            event_loop,
+            market_data=market_data,
+        )
+        for _ in range(2):
+            portfolio.mark_to_market()
+            portfolio.log_state(log_dir, use_state_log=use_state_log)
+            await asyncio.sleep(60 * 5)
@@ -0,0 +1,183 @@
+import os
+
+import pandas as pd
+
+import helpers.hpandas as hpandas
+import helpers.hunit_test as hunitest
+import oms.portfolio.state_log as opstalog
+
+
+def _append_holdings(writer: opstalog.StateLogWriter, dir_name: str) -> None:
+    """
+    Append holdings for 3 bars on one day and 2 bars on the next day.
+
+    A new asset is traded starting from the third bar.
+    """
+    tz = "America/New_York"
+    bar_timestamps = pd.date_range(
+        "2000-01-01 09:35", periods=3, freq="5T", tz=tz
+    ).append(pd.date_range("2000-01-02 09:35", periods=2, freq="5T", tz=tz))
+    for idx, bar_timestamp in enumerate(bar_timestamps):
+        asset_ids = [101, 202] if idx < 2 else [101, 202, 303]
+        df = pd.DataFrame(
+            [[float(idx)] * len(asset_ids)], [bar_timestamp], asset_ids
+        )
+        writer.append(dir_name, df, bar_timestamp)
+    # Empty dataframes are skipped, since the dir already has a segment.
+    writer.append(dir_name, pd.DataFrame(), bar_timestamps[-1])
+
+
+# #############################################################################
+# TestStateLog1
+# #############################################################################
+
+
+class TestStateLog1(hunitest.TestCase):
+    def test_read_state_log1(self) -> None:
+        """
+        Read all the bars across days and schema changes.
+        """
+        dir_name = os.path.join(self.get_scratch_space(), "holdings_shares")
+        writer = opstalog.StateLogWriter()
+        _append_holdings(writer, dir_name)
+        writer.close()
+        # Check the segments.
+        actual = "\n".join(sorted(os.listdir(dir_name)))
+        expected = r"""
+        20000101_093500.arrows
+        20000101_094500.arrows
+        20000102_093500.arrows
+        """
+        self.assert_equal(actual, expected, dedent=True)
+        # Check the data.
+        self.assertTrue(opstalog.has_state_log(dir_name))
+        df = opstalog.read_state_log(dir_name)
+        actual = hpandas.df_to_str(df, num_rows=None)
+        expected = r"""
+                                   101  202  303
+        2000-01-01 09:35:00-05:00  0.0  0.0  NaN
+        2000-01-01 09:40:00-05:00  1.0  1.0  NaN
+        2000-01-01 09:45:00-05:00  2.0  2.0  2.0
+        2000-01-02 09:35:00-05:00  3.0  3.0  3.0
+        2000-01-02 09:40:00-05:00  4.0  4.0  4.0
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_read_state_log2(self) -> None:
+        """
+        Read a range of bars.
+        """
+        dir_name = os.path.join(self.get_scratch_space(), "holdings_shares")
+        writer = opstalog.StateLogWriter()
+        _append_holdings(writer, dir_name)
+        writer.flush()
+        # Read while the segments are still being written.
+        df = opstalog.read_state_log(
+            dir_name,
+            start_bar_timestamp=pd.Timestamp("2000-01-01 09:40:00-05:00"),
+            end_bar_timestamp=pd.Timestamp("2000-01-02 09:35:00-05:00"),
+        )
+        writer.close()
+        actual = hpandas.df_to_str(df, num_rows=None)
+        expected = r"""
+                                   101  202  303
+        2000-01-01 09:40:00-05:00  1.0  1.0  NaN
+        2000-01-01 09:45:00-05:00  2.0  2.0  2.0
+        2000-01-02 09:35:00-05:00  3.0  3.0  3.0
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_truncated_segment1(self) -> None:
+        """
+        Skip a batch that was not completely written.
+        """
+        dir_name = os.path.join(self.get_scratch_space(), "holdings_shares")
+        writer = opstalog.StateLogWriter()
+        _append_holdings(writer, dir_name)
+        writer.flush()
+        # Simulate a crash while writing the last segment.
+        file_name = os.path.join(dir_name, "20000102_093500.arrows")
+        with open(file_name, "ab") as f:
+            f.write(b"\xff\xff\xff\xff\x10\x00")
+        df = opstalog.read_state_log(dir_name)
+        actual = hpandas.df_to_str(df, num_rows=None)
+        expected = r"""
+                                   101  202  303
+        2000-01-01 09:35:00-05:00  0.0  0.0  NaN
+        2000-01-01 09:40:00-05:00  1.0  1.0  NaN
+        2000-01-01 09:45:00-05:00  2.0  2.0  2.0
+        2000-01-02 09:35:00-05:00  3.0  3.0  3.0
+        2000-01-02 09:40:00-05:00  4.0  4.0  4.0
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_has_state_log1(self) -> None:
+        """
+        Check that a dir with CSV files is not a state log.
+        """
+        dir_name = os.path.join(self.get_scratch_space(), "holdings_shares")
+        self.assertFalse(opstalog.has_state_log(dir_name))
+        os.makedirs(dir_name)
+        pd.DataFrame([[1.0]]).to_csv(os.path.join(dir_name, "file.csv"))
+        self.assertFalse(opstalog.has_state_log(dir_name))
+
+    def test_read_state_log3(self) -> None:
+        """
+        Read a state log with only empty dataframes, e.g., without trades.
+        """
+        dir_name = os.path.join(
+            self.get_scratch_space(), "executed_trades_shares"
+        )
+        writer = opstalog.StateLogWriter()
+        tz = "America/New_York"
+        bar_timestamps = pd.date_range(
+            "2000-01-01 09:35", periods=2, freq="5T", tz=tz
+        )
+        for bar_timestamp in bar_timestamps:
+            df = pd.DataFrame(
+                columns=[101, 202], index=pd.DatetimeIndex([], tz=tz)
+            ).astype(float)
+            writer.append(dir_name, df, bar_timestamp)
+        writer.close()
+        # Check that a single segment is written.
+        actual = "\n".join(sorted(os.listdir(dir_name)))
+        expected = r"""
+        20000101_093500.arrows
+        """
+        self.assert_equal(actual, expected, dedent=True)
+        # Check the data.
+        self.assertTrue(opstalog.has_state_log(dir_name))
+        df = opstalog.read_state_log(dir_name)
+        self.assertEqual(df.columns.to_list(), ["101", "202"])
+        self.assertEqual(len(df), 0)
+        self.assertIsInstance(df.index, pd.DatetimeIndex)
+
+    def test_read_state_log4(self) -> None:
+        """
+        Read the segments written by reruns on the same bar in the order they
+        were written.
+        """
+        dir_name = os.path.join(self.get_scratch_space(), "holdings_shares")
+        bar_timestamp = pd.Timestamp("2000-01-01 09:35", tz="America/New_York")
+        # Run 12 times, so that the collision index has 2 digits.
+        for idx in range(12):
+            writer = opstalog.StateLogWriter()
+            df = pd.DataFrame([[float(idx)]], [bar_timestamp], [101])
+            writer.append(dir_name, df, bar_timestamp)
+            writer.close()
+        # Check the segments.
+        file_names = opstalog._get_segment_file_names(dir_name, None, None)
+        actual = "\n".join(
+            os.path.basename(f) for f in file_names[:3] + file_names[-2:]
+        )
+        expected = r"""
+        20000101_093500.arrows
+        20000101_093500.1.arrows
+        20000101_093500.2.arrows
+        20000101_093500.10.arrows
+        20000101_093500.11.arrows
+        """
+        self.assert_equal(actual, expected, dedent=True)
+        # Check the data.
+        df = opstalog.read_state_log(dir_name)
+        self.assertEqual(df["101"].to_list(), [float(idx) for idx in range(12)])
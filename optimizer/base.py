@@ -5,6 +5,10 @@ import optimizer.base as opbase
 """
 
 import abc
+from typing import Union
+
+import numpy as np
+import pandas as pd
 
 # Equivalent to `import cvxpy as cpx`, but skip this module if the module is
 # not present.
@@ -15,6 +19,21 @@ cvx = pytest.importorskip("cvxpy")
 EXPR = cvx.expressions.expression.Expression
 
 
+def get_values(
+    data: Union[pd.Series, cvx.Parameter],
+) -> Union[np.ndarray, cvx.Parameter]:
+    """
+    Return the values of `data` to be used in a cvxpy expression.
+
+    Constraints accept either a `pd.Series`, whose values are constants of the
+    problem, or a `cvx.Parameter`, whose values can change across solves of
+    the same problem.
+    """
+    if isinstance(data, cvx.Parameter):
+        return data
+    return data.values
+
+
 # #############################################################################
 # Base `Expression` class.
 # #############################################################################
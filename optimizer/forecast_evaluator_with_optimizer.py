@@ -6,6 +6,7 @@ import optimizer.forecast_evaluator_with_optimizer as ofevwiop
 import logging
 from typing import Any, Dict, Optional, Tuple
 
+import joblib
 import pandas as pd
 from tqdm.autonotebook import tqdm
 
@@ -92,8 +93,22 @@ class ForecastEvaluatorWithOptimizer(dtfmabfoev.AbstractForecastEvaluator):
         burn_in_days: int = 0,
         compute_extended_stats: bool = False,
         asset_id_to_share_decimals: Optional[Dict[int, int]] = None,
+        warm_start: bool = False,
+        num_workers: int = 1,
         **kwargs: Dict[str, Any],
     ) -> Dict[str, pd.DataFrame]:
+        """
+        Compute the portfolio optimizing the targets bar by bar.
+
+        :param warm_start: build the optimization problem once and re-solve
+            it at each bar, instead of building a new problem for each bar
+            - the targets are the same up to the solver tolerance
+        :param num_workers: number of processes used to run the days in
+            parallel
+            - days are independent only when the holdings are liquidated at
+              the end of the day and the trades are reset at the beginning of
+              the day, so parallelism requires these options
+        """
         # Record index in case we reindex the results.
         if reindex_like_input:
             raise NotImplementedError(
@@ -101,6 +116,90 @@ class ForecastEvaluatorWithOptimizer(dtfmabfoev.AbstractForecastEvaluator):
             )
         else:
             idx = None
+        # Split the bars in tiles that can be processed independently.
+        hdbg.dassert_lte(1, num_workers)
+        if num_workers == 1:
+            tiles = [df]
+        else:
+            hdbg.dassert(
+                liquidate_at_end_of_day
+                and initialize_beginning_of_day_trades_to_zero,
+                "Days are not independent, so they cannot be run in parallel",
+            )
+            tiles = [tile for _, tile in df.groupby(df.index.date)]
+        tile_kwargs = {
+            "quantization": quantization,
+            "liquidate_at_end_of_day": liquidate_at_end_of_day,
+            "initialize_beginning_of_day_trades_to_zero": (
+                initialize_beginning_of_day_trades_to_zero
+            ),
+            "asset_id_to_share_decimals": asset_id_to_share_decimals,
+            "warm_start": warm_start,
+        }
+        if num_workers == 1:
+            tile_dfs = [
+                self._compute_holdings_and_trades(tile, **tile_kwargs)
+                for tile in tiles
+            ]
+        else:
+            _LOG.debug(
+                "Processing %s days with num_workers=%s", len(tiles), num_workers
+            )
+            tile_dfs = joblib.Parallel(n_jobs=num_workers)(
+                joblib.delayed(self._compute_holdings_and_trades)(
+                    tile, **tile_kwargs
+                )
+                for tile in tiles
+            )
+        # Create the portfolio dataframe.
+        (
+            holdings_shares,
+            holdings_notional,
+            executed_trades_shares,
+            executed_trades_notional,
+        ) = [pd.concat(dfs) for dfs in zip(*tile_dfs)]
+        pnl = holdings_notional.subtract(
+            holdings_notional.shift(1), fill_value=0
+        ).subtract(executed_trades_notional, fill_value=0)
+        stats = cofinanc.compute_bar_metrics(
+            holdings_notional,
+            -executed_trades_notional,
+            pnl,
+            compute_extended_stats=compute_extended_stats,
+        )
+        derived_dfs = {
+            "holdings_shares": holdings_shares,
+            "holdings_notional": holdings_notional,
+            "executed_trades_shares": executed_trades_shares,
+            "executed_trades_notional": executed_trades_notional,
+            "pnl": pnl,
+            "stats": stats,
+        }
+        # Apply burn-in and reindex like input.
+        return self._apply_burn_in_and_reindex(
+            df,
+            derived_dfs,
+            burn_in_bars,
+            burn_in_days,
+            idx,
+        )
+
+    def _compute_holdings_and_trades(
+        self,
+        df: pd.DataFrame,
+        *,
+        quantization: Optional[int],
+        liquidate_at_end_of_day: bool,
+        initialize_beginning_of_day_trades_to_zero: bool,
+        asset_id_to_share_decimals: Optional[Dict[int, int]],
+        warm_start: bool,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        Compute holdings and trades starting from zero holdings.
+
+        :return: holdings in shares and notional, executed trades in shares
+            and notional
+        """
         # Prepare to process the DAG df row by row.
         iter_ = enumerate(df.iterrows())
         iter_idx = df.index
@@ -182,6 +281,7 @@ class ForecastEvaluatorWithOptimizer(dtfmabfoev.AbstractForecastEvaluator):
                 quantization,
                 asset_id_to_share_decimals,
                 liquidate_holdings,
+                warm_start,
             )
             # If the time step is not the last one, set the next-period
             # share holdings and executed trades in shares (assuming orders
@@ -204,35 +304,15 @@ class ForecastEvaluatorWithOptimizer(dtfmabfoev.AbstractForecastEvaluator):
                     executed_trades_shares_dict[next_timestamp] = (
                         targets_df["target_trades_shares"]
                     ).rename("executed_trades_shares")
-        # Create the portfolio dataframe.
         holdings_shares = pd.DataFrame(holdings_shares_dict).T
         holdings_notional = pd.DataFrame(holdings_notional_dict).T
         executed_trades_shares = pd.DataFrame(executed_trades_shares_dict).T
         executed_trades_notional = pd.DataFrame(executed_trades_notional_dict).T
-        pnl = holdings_notional.subtract(
-            holdings_notional.shift(1), fill_value=0
-        ).subtract(executed_trades_notional, fill_value=0)
-        stats = cofinanc.compute_bar_metrics(
+        return (
+            holdings_shares,
             holdings_notional,
-            -executed_trades_notional,
-            pnl,
-            compute_extended_stats=compute_extended_stats,
-        )
-        derived_dfs = {
-            "holdings_shares": holdings_shares,
-            "holdings_notional": holdings_notional,
-            "executed_trades_shares": executed_trades_shares,
-            "executed_trades_notional": executed_trades_notional,
-            "pnl": pnl,
-            "stats": stats,
-        }
-        # Apply burn-in and reindex like input.
-        return self._apply_burn_in_and_reindex(
-            df,
-            derived_dfs,
-            burn_in_bars,
-            burn_in_days,
-            idx,
+            executed_trades_shares,
+            executed_trades_notional,
         )
 
     def _compute_holdings_notional(
@@ -265,6 +345,7 @@ class ForecastEvaluatorWithOptimizer(dtfmabfoev.AbstractForecastEvaluator):
         quantization,
         asset_id_to_share_decimals,
         liquidate_holdings,
+        warm_start,
     ) -> pd.Series:
         # Prepare data for the optimizer.
         holdings_df = pd.concat([holdings_shares, holdings_notional], axis=1)
@@ -279,6 +360,7 @@ class ForecastEvaluatorWithOptimizer(dtfmabfoev.AbstractForecastEvaluator):
             quantization=quantization,
             asset_id_to_share_decimals=asset_id_to_share_decimals,
             liquidate_holdings=liquidate_holdings,
+            warm_start=warm_start,
         )
         return output_df
 
@@ -5,6 +5,7 @@ import optimizer.hard_constraints as oharcons
 """
 
 import logging
+from typing import Union
 
 import pandas as pd
 
@@ -108,24 +109,34 @@ class DoNotTradeHardConstraint(opbase.Expression):
 
 
 class DoNotBuyHardConstraint(opbase.Expression):
-    def __init__(self, do_not_buy: pd.Series) -> None:
-        hdbg.dassert_isinstance(do_not_buy, pd.Series)
-        hdbg.dassert(do_not_buy.any())
+    def __init__(self, do_not_buy: Union[pd.Series, cvx.Parameter]) -> None:
+        hdbg.dassert_isinstance(do_not_buy, (pd.Series, cvx.Parameter))
+        if isinstance(do_not_buy, pd.Series):
+            hdbg.dassert(do_not_buy.any())
         self._do_not_buy = do_not_buy
 
     def get_expr(self, target_weights, target_weight_diffs, gmv) -> opbase.EXPR:
         _ = target_weights
         _ = gmv
-        return cvx.multiply(target_weight_diffs, self._do_not_buy.values) <= 0
+        return (
+            cvx.multiply(target_weight_diffs, opbase.get_values(self._do_not_buy))
+            <= 0
+        )
 
 
 class DoNotSellHardConstraint(opbase.Expression):
-    def __init__(self, do_not_sell: pd.Series) -> None:
-        hdbg.dassert_isinstance(do_not_sell, pd.Series)
-        hdbg.dassert(do_not_sell.any())
+    def __init__(self, do_not_sell: Union[pd.Series, cvx.Parameter]) -> None:
+        hdbg.dassert_isinstance(do_not_sell, (pd.Series, cvx.Parameter))
+        if isinstance(do_not_sell, pd.Series):
+            hdbg.dassert(do_not_sell.any())
         self._do_not_sell = do_not_sell
 
     def get_expr(self, target_weights, target_weight_diffs, gmv) -> opbase.EXPR:
         _ = target_weights
         _ = gmv
-        return cvx.multiply(target_weight_diffs, self._do_not_sell.values) >= 0
+        return (
+            cvx.multiply(
+                target_weight_diffs, opbase.get_values(self._do_not_sell)
+            )
+            >= 0
+        )
@@ -4,8 +4,9 @@ Import as:
 import optimizer.single_period_optimization as osipeopt
 """
 
+import collections
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -31,19 +32,244 @@ _LOG = logging.getLogger(__name__)
 # #############################################################################
 
 
+# Maximum number of problems kept by `optimize()` when `warm_start=True`.
+_MAX_NUM_CACHED_PROBLEMS = 16
+# Map from config and universe to the corresponding problem.
+_PROBLEM_CACHE: collections.OrderedDict = collections.OrderedDict()
+
+
 def optimize(
     config_dict: dict,
     df: pd.DataFrame,
+    *,
+    warm_start: bool = False,
     **kwargs: Dict[str, Any],
 ) -> pd.DataFrame:
     """
     Wrapper around `SinglePeriodOptimizer`.
+
+    :param warm_start: reuse a `ParameterizedSinglePeriodProblem` across
+        calls with the same config and universe, instead of building and
+        compiling a new problem for each call
     """
-    spo = SinglePeriodOptimizer(config_dict, df)
+    problem = None
+    if warm_start:
+        problem = get_parameterized_problem(config_dict, df["asset_id"])
+    spo = SinglePeriodOptimizer(config_dict, df, problem=problem)
     output_df = spo.optimize(**kwargs)
     return output_df
 
 
+def get_parameterized_problem(
+    config_dict: dict, asset_ids: pd.Series
+) -> "ParameterizedSinglePeriodProblem":
+    """
+    Get the cached problem for `config_dict` and `asset_ids`, building it if
+    needed.
+    """
+    key = (str(config_dict), tuple(asset_ids))
+    if key in _PROBLEM_CACHE:
+        _PROBLEM_CACHE.move_to_end(key)
+    else:
+        _LOG.debug("Building problem for asset_ids=%s", asset_ids.tolist())
+        _PROBLEM_CACHE[key] = ParameterizedSinglePeriodProblem(
+            config_dict, asset_ids
+        )
+        if len(_PROBLEM_CACHE) > _MAX_NUM_CACHED_PROBLEMS:
+            _PROBLEM_CACHE.popitem(last=False)
+    return _PROBLEM_CACHE[key]
+
+
+def _get_solver(config_dict: dict) -> Optional[str]:
+    # We pass "solver" as a string to avoid propagating `cvx` dependencies.
+    if "solver" in config_dict:
+        solver = config_dict["solver"]
+        if solver == "ECOS":
+            solver = cvx.ECOS
+        elif solver == "OSQP":
+            solver = cvx.OSQP
+        elif solver == "SCS":
+            solver = cvx.SCS
+        else:
+            raise ValueError("solver=%s not supported", solver)
+    else:
+        solver = None
+    return solver
+
+
+def _get_soft_constraints(
+    config_dict: dict, volatility: Union[pd.Series, cvx.Parameter]
+) -> List[opbase.Expression]:
+    # Create soft constraints
+    soft_constraints = []
+    # Maybe add constant correlation risk constraint.
+    if "constant_correlation" in config_dict:
+        constant_correlation = config_dict["constant_correlation"]
+        constant_correlation_penalty = config_dict["constant_correlation_penalty"]
+        constant_correlation_risk = osofcons.ConstantCorrelationRiskModel(
+            constant_correlation,
+            volatility,
+            constant_correlation_penalty,
+        )
+        soft_constraints.append(constant_correlation_risk)
+    # Add GMV constraint.
+    target_gmv_constraint = osofcons.TargetGmvUpperBoundSoftConstraint(
+        config_dict["target_gmv_upper_bound_penalty"]
+    )
+    soft_constraints.append(target_gmv_constraint)
+    # Add dollar neutrality constraint.
+    dollar_neutrality = osofcons.DollarNeutralitySoftConstraint(
+        config_dict["dollar_neutrality_penalty"]
+    )
+    soft_constraints.append(dollar_neutrality)
+    # Add relative holding constraint.
+    relative_holding = osofcons.RelativeHoldingSoftConstraint(
+        config_dict["relative_holding_penalty"]
+    )
+    soft_constraints.append(relative_holding)
+    # Add transaction cost penalty.
+    transaction_cost_penalty = osofcons.TransactionCost(
+        volatility,
+        config_dict["transaction_cost_penalty"],
+    )
+    soft_constraints.append(transaction_cost_penalty)
+    return soft_constraints
+
+
+def _get_hard_constraints(config_dict: dict) -> List[opbase.Expression]:
+    """
+    Create the hard constraints that do not depend on restrictions.
+    """
+    hard_constraints = []
+    # Add target GMV hard constraint.
+    target_gmv_constraint = oharcons.TargetGmvUpperBoundHardConstraint(
+        config_dict["target_gmv"],
+        config_dict["target_gmv_hard_upper_bound_multiple"],
+    )
+    hard_constraints.append(target_gmv_constraint)
+    # Add relative holding constraint.
+    relative_holding_constraint = oharcons.RelativeHoldingHardConstraint(
+        config_dict["relative_holding_max_frac_of_gmv"]
+    )
+    hard_constraints.append(relative_holding_constraint)
+    return hard_constraints
+
+
+# #############################################################################
+# ParameterizedSinglePeriodProblem
+# #############################################################################
+
+
+class ParameterizedSinglePeriodProblem:
+    """
+    Problem solved by `SinglePeriodOptimizer`, built once for a universe and
+    re-solved as its inputs change.
+
+    The inputs that change from bar to bar (i.e., current weights,
+    predictions, volatility, and restrictions) are `cvx.Parameter`, so that
+    cvxpy compiles the problem only once and the solver starts from the
+    solution of the previous solve.
+    """
+
+    def __init__(self, config_dict: dict, asset_ids: pd.Series) -> None:
+        """
+        Constructor.
+
+        :param config_dict: optimizer config, like for `SinglePeriodOptimizer`
+        :param asset_ids: assets of the universe, in the order of the inputs
+            passed to `solve()`
+        """
+        hdbg.dassert_eq(asset_ids.nunique(), asset_ids.count())
+        self._asset_ids = asset_ids.tolist()
+        n_assets = len(self._asset_ids)
+        self._solver = _get_solver(config_dict)
+        self._verbose = config_dict.get("verbose", False)
+        # Create the inputs.
+        self._current_weights = cvx.Parameter(n_assets)
+        self._predictions = cvx.Parameter(n_assets)
+        self._volatility = cvx.Parameter(n_assets, nonneg=True)
+        self._do_not_buy = cvx.Parameter(n_assets, nonneg=True)
+        self._do_not_sell = cvx.Parameter(n_assets, nonneg=True)
+        # Use variables for both the target weights and the target weight
+        # diffs, instead of an expression of the current weights, so that the
+        # volatility only multiplies parameter-free expressions, as required
+        # by cvxpy to compile the problem once (see "Disciplined Parametrized
+        # Programming").
+        self._target_weights = cvx.Variable(n_assets)
+        self._target_weight_diffs = cvx.Variable(n_assets)
+        predicted_returns = cvx.multiply(self._predictions, self._target_weights)
+        mu = cvx.sum(predicted_returns)
+        # Get constraints.
+        soft_constraints = _get_soft_constraints(config_dict, self._volatility)
+        hard_constraints = _get_hard_constraints(config_dict)
+        # Restrictions are always part of the problem, and they are disabled
+        # by setting the corresponding parameters to 0.
+        hard_constraints.append(oharcons.DoNotBuyHardConstraint(self._do_not_buy))
+        hard_constraints.append(
+            oharcons.DoNotSellHardConstraint(self._do_not_sell)
+        )
+        # Convert constraints into cvxpy expressions.
+        target_gmv = config_dict["target_gmv"]
+        soft_constraint_cvx_expr = [
+            constraint.get_expr(
+                self._target_weights, self._target_weight_diffs, target_gmv
+            )
+            for constraint in soft_constraints
+        ]
+        hard_constraint_cvx_expr = [
+            constraint.get_expr(
+                self._target_weights, self._target_weight_diffs, target_gmv
+            )
+            for constraint in hard_constraints
+        ]
+        hard_constraint_cvx_expr.append(
+            self._target_weights
+            == self._current_weights + self._target_weight_diffs
+        )
+        # Create the cvxpy problem.
+        self._problem = cvx.Problem(
+            cvx.Maximize(mu - sum(soft_constraint_cvx_expr)),
+            hard_constraint_cvx_expr,
+        )
+        hdbg.dassert(self._problem.is_dpp())
+
+    @property
+    def asset_ids(self) -> List[int]:
+        return self._asset_ids
+
+    def solve(
+        self,
+        current_weights: pd.Series,
+        predictions: pd.Series,
+        volatility: pd.Series,
+        do_not_buy: pd.Series,
+        do_not_sell: pd.Series,
+    ) -> Tuple[cvx.Variable, cvx.Variable]:
+        """
+        Solve the problem for the passed inputs, aligned with `asset_ids`.
+
+        :return: target weights and weight diffs (from current weights),
+            normalized by current GMV
+        """
+        self._current_weights.value = current_weights.to_numpy(dtype=float)
+        self._predictions.value = predictions.to_numpy(dtype=float)
+        self._volatility.value = volatility.to_numpy(dtype=float)
+        self._do_not_buy.value = do_not_buy.to_numpy(dtype=float)
+        self._do_not_sell.value = do_not_sell.to_numpy(dtype=float)
+        optimal_value = self._problem.solve(
+            self._solver, warm_start=True, verbose=self._verbose
+        )
+        if self._problem.status != "optimal":
+            _LOG.warning("problem.status=%s", self._problem.status)
+        _LOG.debug("`optimal_value`=%0.2f", optimal_value)
+        return self._target_weights, self._target_weight_diffs
+
+
+# #############################################################################
+# SinglePeriodOptimizer
+# #############################################################################
+
+
 class SinglePeriodOptimizer:
     def __init__(
         self,
@@ -51,6 +277,7 @@ class SinglePeriodOptimizer:
         df: pd.DataFrame,
         *,
         restrictions: Optional[pd.DataFrame] = None,
+        problem: Optional[ParameterizedSinglePeriodProblem] = None,
     ) -> None:
         """
         Single period optimization constructor.
@@ -62,6 +289,9 @@ class SinglePeriodOptimizer:
             - asset volatility is needed to generate a risk constraint
             - some restriction constraints are position-dependent
         :param restrictions: restrictions dataframe
+        :param problem: problem to solve for the assets of `df`, reused across
+            bars
+            - `None` to build a new problem
         """
         # Process `config_dict` and extract parameters.
         self._dollar_neutrality_penalty = config_dict["dollar_neutrality_penalty"]
@@ -96,19 +326,10 @@ class SinglePeriodOptimizer:
         _LOG.debug(
             "current_weights=\n%s", hpandas.df_to_str(self._current_weights)
         )
-        # We pass "solver" as a string to avoid propagating `cvx` dependencies.
-        if "solver" in config_dict:
-            solver = config_dict["solver"]
-            if solver == "ECOS":
-                self._solver = cvx.ECOS
-            elif solver == "OSQP":
-                self._solver = cvx.OSQP
-            elif solver == "SCS":
-                self._solver = cvx.SCS
-            else:
-                raise ValueError("solver=%s not supported", solver)
-        else:
-            self._solver = None
+        self._solver = _get_solver(config_dict)
+        if problem is not None:
+            hdbg.dassert_eq(problem.asset_ids, self._asset_ids.tolist())
+        self._problem = problem
         self._verbose = config_dict.get("verbose", False)
 
     def optimize(
@@ -269,6 +490,15 @@ class SinglePeriodOptimizer:
         :return: target weights and weight diffs (from current weights),
             normalized by current GMV.
         """
+        if self._problem is not None:
+            do_not_buy, do_not_sell = self._get_do_not_buy_and_sell()
+            return self._problem.solve(
+                self._current_weights,
+                self._df["prediction"] * self._df["volatility"],
+                self._df["volatility"],
+                do_not_buy,
+                do_not_sell,
+            )
         # Determine the current GMV and GMV-normalized weights.
         # Create a placeholder for (current) GMV-normalized weight adjustments.
         target_weight_diffs = cvx.Variable(self._n_assets)
@@ -311,78 +541,41 @@ class SinglePeriodOptimizer:
         return target_weights, target_weight_diffs
 
     def _get_soft_constraints(self) -> List[opbase.Expression]:
-        # Create soft constraints
-        soft_constraints = []
         volatility = self._df["volatility"]
-        # Maybe add constant correlation risk constraint.
-        if "constant_correlation" in self._config_dict:
-            constant_correlation = self._config_dict["constant_correlation"]
-            constant_correlation_penalty = self._config_dict[
-                "constant_correlation_penalty"
-            ]
-            constant_correlation_risk = osofcons.ConstantCorrelationRiskModel(
-                constant_correlation,
-                volatility,
-                constant_correlation_penalty,
-            )
-            soft_constraints.append(constant_correlation_risk)
-        # Add GMV constraint.
-        target_gmv_constraint = osofcons.TargetGmvUpperBoundSoftConstraint(
-            self._target_gmv_upper_bound_penalty
-        )
-        soft_constraints.append(target_gmv_constraint)
-        # Add dollar neutrality constraint.
-        dollar_neutrality = osofcons.DollarNeutralitySoftConstraint(
-            self._dollar_neutrality_penalty
-        )
-        soft_constraints.append(dollar_neutrality)
-        # Add relative holding constraint.
-        relative_holding = osofcons.RelativeHoldingSoftConstraint(
-            self._relative_holding_penalty
-        )
-        soft_constraints.append(relative_holding)
-        # Add transaction cost penalty.
-        transaction_cost_penalty = osofcons.TransactionCost(
-            volatility,
-            self._transaction_cost_penalty,
-        )
-        soft_constraints.append(transaction_cost_penalty)
-        return soft_constraints
+        return _get_soft_constraints(self._config_dict, volatility)
 
     def _get_hard_constraints(self) -> List[opbase.Expression]:
-        # Create hard constraints.
-        hard_constraints = []
-        # Add target GMV hard constraint.
-        target_gmv_constraint = oharcons.TargetGmvUpperBoundHardConstraint(
-            self._target_gmv,
-            self._target_gmv_hard_upper_bound_multiple,
-        )
-        hard_constraints.append(target_gmv_constraint)
-        # Add relative holding constraint.
-        relative_holding_constraint = oharcons.RelativeHoldingHardConstraint(
-            self._relative_holding_max_frac_of_gmv
-        )
-        hard_constraints.append(relative_holding_constraint)
+        hard_constraints = _get_hard_constraints(self._config_dict)
         if self._restrictions is not None:
             restriction_constraints = self._get_restriction_constraints()
             if restriction_constraints:
                 hard_constraints.extend(restriction_constraints)
         return hard_constraints
 
-    def _get_restriction_constraints(self) -> List[opbase.Expression]:
-        constraints = []
+    def _get_do_not_buy_and_sell(self) -> Tuple[pd.Series, pd.Series]:
+        """
+        Get the masks of the assets that cannot be bought and sold.
+        """
+        if self._restrictions is None:
+            no_restrictions = pd.Series(False, index=self._df.index)
+            return no_restrictions, no_restrictions
         df = self._df.merge(self._restrictions, how="left", on="asset_id").fillna(
             False
         )
         do_not_buy = ((df["holdings_shares"] >= 0) & df["is_buy_restricted"]) | (
             (df["holdings_shares"] < 0) & df["is_buy_cover_restricted"]
         )
-        if do_not_buy.any():
-            do_not_buy_constraint = oharcons.DoNotBuyHardConstraint(do_not_buy)
-            constraints.append(do_not_buy_constraint)
         do_not_sell = (
             (df["holdings_shares"] > 0) & df["is_sell_long_restricted"]
         ) | ((df["holdings_shares"] <= 0) & df["is_sell_short_restricted"])
+        return do_not_buy, do_not_sell
+
+    def _get_restriction_constraints(self) -> List[opbase.Expression]:
+        constraints = []
+        do_not_buy, do_not_sell = self._get_do_not_buy_and_sell()
+        if do_not_buy.any():
+            do_not_buy_constraint = oharcons.DoNotBuyHardConstraint(do_not_buy)
+            constraints.append(do_not_buy_constraint)
         if do_not_sell.any():
             do_not_sell_constraint = oharcons.DoNotSellHardConstraint(do_not_sell)
             constraints.append(do_not_sell_constraint)
@@ -6,6 +6,7 @@ import optimizer.soft_constraints as osofcons
 
 import abc
 import logging
+from typing import Union
 
 import pandas as pd
 
@@ -56,6 +57,11 @@ class SoftConstraint(abc.ABC):
     def get_expr(self, target_weights, target_weight_diffs, gmv) -> opbase.EXPR:
         expr = self._estimate(target_weights, target_weight_diffs, gmv)
         self.expr = expr.copy()
+        if expr.parameters():
+            # A product of parameters would prevent cvxpy from compiling the
+            # problem once for all the values of the parameters, so the
+            # current value of the multiplier is used.
+            return self.gamma.value * expr
         return self.gamma * expr
 
     @abc.abstractmethod
@@ -109,7 +115,10 @@ class ConstantCorrelationRiskModel(SoftConstraint):
     """
 
     def __init__(
-        self, correlation: float, volatility: pd.Series, gamma: float = 1.0
+        self,
+        correlation: float,
+        volatility: Union[pd.Series, cvx.Parameter],
+        gamma: float = 1.0,
     ) -> None:
         self._correlation = correlation
         self._volatility = volatility
@@ -119,10 +128,10 @@ class ConstantCorrelationRiskModel(SoftConstraint):
         _ = target_weight_diffs
         _ = gmv
         expr1 = (1 - self._correlation) * cvx.sum_squares(
-            cvx.multiply(target_weights, self._volatility.values)
+            cvx.multiply(target_weights, opbase.get_values(self._volatility))
         )
         expr2 = self._correlation * cvx.power(
-            target_weights @ self._volatility.values, 2
+            target_weights @ opbase.get_values(self._volatility), 2
         )
         expr = expr1 + expr2
         return expr
@@ -148,15 +157,19 @@ class SpreadCost(SoftConstraint):
 
 
 class TransactionCost(SoftConstraint):
-    def __init__(self, volatility: pd.Series, gamma: float = 1.0) -> None:
-        hdbg.dassert_isinstance(volatility, pd.Series)
+    def __init__(
+        self, volatility: Union[pd.Series, cvx.Parameter], gamma: float = 1.0
+    ) -> None:
+        hdbg.dassert_isinstance(volatility, (pd.Series, cvx.Parameter))
         self._volatility = volatility
         super().__init__(gamma)
 
     def _estimate(self, target_weights, target_weight_diffs, gmv) -> opbase.EXPR:
         _ = target_weights
         _ = gmv
-        expr = self._volatility.values @ cvx.abs(target_weight_diffs).T
+        expr = (
+            opbase.get_values(self._volatility) @ cvx.abs(target_weight_diffs).T
+        )
         return expr
 
 
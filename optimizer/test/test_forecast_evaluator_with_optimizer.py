@@ -399,3 +399,88 @@ class TestForecastEvaluatorWithOptimizer2(hunitest.TestCase):
 2022-01-05 16:00:00-05:00 -36.72     100280.69      124.56       0.00    0.00
 """
         self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_multiday_parallel(self) -> None:
+        """
+        Check that processing the days in parallel gives the same results as
+        processing them sequentially.
+        """
+        data = self.get_data(
+            pd.Timestamp("2022-01-03 09:30:00", tz="America/New_York"),
+            pd.Timestamp("2022-01-05 16:00:00", tz="America/New_York"),
+            asset_ids=[101, 201, 301],
+        )
+        config_dict = self.get_config_dict()
+        forecast_evaluator = ofevwiop.ForecastEvaluatorWithOptimizer(
+            price_col="price",
+            volatility_col="volatility",
+            prediction_col="prediction",
+            optimizer_config_dict=config_dict,
+        )
+        expected_portfolio_df, expected_stats_df = (
+            forecast_evaluator.annotate_forecasts(data, quantization=0)
+        )
+        actual_portfolio_df, actual_stats_df = (
+            forecast_evaluator.annotate_forecasts(
+                data, quantization=0, num_workers=2
+            )
+        )
+        self.assert_equal(
+            hpandas.df_to_str(actual_portfolio_df, num_rows=None),
+            hpandas.df_to_str(expected_portfolio_df, num_rows=None),
+        )
+        self.assert_equal(
+            hpandas.df_to_str(actual_stats_df, num_rows=None),
+            hpandas.df_to_str(expected_stats_df, num_rows=None),
+        )
+
+    def test_multiday_warm_start(self) -> None:
+        """
+        Check that re-solving the same problem with the parameters of each bar
+        gives the same results as building a new problem for each bar.
+        """
+        data = self.get_data(
+            pd.Timestamp("2022-01-03 09:30:00", tz="America/New_York"),
+            pd.Timestamp("2022-01-05 16:00:00", tz="America/New_York"),
+            asset_ids=[101, 201, 301],
+        )
+        # Scale predictions and volatility up, since with values of the order of
+        # 1e-3 the objective is within the solver tolerance for a wide range of
+        # targets and the two solves can pick different ones.
+        data["prediction"] = data["prediction"] * 100
+        data["volatility"] = data["volatility"] * 100
+        config_dict = self.get_config_dict()
+        forecast_evaluator = ofevwiop.ForecastEvaluatorWithOptimizer(
+            price_col="price",
+            volatility_col="volatility",
+            prediction_col="prediction",
+            optimizer_config_dict=config_dict,
+        )
+        # Don't round the shares to integers, so that the differences within
+        # the solver tolerance are not rounded to different numbers of shares.
+        kwargs = {
+            "quantization": None,
+            "asset_id_to_share_decimals": {101: 6, 201: 6, 301: 6},
+        }
+        expected_portfolio_df, expected_stats_df = (
+            forecast_evaluator.annotate_forecasts(data, **kwargs)
+        )
+        actual_portfolio_df, actual_stats_df = (
+            forecast_evaluator.annotate_forecasts(data, warm_start=True, **kwargs)
+        )
+        # Compare up to the solver tolerance, i.e., a few dollars on a target
+        # GMV of 1e5.
+        self.assert_dfs_close(
+            actual_portfolio_df,
+            expected_portfolio_df,
+            rtol=1e-4,
+            atol=5.0,
+            equal_nan=True,
+        )
+        self.assert_dfs_close(
+            actual_stats_df,
+            expected_stats_df,
+            rtol=1e-4,
+            atol=5.0,
+            equal_nan=True,
+        )
@@ -1,6 +1,7 @@
 import logging
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -356,3 +357,107 @@ class TestSinglePeriodOptimizer1(hunitest.TestCase):
         """
         # pylint: enable=line-too-long
         self.assert_equal(actual, expected, fuzzy_match=True)
+
+
+# #############################################################################
+# TestParameterizedSinglePeriodProblem1
+# #############################################################################
+
+
+class TestParameterizedSinglePeriodProblem1(hunitest.TestCase):
+    """
+    Check that re-solving the same problem gives the same targets as building
+    a new problem for each bar.
+    """
+
+    @staticmethod
+    def get_config_dict() -> Dict[str, Any]:
+        config_dict = {
+            "dollar_neutrality_penalty": 0.1,
+            "constant_correlation": 0.5,
+            "constant_correlation_penalty": 1.0,
+            "relative_holding_penalty": 0.1,
+            "relative_holding_max_frac_of_gmv": 0.6,
+            "target_gmv": 3000,
+            "target_gmv_upper_bound_penalty": 0.1,
+            "target_gmv_hard_upper_bound_multiple": 1.05,
+            "transaction_cost_penalty": 0.1,
+            # Use an interior-point solver, which solves to high accuracy from
+            # any starting point.
+            "solver": "ECOS",
+        }
+        return config_dict
+
+    @staticmethod
+    def get_prediction_df(seed: int) -> pd.DataFrame:
+        rng = np.random.default_rng(seed=seed)
+        n_assets = 4
+        holdings_shares = rng.integers(-1000, 1000, size=n_assets)
+        price = rng.uniform(1, 10, size=n_assets)
+        df = pd.DataFrame(
+            {
+                "asset_id": [101, 102, 103, 104],
+                "holdings_shares": holdings_shares,
+                "price": price,
+                "holdings_notional": holdings_shares * price,
+                "prediction": rng.normal(scale=0.1, size=n_assets),
+                "volatility": rng.uniform(0.01, 0.1, size=n_assets),
+            }
+        )
+        return df
+
+    def check_bars(self, restrictions: Optional[pd.DataFrame]) -> None:
+        config_dict = self.get_config_dict()
+        asset_ids = self.get_prediction_df(0)["asset_id"]
+        problem = osipeopt.ParameterizedSinglePeriodProblem(
+            config_dict, asset_ids
+        )
+        for seed in range(5):
+            df = self.get_prediction_df(seed)
+            expected = osipeopt.SinglePeriodOptimizer(
+                config_dict, df, restrictions=restrictions
+            ).optimize(
+                quantization=None,
+                asset_id_to_share_decimals={
+                    asset_id: 6 for asset_id in asset_ids
+                },
+            )
+            actual = osipeopt.SinglePeriodOptimizer(
+                config_dict, df, restrictions=restrictions, problem=problem
+            ).optimize(
+                quantization=None,
+                asset_id_to_share_decimals={
+                    asset_id: 6 for asset_id in asset_ids
+                },
+            )
+            # Compare the targets up to the solver tolerance.
+            col = "target_holdings_notional"
+            np.testing.assert_allclose(
+                actual[col], expected[col], rtol=1e-3, atol=1.0
+            )
+
+    def test1(self) -> None:
+        self.check_bars(restrictions=None)
+
+    def test_restrictions1(self) -> None:
+        restrictions = pd.DataFrame(
+            {
+                "asset_id": [101, 103],
+                "is_buy_restricted": [True, False],
+                "is_buy_cover_restricted": [True, False],
+                "is_sell_short_restricted": [False, True],
+                "is_sell_long_restricted": [False, True],
+            }
+        )
+        self.check_bars(restrictions=restrictions)
+
+    def test_optimize1(self) -> None:
+        """
+        Check that `optimize()` reuses the problem across calls.
+        """
+        config_dict = self.get_config_dict()
+        df = self.get_prediction_df(0)
+        problem1 = osipeopt.get_parameterized_problem(config_dict, df["asset_id"])
+        _ = osipeopt.optimize(config_dict, df, warm_start=True)
+        problem2 = osipeopt.get_parameterized_problem(config_dict, df["asset_id"])
+        self.assertIs(problem1, problem2)